@@ -25,23 +25,16 @@ async def add_stock_photos():
     """Add stock photos to all venues that don't have photos"""
     async for db in get_db():
         try:
-            # Get all venues
-            result = await db.execute(select(Venue))
+            # Venues without photos, in one query (instead of a photo
+            # lookup per venue)
+            result = await db.execute(
+                select(Venue).where(~Venue.photos.any()).order_by(Venue.name)
+            )
             venues = result.scalars().all()
             
-            print(f"Found {len(venues)} venues")
+            print(f"Found {len(venues)} venues without photos")
             
             for i, venue in enumerate(venues):
-                # Check if venue already has photos with a separate query
-                photo_check = await db.execute(
-                    select(Photo).where(Photo.venue_id == venue.id)
-                )
-                existing_photos = photo_check.scalars().all()
-                
-                if existing_photos:
-                    print(f"  {venue.name}: Already has {len(existing_photos)} photo(s), skipping")
-                    continue
-                
                 # Add a stock photo (cycle through the available photos)
                 photo_url = VENUE_PHOTOS[i % len(VENUE_PHOTOS)]
                 
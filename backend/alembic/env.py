@@ -1,5 +1,6 @@
 """Alembic environment configuration for async migrations."""
 import asyncio
+import re
 from logging.config import fileConfig
 
 from sqlalchemy import pool
@@ -23,6 +24,15 @@ if config.config_file_name is not None:
 # Target metadata for autogenerate
 target_metadata = Base.metadata
 
+# Monthly activity_logs partitions are created and dropped at runtime
+# (activity_log_service), not by migrations
+RUNTIME_TABLES = re.compile(r"^activity_logs_p\d{4}_\d{2}$")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep runtime-managed partitions out of autogenerate."""
+    return not (type_ == "table" and reflected and RUNTIME_TABLES.match(name))
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -40,6 +50,7 @@ def run_migrations_offline() -> None:
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
         compare_server_default=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -53,6 +64,7 @@ def do_run_migrations(connection):
         target_metadata=target_metadata,
         compare_type=True,
         compare_server_default=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -0,0 +1,55 @@
+"""venue_partial_indexes
+
+Revision ID: c41e7a9d2f10
+Revises: b875bd43a330
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c41e7a9d2f10'
+down_revision = 'b875bd43a330'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build the new indexes without locking writes on the venues table.
+    # CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        # 1. Partial index backing the default gallery ordering (ORDER BY name)
+        op.create_index(
+            'ix_venues_name_active',
+            'venues',
+            ['name'],
+            postgresql_where=sa.text('NOT is_deleted'),
+            postgresql_concurrently=True,
+        )
+
+        # 2. Expression index matching func.lower(Venue.city) == :city,
+        #    with name appended so the filtered list comes back pre-sorted
+        op.create_index(
+            'ix_venues_city_lower_active',
+            'venues',
+            [sa.text('lower(city)'), 'name'],
+            postgresql_where=sa.text('NOT is_deleted'),
+            postgresql_concurrently=True,
+        )
+
+        # 3. Drop the plain btree indexes the planner could not use for
+        #    these queries
+        op.drop_index('ix_venues_name', table_name='venues', postgresql_concurrently=True)
+        op.drop_index('ix_venues_city', table_name='venues', postgresql_concurrently=True)
+        op.drop_index('ix_venues_is_deleted', table_name='venues', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_venues_is_deleted', 'venues', ['is_deleted'], postgresql_concurrently=True)
+        op.create_index('ix_venues_city', 'venues', ['city'], postgresql_concurrently=True)
+        op.create_index('ix_venues_name', 'venues', ['name'], postgresql_concurrently=True)
+
+        op.drop_index('ix_venues_city_lower_active', table_name='venues', postgresql_concurrently=True)
+        op.drop_index('ix_venues_name_active', table_name='venues', postgresql_concurrently=True)
@@ -0,0 +1,40 @@
+"""venue_coordinates
+
+Revision ID: d7e2b19c4a55
+Revises: c41e7a9d2f10
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd7e2b19c4a55'
+down_revision = 'c41e7a9d2f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 1. Nullable coordinates; existing venues are filled in by
+    #    `python -m tools.geocode_venues`
+    op.add_column('venues', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('venues', sa.Column('longitude', sa.Float(), nullable=True))
+
+    # 2. Bounding-box index for radius searches that fall back to SQL
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_venues_lat_lng_active',
+            'venues',
+            ['latitude', 'longitude'],
+            postgresql_where=sa.text('NOT is_deleted AND latitude IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_venues_lat_lng_active', table_name='venues', postgresql_concurrently=True)
+
+    op.drop_column('venues', 'longitude')
+    op.drop_column('venues', 'latitude')
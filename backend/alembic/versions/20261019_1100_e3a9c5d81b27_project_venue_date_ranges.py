@@ -0,0 +1,47 @@
+"""project_venue_date_ranges
+
+Revision ID: e3a9c5d81b27
+Revises: d7e2b19c4a55
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'e3a9c5d81b27'
+down_revision = 'd7e2b19c4a55'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 1. Structured ranges next to the free-text availability_dates,
+    #    which is kept for existing data
+    op.add_column('project_venues', sa.Column('availability_range', postgresql.DATERANGE(), nullable=True))
+    op.add_column('project_venues', sa.Column('hold_range', postgresql.DATERANGE(), nullable=True))
+
+    # 2. GiST index for venue + date overlap lookups; btree_gist provides
+    #    the GiST operator class for the uuid column
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_project_venues_venue_hold_range',
+            'project_venues',
+            ['venue_id', 'hold_range'],
+            postgresql_using='gist',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_project_venues_venue_hold_range',
+            table_name='project_venues',
+            postgresql_concurrently=True,
+        )
+
+    op.drop_column('project_venues', 'hold_range')
+    op.drop_column('project_venues', 'availability_range')
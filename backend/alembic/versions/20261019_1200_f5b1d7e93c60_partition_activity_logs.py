@@ -0,0 +1,122 @@
+"""partition_activity_logs
+
+Revision ID: f5b1d7e93c60
+Revises: e3a9c5d81b27
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'f5b1d7e93c60'
+down_revision = 'e3a9c5d81b27'
+branch_labels = None
+depends_on = None
+
+# Monthly partitions created beyond the current month; the application
+# keeps creating them from then on (ACTIVITY_LOG_PARTITIONS_AHEAD)
+PARTITIONS_AHEAD = 3
+
+OLD_INDEXES = (
+    'activity_logs_pkey',
+    'ix_activity_logs_project_id',
+    'ix_activity_logs_user_id',
+    'ix_activity_logs_action',
+)
+
+
+def upgrade() -> None:
+    # 1. Move the plain table (and its index names) out of the way
+    op.rename_table('activity_logs', 'activity_logs_old')
+    for name in OLD_INDEXES:
+        op.execute(f'ALTER INDEX {name} RENAME TO {name}_old')
+
+    # 2. Partitioned table; the partition key has to be part of the
+    #    primary key
+    op.create_table(
+        'activity_logs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('action', sa.String(100), nullable=False),
+        sa.Column('details', postgresql.JSONB, nullable=False, server_default='{}'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'created_at', name='activity_logs_pkey'),
+        sa.ForeignKeyConstraint(
+            ['project_id'], ['projects.id'], ondelete='CASCADE', name='activity_logs_project_id_fkey'
+        ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE', name='activity_logs_user_id_fkey'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    # Indexes on a partitioned table are created on every partition and
+    # cannot be built CONCURRENTLY; the table is new, so nothing waits.
+    # (project_id, created_at, id) serves the keyset-paginated timeline.
+    op.create_index(
+        'ix_activity_logs_project_created', 'activity_logs', ['project_id', 'created_at', 'id']
+    )
+    op.create_index('ix_activity_logs_user_id', 'activity_logs', ['user_id'])
+    op.create_index('ix_activity_logs_action', 'activity_logs', ['action'])
+
+    # 3. One partition per month (UTC) from the oldest existing row up to
+    #    PARTITIONS_AHEAD months from now
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month timestamptz := date_trunc(
+                'month', coalesce((SELECT min(created_at) FROM activity_logs_old), now()) AT TIME ZONE 'UTC'
+            ) AT TIME ZONE 'UTC';
+            last timestamptz := date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+                + interval '{PARTITIONS_AHEAD} months';
+        BEGIN
+            WHILE month <= last LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF activity_logs FOR VALUES FROM (%L) TO (%L)',
+                    'activity_logs_p' || to_char(month AT TIME ZONE 'UTC', 'YYYY_MM'),
+                    month,
+                    month + interval '1 month'
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END
+        $$
+    """)
+
+    # 4. Copy existing rows and drop the old table
+    op.execute(
+        'INSERT INTO activity_logs (id, project_id, user_id, action, details, created_at) '
+        'SELECT id, project_id, user_id, action, details, created_at FROM activity_logs_old'
+    )
+    op.drop_table('activity_logs_old')
+
+
+def downgrade() -> None:
+    op.rename_table('activity_logs', 'activity_logs_partitioned')
+    op.execute('ALTER INDEX activity_logs_pkey RENAME TO activity_logs_partitioned_pkey')
+    op.drop_index('ix_activity_logs_user_id', table_name='activity_logs_partitioned')
+    op.drop_index('ix_activity_logs_action', table_name='activity_logs_partitioned')
+
+    op.create_table(
+        'activity_logs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('action', sa.String(100), nullable=False),
+        sa.Column('details', postgresql.JSONB, nullable=False, server_default='{}'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['project_id'], ['projects.id'], ondelete='CASCADE', name='activity_logs_project_id_fkey'
+        ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE', name='activity_logs_user_id_fkey'),
+    )
+    op.execute(
+        'INSERT INTO activity_logs (id, project_id, user_id, action, details, created_at) '
+        'SELECT id, project_id, user_id, action, details, created_at FROM activity_logs_partitioned'
+    )
+    op.create_index('ix_activity_logs_project_id', 'activity_logs', ['project_id'])
+    op.create_index('ix_activity_logs_user_id', 'activity_logs', ['user_id'])
+    op.create_index('ix_activity_logs_action', 'activity_logs', ['action'])
+
+    # Dropping the parent drops every partition
+    op.drop_table('activity_logs_partitioned')
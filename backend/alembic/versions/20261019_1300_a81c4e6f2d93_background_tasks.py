@@ -0,0 +1,63 @@
+"""background_tasks
+
+Revision ID: a81c4e6f2d93
+Revises: f5b1d7e93c60
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'a81c4e6f2d93'
+down_revision = 'f5b1d7e93c60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE TYPE task_status AS ENUM ('queued', 'running', 'succeeded', 'failed', 'cancelled')")
+
+    op.create_table(
+        'tasks',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('kind', sa.String(50), nullable=False),
+        sa.Column(
+            'status',
+            postgresql.ENUM('queued', 'running', 'succeeded', 'failed', 'cancelled', name='task_status', create_type=False),
+            nullable=False,
+            server_default='queued',
+        ),
+        sa.Column('payload', postgresql.JSONB, nullable=False, server_default='{}'),
+        sa.Column('result', postgresql.JSONB, nullable=True),
+        sa.Column('error', sa.Text, nullable=True),
+        sa.Column('output', sa.LargeBinary, nullable=True),
+        sa.Column('output_type', sa.String(100), nullable=True),
+        sa.Column('output_filename', sa.String(255), nullable=True),
+        sa.Column('attempts', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer, nullable=False, server_default='3'),
+        sa.Column('run_after', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('cancel_requested', sa.Boolean, nullable=False, server_default='false'),
+        sa.Column('locked_by', sa.String(100), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    )
+    # Claim order for workers; partial, so finished tasks don't weigh on it
+    op.create_index(
+        'ix_tasks_queued_run_after',
+        'tasks',
+        ['run_after'],
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+    op.create_index('ix_tasks_user_created', 'tasks', ['user_id', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('tasks')
+    op.execute('DROP TYPE task_status')
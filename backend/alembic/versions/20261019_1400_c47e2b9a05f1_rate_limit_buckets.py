@@ -0,0 +1,30 @@
+"""rate_limit_buckets
+
+Revision ID: c47e2b9a05f1
+Revises: a81c4e6f2d93
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c47e2b9a05f1'
+down_revision = 'a81c4e6f2d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # UNLOGGED: transient state, not worth a WAL write per request
+    op.create_table(
+        'rate_limit_buckets',
+        sa.Column('key', sa.String(100), primary_key=True),
+        sa.Column('tokens', sa.Float, nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        prefixes=['UNLOGGED'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rate_limit_buckets')
@@ -0,0 +1,65 @@
+"""venue_name_sort_indexes
+
+Revision ID: b92d6e0f4a17
+Revises: c47e2b9a05f1
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b92d6e0f4a17'
+down_revision = 'c47e2b9a05f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Venue lists are now ordered by (lower(name) COLLATE "C", id), an order
+    # the in-memory catalogue reproduces exactly, and cities are compared
+    # trimmed with whitespace collapsed, as in the catalogue. Rebuild the
+    # indexes for both without locking writes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_venues_name_sort_active',
+            'venues',
+            [sa.text('(lower(name) COLLATE "C")'), 'id'],
+            postgresql_where=sa.text('NOT is_deleted'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_venues_city_key_name_sort_active',
+            'venues',
+            [
+                sa.text("lower(btrim(regexp_replace(city, '\\s+', ' ', 'g')))"),
+                sa.text('(lower(name) COLLATE "C")'),
+                'id',
+            ],
+            postgresql_where=sa.text('NOT is_deleted'),
+            postgresql_concurrently=True,
+        )
+
+        op.drop_index('ix_venues_city_lower_active', table_name='venues', postgresql_concurrently=True)
+        op.drop_index('ix_venues_name_active', table_name='venues', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_venues_name_active',
+            'venues',
+            ['name'],
+            postgresql_where=sa.text('NOT is_deleted'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_venues_city_lower_active',
+            'venues',
+            [sa.text('lower(city)'), 'name'],
+            postgresql_where=sa.text('NOT is_deleted'),
+            postgresql_concurrently=True,
+        )
+
+        op.drop_index('ix_venues_city_key_name_sort_active', table_name='venues', postgresql_concurrently=True)
+        op.drop_index('ix_venues_name_sort_active', table_name='venues', postgresql_concurrently=True)
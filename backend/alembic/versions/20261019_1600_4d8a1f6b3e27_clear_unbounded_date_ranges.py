@@ -0,0 +1,29 @@
+"""clear_unbounded_date_ranges
+
+Revision ID: 4d8a1f6b3e27
+Revises: b92d6e0f4a17
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '4d8a1f6b3e27'
+down_revision = 'b92d6e0f4a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A date range needs at least one bound now. Ranges saved without
+    # either bound (or empty ones) carried no dates, so clear them.
+    for column in ('availability_range', 'hold_range'):
+        op.execute(
+            f'UPDATE project_venues SET {column} = NULL '
+            f'WHERE isempty({column}) OR (lower_inf({column}) AND upper_inf({column}))'
+        )
+
+
+def downgrade() -> None:
+    # Cleared ranges had no dates to restore
+    pass
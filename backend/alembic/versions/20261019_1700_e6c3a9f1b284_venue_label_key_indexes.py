@@ -0,0 +1,56 @@
+"""venue_label_key_indexes
+
+Revision ID: e6c3a9f1b284
+Revises: 4d8a1f6b3e27
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e6c3a9f1b284'
+down_revision = '4d8a1f6b3e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Facility and event type filters compare labels trimmed, with
+    # whitespace collapsed and lowercased, as in the venue catalogue. An
+    # IMMUTABLE function doing that to a whole array can be indexed, so the
+    # filters become a plain @> on it instead of a per-row subquery. An
+    # expression index rather than a stored column: no table rewrite, and
+    # the stored labels keep their spelling for display.
+    op.execute(r"""
+        CREATE OR REPLACE FUNCTION normalized_labels(labels text[]) RETURNS text[]
+        LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+        AS $$
+            SELECT coalesce(array_agg(lower(btrim(regexp_replace(label, '\s+', ' ', 'g'))) ORDER BY n), '{}')
+            FROM unnest(labels) WITH ORDINALITY AS t(label, n)
+        $$
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_venues_facility_keys_active',
+            'venues',
+            [sa.text('normalized_labels(facilities)')],
+            postgresql_using='gin',
+            postgresql_where=sa.text('NOT is_deleted'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_venues_event_type_keys_active',
+            'venues',
+            [sa.text('normalized_labels(event_types)')],
+            postgresql_using='gin',
+            postgresql_where=sa.text('NOT is_deleted'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_venues_event_type_keys_active', table_name='venues', postgresql_concurrently=True)
+        op.drop_index('ix_venues_facility_keys_active', table_name='venues', postgresql_concurrently=True)
+    op.execute('DROP FUNCTION normalized_labels(text[])')
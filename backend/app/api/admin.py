@@ -0,0 +1,111 @@
+"""Admin and monitoring endpoints."""
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_admin_user, get_db
+from app.config import settings
+from app.models.user import User
+from app.schemas.admin import (
+    ActivityLogPartitionListResponse,
+    RateLimitStatsResponse,
+    RoutePerfResponse,
+    SlowQueryListResponse,
+    VenueCatalogueStats,
+)
+from app.services.activity_log_service import activity_log_service
+from app.services.rate_limit import rate_limiter
+from app.services.request_stats import route_perf_registry
+from app.services.slow_queries import slow_query_log
+from app.services.venue_catalogue import venue_catalogue
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/venue-catalogue", response_model=VenueCatalogueStats)
+async def get_venue_catalogue_stats(
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Report memory usage and staleness of the in-memory venue catalogue.
+    
+    Requires admin role. Does not trigger a refresh.
+    """
+    return venue_catalogue.stats()
+
+
+@router.get("/perf", response_model=RoutePerfResponse)
+async def get_route_perf(
+    reset: bool = Query(False, description="Clear the histograms after reading them"),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Per-route latency, DB time and SQL statement count histograms.
+    
+    Requires admin role. Figures are for this worker process only. A route
+    whose query count grows with the data (N+1) shows up as a widening
+    ``queries`` histogram.
+    """
+    routes = route_perf_registry.snapshot()
+    if reset:
+        route_perf_registry.reset()
+    return RoutePerfResponse(routes=routes)
+
+
+@router.get("/slow-queries", response_model=SlowQueryListResponse)
+async def list_slow_queries(
+    limit: int = Query(50, ge=1, le=1000, description="Maximum entries to return"),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Recent statements slower than SLOW_QUERY_THRESHOLD_MS, newest first.
+    
+    Requires admin role and SLOW_QUERY_LOG_ENABLED. Parameters are redacted
+    to their types. ``plan`` holds the EXPLAIN (ANALYZE, BUFFERS) JSON for
+    sampled SELECTs; it may still be null for a few seconds after the entry
+    is recorded.
+    """
+    return SlowQueryListResponse(
+        enabled=settings.SLOW_QUERY_LOG_ENABLED,
+        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+        items=slow_query_log.snapshot()[:limit],
+    )
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Empty the slow query buffer. Requires admin role."""
+    slow_query_log.clear()
+
+
+@router.get("/activity-log/partitions", response_model=ActivityLogPartitionListResponse)
+async def list_activity_log_partitions(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Monthly activity_logs partitions with estimated rows and size, oldest first.
+    
+    Requires admin role. Row counts are planner estimates (0 until the
+    partition has been analyzed).
+    """
+    partitions = await activity_log_service.list_partitions(db)
+    return ActivityLogPartitionListResponse(
+        retention_months=settings.ACTIVITY_LOG_RETENTION_MONTHS,
+        partitions_ahead=settings.ACTIVITY_LOG_PARTITIONS_AHEAD,
+        partitions=[vars(partition) for partition in partitions],
+    )
+
+
+@router.get("/rate-limits", response_model=RateLimitStatsResponse)
+async def get_rate_limits(
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Rate limits and concurrency caps per endpoint class.
+    
+    Requires admin role. ``in_flight`` and the rejection counts are for
+    this worker process only (rate_limited_requests_total on /metrics
+    covers all of them).
+    """
+    return RateLimitStatsResponse(
+        enabled=rate_limiter.enabled,
+        backend=settings.RATE_LIMIT_BACKEND,
+        items=rate_limiter.stats(),
+    )
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas.client import Client, ClientCreate, ClientUpdate
 from app.services.client_service import client_service
-from app.services.auth import get_current_user
+from app.api.deps import get_current_user
 from app.models.user import User
 
 router = APIRouter(prefix="/clients", tags=["clients"])
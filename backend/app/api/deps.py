@@ -1,13 +1,16 @@
 """API dependencies."""
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Callable, Optional, Tuple, Type
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db as _get_db
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.services.auth import decode_access_token
+from app.services.projection import Projection
+from app.services.rate_limit import RateLimitExceeded, rate_limiter
 from app.services.user_service import user_service
 
 # HTTP Bearer token scheme
@@ -76,3 +79,95 @@ async def get_current_active_user(
         )
     return current_user
 
+
+async def get_current_admin_user(
+    current_user: User = Depends(get_current_active_user)
+) -> User:
+    """Ensure the current user is an admin.
+    
+    Args:
+        current_user: Current active user
+        
+    Returns:
+        Admin user object
+        
+    Raises:
+        HTTPException: If user is not an admin
+    """
+    if current_user.role != UserRole.admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
+
+
+def parse_projection(
+    schema: Type[BaseModel],
+    fields: Optional[str],
+    include: Optional[str],
+    venue_path: Tuple[str, ...] = (),
+) -> Projection:
+    """Build a Projection from the ``fields=`` and ``include=`` query parameters.
+    
+    Args:
+        schema: Response schema of one item
+        fields: Comma-separated field paths
+        include: Extra includes ("photos:first")
+        venue_path: Attribute path from an item to its venue(s)
+        
+    Returns:
+        Projection for the service and the response schema
+        
+    Raises:
+        HTTPException: If a field or include value is not supported
+    """
+    try:
+        return Projection.parse(schema, fields, include, venue_path)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid 'fields'/'include': {e}"
+        )
+
+
+def rate_limited(endpoint_class: str) -> Callable:
+    """Dependency applying an endpoint class's rate limit and concurrency cap.
+    
+    Use as ``dependencies=[Depends(rate_limited("ai"))]`` on the route. The
+    concurrency slot is held until the response has been sent.
+    
+    Args:
+        endpoint_class: Class in RATE_LIMITS / CONCURRENCY_LIMITS
+        
+    Returns:
+        The dependency
+    """
+    async def dependency(
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(get_current_active_user),
+    ) -> AsyncGenerator[None, None]:
+        try:
+            # The cap first, so a request turned away there keeps its token
+            rate_limiter.enter(endpoint_class)
+        except RateLimitExceeded as e:
+            raise _too_many_requests(e)
+        try:
+            await rate_limiter.check(db, endpoint_class, current_user.id)
+        except RateLimitExceeded as e:
+            rate_limiter.leave(endpoint_class)
+            raise _too_many_requests(e)
+        try:
+            yield
+        finally:
+            rate_limiter.leave(endpoint_class)
+    
+    return dependency
+
+
+def _too_many_requests(error: RateLimitExceeded) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)},
+    )
@@ -1,16 +1,22 @@
 """Project API endpoints."""
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 import io
+import math
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status
 from fastapi.responses import HTMLResponse, StreamingResponse
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import get_current_active_user, get_db, parse_projection, rate_limited
+from app.api.responses import model_response, not_modified, with_etag
+from app.config import settings
 from app.models.project import ProjectStatus
 from app.models.user import User
+from app.schemas.activity_log import ActivityLogPage
+from app.schemas.task import TaskResponse
 from app.schemas.project import (
     ProjectCreate,
     ProjectListResponse,
@@ -18,44 +24,67 @@ from app.schemas.project import (
     ProjectUpdate,
 )
 from app.schemas.project_venue import (
+    ProjectConflictListResponse,
+    ProjectVenueBatchUpdate,
+    ProjectVenueBulkCreate,
+    ProjectVenueBulkCreateResponse,
     ProjectVenueCreate,
     ProjectVenueDetailResponse,
+    ProjectVenueResponse,
     ProjectVenueUpdate,
 )
+from app.schemas.venue_suggestion import VenueSuggestionListResponse
+from app.services.activity_log import activity_log_writer
+from app.services.activity_log_service import activity_log_service
+from app.services.etags import etag_matches, etag_service
+from app.services.events import event_bus, format_sse, make_event
 from app.services.project_service import project_service
 from app.services.project_venue_service import project_venue_service
+from app.services.venue_matching import venue_matching_service
 from app.services.venue_service import venue_service
 from app.services.pdf_generator import proposal_generator
+from app.services.resilience import CircuitOpenError, DeadlineExceeded
 from app.services.ai_description_service import ai_description_service
+from app.services.task_handlers import AI_DESCRIPTION, PROPOSAL_PDF
+from app.services.task_runner import task_runner
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
+def _project_venue_items(project_venues) -> dict:
+    """Event payload for changed project-venue links (without venue details)."""
+    return {"items": [ProjectVenueResponse.model_validate(pv).model_dump(mode="json") for pv in project_venues]}
+
+
 @router.get("", response_model=ProjectListResponse)
 async def list_projects(
     status: Optional[ProjectStatus] = Query(None, description="Filter by project status"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,event_name,project_venues.outreach_status"),
+    include: Optional[str] = Query(None, description="'photos:first' to return only each venue's first photo"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """List current user's projects with filtering.
     
-    Returns only projects owned by the authenticated user.
+    Returns only projects owned by the authenticated user. ``fields``
+    narrows the items (and the columns loaded) to the listed fields; leave
+    out ``project_venues`` to skip loading the shortlists entirely.
     """
+    projection = parse_projection(ProjectResponse, fields, include, venue_path=("project_venues", "venue"))
     projects, total = await project_service.get_list(
         db,
         user_id=current_user.id,
         status=status,
         page=page,
         page_size=page_size,
+        projection=projection,
     )
     
-    return ProjectListResponse(
-        items=projects,
-        total=total,
-        page=page,
-        page_size=page_size,
+    return model_response(
+        {"items": projects, "total": total, "page": page, "page_size": page_size},
+        projection.list_schema(ProjectListResponse),
     )
 
 
@@ -70,26 +99,38 @@ async def create_project(
     The project is automatically assigned to the authenticated user.
     """
     project = await project_service.create(db, project_data, current_user.id)
+    await activity_log_writer.log(project.id, current_user.id, "project.created", {"event_name": project.event_name})
     return project
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Get a single project by ID with venues.
     
-    Returns 404 if project not found or not owned by current user.
+    Returns 404 if project not found or not owned by current user, and
+    304 if the If-None-Match ETag is still current.
     """
+    etag = await etag_service.project_etag(db, project_id, user_id=current_user.id, variant=request.url.path)
+    if etag is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project with id {project_id} not found"
+        )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    
     project = await project_service.get_by_id(db, project_id, user_id=current_user.id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with id {project_id} not found"
         )
-    return project
+    return with_etag(model_response(project, ProjectResponse), etag)
 
 
 @router.patch("/{project_id}", response_model=ProjectResponse)
@@ -111,6 +152,11 @@ async def update_project(
         )
     
     updated_project = await project_service.update(db, project, project_data)
+    await activity_log_writer.log(
+        project_id, current_user.id, "project.updated",
+        {"fields": sorted(project_data.model_dump(exclude_unset=True))}
+    )
+    event_bus.publish(project_id, "project.updated", project_data.model_dump(exclude_unset=True, mode="json"))
     return updated_project
 
 
@@ -132,6 +178,155 @@ async def delete_project(
         )
     
     await project_service.delete(db, project)
+    event_bus.publish(project_id, "project.deleted")
+
+
+@router.get("/{project_id}/venue-suggestions", response_model=VenueSuggestionListResponse)
+async def suggest_venues(
+    project_id: UUID,
+    limit: int = Query(10, ge=1, le=100, description="Number of suggestions"),
+    include_shortlisted: bool = Query(False, description="Also rank venues already on the project"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Rank catalogue venues for a project.
+    
+    Scores every venue on capacity fit, facility/requirement overlap, city
+    match and past quoted prices against the project budget.
+    """
+    project = await project_service.get_by_id(db, project_id, user_id=current_user.id)
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project with id {project_id} not found"
+        )
+    
+    suggestions, candidates = await venue_matching_service.suggest(
+        db,
+        project,
+        limit=limit,
+        include_shortlisted=include_shortlisted,
+    )
+    
+    return VenueSuggestionListResponse(
+        project_id=project_id,
+        items=suggestions,
+        candidates=candidates,
+    )
+
+
+@router.get("/{project_id}/conflicts", response_model=ProjectConflictListResponse)
+async def list_date_conflicts(
+    project_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """List venues on this project that other projects hold on overlapping dates.
+    
+    Compares each shortlisted venue's holds on other (non-cancelled) projects
+    against this project's event_date_start..event_date_end, inclusive.
+    """
+    project = await project_service.get_by_id(db, project_id, user_id=current_user.id)
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project with id {project_id} not found"
+        )
+    
+    conflicts = await project_venue_service.get_date_conflicts(db, project)
+    
+    return ProjectConflictListResponse(
+        project_id=project_id,
+        event_date_start=project.event_date_start,
+        event_date_end=project.event_date_end,
+        items=conflicts,
+    )
+
+
+@router.get("/{project_id}/activity", response_model=ActivityLogPage)
+async def list_project_activity(
+    project_id: UUID,
+    limit: int = Query(50, ge=1, le=200, description="Entries per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    since: Optional[datetime] = Query(None, description="Only entries at or after this time"),
+    action: Optional[str] = Query(None, description="Only entries with this action, e.g. project_venue.updated"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get the project's activity timeline, newest first.
+    
+    Cursor-paginated: pass ``next_cursor`` back as ``cursor`` for older
+    entries. Entries are written in batches, so the latest changes can
+    take up to ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS to appear.
+    """
+    if not await project_service.exists(db, project_id, user_id=current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project with id {project_id} not found"
+        )
+    
+    try:
+        entries, next_cursor = await activity_log_service.get_project_activity(
+            db, project_id, limit=limit, cursor=cursor, since=since, action=action
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return model_response({"items": entries, "next_cursor": next_cursor}, ActivityLogPage)
+
+
+@router.get("/{project_id}/events")
+async def stream_project_events(
+    project_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Stream the project's changes as Server-Sent Events.
+
+    Each message's ``event`` is the event type and ``data`` the event
+    (``{id, type, project_id, data, at}``):
+
+    - ``ready``: the stream is live; fetch the shortlist now, then apply events
+    - ``project.updated`` / ``project.deleted``
+    - ``project_venue.added`` / ``project_venue.updated``: ``{items}``, the
+      changed links without venue details
+    - ``project_venue.bulk_added``: ``{venue_ids}``
+    - ``project_venue.removed``: ``{venue_id}``
+    - ``project_venue.description_generated``: ``{venue_id, ai_description}``
+    - ``task.updated``: a background task for this project changed status
+    - ``proposal.ready``: ``{task_id, ...}``; download from ``GET /tasks/{id}/output``
+    - ``resync``: events were missed; re-fetch
+
+    Events are not stored: after reconnecting, re-fetch as on ``ready``.
+    """
+    if not await project_service.exists(db, project_id, user_id=current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project with id {project_id} not found"
+        )
+    # Don't hold a database connection for the life of the stream
+    await db.close()
+
+    async def stream():
+        async with event_bus.subscribe(project_id) as subscription:
+            yield "retry: 3000\n\n" + format_sse(make_event(project_id, "ready"))
+            while True:
+                event = await subscription.get(settings.EVENTS_KEEPALIVE_SECONDS)
+                if event is None:
+                    # Keeps proxies from closing an idle stream, and notices gone clients
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event)
+                if event["type"] == "project.deleted":
+                    return
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ProjectVenue endpoints
@@ -148,8 +343,7 @@ async def add_venue_to_project(
     Creates a project-venue link with default 'draft' outreach status.
     """
     # Verify project exists and user owns it
-    project = await project_service.get_by_id(db, project_id, user_id=current_user.id)
-    if not project:
+    if not await project_service.exists(db, project_id, user_id=current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with id {project_id} not found"
@@ -166,37 +360,141 @@ async def add_venue_to_project(
     # Add venue to project
     try:
         project_venue = await project_venue_service.add_venue_to_project(
-            db, project_id, venue_data.venue_id
+            db, project_id, venue_data.venue_id, venue=venue
         )
-        return project_venue
     except IntegrityError:
         await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Venue already added to this project"
         )
+    await activity_log_writer.log(
+        project_id, current_user.id, "project_venue.added", {"venue_id": str(venue_data.venue_id)}
+    )
+    event_bus.publish(project_id, "project_venue.added", _project_venue_items([project_venue]))
+    return project_venue
+
+
+@router.post("/{project_id}/venues/bulk", response_model=ProjectVenueBulkCreateResponse)
+async def add_venues_to_project(
+    project_id: UUID,
+    venue_data: ProjectVenueBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Add several venues to a project at once.
+    
+    Venues already on the shortlist are reported as ``already_present``
+    instead of failing the request. Returns 404 (and adds nothing) if any
+    venue does not exist.
+    """
+    # Verify project exists and user owns it
+    if not await project_service.exists(db, project_id, user_id=current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project with id {project_id} not found"
+        )
+    
+    try:
+        created, already_present = await project_venue_service.add_venues_to_project(
+            db, project_id, venue_data.venue_ids
+        )
+    except LookupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Venues not found: {e}"
+        )
+    if created:
+        await activity_log_writer.log(
+            project_id, current_user.id, "project_venue.bulk_added",
+            {"venue_ids": [str(venue_id) for venue_id in created]}
+        )
+        event_bus.publish(
+            project_id, "project_venue.bulk_added", {"venue_ids": [str(venue_id) for venue_id in created]}
+        )
+    return ProjectVenueBulkCreateResponse(created=created, already_present=already_present)
 
 
 @router.get("/{project_id}/venues", response_model=list[ProjectVenueDetailResponse])
 async def list_project_venues(
     project_id: UUID,
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. venue_id,outreach_status,venue.name"),
+    include: Optional[str] = Query(None, description="'photos:first' to return only each venue's first photo"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """List all venues for a project.
     
-    Returns venues with outreach status and response data.
+    Returns venues with outreach status and response data. ``fields``
+    narrows each item (and the columns loaded) to the listed fields.
+    Returns 304 if the If-None-Match ETag is still current.
+    """
+    projection = parse_projection(ProjectVenueDetailResponse, fields, include, venue_path=("venue",))
+    
+    # The version lookup also verifies the project exists and user owns it
+    etag = await etag_service.project_etag(
+        db, project_id, user_id=current_user.id, variant=f"{request.url.path}?{request.url.query}"
+    )
+    if etag is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project with id {project_id} not found"
+        )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    
+    project_venues = await project_venue_service.get_project_venues(db, project_id, projection=projection)
+    return with_etag(model_response(project_venues, list[projection.item_schema]), etag)
+
+
+@router.patch("/{project_id}/venues", response_model=list[ProjectVenueDetailResponse])
+async def batch_update_project_venues(
+    project_id: UUID,
+    updates: list[ProjectVenueBatchUpdate] = Body(..., min_length=1, max_length=500),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Update several project-venue links at once.
+    
+    Takes a list of ``{venue_id, ...fields}`` items (the fields of the
+    single-venue PATCH) and applies them in one transaction: all or none.
+    Returns the updated links.
     """
     # Verify project exists and user owns it
-    project = await project_service.get_by_id(db, project_id, user_id=current_user.id)
-    if not project:
+    if not await project_service.exists(db, project_id, user_id=current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with id {project_id} not found"
         )
     
-    project_venues = await project_venue_service.get_project_venues(db, project_id)
-    return project_venues
+    try:
+        project_venues = await project_venue_service.batch_update_project_venues(db, project_id, updates)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except LookupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Venues not found in this project: {e}"
+        )
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Batch update references an unknown catering provider"
+        )
+    await activity_log_writer.log(
+        project_id, current_user.id, "project_venue.batch_updated",
+        {
+            "venue_ids": [str(item.venue_id) for item in updates],
+            "fields": sorted({field for item in updates for field in item.model_dump(exclude_unset=True)} - {"venue_id"}),
+        }
+    )
+    event_bus.publish(project_id, "project_venue.updated", _project_venue_items(project_venues))
+    return model_response(project_venues, list[ProjectVenueDetailResponse])
 
 
 @router.patch("/{project_id}/venues/{venue_id}", response_model=ProjectVenueDetailResponse)
@@ -212,8 +510,7 @@ async def update_project_venue(
     Updates outreach status, response data, or AI-generated content.
     """
     # Verify project exists and user owns it
-    project = await project_service.get_by_id(db, project_id, user_id=current_user.id)
-    if not project:
+    if not await project_service.exists(db, project_id, user_id=current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with id {project_id} not found"
@@ -228,6 +525,11 @@ async def update_project_venue(
         )
     
     updated_pv = await project_venue_service.update_project_venue(db, project_venue, update_data)
+    await activity_log_writer.log(
+        project_id, current_user.id, "project_venue.updated",
+        {"venue_id": str(venue_id), "fields": sorted(update_data.model_dump(exclude_unset=True))}
+    )
+    event_bus.publish(project_id, "project_venue.updated", _project_venue_items([updated_pv]))
     return updated_pv
 
 
@@ -259,20 +561,25 @@ async def remove_venue_from_project(
         )
     
     await project_venue_service.remove_venue_from_project(db, project_venue)
+    await activity_log_writer.log(project_id, current_user.id, "project_venue.removed", {"venue_id": str(venue_id)})
+    event_bus.publish(project_id, "project_venue.removed", {"venue_id": str(venue_id)})
 
 
 # AI Description Generation endpoint
 
-@router.post("/{project_id}/venues/{venue_id}/generate-description")
+@router.post("/{project_id}/venues/{venue_id}/generate-description", dependencies=[Depends(rate_limited("ai"))])
 async def generate_venue_description(
     project_id: UUID,
     venue_id: UUID,
+    background: bool = Query(False, description="Queue a background task and return it (202) instead of waiting"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Generate AI description for a venue in a project.
     
     Uses the ai_context stored in the project_venue to generate a tailored description.
+    With ``background=true`` the description is generated by a background
+    task; poll ``GET /tasks/{id}`` for its result.
     """
     # Verify project ownership
     project = await project_service.get_by_id(db, project_id, user_id=current_user.id)
@@ -297,15 +604,36 @@ async def generate_venue_description(
             detail="No AI context provided. Please add context before generating description."
         )
     
+    if background:
+        task = await task_runner.submit(
+            db, AI_DESCRIPTION, current_user.id, {"project_id": str(project_id), "venue_id": str(venue_id)}
+        )
+        return model_response(task, TaskResponse, status_code=status.HTTP_202_ACCEPTED)
+    
     # Generate description
     try:
         description = await ai_description_service.generate_description(db, project_venue)
+        event_bus.publish(
+            project_id, "project_venue.description_generated",
+            {"venue_id": str(venue_id), "ai_description": description}
+        )
         
         return {
             "success": True,
             "ai_description": description,
             "message": "Description generated successfully"
         }
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"AI generation unavailable: {str(e)}",
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+    except DeadlineExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"AI generation timed out: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -347,15 +675,18 @@ async def preview_proposal(
     return HTMLResponse(content=html_content)
 
 
-@router.get("/{project_id}/proposal/pdf")
+@router.get("/{project_id}/proposal/pdf", dependencies=[Depends(rate_limited("pdf"))])
 async def generate_proposal_pdf(
     project_id: UUID,
+    background: bool = Query(False, description="Queue a background task and return it (202) instead of waiting"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Generate and download PDF proposal for a project.
     
-    Returns PDF file as downloadable attachment.
+    Returns PDF file as downloadable attachment. With ``background=true``
+    the PDF is rendered by a background task and downloaded from
+    ``GET /tasks/{id}/output`` once it has succeeded.
     """
     # Get project with venues
     project = await project_service.get_by_id_with_venues(db, project_id, user_id=current_user.id)
@@ -373,6 +704,10 @@ async def generate_proposal_pdf(
             detail="No venues marked for inclusion in proposal"
         )
     
+    if background:
+        task = await task_runner.submit(db, PROPOSAL_PDF, current_user.id, {"project_id": str(project_id)})
+        return model_response(task, TaskResponse, status_code=status.HTTP_202_ACCEPTED)
+    
     try:
         # Generate PDF
         pdf_bytes = await proposal_generator.generate_pdf_proposal(db, project)
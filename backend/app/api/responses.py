@@ -0,0 +1,83 @@
+"""Fast JSON responses for large, deeply nested payloads."""
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional
+from uuid import UUID
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+# Responses carrying an ETag may be cached, but must be revalidated
+# (If-None-Match) on every use
+REVALIDATE = "private, no-cache"
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson.
+
+    orjson serializes datetimes, dates, UUIDs and enums natively, so
+    content only has to be converted to plain Python objects, not to
+    JSON-compatible ones, before encoding. UTC datetimes are written with
+    a "Z" suffix, as pydantic does.
+    """
+
+    OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=self.OPTIONS)
+
+
+def _default(value: Any) -> Any:
+    """Encode types orjson does not handle natively."""
+    # asyncpg returns its own UUID class, which is not a uuid.UUID subclass
+    # as far as orjson is concerned
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def model_response(content: Any, schema: Optional[Any] = None, status_code: int = 200) -> ORJSONResponse:
+    """Serialize ORM objects or schema instances in a single pass.
+
+    When an endpoint returns ORM objects (or a schema instance) and lets
+    FastAPI apply ``response_model``, the content is validated, dumped,
+    validated again and then run through the JSON encoder. Returning this
+    response instead validates once and encodes with orjson. Keep
+    ``response_model`` on the route for the OpenAPI schema.
+
+    Args:
+        content: ORM object(s) to validate with ``schema``, or a schema
+            instance when ``schema`` is omitted
+        schema: Response type, e.g. ``list[ProjectVenueDetailResponse]``
+        status_code: HTTP status code
+
+    Returns:
+        Response with the encoded body
+    """
+    if schema is None:
+        if not isinstance(content, BaseModel):
+            raise TypeError("model_response needs a schema for non-model content")
+        schema = type(content)
+    else:
+        content = _adapter(schema).validate_python(content, from_attributes=True)
+    return ORJSONResponse(_adapter(schema).dump_python(content), status_code=status_code)
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    """Set the ETag (and a must-revalidate Cache-Control) on a response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE
+    return response
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 for a client whose cached copy is current."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": REVALIDATE})
@@ -0,0 +1,100 @@
+"""Background task API endpoints."""
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_active_user, get_db
+from app.api.responses import model_response
+from app.models.task import TaskStatus
+from app.models.user import User
+from app.schemas.task import TaskListResponse, TaskResponse
+from app.services import task_handlers  # noqa: F401  (registers the task types)
+from app.services.task_runner import task_runner
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+
+@router.get("", response_model=TaskListResponse)
+async def list_tasks(
+    status: Optional[TaskStatus] = Query(None, description="Filter by task status"),
+    kind: Optional[str] = Query(None, description="Filter by task type, e.g. proposal_pdf"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum tasks to return"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """List the current user's background tasks, newest first."""
+    tasks = await task_runner.list_tasks(db, current_user.id, status=status, kind=kind, limit=limit)
+    return model_response({"items": tasks}, TaskListResponse)
+
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task(
+    task_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get a task's status and, once it has succeeded, its result.
+
+    Poll this after submitting work with ``background=true``.
+    """
+    task = await task_runner.get(db, task_id, user_id=current_user.id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with id {task_id} not found"
+        )
+    return model_response(task, TaskResponse)
+
+
+@router.get("/{task_id}/output")
+async def download_task_output(
+    task_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Download the file a task produced (e.g. a proposal PDF)."""
+    task = await task_runner.get_output(db, task_id, user_id=current_user.id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with id {task_id} not found"
+        )
+    if task.output is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task has no output"
+        )
+    return Response(
+        content=task.output,
+        media_type=task.output_type or "application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{task.output_filename or task_id}"'},
+    )
+
+
+@router.post("/{task_id}/cancel", response_model=TaskResponse)
+async def cancel_task(
+    task_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Cancel a queued or running task.
+
+    A queued task is cancelled at once. A running task is flagged
+    (``cancel_requested``) and stopped by its worker shortly after.
+    """
+    task = await task_runner.get(db, task_id, user_id=current_user.id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with id {task_id} not found"
+        )
+    try:
+        task = await task_runner.cancel(db, task)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    return model_response(task, TaskResponse)
@@ -2,12 +2,14 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import get_current_active_user, get_db, parse_projection, rate_limited
+from app.api.responses import model_response, not_modified, with_etag
 from app.models.user import User
 from app.schemas.photo import PhotoResponse
+from app.schemas.task import TaskResponse
 from app.schemas.venue import (
     VenueCreate,
     VenueListResponse,
@@ -15,7 +17,11 @@ from app.schemas.venue import (
     VenueUpdate,
     VenueUploadResult,
 )
+from app.services.etags import etag_matches, etag_service
+from app.services.geocoding import parse_point
 from app.services.photo_service import photo_service
+from app.services.task_handlers import VENUE_CSV_IMPORT
+from app.services.task_runner import task_runner
 from app.services.venue_service import venue_service
 
 router = APIRouter(prefix="/venues", tags=["venues"])
@@ -26,28 +32,63 @@ async def list_venues(
     city: Optional[str] = Query(None, description="Filter by city (case-insensitive)"),
     min_capacity: Optional[int] = Query(None, gt=0, description="Minimum capacity"),
     facilities: Optional[List[str]] = Query(None, description="Required facilities (must have all)"),
+    event_types: Optional[List[str]] = Query(None, description="Required event types (must have all)"),
+    near: Optional[str] = Query(None, description="'lat,lng' to sort by distance from, e.g. 50.8467,4.3525"),
+    radius_km: Optional[float] = Query(None, gt=0, le=500, description="Only venues within this distance of 'near'"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    include_facets: bool = Query(True, description="Include facility/event type counts for the filters"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name,city,capacity,photos.url"),
+    include: Optional[str] = Query(None, description="'photos:first' to return only each venue's first photo"),
     db: AsyncSession = Depends(get_db),
 ):
     """List venues with filtering and pagination.
     
-    Excludes soft-deleted venues. Supports filtering by city, capacity, and facilities.
+    Excludes soft-deleted venues. Supports filtering by city, capacity, facilities
+    and event types. Facet counts (e.g. "WiFi": 812) cover every venue matching
+    the filters, not just the current page.
+    
+    With ``near`` the results are sorted by distance (closest first), each item
+    carries ``distance_km``, and venues without coordinates are left out.
+    
+    ``fields`` narrows the items to the listed fields (``id`` is always
+    returned), e.g. ``fields=id,name,city,capacity&include=photos:first``
+    for the gallery; only those columns are read from the database.
     """
-    venues, total = await venue_service.get_list(
+    projection = parse_projection(VenueResponse, fields, include)
+    
+    point = None
+    if near is not None:
+        try:
+            point = parse_point(near)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid 'near' value: {e}"
+            )
+    elif radius_km is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'radius_km' requires 'near'"
+        )
+    
+    venues, total, facets = await venue_service.get_list(
         db,
         city=city,
         min_capacity=min_capacity,
         facilities=facilities,
+        event_types=event_types,
+        near=point,
+        radius_km=radius_km,
         page=page,
         page_size=page_size,
+        with_facets=include_facets,
+        projection=projection,
     )
     
-    return VenueListResponse(
-        items=venues,
-        total=total,
-        page=page,
-        page_size=page_size,
+    return model_response(
+        {"items": venues, "total": total, "page": page, "page_size": page_size, "facets": facets},
+        projection.list_schema(VenueListResponse),
     )
 
 
@@ -68,19 +109,30 @@ async def create_venue(
 @router.get("/{venue_id}", response_model=VenueResponse)
 async def get_venue(
     venue_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """Get a single venue by ID with photos.
     
-    Returns 404 if venue not found or soft-deleted.
+    Returns 404 if venue not found or soft-deleted, and 304 if the
+    If-None-Match ETag is still current.
     """
+    etag = await etag_service.venue_etag(db, venue_id)
+    if etag is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Venue with id {venue_id} not found"
+        )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    
     venue = await venue_service.get_by_id(db, venue_id)
     if not venue:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Venue with id {venue_id} not found"
         )
-    return venue
+    return with_etag(model_response(venue, VenueResponse), etag)
 
 
 @router.patch("/{venue_id}", response_model=VenueResponse)
@@ -200,9 +252,15 @@ async def delete_photo(
     await photo_service.delete_photo(db, photo)
 
 
-@router.post("/upload-csv", response_model=VenueUploadResult)
+@router.post(
+    "/upload-csv",
+    response_model=VenueUploadResult,
+    responses={status.HTTP_202_ACCEPTED: {"model": TaskResponse, "description": "Background import queued"}},
+    dependencies=[Depends(rate_limited("import"))],
+)
 async def upload_venues_csv(
     file: UploadFile = File(..., description="CSV file with venue data"),
+    background: bool = Query(False, description="Queue a background import and return it (202) instead of waiting"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -224,9 +282,12 @@ async def upload_venues_csv(
     name,city,capacity,facilities,event_types
     "Grand Hotel","Brussels",200,"WiFi,Projector","Conference,Workshop"
     ```
+    
+    With ``background=true`` the file is checked (size, encoding, headers)
+    and then imported by a background task; the summary becomes the
+    task's result.
     """
     from app.services.csv_service import csv_service
-    from app.schemas.venue import VenueUploadResult
     
     # Validate file type
     if not file.filename or not file.filename.endswith('.csv'):
@@ -235,6 +296,19 @@ async def upload_venues_csv(
             detail="File must be a CSV file (.csv extension)"
         )
     
+    if background:
+        try:
+            content = csv_service.validate_venue_csv(await file.read())
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        task = await task_runner.submit(
+            db, VENUE_CSV_IMPORT, current_user.id, {"filename": file.filename, "content": content}
+        )
+        return model_response(task, TaskResponse, status_code=status.HTTP_202_ACCEPTED)
+    
     try:
         result = await csv_service.process_venue_csv(db, file)
         return result
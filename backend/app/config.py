@@ -1,5 +1,5 @@
 """Application configuration using Pydantic Settings."""
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -47,13 +47,219 @@ class Settings(BaseSettings):
     S3_ACCESS_KEY: str = Field(default="", description="S3 access key")
     S3_SECRET_KEY: str = Field(default="", description="S3 secret key")
     
+    LOG_LEVEL: str = Field(default="INFO", description="Root log level")
+    REQUEST_TIMING_ENABLED: bool = Field(
+        default=True,
+        description="Add Server-Timing headers, per-request logs and per-route histograms"
+    )
+    METRICS_ENABLED: bool = Field(
+        default=True,
+        description="Expose Prometheus metrics on /metrics (set PROMETHEUS_MULTIPROC_DIR for multi-worker setups)"
+    )
+    
+    # Response compression
+    COMPRESSION_ENABLED: bool = Field(default=True, description="Compress responses the client accepts compressed")
+    COMPRESSION_MINIMUM_SIZE: int = Field(default=1024, description="Smallest response body in bytes worth compressing")
+    COMPRESSION_ENCODINGS: str = Field(
+        default="zstd,br,gzip",
+        description="Comma-separated codings in order of preference (br and zstd need the brotli/zstandard packages)"
+    )
+    COMPRESSION_GZIP_LEVEL: int = Field(default=6, description="gzip level (1-9)")
+    COMPRESSION_BROTLI_QUALITY: int = Field(default=4, description="Brotli quality (0-11)")
+    COMPRESSION_ZSTD_LEVEL: int = Field(default=3, description="zstd level (1-22)")
+    
+    # Activity log (audit trail) writer
+    ACTIVITY_LOG_ENABLED: bool = Field(
+        default=True,
+        description="Record project changes in activity_logs (written in batches off the request path)"
+    )
+    ACTIVITY_LOG_BATCH_SIZE: int = Field(default=500, description="Most activity events written per INSERT")
+    ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=1.0,
+        description="Longest an activity event waits in memory before its batch is written"
+    )
+    ACTIVITY_LOG_QUEUE_SIZE: int = Field(default=10000, description="Activity events held in memory before backpressure")
+    ACTIVITY_LOG_ENQUEUE_TIMEOUT_MS: float = Field(
+        default=50,
+        description="How long a request waits for room in a full queue before the event is dropped"
+    )
+    ACTIVITY_LOG_PARTITIONS_AHEAD: int = Field(
+        default=3,
+        description="Monthly activity_logs partitions kept created beyond the current month"
+    )
+    ACTIVITY_LOG_RETENTION_MONTHS: int = Field(
+        default=0,
+        description="Whole months of activity kept before the current one; older partitions are dropped (0 keeps all)"
+    )
+    ACTIVITY_LOG_MAINTENANCE_INTERVAL_SECONDS: int = Field(
+        default=21600,
+        description="Interval between activity_logs partition maintenance runs"
+    )
+    
+    # Background tasks (AI generation, PDF rendering, CSV imports)
+    TASKS_ENABLED: bool = Field(
+        default=True,
+        description="Run queued background tasks in this process (tasks can still be submitted when off)"
+    )
+    TASK_WORKERS: int = Field(default=4, description="Tasks run at once by this process")
+    TASK_CONCURRENCY: str = Field(
+        default="ai_description=4,proposal_pdf=2,venue_csv_import=1",
+        description="Per task type limits on tasks run at once by this process, as kind=limit pairs"
+    )
+    TASK_POLL_INTERVAL_SECONDS: float = Field(
+        default=1.0,
+        description="How often idle workers look for tasks submitted by other processes"
+    )
+    TASK_TIMEOUT_SECONDS: float = Field(default=300, description="Attempts running longer than this fail")
+    TASK_RETRY_BACKOFF_SECONDS: float = Field(
+        default=5,
+        description="Delay before the first retry; doubles with each attempt (with jitter)"
+    )
+    TASK_RETRY_BACKOFF_MAX_SECONDS: float = Field(default=300, description="Longest delay between retries")
+    TASK_STALE_SECONDS: float = Field(
+        default=120,
+        description="Running tasks whose worker has not reported for this long are requeued"
+    )
+    TASK_SHUTDOWN_GRACE_SECONDS: float = Field(
+        default=10,
+        description="On shutdown, how long running tasks may finish before they are requeued"
+    )
+    
+    # Realtime project events (Server-Sent Events)
+    EVENTS_BROKER: str = Field(
+        default="memory",
+        description="How events reach other worker processes: memory (single worker) or postgres (LISTEN/NOTIFY)"
+    )
+    EVENTS_QUEUE_SIZE: int = Field(
+        default=100,
+        description="Events held per client stream; a client further behind is told to re-fetch"
+    )
+    EVENTS_KEEPALIVE_SECONDS: float = Field(
+        default=15,
+        description="Interval of keep-alive comments on idle event streams (keeps proxies from closing them)"
+    )
+    
+    # Rate limits for expensive endpoints (ai: generate-description, pdf: proposal/pdf, import: upload-csv)
+    RATE_LIMIT_ENABLED: bool = Field(default=True, description="Apply the rate limits and concurrency caps below")
+    RATE_LIMIT_BACKEND: str = Field(
+        default="memory",
+        description="Where per-user token buckets live: memory (per process) or postgres (shared by all workers)"
+    )
+    RATE_LIMITS: str = Field(
+        default="ai=10/60,pdf=20/60,import=5/60",
+        description="Per user token buckets as class=requests/seconds pairs: bursts of up to 'requests', refilled over 'seconds'"
+    )
+    CONCURRENCY_LIMITS: str = Field(
+        default="ai=8,pdf=4,import=2",
+        description="Requests of each class handled at once by this process, as class=limit pairs"
+    )
+    
+    # Slow query log (opt-in)
+    SLOW_QUERY_LOG_ENABLED: bool = Field(
+        default=False,
+        description="Record SQL statements slower than SLOW_QUERY_THRESHOLD_MS"
+    )
+    SLOW_QUERY_THRESHOLD_MS: float = Field(default=200, description="Slow query threshold in milliseconds")
+    SLOW_QUERY_BUFFER_SIZE: int = Field(default=200, description="Slow queries kept in the ring buffer")
+    SLOW_QUERY_EXPLAIN: bool = Field(
+        default=True,
+        description="Capture EXPLAIN (ANALYZE, BUFFERS) for slow SELECTs (runs the query again, read-only)"
+    )
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = Field(
+        default=60,
+        description="Explain each distinct statement at most once per interval"
+    )
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = Field(
+        default=10000,
+        description="statement_timeout for the EXPLAIN ANALYZE re-run"
+    )
+    
+    # Venue catalogue read model
+    VENUE_CATALOGUE_ENABLED: bool = Field(
+        default=True,
+        description="Serve GET /venues filtering, sorting and counts from the in-memory catalogue"
+    )
+    VENUE_CATALOGUE_REFRESH_SECONDS: int = Field(
+        default=5,
+        description="Maximum staleness before the catalogue applies incremental changes"
+    )
+    VENUE_CATALOGUE_TTL_SECONDS: int = Field(
+        default=3600,
+        description="Interval between full reloads of the in-memory venue catalogue"
+    )
+    
+    # Geocoding
+    GAZETTEER_PATH: Optional[str] = Field(
+        default=None,
+        description="Local gazetteer file (GeoNames dump or name,latitude,longitude CSV) used to geocode venues"
+    )
+    
     # AI Integration (Phase 2)
     OPENAI_API_KEY: str = Field(default="", description="OpenAI API key")
+    OPENAI_BASE_URL: Optional[str] = Field(
+        default=None,
+        description="OpenAI-compatible API root, e.g. http://127.0.0.1:8999/v1 for tools.fake_openai (default: api.openai.com)"
+    )
+    OPENAI_MAX_ATTEMPTS: int = Field(default=3, description="Attempts per AI call on 429, 5xx, timeouts and connection errors")
+    OPENAI_RETRY_BASE_SECONDS: float = Field(
+        default=0.5,
+        description="Backoff before the first retry; doubles with each attempt (full jitter)"
+    )
+    OPENAI_RETRY_MAX_SECONDS: float = Field(default=8, description="Longest backoff between attempts")
+    OPENAI_TIMEOUT_SECONDS: float = Field(default=20, description="Longest single AI request")
+    OPENAI_DEADLINE_SECONDS: float = Field(
+        default=45,
+        description="Longest an AI call may take in total, retries and waits included"
+    )
+    OPENAI_BREAKER_FAILURES: int = Field(
+        default=5,
+        description="Consecutive retryable failures that open the circuit (AI calls then fail at once)"
+    )
+    OPENAI_BREAKER_RESET_SECONDS: float = Field(
+        default=30,
+        description="How long the circuit stays open before a trial call is let through"
+    )
     
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins string into list."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
+    
+    @property
+    def compression_encodings_list(self) -> List[str]:
+        """Parse compression codings string into list."""
+        return [coding.strip().lower() for coding in self.COMPRESSION_ENCODINGS.split(",") if coding.strip()]
+    
+    @property
+    def task_concurrency_map(self) -> Dict[str, int]:
+        """Parse per task type concurrency limits into a dict."""
+        limits = {}
+        for pair in self.TASK_CONCURRENCY.split(","):
+            kind, _, limit = pair.partition("=")
+            if kind.strip() and limit.strip():
+                limits[kind.strip()] = int(limit)
+        return limits
+    
+    @property
+    def rate_limits_map(self) -> Dict[str, Tuple[int, float]]:
+        """Parse per class rate limits into a dict of (requests, seconds)."""
+        limits = {}
+        for pair in self.RATE_LIMITS.split(","):
+            name, _, limit = pair.partition("=")
+            if name.strip() and limit.strip():
+                requests, _, seconds = limit.partition("/")
+                limits[name.strip()] = (int(requests), float(seconds))
+        return limits
+    
+    @property
+    def concurrency_limits_map(self) -> Dict[str, int]:
+        """Parse per class concurrency caps into a dict."""
+        limits = {}
+        for pair in self.CONCURRENCY_LIMITS.split(","):
+            name, _, limit = pair.partition("=")
+            if name.strip() and limit.strip():
+                limits[name.strip()] = int(limit)
+        return limits
 
 
 settings = Settings()
@@ -1,10 +1,24 @@
 """FastAPI application entry point."""
-from fastapi import FastAPI
+import logging
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from app.api import auth, clients, projects, venues
+from app.api import admin, auth, clients, projects, tasks, venues
+from app.api.responses import ORJSONResponse
 from app.config import settings
+from app.database import engine
+from app.middleware import CompressionMiddleware, PrometheusMiddleware, RequestTimingMiddleware
+from app.services import metrics
+from app.services.activity_log import activity_log_partitions, activity_log_writer
+from app.services.events import event_bus
+from app.services.geocoding import geocoding_service
+from app.services.request_stats import install_query_listeners
+from app.services.slow_queries import slow_query_log
+from app.services.task_runner import task_runner
+
+logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s %(message)s")
 
 # Create FastAPI application
 app = FastAPI(
@@ -13,6 +27,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -22,8 +37,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Response compression (inside the timing middleware, so its cost shows in Server-Timing)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        encodings=settings.compression_encodings_list,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+    )
+
+if settings.SLOW_QUERY_LOG_ENABLED:
+    slow_query_log.install(engine)
+
+if settings.METRICS_ENABLED:
+    metrics.install_pool_metrics(engine)
+    app.add_middleware(PrometheusMiddleware)
+
+# Request timing (added last, so it is outermost and also covers CORS
+# preflights, compression and the metrics middleware)
+if settings.REQUEST_TIMING_ENABLED:
+    install_query_listeners(engine)
+    app.add_middleware(RequestTimingMiddleware)
+
 # Mount static files for photo uploads
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
@@ -32,6 +72,8 @@ app.include_router(auth.router, prefix="/api/v1")
 app.include_router(clients.router, prefix="/api/v1")
 app.include_router(venues.router, prefix="/api/v1")
 app.include_router(projects.router, prefix="/api/v1")
+app.include_router(tasks.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
 
 
 @app.get("/health", tags=["Health"])
@@ -44,6 +86,75 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint (all workers when PROMETHEUS_MULTIPROC_DIR is set)."""
+    payload, content_type = metrics.render_latest()
+    return Response(content=payload, media_type=content_type)
+
+
+@app.on_event("startup")
+async def start_activity_log():
+    """Start the background writer that batches activity log inserts."""
+    if settings.ACTIVITY_LOG_ENABLED:
+        activity_log_writer.start()
+
+
+@app.on_event("shutdown")
+async def flush_activity_log():
+    """Write activity events still queued in memory."""
+    await activity_log_writer.stop()
+
+
+@app.on_event("startup")
+async def start_activity_log_partitions():
+    """Keep activity_logs partitions created ahead and apply retention (even with logging off)."""
+    activity_log_partitions.start()
+
+
+@app.on_event("shutdown")
+async def stop_activity_log_partitions():
+    """Stop the activity_logs partition maintenance loop."""
+    await activity_log_partitions.stop()
+
+
+@app.on_event("startup")
+async def load_gazetteer():
+    """Load the geocoding gazetteer (when GAZETTEER_PATH is set) off the event loop."""
+    await geocoding_service.load()
+
+
+@app.on_event("startup")
+async def start_event_bus():
+    """Connect the broker that relays project events between workers."""
+    await event_bus.start()
+
+
+@app.on_event("startup")
+async def start_task_runner():
+    """Start the workers that run queued background tasks."""
+    if settings.TASKS_ENABLED:
+        task_runner.start()
+
+
+@app.on_event("shutdown")
+async def stop_task_runner():
+    """Let running tasks finish (or requeue them) before exiting."""
+    await task_runner.stop()
+
+
+@app.on_event("shutdown")
+async def stop_event_bus():
+    """Disconnect the project event broker."""
+    await event_bus.stop()
+
+
+@app.on_event("shutdown")
+async def release_worker_metrics():
+    """Remove this worker's live gauges from the multiprocess aggregate."""
+    metrics.mark_process_dead()
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint with API information."""
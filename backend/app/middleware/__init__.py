@@ -0,0 +1,6 @@
+"""ASGI middleware."""
+from .compression import CompressionMiddleware
+from .metrics import PrometheusMiddleware
+from .timing import RequestTimingMiddleware
+
+__all__ = ["CompressionMiddleware", "PrometheusMiddleware", "RequestTimingMiddleware"]
@@ -0,0 +1,232 @@
+"""Negotiated response compression (zstd, brotli, gzip)."""
+import zlib
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install zstandard
+    zstandard = None
+
+# Media that is already compressed, or must reach the client unbuffered
+EXCLUDED_CONTENT_TYPES = (
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "application/octet-stream",
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "text/event-stream",
+)
+
+
+class Encoder(ABC):
+    """Incremental compressor for one response body."""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it, so streamed chunks reach the client."""
+
+    @abstractmethod
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the last chunk and end the stream."""
+
+
+class GzipEncoder(Encoder):
+    def __init__(self, level: int):
+        # wbits 31 = gzip container
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder(Encoder):
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class ZstdEncoder(Encoder):
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_encodings() -> List[str]:
+    """Content codings this process can produce (depends on installed packages)."""
+    encodings = ["gzip"]
+    if brotli is not None:
+        encodings.insert(0, "br")
+    if zstandard is not None:
+        encodings.insert(0, "zstd")
+    return encodings
+
+
+def make_encoder(encoding: str, gzip_level: int = 6, brotli_quality: int = 4, zstd_level: int = 3) -> Encoder:
+    """Create an encoder for a content coding from available_encodings()."""
+    factories: Dict[str, Callable[[], Encoder]] = {
+        "gzip": lambda: GzipEncoder(gzip_level),
+        "br": lambda: BrotliEncoder(brotli_quality),
+        "zstd": lambda: ZstdEncoder(zstd_level),
+    }
+    return factories[encoding]()
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """Parse Accept-Encoding into {coding: q} (lower-cased codings)."""
+    accepted: Dict[str, float] = {}
+    for item in value.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, number = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(accept_encoding: str, preferred: Sequence[str]) -> Optional[str]:
+    """Pick the coding to use, or None for identity.
+
+    The client's q-values decide first; ties go to the server's order in
+    ``preferred``. ``*`` matches codings the client did not name.
+    """
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best: Optional[Tuple[float, int, str]] = None
+    for rank, coding in enumerate(preferred):
+        q = accepted.get(coding, wildcard)
+        if q > 0 and (best is None or (q, -rank) > best[:2]):
+            best = (q, -rank, coding)
+    return best[2] if best else None
+
+
+class CompressionMiddleware:
+    """Compress responses with the best coding the client accepts.
+
+    Pure ASGI, like the other middleware here, so streaming responses are
+    compressed chunk by chunk (each chunk is flushed, nothing is held back)
+    instead of being buffered. Responses are left alone when they:
+
+    - are smaller than ``minimum_size`` (single-chunk responses only)
+    - already have a Content-Encoding
+    - are already-compressed media or an event stream (EXCLUDED_CONTENT_TYPES)
+    - carry ``Cache-Control: no-transform``
+
+    ``Vary: Accept-Encoding`` is added to every compressible response, and
+    strong ETags become weak when the body is re-encoded.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: Sequence[str] = ("zstd", "br", "gzip"),
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        available = available_encodings()
+        self.encodings = [coding for coding in encodings if coding in available]
+        self.levels = {"gzip_level": gzip_level, "brotli_quality": brotli_quality, "zstd_level": zstd_level}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        start: Optional[Message] = None
+        encoder: Optional[Encoder] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk decides the headers
+                start = message
+                headers = Headers(raw=message["headers"])
+                compressible = (
+                    "content-encoding" not in headers
+                    and not headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+                    and "no-transform" not in headers.get("cache-control", "")
+                    and message["status"] not in (204, 304)
+                )
+                if compressible:
+                    MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+                passthrough = not compressible or coding is None
+                return
+
+            if message["type"] != "http.response.body":
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                if passthrough or (len(body) < self.minimum_size and not more_body):
+                    passthrough = True
+                else:
+                    encoder = make_encoder(coding, **self.levels)
+                    headers["Content-Encoding"] = coding
+                    etag = headers.get("etag")
+                    if etag and not etag.startswith("W/"):
+                        headers["ETag"] = f"W/{etag}"
+                    if "content-length" in headers:
+                        del headers["Content-Length"]
+                    if not more_body:
+                        body = encoder.finish(body)
+                        headers["Content-Length"] = str(len(body))
+                        message = {**message, "body": body}
+                        encoder = None
+                await send(start)
+                start = None
+                if passthrough or encoder is None:
+                    await send(message)
+                    return
+
+            if passthrough or encoder is None:
+                await send(message)
+                return
+            body = encoder.compress(body) if more_body else encoder.finish(body)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,43 @@
+"""Prometheus HTTP metrics middleware."""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.timing import route_template
+from app.services.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS, HTTP_REQUESTS_IN_PROGRESS
+
+
+class PrometheusMiddleware:
+    """Count and time HTTP requests per route template.
+
+    Labels use the matched route's template, never the raw path, so ids in
+    URLs do not create new series. Requests to /metrics itself are skipped.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method=method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            route = route_template(scope)
+            HTTP_REQUEST_DURATION.labels(method=method, route=route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method=method, route=route, status=str(status_code)).inc()
@@ -0,0 +1,78 @@
+"""Request timing middleware: Server-Timing headers, structured logs, route histograms."""
+import json
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.request_stats import begin_request, end_request, route_perf_registry
+
+logger = logging.getLogger("app.requests")
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template (e.g. /api/v1/venues/{venue_id}).
+
+    Falls back to "unmatched" so raw paths with ids never become labels.
+    """
+    return getattr(scope.get("route"), "path", None) or "unmatched"
+
+
+class RequestTimingMiddleware:
+    """Time each HTTP request and count the SQL it runs.
+
+    Pure ASGI (no BaseHTTPMiddleware) so streaming responses pass through
+    untouched. Per request it:
+
+    - adds ``Server-Timing: app;dur=..., db;dur=...;desc="N queries"``
+      (measured when the response headers are sent)
+    - logs one JSON line on the ``app.requests`` logger
+    - records duration, DB time and statement count in the per-route
+      histograms served by ``GET /admin/perf``
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = begin_request(scope)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                server_timing = (
+                    f'app;dur={stats.elapsed_seconds * 1000:.1f}, '
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = stats.elapsed_seconds
+            end_request(token)
+
+            method = scope["method"]
+            route = route_template(scope)
+            route_perf_registry.record(method, route, status_code, stats, duration)
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(json.dumps({
+                    "event": "request",
+                    "method": method,
+                    "route": route,
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round(duration * 1000, 2),
+                    "db_ms": round(stats.db_seconds * 1000, 2),
+                    "queries": stats.queries,
+                }))
@@ -8,6 +8,8 @@ from .client import Client
 from .project import Project, ProjectStatus
 from .project_venue import ProjectVenue, OutreachStatus
 from .activity_log import ActivityLog
+from .task import Task, TaskStatus
+from .rate_limit import RateLimitBucket
 
 __all__ = [
     "Base",
@@ -23,4 +25,7 @@ __all__ = [
     "ProjectVenue",
     "OutreachStatus",
     "ActivityLog",
+    "Task",
+    "TaskStatus",
+    "RateLimitBucket",
 ]
@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Any, Dict
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -15,9 +15,18 @@ if TYPE_CHECKING:
 
 
 class ActivityLog(Base):
-    """Audit trail entry recording actions taken on a project."""
+    """Audit trail entry recording actions taken on a project.
+    
+    The table is range-partitioned by month on created_at (partitions are
+    managed by ActivityLogService), so created_at is part of the primary key.
+    """
     
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        # Project timeline, newest first, keyset-paginated on (created_at, id)
+        Index("ix_activity_logs_project_created", "project_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     
     id: Mapped[UUID] = mapped_column(
         postgresql.UUID(as_uuid=True),
@@ -27,8 +36,7 @@ class ActivityLog(Base):
     project_id: Mapped[UUID] = mapped_column(
         postgresql.UUID(as_uuid=True),
         ForeignKey("projects.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     user_id: Mapped[UUID] = mapped_column(
         postgresql.UUID(as_uuid=True),
@@ -44,6 +52,7 @@ class ActivityLog(Base):
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         server_default=func.now(),
         nullable=False
     )
@@ -11,7 +11,15 @@ class Base(DeclarativeBase):
 
 
 class TimestampMixin:
-    """Mixin to add created_at and updated_at timestamps."""
+    """Mixin to add created_at and updated_at timestamps.
+    
+    Both are generated by the database. ``eager_defaults`` fetches them with
+    RETURNING in the INSERT/UPDATE itself; otherwise they are expired after
+    a flush, and reading them (e.g. to build a response) needs another
+    SELECT, which also fails outside a greenlet under asyncio.
+    """
+    
+    __mapper_args__ = {"eager_defaults": True}
     
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
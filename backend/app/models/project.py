@@ -80,7 +80,9 @@ class Project(Base, TimestampMixin):
     activity_logs: Mapped[List["ActivityLog"]] = relationship(
         "ActivityLog",
         back_populates="project",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        # ON DELETE CASCADE removes them; don't load a project's whole log to delete it
+        passive_deletes=True
     )
     
     def __repr__(self) -> str:
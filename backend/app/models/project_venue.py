@@ -1,10 +1,12 @@
 """ProjectVenue junction model."""
 import enum
+from datetime import date
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, ForeignKey, Numeric, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, ForeignKey, Index, Numeric, String, Text, UniqueConstraint
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import Range
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -30,6 +32,14 @@ class ProjectVenue(Base, TimestampMixin):
     __tablename__ = "project_venues"
     __table_args__ = (
         UniqueConstraint("project_id", "venue_id", name="uq_project_venue"),
+        # Serves "who else holds this venue on overlapping dates" (needs btree_gist
+        # for the uuid column)
+        Index(
+            "ix_project_venues_venue_hold_range",
+            "venue_id",
+            "hold_range",
+            postgresql_using="gist",
+        ),
     )
     
     id: Mapped[UUID] = mapped_column(
@@ -65,6 +75,8 @@ class ProjectVenue(Base, TimestampMixin):
     
     # Response data
     availability_dates: Mapped[Optional[str]] = mapped_column(String(255))
+    availability_range: Mapped[Optional[Range[date]]] = mapped_column(postgresql.DATERANGE)
+    hold_range: Mapped[Optional[Range[date]]] = mapped_column(postgresql.DATERANGE)
     is_available: Mapped[Optional[bool]] = mapped_column(Boolean)
     quoted_price: Mapped[Optional[float]] = mapped_column(Numeric(12, 2))
     room_allocation: Mapped[Optional[str]] = mapped_column(Text)
@@ -0,0 +1,31 @@
+"""Rate limit bucket model (shared rate limiter backend)."""
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class RateLimitBucket(Base):
+    """Token bucket state of one user for one endpoint class.
+
+    Only used with RATE_LIMIT_BACKEND=postgres. The table is UNLOGGED:
+    buckets are cheap to lose in a crash (everyone just gets a full
+    bucket) and skipping the WAL keeps the per-request update cheap.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    # "<endpoint class>:<user id>"
+    key: Mapped[str] = mapped_column(String(100), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<RateLimitBucket {self.key} {self.tokens:.2f}>"
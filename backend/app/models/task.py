@@ -0,0 +1,86 @@
+"""Background task model."""
+import enum
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text, func, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Mapped, deferred, mapped_column
+
+from .base import Base, TimestampMixin
+
+
+class TaskStatus(str, enum.Enum):
+    """Background task status enumeration."""
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+    cancelled = "cancelled"
+
+
+class Task(Base, TimestampMixin):
+    """A unit of background work (AI generation, PDF rendering, CSV import).
+
+    Rows are the queue: workers claim queued rows with FOR UPDATE SKIP
+    LOCKED, so any number of API processes can run them.
+    """
+
+    __tablename__ = "tasks"
+    __table_args__ = (
+        # Claim order for workers; only queued rows are indexed
+        Index(
+            "ix_tasks_queued_run_after",
+            "run_after",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        Index("ix_tasks_user_created", "user_id", "created_at"),
+    )
+
+    id: Mapped[UUID] = mapped_column(
+        postgresql.UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4
+    )
+    user_id: Mapped[UUID] = mapped_column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    status: Mapped[TaskStatus] = mapped_column(
+        postgresql.ENUM(TaskStatus, name="task_status", create_type=False),
+        nullable=False,
+        default=TaskStatus.queued
+    )
+    payload: Mapped[Dict[str, Any]] = mapped_column(
+        postgresql.JSONB,
+        nullable=False,
+        default=dict
+    )
+    result: Mapped[Optional[Dict[str, Any]]] = mapped_column(postgresql.JSONB)
+    error: Mapped[Optional[str]] = mapped_column(Text)
+
+    # File produced by the task (e.g. a proposal PDF); not loaded unless asked for
+    output: Mapped[Optional[bytes]] = deferred(mapped_column(LargeBinary))
+    output_type: Mapped[Optional[str]] = mapped_column(String(100))
+    output_filename: Mapped[Optional[str]] = mapped_column(String(255))
+
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    # Set by the worker running the task
+    locked_by: Mapped[Optional[str]] = mapped_column(String(100))
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    def __repr__(self) -> str:
+        return f"<Task {self.kind} {self.status.value}>"
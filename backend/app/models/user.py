@@ -55,7 +55,8 @@ class User(Base, TimestampMixin):
     )
     activity_logs: Mapped[List["ActivityLog"]] = relationship(
         "ActivityLog",
-        back_populates="user"
+        back_populates="user",
+        passive_deletes=True
     )
     
     def __repr__(self) -> str:
@@ -2,7 +2,7 @@
 from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, Integer, String, Text
+from sqlalchemy import Boolean, Float, Index, Integer, String, Text, func, literal_column
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -23,8 +23,8 @@ class Venue(Base, TimestampMixin):
         primary_key=True,
         default=uuid4
     )
-    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
-    city: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    city: Mapped[str] = mapped_column(String(100), nullable=False)
     capacity: Mapped[int] = mapped_column(Integer, nullable=False)
     facilities: Mapped[List[str]] = mapped_column(
         postgresql.ARRAY(String),
@@ -40,13 +40,14 @@ class Venue(Base, TimestampMixin):
     contact_phone: Mapped[Optional[str]] = mapped_column(String(50))
     website: Mapped[Optional[str]] = mapped_column(String(500))
     address: Mapped[Optional[str]] = mapped_column(Text)
+    latitude: Mapped[Optional[float]] = mapped_column(Float)
+    longitude: Mapped[Optional[float]] = mapped_column(Float)
     description_template: Mapped[Optional[str]] = mapped_column(Text)
     notes: Mapped[Optional[str]] = mapped_column(Text)
     is_deleted: Mapped[bool] = mapped_column(
         Boolean,
         nullable=False,
-        default=False,
-        index=True
+        default=False
     )
     
     # Relationships
@@ -63,3 +64,72 @@ class Venue(Base, TimestampMixin):
     
     def __repr__(self) -> str:
         return f"<Venue {self.name} ({self.city})>"
+
+
+def normalized_label(expr):
+    """SQL counterpart of ``normalize_label``: trim, collapse whitespace, lowercase.
+
+    The arguments are inlined rather than bound, so the expression matches
+    the index on it.
+    """
+    collapsed = func.regexp_replace(expr, literal_column(r"'\s+'"), literal_column("' '"), literal_column("'g'"))
+    return func.lower(func.btrim(collapsed))
+
+
+def normalized_labels(expr):
+    """Array of a label column's entries, each normalised like ``normalize_label``.
+
+    Calls the IMMUTABLE SQL function ``normalized_labels`` (migration
+    e6c3a9f1b284), so the expression can be indexed.
+    """
+    return func.normalized_labels(expr, type_=postgresql.ARRAY(Text))
+
+
+# City and name order shared by SQL and the in-memory venue catalogue. The
+# city is normalised like the catalogue's city labels; names are ordered by
+# the lowercased name compared by code point (COLLATE "C"), then id, which,
+# unlike the database's default collation, Python reproduces exactly.
+VENUE_CITY_KEY = normalized_label(Venue.city)
+VENUE_NAME_SORT_KEY = func.lower(Venue.name).collate("C")
+# Facility and event type filters are containment (@>) on these
+VENUE_FACILITY_KEYS = normalized_labels(Venue.facilities)
+VENUE_EVENT_TYPE_KEYS = normalized_labels(Venue.event_types)
+
+# Partial indexes: every read path filters out soft-deleted venues, so only
+# live rows are indexed. The city index is on the normalised city to match
+# the case-insensitive filter in VenueService, with the name order appended.
+Index(
+    "ix_venues_name_sort_active",
+    VENUE_NAME_SORT_KEY,
+    Venue.id,
+    postgresql_where=~Venue.is_deleted,
+)
+Index(
+    "ix_venues_city_key_name_sort_active",
+    VENUE_CITY_KEY,
+    VENUE_NAME_SORT_KEY,
+    Venue.id,
+    postgresql_where=~Venue.is_deleted,
+)
+
+# GIN indexes for the facility and event type filters
+Index(
+    "ix_venues_facility_keys_active",
+    VENUE_FACILITY_KEYS,
+    postgresql_using="gin",
+    postgresql_where=~Venue.is_deleted,
+)
+Index(
+    "ix_venues_event_type_keys_active",
+    VENUE_EVENT_TYPE_KEYS,
+    postgresql_using="gin",
+    postgresql_where=~Venue.is_deleted,
+)
+
+# Bounding-box prefilter for radius searches served from SQL
+Index(
+    "ix_venues_lat_lng_active",
+    Venue.latitude,
+    Venue.longitude,
+    postgresql_where=~Venue.is_deleted & Venue.latitude.isnot(None),
+)
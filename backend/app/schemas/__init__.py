@@ -1,16 +1,25 @@
 """Pydantic schemas for request/response validation."""
 from .user import UserBase, UserCreate, UserLogin, UserResponse, UserUpdate
 from .token import Token, TokenData
-from .venue import VenueBase, VenueCreate, VenueUpdate, VenueResponse, VenueListResponse, VenueFilters
+from .venue import VenueBase, VenueCreate, VenueUpdate, VenueResponse, VenueListResponse, VenueFilters, VenueFacets
 from .photo import PhotoBase, PhotoCreate, PhotoResponse
 from .project import ProjectBase, ProjectCreate, ProjectUpdate, ProjectResponse, ProjectListResponse, ProjectFilters
 from .project_venue import (
     ProjectVenueBase,
     ProjectVenueCreate,
+    ProjectVenueBulkCreate,
+    ProjectVenueBulkCreateResponse,
     ProjectVenueUpdate,
+    ProjectVenueBatchUpdate,
     ProjectVenueResponse,
     ProjectVenueDetailResponse,
+    DateRange,
+    VenueDateConflict,
+    ProjectConflictListResponse,
 )
+from .venue_suggestion import VenueSuggestion, VenueSuggestionListResponse
+from .activity_log import ActivityLogResponse, ActivityLogPage
+from .task import TaskResponse, TaskListResponse
 
 __all__ = [
     "UserBase",
@@ -26,6 +35,7 @@ __all__ = [
     "VenueResponse",
     "VenueListResponse",
     "VenueFilters",
+    "VenueFacets",
     "PhotoBase",
     "PhotoCreate",
     "PhotoResponse",
@@ -37,9 +47,21 @@ __all__ = [
     "ProjectFilters",
     "ProjectVenueBase",
     "ProjectVenueCreate",
+    "ProjectVenueBulkCreate",
+    "ProjectVenueBulkCreateResponse",
     "ProjectVenueUpdate",
+    "ProjectVenueBatchUpdate",
     "ProjectVenueResponse",
     "ProjectVenueDetailResponse",
+    "DateRange",
+    "VenueDateConflict",
+    "ProjectConflictListResponse",
+    "VenueSuggestion",
+    "VenueSuggestionListResponse",
+    "ActivityLogResponse",
+    "ActivityLogPage",
+    "TaskResponse",
+    "TaskListResponse",
 ]
 
 
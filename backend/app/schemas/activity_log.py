@@ -0,0 +1,28 @@
+"""Activity log schemas for request/response validation."""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ActivityLogResponse(BaseModel):
+    """One entry of a project's activity timeline."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: UUID
+    project_id: UUID
+    user_id: UUID
+    action: str
+    details: Dict[str, Any]
+    created_at: datetime
+
+
+class ActivityLogPage(BaseModel):
+    """A page of activity, newest first.
+    
+    Pass ``next_cursor`` as ``cursor`` to get the next (older) page; it is
+    null on the last page.
+    """
+    items: List[ActivityLogResponse]
+    next_cursor: Optional[str] = None
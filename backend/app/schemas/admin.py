@@ -0,0 +1,104 @@
+"""Admin and monitoring schemas."""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class VenueCatalogueStats(BaseModel):
+    """Size, memory and staleness of the in-memory venue catalogue."""
+    rows: int
+    live_rows: int
+    dead_rows: int
+    cities: int
+    geocoded_rows: int
+    facilities: int
+    event_types: int
+    memory_bytes: int
+    watermark: Optional[datetime] = None
+    last_refresh_at: Optional[datetime] = None
+    seconds_since_refresh: Optional[float] = None
+    seconds_since_full_load: Optional[float] = None
+    full_loads: int
+    incremental_refreshes: int
+    rows_applied: int
+
+
+class HistogramSummary(BaseModel):
+    """Fixed-bucket histogram; quantiles are bucket upper bounds."""
+    count: int
+    mean: Optional[float] = None
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+    p99: Optional[float] = None
+    max: float
+    buckets: Dict[str, int]
+
+
+class RoutePerfStats(BaseModel):
+    """Request latency, DB time and SQL statement counts for one route."""
+    method: str
+    route: str
+    requests: int
+    errors: int
+    duration_ms: HistogramSummary
+    db_ms: HistogramSummary
+    queries: HistogramSummary
+
+
+class RoutePerfResponse(BaseModel):
+    """Per-route performance since process start (or the last reset)."""
+    routes: List[RoutePerfStats]
+
+
+class SlowQueryEntry(BaseModel):
+    """A statement that exceeded the slow query threshold."""
+    recorded_at: datetime
+    duration_ms: float
+    sql: str
+    params: Any = None
+    executemany: bool = False
+    endpoint: Optional[str] = None
+    plan: Optional[Any] = None
+    plan_error: Optional[str] = None
+
+
+class SlowQueryListResponse(BaseModel):
+    """Slow query ring buffer, newest first."""
+    enabled: bool
+    threshold_ms: float
+    items: List[SlowQueryEntry]
+
+
+class ActivityLogPartition(BaseModel):
+    """One monthly partition of activity_logs."""
+    name: str
+    start: datetime
+    end: datetime
+    rows_estimate: int
+    total_bytes: int
+
+
+class ActivityLogPartitionListResponse(BaseModel):
+    """activity_logs partitions, oldest first, and the retention policy."""
+    retention_months: int
+    partitions_ahead: int
+    partitions: List[ActivityLogPartition]
+
+
+class RateLimitClassStats(BaseModel):
+    """Limits of one endpoint class, with requests in progress and rejections."""
+    endpoint_class: str
+    burst: Optional[int] = None
+    refill_per_second: Optional[float] = None
+    concurrency_limit: Optional[int] = None
+    in_flight: int
+    rejected_rate: int
+    rejected_concurrency: int
+
+
+class RateLimitStatsResponse(BaseModel):
+    """Rate limit configuration and this worker's counters."""
+    enabled: bool
+    backend: str
+    items: List[RateLimitClassStats]
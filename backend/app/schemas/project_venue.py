@@ -1,18 +1,57 @@
 """ProjectVenue junction schemas for request/response validation."""
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime, timedelta
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from sqlalchemy.dialects.postgresql import Range
 
 from app.models.project_venue import OutreachStatus
 from app.schemas.venue import VenueResponse
 
 
+class DateRange(BaseModel):
+    """Inclusive date range, stored as a Postgres daterange.
+    
+    Either bound may be null for an open-ended range, but not both. Postgres returns
+    dateranges in canonical ``[start, end)`` form; they are converted back
+    to an inclusive end date here.
+    """
+    start: Optional[date] = None
+    end: Optional[date] = None
+    
+    @model_validator(mode="before")
+    @classmethod
+    def from_pg_range(cls, value):
+        """Accept the Range objects loaded from the database."""
+        if isinstance(value, Range):
+            start, end = value.lower, value.upper
+            if start is not None and not value.lower_inc:
+                start += timedelta(days=1)
+            if end is not None and not value.upper_inc:
+                end -= timedelta(days=1)
+            return {"start": start, "end": end}
+        return value
+    
+    @model_validator(mode="after")
+    def check_order(self) -> "DateRange":
+        if self.start is None and self.end is None:
+            raise ValueError("start or end is required")
+        if self.start and self.end and self.end < self.start:
+            raise ValueError("end must be on or after start")
+        return self
+    
+    def to_range(self) -> Range:
+        """Convert to a Range for the DATERANGE columns."""
+        return Range(self.start, self.end, bounds="[]")
+
+
 class ProjectVenueBase(BaseModel):
     """Shared project-venue fields."""
     outreach_status: OutreachStatus = OutreachStatus.draft
     availability_dates: Optional[str] = Field(None, max_length=255)
+    availability_range: Optional[DateRange] = Field(None, description="Dates the venue says it is available")
+    hold_range: Optional[DateRange] = Field(None, description="Dates the venue is provisionally held for this project")
     is_available: Optional[bool] = None
     quoted_price: Optional[float] = Field(None, gt=0, description="Quoted price in EUR")
     room_allocation: Optional[str] = None
@@ -31,11 +70,24 @@ class ProjectVenueCreate(BaseModel):
     venue_id: UUID
 
 
+class ProjectVenueBulkCreate(BaseModel):
+    """Venues to add to a project in one request."""
+    venue_ids: List[UUID] = Field(..., min_length=1, max_length=500)
+
+
+class ProjectVenueBulkCreateResponse(BaseModel):
+    """Outcome of a bulk add, in request order."""
+    created: List[UUID]
+    already_present: List[UUID]
+
+
 class ProjectVenueUpdate(BaseModel):
     """Fields that can be updated (all optional)."""
     outreach_status: Optional[OutreachStatus] = None
     catering_provider_id: Optional[UUID] = None
     availability_dates: Optional[str] = Field(None, max_length=255)
+    availability_range: Optional[DateRange] = None
+    hold_range: Optional[DateRange] = None
     is_available: Optional[bool] = None
     quoted_price: Optional[float] = Field(None, gt=0)
     room_allocation: Optional[str] = None
@@ -49,6 +101,11 @@ class ProjectVenueUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class ProjectVenueBatchUpdate(ProjectVenueUpdate):
+    """One item of a batch update: the venue plus the fields to change."""
+    venue_id: UUID
+
+
 class ProjectVenueResponse(ProjectVenueBase):
     """ProjectVenue response schema."""
     model_config = ConfigDict(from_attributes=True)
@@ -64,3 +121,22 @@ class ProjectVenueResponse(ProjectVenueBase):
 class ProjectVenueDetailResponse(ProjectVenueResponse):
     """ProjectVenue response with full venue details."""
     venue: VenueResponse
+
+
+class VenueDateConflict(BaseModel):
+    """Another project holding one of this project's venues on overlapping dates."""
+    venue_id: UUID
+    venue_name: str
+    project_id: UUID
+    event_name: str
+    client_name: str
+    outreach_status: OutreachStatus
+    hold_range: DateRange
+
+
+class ProjectConflictListResponse(BaseModel):
+    """Date conflicts for a project's shortlisted venues."""
+    project_id: UUID
+    event_date_start: date
+    event_date_end: date
+    items: List[VenueDateConflict]
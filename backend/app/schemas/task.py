@@ -0,0 +1,38 @@
+"""Background task schemas for request/response validation."""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.task import TaskStatus
+
+
+class TaskResponse(BaseModel):
+    """A background task and, once finished, its result.
+    
+    When ``output_filename`` is set the task produced a file, downloadable
+    from ``GET /tasks/{id}/output``.
+    """
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: UUID
+    kind: str
+    status: TaskStatus
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    output_type: Optional[str] = None
+    output_filename: Optional[str] = None
+    run_after: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class TaskListResponse(BaseModel):
+    """The current user's tasks, newest first."""
+    items: List[TaskResponse]
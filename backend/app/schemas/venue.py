@@ -1,9 +1,9 @@
 """Venue schemas for request/response validation."""
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 from app.schemas.photo import PhotoResponse
 
@@ -19,6 +19,8 @@ class VenueBase(BaseModel):
     contact_phone: Optional[str] = Field(None, max_length=50)
     website: Optional[str] = Field(None, max_length=500)
     address: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     description_template: Optional[str] = None
     notes: Optional[str] = None
 
@@ -39,6 +41,8 @@ class VenueUpdate(BaseModel):
     contact_phone: Optional[str] = Field(None, max_length=50)
     website: Optional[str] = Field(None, max_length=500)
     address: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     description_template: Optional[str] = None
     notes: Optional[str] = None
 
@@ -52,6 +56,13 @@ class VenueResponse(VenueBase):
     created_at: datetime
     updated_at: datetime
     photos: List[PhotoResponse] = []
+    distance_km: Optional[float] = Field(None, description="Distance from the 'near' point, when given")
+
+
+class VenueFacets(BaseModel):
+    """Match counts per facility and event type for the current filters."""
+    facilities: Dict[str, int] = {}
+    event_types: Dict[str, int] = {}
 
 
 class VenueListResponse(BaseModel):
@@ -60,6 +71,7 @@ class VenueListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    facets: Optional[VenueFacets] = None
 
 
 class VenueFilters(BaseModel):
@@ -67,6 +79,9 @@ class VenueFilters(BaseModel):
     city: Optional[str] = None
     min_capacity: Optional[int] = Field(None, gt=0)
     facilities: Optional[List[str]] = None
+    event_types: Optional[List[str]] = None
+    near: Optional[str] = Field(None, description="'lat,lng' to sort by distance from")
+    radius_km: Optional[float] = Field(None, gt=0, le=500)
     page: int = Field(1, ge=1)
     page_size: int = Field(20, ge=1, le=100)
 
@@ -82,9 +97,19 @@ class VenueCSVRow(BaseModel):
     contact_phone: Optional[str] = Field(None, max_length=50)
     website: Optional[str] = Field(None, max_length=500)
     address: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     description_template: Optional[str] = None
     notes: Optional[str] = None
     
+    @field_validator("latitude", "longitude", mode="before")
+    @classmethod
+    def empty_coordinate_to_none(cls, value):
+        """Treat blank CSV cells as missing coordinates."""
+        if isinstance(value, str):
+            return value.strip() or None
+        return value
+    
     def to_venue_create(self) -> VenueCreate:
         """Convert CSV row to VenueCreate schema."""
         # Parse comma-separated strings into lists
@@ -101,6 +126,8 @@ class VenueCSVRow(BaseModel):
             contact_phone=self.contact_phone,
             website=self.website,
             address=self.address,
+            latitude=self.latitude,
+            longitude=self.longitude,
             description_template=self.description_template,
             notes=self.notes,
         )
@@ -0,0 +1,32 @@
+"""Venue suggestion schemas for project matching."""
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.schemas.venue import VenueResponse
+
+
+class VenueSuggestion(BaseModel):
+    """A candidate venue with its match score breakdown.
+    
+    Component scores are in [0, 1]; a component is null when the project
+    does not specify that criterion (e.g. no budget) and it was left out
+    of the overall score.
+    """
+    venue: VenueResponse
+    score: float = Field(..., ge=0, le=1, description="Weighted match score")
+    capacity_score: Optional[float] = None
+    requirement_score: Optional[float] = None
+    location_score: Optional[float] = None
+    price_score: Optional[float] = None
+    estimated_price: Optional[float] = Field(
+        None, description="Estimate from past quotes per attendee, in EUR"
+    )
+
+
+class VenueSuggestionListResponse(BaseModel):
+    """Ranked venue suggestions for a project."""
+    project_id: UUID
+    items: List[VenueSuggestion]
+    candidates: int = Field(..., description="Number of venues that were scored")
@@ -0,0 +1,264 @@
+"""Batched, asynchronous activity log (audit trail) writer.
+
+Endpoints call ``activity_log_writer.log(...)``, which only puts the event
+on an in-memory queue; a background task drains the queue and writes
+events with one multi-row INSERT per batch, in its own transaction. An
+audited request therefore runs no extra SQL and does not wait for the
+log write.
+
+The queue is flushed every ``flush_interval`` seconds, or as soon as
+``batch_size`` events are waiting, in INSERTs of up to ``batch_size`` rows.
+The queue is bounded: when the database falls behind, ``log`` waits up to
+``enqueue_timeout`` for room (backpressure) and then drops the event
+rather than stall the request. Events still queued at shutdown are
+flushed by ``stop()``. Logging is best effort: events are lost if the
+process dies before a flush.
+
+``ActivityLogPartitionMaintainer`` keeps the monthly activity_logs
+partitions ahead of the clock and applies retention (see
+activity_log_service). It runs whether or not events are being logged.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from app.config import settings
+from app.database import async_session_maker, engine
+from app.models.activity_log import ActivityLog
+from app.services.activity_log_service import activity_log_service
+from app.services.metrics import ACTIVITY_LOG_BATCH_SIZE, ACTIVITY_LOG_EVENTS
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogWriter:
+    """Queue activity events and write them to activity_logs in batches."""
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue: int = 10_000,
+        enqueue_timeout: float = 0.05,
+        session_maker: async_sessionmaker = async_session_maker,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.enqueue_timeout = enqueue_timeout
+        self.session_maker = session_maker
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background flusher (on application startup)."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="activity-log-writer")
+
+    async def stop(self) -> None:
+        """Stop the flusher and write every event still queued."""
+        if self._task is None:
+            return
+        # Not cancelled: a batch being written is allowed to finish
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        await self.flush()
+
+    async def log(
+        self,
+        project_id: UUID,
+        user_id: UUID,
+        action: str,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Queue one activity event.
+
+        Returns immediately unless the queue is full, in which case it
+        waits up to ``enqueue_timeout`` for the flusher to make room.
+
+        Args:
+            project_id: Project the action was taken on
+            user_id: User who took it
+            action: Dotted action name, e.g. "project_venue.updated"
+            details: JSON-serializable context (ids, changed fields)
+
+        Returns:
+            True if queued, False if logging is off or the event was dropped
+        """
+        if not self.running or self._stopping:
+            return False
+        event = {
+            "id": uuid4(),
+            "project_id": project_id,
+            "user_id": user_id,
+            "action": action,
+            "details": details or {},
+            # The time of the action, not of the batch insert
+            "created_at": datetime.now(timezone.utc),
+        }
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(self._queue.put(event), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                ACTIVITY_LOG_EVENTS.labels(result="dropped").inc()
+                logger.warning("Activity log queue full; dropped %s event", action)
+                return False
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> int:
+        """Write every queued event now.
+
+        Returns:
+            Number of events written
+        """
+        written = 0
+        while self._queue is not None and not self._queue.empty():
+            batch = []
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            written += await self._write(batch)
+        return written
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._stopping:
+            # Woken by the timer, a full batch, or stop()
+            timer = loop.call_later(self.flush_interval, self._wakeup.set)
+            await self._wakeup.wait()
+            timer.cancel()
+            self._wakeup.clear()
+            if not self._stopping:
+                await self.flush()
+
+    async def _write(self, batch: List[dict]) -> int:
+        """Insert a batch; returns the number of events written."""
+        try:
+            async with self.session_maker() as db:
+                await db.execute(insert(ActivityLog.__table__), batch)
+                await db.commit()
+        except IntegrityError:
+            # A project (or user) was deleted before its events were
+            # written; keep the rest of the batch
+            return await self._write_each(batch)
+        except Exception:
+            ACTIVITY_LOG_EVENTS.labels(result="failed").inc(len(batch))
+            logger.exception("Failed to write %d activity log events", len(batch))
+            return 0
+        ACTIVITY_LOG_EVENTS.labels(result="written").inc(len(batch))
+        ACTIVITY_LOG_BATCH_SIZE.observe(len(batch))
+        return len(batch)
+
+    async def _write_each(self, batch: List[dict]) -> int:
+        written = 0
+        for event in batch:
+            async with self.session_maker() as db:
+                try:
+                    await db.execute(insert(ActivityLog.__table__), [event])
+                    await db.commit()
+                    written += 1
+                except IntegrityError:
+                    ACTIVITY_LOG_EVENTS.labels(result="failed").inc()
+        ACTIVITY_LOG_EVENTS.labels(result="written").inc(written)
+        return written
+
+
+class ActivityLogPartitionMaintainer:
+    """Periodically create upcoming activity_logs partitions and apply retention."""
+
+    def __init__(
+        self,
+        months_ahead: int = 3,
+        retention_months: int = 0,
+        interval: float = 21600,
+        session_maker: async_sessionmaker = async_session_maker,
+        engine: AsyncEngine = engine,
+    ):
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.interval = interval
+        self.session_maker = session_maker
+        self.engine = engine
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    def start(self) -> None:
+        """Run maintenance now and every ``interval`` seconds (on application startup)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="activity-log-partitions")
+
+    async def stop(self) -> None:
+        """Stop after the run in progress, if any."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    async def run_once(self) -> Tuple[List[str], List[str]]:
+        """Create the partitions up to ``months_ahead`` and drop expired ones.
+
+        Returns:
+            Tuple of (created partition names, dropped partition names)
+        """
+        async with self.session_maker() as db:
+            created = await activity_log_service.ensure_partitions(db, self.months_ahead)
+        dropped = []
+        if self.retention_months > 0:
+            dropped = await activity_log_service.drop_expired_partitions(self.engine, self.retention_months)
+        if created or dropped:
+            logger.info("activity_logs partitions created=%s dropped=%s", created, dropped)
+        return created, dropped
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._stopping:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("activity_logs partition maintenance failed")
+            timer = loop.call_later(self.interval, self._wakeup.set)
+            await self._wakeup.wait()
+            timer.cancel()
+            self._wakeup.clear()
+
+
+# Singleton instances
+activity_log_writer = ActivityLogWriter(
+    batch_size=settings.ACTIVITY_LOG_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS,
+    max_queue=settings.ACTIVITY_LOG_QUEUE_SIZE,
+    enqueue_timeout=settings.ACTIVITY_LOG_ENQUEUE_TIMEOUT_MS / 1000,
+)
+activity_log_partitions = ActivityLogPartitionMaintainer(
+    months_ahead=settings.ACTIVITY_LOG_PARTITIONS_AHEAD,
+    retention_months=settings.ACTIVITY_LOG_RETENTION_MONTHS,
+    interval=settings.ACTIVITY_LOG_MAINTENANCE_INTERVAL_SECONDS,
+)
@@ -0,0 +1,230 @@
+"""Activity log reads and partition maintenance.
+
+activity_logs is range-partitioned by month on created_at (UTC), one
+partition per month named ``activity_logs_pYYYY_MM``. Partitions are
+created ``ACTIVITY_LOG_PARTITIONS_AHEAD`` months in advance, because an
+insert with no partition for its month fails. Retention drops whole
+partitions, which frees their space at once, where a DELETE of old rows
+would leave dead tuples behind for vacuum. A partition is first detached
+CONCURRENTLY, so timeline reads and batch inserts on activity_logs are
+not blocked while it goes. ``ActivityLogPartitionMaintainer`` (in
+activity_log) runs both periodically.
+
+The timeline is keyset-paginated on (created_at, id), newest first. Each
+page query carries an upper bound on created_at (the cursor) and an
+optional lower one (``since``), so the planner skips partitions outside
+them, and the ordered scan stops once it has a page.
+"""
+import base64
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.models.activity_log import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME = re.compile(r"^activity_logs_p(\d{4})_(\d{2})$")
+
+# Serializes partition DDL between workers
+PARTITION_LOCK_ID = 0x61637431  # "act1"
+
+
+def month_start(value: date, offset: int = 0) -> datetime:
+    """First instant (UTC) of the month ``offset`` months after ``value``'s."""
+    index = value.year * 12 + value.month - 1 + offset
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the partition holding ``month``."""
+    return f"activity_logs_p{month.year:04d}_{month.month:02d}"
+
+
+def encode_cursor(created_at: datetime, log_id: UUID) -> str:
+    """Opaque cursor for the entry after which the next page starts."""
+    raw = f"{created_at.isoformat()}|{log_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Inverse of encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, log_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(log_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("invalid cursor") from e
+
+
+@dataclass
+class Partition:
+    """A monthly partition and its size."""
+    name: str
+    start: datetime
+    end: datetime
+    rows_estimate: int
+    total_bytes: int
+    # Left half-detached by an interrupted DETACH ... CONCURRENTLY
+    detach_pending: bool = False
+
+
+class ActivityLogService:
+    """Project activity timeline and activity_logs partition management."""
+
+    async def get_project_activity(
+        self,
+        db: AsyncSession,
+        project_id: UUID,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        since: Optional[datetime] = None,
+        action: Optional[str] = None,
+    ) -> Tuple[List[ActivityLog], Optional[str]]:
+        """Get a page of a project's activity, newest first.
+
+        Args:
+            db: Database session
+            project_id: Project UUID
+            limit: Page size
+            cursor: next_cursor of the previous page
+            since: Only entries at or after this time
+            action: Only entries with this action
+
+        Returns:
+            Tuple of (entries, cursor of the next page or None)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = select(ActivityLog).where(ActivityLog.project_id == project_id)
+        if cursor:
+            created_at, log_id = decode_cursor(cursor)
+            query = query.where(
+                # The plain bound is what lets the planner prune partitions
+                ActivityLog.created_at <= created_at,
+                tuple_(ActivityLog.created_at, ActivityLog.id) < (created_at, log_id),
+            )
+        if since:
+            query = query.where(ActivityLog.created_at >= since)
+        if action:
+            query = query.where(ActivityLog.action == action)
+
+        result = await db.execute(
+            query.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc()).limit(limit + 1)
+        )
+        entries = list(result.scalars().all())
+        if len(entries) <= limit:
+            return entries, None
+        entries = entries[:limit]
+        return entries, encode_cursor(entries[-1].created_at, entries[-1].id)
+
+    async def list_partitions(self, db: Union[AsyncSession, AsyncConnection]) -> List[Partition]:
+        """List activity_logs partitions, oldest first.
+
+        Args:
+            db: Database session or connection
+
+        Returns:
+            Partitions with planner row estimates and on-disk size
+        """
+        result = await db.execute(text("""
+            SELECT c.relname, greatest(c.reltuples, 0)::bigint, pg_total_relation_size(c.oid), i.inhdetachpending
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'activity_logs'::regclass
+        """))
+        partitions = []
+        for name, rows, size, detach_pending in result.all():
+            match = PARTITION_NAME.match(name)
+            if not match:
+                continue
+            start = datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)
+            partitions.append(Partition(name, start, month_start(start, 1), rows, size, detach_pending))
+        return sorted(partitions, key=lambda partition: partition.start)
+
+    async def ensure_partitions(self, db: AsyncSession, months_ahead: int, now: Optional[datetime] = None) -> List[str]:
+        """Create any missing partitions from this month to ``months_ahead`` months on.
+
+        Args:
+            db: Database session (committed by this call)
+            months_ahead: Months after the current one to cover
+            now: Current time (for tests and backfills)
+
+        Returns:
+            Names of the partitions created
+        """
+        now = now or datetime.now(timezone.utc)
+        await db.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": PARTITION_LOCK_ID})
+        existing = {partition.name for partition in await self.list_partitions(db)}
+        created = []
+        for offset in range(months_ahead + 1):
+            start = month_start(now, offset)
+            name = partition_name(start)
+            if name in existing:
+                continue
+            await db.execute(text(
+                f"CREATE TABLE {name} PARTITION OF activity_logs "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{month_start(start, 1).isoformat()}')"
+            ))
+            created.append(name)
+        await db.commit()
+        return created
+
+    async def drop_expired_partitions(
+        self,
+        engine: AsyncEngine,
+        retention_months: int,
+        now: Optional[datetime] = None,
+    ) -> List[str]:
+        """Drop partitions that ended more than ``retention_months`` months ago.
+
+        The current month and the ``retention_months`` before it are kept,
+        so no entry younger than ``retention_months`` whole months is
+        dropped.
+
+        A plain DROP TABLE of a partition locks the whole of activity_logs
+        (ACCESS EXCLUSIVE) until it commits. Each partition is therefore
+        detached with DETACH PARTITION ... CONCURRENTLY, which only waits
+        for queries already running, and then dropped on its own. DETACH
+        CONCURRENTLY cannot run in a transaction, so this uses its own
+        autocommit connection rather than a session.
+
+        Args:
+            engine: Engine to open the autocommit connection on
+            retention_months: Whole months to keep before the current one
+            now: Current time (for tests)
+
+        Returns:
+            Names of the partitions dropped
+        """
+        cutoff = month_start(now or datetime.now(timezone.utc), -retention_months)
+        dropped = []
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": PARTITION_LOCK_ID})
+            try:
+                for partition in await self.list_partitions(conn):
+                    if partition.end > cutoff:
+                        continue
+                    mode = "FINALIZE" if partition.detach_pending else "CONCURRENTLY"
+                    await conn.execute(text(f"ALTER TABLE activity_logs DETACH PARTITION {partition.name} {mode}"))
+                    await conn.execute(text(f"DROP TABLE {partition.name}"))
+                    dropped.append(partition.name)
+            finally:
+                await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": PARTITION_LOCK_ID})
+        return dropped
+
+
+# Singleton instance
+activity_log_service = ActivityLogService()
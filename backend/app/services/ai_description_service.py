@@ -1,22 +1,98 @@
-"""AI description generation service using OpenAI."""
-from typing import Optional
+"""AI description generation service using OpenAI.
 
+Calls to OpenAI go through ``call_with_retries``: rate limits (429),
+server errors, timeouts and dropped connections are retried with jittered
+backoff, honouring the Retry-After OpenAI sends; other errors (bad
+request, bad key) are not. A circuit breaker fails calls fast while
+OpenAI is down, and every call has a deadline (OPENAI_DEADLINE_SECONDS)
+covering its retries. The SDK's own retries are turned off so that these
+are the only ones.
+
+Point OPENAI_BASE_URL at ``tools/fake_openai.py`` to exercise all of this
+without the real API.
+"""
+import time
+from typing import Optional, Tuple
+
+import openai
 from openai import AsyncOpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.models.project_venue import ProjectVenue
 from app.models.venue import Venue
+from app.services.metrics import record_ai_usage
+from app.services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    DeadlineExceeded,
+    RetryPolicy,
+    call_with_retries,
+)
+
+
+def _retry_after(response) -> Optional[float]:
+    """Seconds to wait according to a response's retry-after(-ms) headers."""
+    if response is None:
+        return None
+    headers = response.headers
+    for name, scale in (("retry-after-ms", 1000), ("retry-after", 1)):
+        try:
+            return float(headers[name]) / scale
+        except (KeyError, ValueError):
+            continue
+    return None
+
+
+def classify_openai_error(exc: BaseException) -> Tuple[bool, Optional[float]]:
+    """Whether an OpenAI failure is worth retrying, and the Retry-After it gave.
+
+    Rate limits, 408/409 and 5xx responses, timeouts and connection errors
+    are transient; other API errors (400, 401, 403, 404, 422) are not.
+    """
+    if isinstance(exc, openai.APIStatusError):
+        retryable = exc.status_code in (408, 409, 429) or exc.status_code >= 500
+        return retryable, _retry_after(exc.response)
+    if isinstance(exc, openai.APIConnectionError):
+        # Includes APITimeoutError
+        return True, None
+    return False, None
 
 
 class AIDescriptionService:
     """Generate venue descriptions using OpenAI GPT-4."""
     
+    MODEL = "gpt-4o-mini"  # Cost-effective model for testing
+    
     def __init__(self):
-        """Initialize OpenAI client."""
+        """Initialize OpenAI settings, retry policy and circuit breaker."""
         self.api_key = settings.OPENAI_API_KEY
         if not self.api_key:
             print("Warning: OPENAI_API_KEY not set. AI generation will fail.")
+        self.retry_policy = RetryPolicy(
+            max_attempts=settings.OPENAI_MAX_ATTEMPTS,
+            base_delay=settings.OPENAI_RETRY_BASE_SECONDS,
+            max_delay=settings.OPENAI_RETRY_MAX_SECONDS,
+            attempt_timeout=settings.OPENAI_TIMEOUT_SECONDS,
+        )
+        self.breaker = CircuitBreaker(
+            "openai",
+            failure_threshold=settings.OPENAI_BREAKER_FAILURES,
+            reset_timeout=settings.OPENAI_BREAKER_RESET_SECONDS,
+        )
+        self._client: Optional[AsyncOpenAI] = None
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """OpenAI client, shared so its connections are reused."""
+        if self._client is None:
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=settings.OPENAI_BASE_URL or None,
+                max_retries=0,
+            )
+        return self._client
     
     async def generate_description(
         self,
@@ -33,6 +109,8 @@ class AIDescriptionService:
             Generated description text
             
         Raises:
+            CircuitOpenError: If OpenAI is failing and calls are refused for now
+            DeadlineExceeded: If no attempt succeeded within OPENAI_DEADLINE_SECONDS
             Exception: If OpenAI API call fails
         """
         if not self.api_key:
@@ -45,25 +123,43 @@ class AIDescriptionService:
         
         prompt = self._build_prompt(venue, project, context)
         
+        messages = [
+            {
+                "role": "system",
+                "content": "You are a professional event planner writing compelling venue descriptions for client proposals. Write in a professional yet engaging tone."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+        
+        async def attempt(timeout: float):
+            started = time.perf_counter()
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.MODEL,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=600,
+                    presence_penalty=0.1,
+                    frequency_penalty=0.1,
+                    timeout=timeout,
+                )
+            except Exception:
+                record_ai_usage(self.MODEL, None, time.perf_counter() - started, outcome="error")
+                raise
+            record_ai_usage(self.MODEL, response.usage, time.perf_counter() - started)
+            return response
+        
         # Call OpenAI API
         try:
-            client = AsyncOpenAI(api_key=self.api_key)
-            response = await client.chat.completions.create(
-                model="gpt-4o-mini",  # Cost-effective model for testing
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional event planner writing compelling venue descriptions for client proposals. Write in a professional yet engaging tone."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=600,
-                presence_penalty=0.1,
-                frequency_penalty=0.1
+            response = await call_with_retries(
+                attempt,
+                classify_openai_error,
+                self.retry_policy,
+                breaker=self.breaker,
+                deadline=Deadline(settings.OPENAI_DEADLINE_SECONDS),
             )
             
             description = response.choices[0].message.content.strip()
@@ -75,6 +171,9 @@ class AIDescriptionService:
             
             return description
             
+        except (CircuitOpenError, DeadlineExceeded):
+            await db.rollback()
+            raise
         except Exception as e:
             await db.rollback()
             raise Exception(f"OpenAI API error: {str(e)}")
@@ -1,6 +1,7 @@
 """CSV processing service for venue uploads."""
 import csv
 import io
+import time
 from typing import List, Tuple
 
 from fastapi import UploadFile
@@ -8,6 +9,7 @@ from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.venue import VenueCSVRow, VenueResponse, VenueUploadError, VenueUploadResult
+from app.services.metrics import CSV_IMPORT_DURATION, CSV_IMPORT_ROWS
 from app.services.venue_service import venue_service
 
 
@@ -25,6 +27,8 @@ class CSVService:
         "contact_phone",
         "website",
         "address",
+        "latitude",
+        "longitude",
         "description_template",
         "notes",
     ]
@@ -47,9 +51,23 @@ class CSVService:
         Raises:
             ValueError: If file is invalid or too large
         """
-        # Read file content
-        content = await file.read()
+        return await self.import_venue_csv(db, await file.read())
+    
+    def validate_venue_csv(self, content: bytes) -> str:
+        """Check size, encoding and headers of a venue CSV.
+        
+        Run before queueing a background import, so a bad file is
+        rejected in the request rather than in the task.
         
+        Args:
+            content: Raw CSV file content
+            
+        Returns:
+            Decoded CSV text
+            
+        Raises:
+            ValueError: If file is invalid or too large
+        """
         # Check file size
         if len(content) > self.MAX_FILE_SIZE:
             raise ValueError(f"File too large. Maximum size is {self.MAX_FILE_SIZE / 1024 / 1024}MB")
@@ -60,14 +78,35 @@ class CSVService:
         except UnicodeDecodeError:
             raise ValueError("File must be UTF-8 encoded")
         
-        # Parse CSV
-        csv_reader = csv.DictReader(io.StringIO(text_content))
-        
         # Validate headers
-        if not csv_reader.fieldnames:
+        fieldnames = csv.DictReader(io.StringIO(text_content)).fieldnames
+        if not fieldnames:
             raise ValueError("CSV file is empty or has no headers")
         
-        self._validate_headers(csv_reader.fieldnames)
+        self._validate_headers(fieldnames)
+        return text_content
+    
+    async def import_venue_csv(
+        self,
+        db: AsyncSession,
+        content: bytes,
+    ) -> VenueUploadResult:
+        """Create venues from CSV file content.
+        
+        Args:
+            db: Database session
+            content: Raw CSV file content
+            
+        Returns:
+            VenueUploadResult with success/error details
+            
+        Raises:
+            ValueError: If file is invalid or too large
+        """
+        started = time.perf_counter()
+        
+        text_content = self.validate_venue_csv(content)
+        csv_reader = csv.DictReader(io.StringIO(text_content))
         
         # Process rows
         created_venues: List[VenueResponse] = []
@@ -128,6 +167,10 @@ class CSVService:
         successful = len(created_venues)
         failed = len(errors)
         
+        CSV_IMPORT_ROWS.labels(result="created").inc(successful)
+        CSV_IMPORT_ROWS.labels(result="failed").inc(failed)
+        CSV_IMPORT_DURATION.observe(time.perf_counter() - started)
+        
         return VenueUploadResult(
             total_rows=total_rows,
             successful=successful,
@@ -186,6 +229,8 @@ class CSVService:
             "contact_phone": "+32 2 123 4567",
             "website": "https://www.example-venue.com",
             "address": "123 Example Street, 1000 Brussels, Belgium",
+            "latitude": "50.8467",
+            "longitude": "4.3525",
             "description_template": "A modern venue in the heart of Brussels, perfect for corporate events.",
             "notes": "Free parking available. Wheelchair accessible.",
         }
@@ -0,0 +1,125 @@
+"""Weak ETags for conditional GETs.
+
+A resource's version is the newest ``updated_at`` of every row its
+response is built from, plus the row counts (so deleting a child, which
+leaves no newer timestamp behind, still changes the version). It is read
+with one aggregate query over indexed foreign keys, which is much cheaper
+than loading and serializing the resource, so an unchanged resource costs
+a single lookup and an empty 304.
+
+The version is read before the resource is loaded: if a write lands in
+between, the client gets new content under the old tag and simply
+refetches on its next request, never a 304 for content it has not seen.
+"""
+import hashlib
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.photo import Photo
+from app.models.project import Project
+from app.models.project_venue import ProjectVenue
+from app.models.venue import Venue
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a weak ETag from version parts.
+
+    Args:
+        *parts: Timestamps, counts and variant strings identifying the
+            representation
+
+    Returns:
+        Header value such as ``W/"3f2a..."``
+    """
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison).
+
+    Args:
+        if_none_match: Header value, possibly a comma-separated list or ``*``
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's cached copy is current
+    """
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+class ETagService:
+    """Version lookups for the resources the frontend polls."""
+
+    async def venue_etag(self, db: AsyncSession, venue_id: UUID, variant: str = "") -> Optional[str]:
+        """ETag of a venue and its photos.
+
+        Args:
+            db: Database session
+            venue_id: Venue UUID
+            variant: Anything else the representation depends on (query string)
+
+        Returns:
+            ETag, or None if the venue does not exist or is deleted
+        """
+        photos = select(Photo).where(Photo.venue_id == venue_id)
+        result = await db.execute(
+            select(
+                Venue.updated_at,
+                photos.with_only_columns(func.max(Photo.updated_at)).scalar_subquery(),
+                photos.with_only_columns(func.count()).scalar_subquery(),
+            ).where(Venue.id == venue_id, Venue.is_deleted == False)  # noqa: E712
+        )
+        row = result.first()
+        return None if row is None else make_etag("venue", venue_id, *row, variant)
+
+    async def project_etag(
+        self,
+        db: AsyncSession,
+        project_id: UUID,
+        user_id: Optional[UUID] = None,
+        variant: str = "",
+    ) -> Optional[str]:
+        """ETag of a project with its shortlist, venues and their photos.
+
+        Used for both the project and its venue list; the variant keeps
+        the two (and different ``fields=`` selections) apart.
+
+        Args:
+            db: Database session
+            project_id: Project UUID
+            user_id: Optional user ID to check ownership
+            variant: Anything else the representation depends on (path, query string)
+
+        Returns:
+            ETag, or None if the project does not exist or is not owned by user_id
+        """
+        shortlist = select(ProjectVenue).where(ProjectVenue.project_id == project_id)
+        photos = shortlist.join(Photo, Photo.venue_id == ProjectVenue.venue_id)
+        venues = shortlist.join(Venue, Venue.id == ProjectVenue.venue_id)
+        query = select(
+            Project.updated_at,
+            shortlist.with_only_columns(func.max(ProjectVenue.updated_at)).scalar_subquery(),
+            shortlist.with_only_columns(func.count()).scalar_subquery(),
+            venues.with_only_columns(func.max(Venue.updated_at)).scalar_subquery(),
+            photos.with_only_columns(func.max(Photo.updated_at)).scalar_subquery(),
+            photos.with_only_columns(func.count()).scalar_subquery(),
+        ).where(Project.id == project_id)
+        if user_id:
+            query = query.where(Project.user_id == user_id)
+        row = (await db.execute(query)).first()
+        return None if row is None else make_etag("project", project_id, *row, variant)
+
+
+# Singleton instance
+etag_service = ETagService()
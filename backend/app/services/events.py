@@ -0,0 +1,279 @@
+"""Per-project event channels for realtime updates.
+
+Changes to a project's shortlist, generated descriptions and finished
+background tasks are published as events on the project's channel, and
+streamed to clients over Server-Sent Events (``GET
+/projects/{id}/events``), so the frontend no longer has to poll the
+shortlist to notice them.
+
+- Publishing delivers to this process's subscribers at once, and hands
+  the event to the broker for the other processes.
+- The broker is pluggable (EVENTS_BROKER). ``memory`` keeps events in the
+  process, which is enough for a single worker. ``postgres`` relays them
+  through LISTEN/NOTIFY on the existing database, so subscribers on any
+  worker see events published on any other.
+- Each subscriber has a bounded queue. A subscriber that falls behind
+  loses its queued events and gets one ``resync`` event instead, telling
+  the client to re-fetch; the same happens to everyone when the broker
+  loses its connection. Events are not stored, so a client that
+  reconnects should re-fetch too.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Optional, Set
+from uuid import UUID, uuid4
+
+from app.config import settings
+from app.services.metrics import EVENTS_PUBLISHED, EVENTS_SUBSCRIBERS
+
+logger = logging.getLogger(__name__)
+
+RESYNC = "resync"
+
+
+def make_event(project_id: UUID, event_type: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build an event (JSON-serializable)."""
+    return {
+        "id": str(uuid4()),
+        "type": event_type,
+        "project_id": str(project_id),
+        "data": data or {},
+        "at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """An event as a Server-Sent Events message."""
+    data = json.dumps(event, separators=(",", ":"))
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+class Subscription:
+    """One client's view of a project channel."""
+
+    def __init__(self, project_id: UUID, queue_size: int):
+        self.project_id = project_id
+        self.queue_size = queue_size
+        self._events: list = []
+        self._wakeup = asyncio.Event()
+
+    def put(self, event: Dict[str, Any]) -> None:
+        if len(self._events) >= self.queue_size:
+            # Too far behind: what's queued is no use, the client must re-fetch
+            self._events = [make_event(self.project_id, RESYNC, {"reason": "overflow"})]
+            EVENTS_PUBLISHED.labels(result="overflow").inc()
+        else:
+            self._events.append(event)
+        self._wakeup.set()
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next event, or None if none arrived within ``timeout`` seconds."""
+        if not self._events:
+            # Timer plus event rather than wait_for, so that the stream
+            # being cancelled (client gone) can never be swallowed here
+            timer = asyncio.get_running_loop().call_later(timeout, self._wakeup.set)
+            try:
+                await self._wakeup.wait()
+            finally:
+                timer.cancel()
+        self._wakeup.clear()
+        return self._events.pop(0) if self._events else None
+
+
+class MemoryBroker:
+    """Broker for a single process: nothing to relay."""
+
+    async def start(self, bus: "EventBus") -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def publish(self, message: str) -> None:
+        pass
+
+
+class PostgresBroker:
+    """Relay events between processes through Postgres LISTEN/NOTIFY.
+
+    One dedicated connection per process listens on the channel and sends
+    the NOTIFYs queued by ``publish``. If it drops, subscribers are told
+    to resync and the broker reconnects.
+    """
+
+    CHANNEL = "project_events"
+    # NOTIFY payloads are limited to 8000 bytes
+    MAX_PAYLOAD = 7900
+    # Unsent events kept while disconnected
+    MAX_OUTBOX = 10_000
+
+    def __init__(self, dsn: str, reconnect_delay: float = 2.0):
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self._bus: Optional["EventBus"] = None
+        self._outbox: list = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def start(self, bus: "EventBus") -> None:
+        self._bus = bus
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="event-broker")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    def publish(self, message: str) -> None:
+        if self._task is None:
+            return
+        if len(message.encode()) > self.MAX_PAYLOAD:
+            # Too big to relay: have the other processes' subscribers re-fetch
+            event = json.loads(message)["event"]
+            message = self._bus.encode(make_event(event["project_id"], RESYNC, {"reason": event["type"]}))
+        if len(self._outbox) < self.MAX_OUTBOX:
+            self._outbox.append(message)
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        import asyncpg
+
+        while not self._stopping:
+            lost = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except Exception:
+                logger.exception("Event broker could not connect; retrying in %.0fs", self.reconnect_delay)
+                await self._sleep(self.reconnect_delay)
+                continue
+            try:
+                connection.add_termination_listener(lambda _: (lost.set(), self._wakeup.set()))
+                await connection.add_listener(self.CHANNEL, self._on_notify)
+                logger.info("Event broker listening on %s", self.CHANNEL)
+                while not self._stopping and not lost.is_set():
+                    await self._wakeup.wait()
+                    self._wakeup.clear()
+                    while self._outbox and not lost.is_set():
+                        messages, self._outbox = self._outbox, []
+                        await connection.executemany(
+                            "SELECT pg_notify($1, $2)", [(self.CHANNEL, message) for message in messages]
+                        )
+            except Exception:
+                logger.exception("Event broker connection failed")
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
+            if not self._stopping:
+                logger.warning("Event broker connection lost; reconnecting")
+                # Events may have been missed meanwhile
+                self._bus.resync_all("broker reconnected")
+                await self._sleep(self.reconnect_delay)
+
+    async def _sleep(self, seconds: float) -> None:
+        timer = asyncio.get_running_loop().call_later(seconds, self._wakeup.set)
+        await self._wakeup.wait()
+        timer.cancel()
+        self._wakeup.clear()
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        self._bus.receive(payload)
+
+
+class EventBus:
+    """Publish project events and subscribe to a project's channel."""
+
+    def __init__(self, broker=None, queue_size: int = 100):
+        self.broker = broker or MemoryBroker()
+        self.queue_size = queue_size
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    async def start(self) -> None:
+        """Connect the broker (on application startup)."""
+        await self.broker.start(self)
+
+    async def stop(self) -> None:
+        await self.broker.stop()
+
+    def publish(self, project_id: UUID, event_type: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """Publish an event on a project's channel.
+
+        Never blocks: local subscribers get it at once, other processes
+        through the broker.
+
+        Args:
+            project_id: Project whose channel gets the event
+            event_type: Event name, e.g. ``project_venue.updated``
+            data: JSON-serializable payload
+        """
+        event = make_event(project_id, event_type, data)
+        self._deliver(event)
+        self.broker.publish(self.encode(event))
+        EVENTS_PUBLISHED.labels(result="published").inc()
+
+    @asynccontextmanager
+    async def subscribe(self, project_id: UUID) -> AsyncIterator[Subscription]:
+        """Subscribe to a project's channel for the duration of the block."""
+        key = str(project_id)
+        subscription = Subscription(project_id, self.queue_size)
+        self._subscribers.setdefault(key, set()).add(subscription)
+        EVENTS_SUBSCRIBERS.inc()
+        try:
+            yield subscription
+        finally:
+            EVENTS_SUBSCRIBERS.dec()
+            subscribers = self._subscribers.get(key)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[key]
+
+    def encode(self, event: Dict[str, Any]) -> str:
+        return json.dumps({"origin": self.origin, "event": event}, separators=(",", ":"))
+
+    def receive(self, message: str) -> None:
+        """Deliver an event relayed by the broker."""
+        try:
+            envelope = json.loads(message)
+        except ValueError:
+            logger.warning("Ignoring malformed event message")
+            return
+        if envelope.get("origin") != self.origin:
+            self._deliver(envelope["event"])
+
+    def resync_all(self, reason: str) -> None:
+        """Tell every local subscriber to re-fetch."""
+        for key, subscribers in list(self._subscribers.items()):
+            event = make_event(UUID(key), RESYNC, {"reason": reason})
+            for subscription in list(subscribers):
+                subscription.put(event)
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        for subscription in list(self._subscribers.get(event["project_id"], ())):
+            subscription.put(event)
+
+
+def _build_broker():
+    if settings.EVENTS_BROKER == "postgres":
+        from sqlalchemy.engine import make_url
+
+        url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+        return PostgresBroker(url.render_as_string(hide_password=False))
+    if settings.EVENTS_BROKER != "memory":
+        raise ValueError(f"Unknown EVENTS_BROKER '{settings.EVENTS_BROKER}' (memory or postgres)")
+    return MemoryBroker()
+
+
+# Singleton instance
+event_bus = EventBus(broker=_build_broker(), queue_size=settings.EVENTS_QUEUE_SIZE)
@@ -0,0 +1,160 @@
+"""Interned label dictionaries and bitset indexes for venue facilities and event types."""
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+def normalize_label(label: str) -> str:
+    """Normalise a city/facility label for matching (trim + casefold)."""
+    return " ".join(label.split()).casefold()
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Count set bits per row of a 2-D uint64 bitset array."""
+    if words.size == 0:
+        return np.zeros(words.shape[0], dtype=np.int64)
+    return np.unpackbits(words.view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+
+def pack_bitsets(label_ids: List[List[int]], n_labels: int) -> np.ndarray:
+    """Pack per-row lists of label ids into a 2-D uint64 bitset array.
+
+    Args:
+        label_ids: For each row, the ids of the labels it carries
+        n_labels: Size of the label dictionary
+
+    Returns:
+        Array of shape (rows, words) with bit ``id`` set for each label
+    """
+    n_words = max(1, (n_labels + 63) // 64)
+    bits = np.zeros((len(label_ids), n_words), dtype=np.uint64)
+    lengths = np.fromiter((len(ids) for ids in label_ids), dtype=np.int64, count=len(label_ids))
+    if lengths.sum() == 0:
+        return bits
+
+    rows = np.repeat(np.arange(len(label_ids)), lengths)
+    ids = np.fromiter((i for row in label_ids for i in row), dtype=np.int64, count=int(lengths.sum()))
+    masks = np.left_shift(np.uint64(1), (ids % 64).astype(np.uint64))
+    np.bitwise_or.at(bits, (rows, ids // 64), masks)
+    return bits
+
+
+class LabelDictionary:
+    """Interns string labels to dense integer ids."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.labels: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def intern(self, label: str) -> int:
+        """Return the id for a label, assigning a new one if unseen."""
+        key = normalize_label(label)
+        label_id = self.ids.get(key)
+        if label_id is None:
+            label_id = len(self.labels)
+            self.ids[key] = label_id
+            self.labels.append(label)
+        return label_id
+
+    def get(self, label: str) -> Optional[int]:
+        """Return the id for a label, or None if it was never interned."""
+        return self.ids.get(normalize_label(label))
+
+
+class LabelBitsetIndex:
+    """A label dictionary plus one bitset row per venue.
+
+    Bit ``i`` of a row is set when the venue carries label ``i``. "Has all
+    of these facilities" becomes a bitwise AND against a query mask, and
+    facet counts are per-bit popcounts over the matching rows.
+    """
+
+    def __init__(self):
+        self.dictionary = LabelDictionary()
+        self.bits = np.zeros((0, 1), dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.dictionary)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.bits.nbytes)
+
+    def intern_all(self, labels: Optional[Iterable[str]]) -> List[int]:
+        """Intern a row's labels and return their ids."""
+        return [self.dictionary.intern(label) for label in labels or []]
+
+    def build(self, label_ids: List[List[int]]) -> None:
+        """Replace all rows with freshly packed bitsets."""
+        self.bits = pack_bitsets(label_ids, len(self.dictionary))
+
+    def _widen(self) -> None:
+        """Grow the bitset array when the dictionary outgrows it."""
+        needed = max(1, (len(self.dictionary) + 63) // 64)
+        current = self.bits.shape[1]
+        if needed > current:
+            padding = np.zeros((self.bits.shape[0], needed - current), dtype=np.uint64)
+            self.bits = np.hstack([self.bits, padding])
+
+    def set_rows(self, rows: List[int], label_ids: List[List[int]]) -> None:
+        """Overwrite existing rows."""
+        self._widen()
+        if rows:
+            self.bits[rows] = pack_bitsets(label_ids, len(self.dictionary))
+
+    def append_rows(self, label_ids: List[List[int]]) -> None:
+        """Add rows at the end."""
+        self._widen()
+        if label_ids:
+            self.bits = np.vstack([self.bits, pack_bitsets(label_ids, len(self.dictionary))])
+
+    def encode(self, labels: Iterable[str]) -> np.ndarray:
+        """Encode labels as a single bitset row (unknown labels are ignored).
+
+        Args:
+            labels: Labels to encode
+
+        Returns:
+            uint64 array with the same width as the index rows
+        """
+        ids = [self.dictionary.get(label) for label in labels]
+        words = pack_bitsets([[i for i in ids if i is not None]], len(self.dictionary))
+        return words[0, :self.bits.shape[1]]
+
+    def contains_all(self, labels: List[str]) -> np.ndarray:
+        """Boolean mask of rows carrying every one of the labels.
+
+        A label that no venue has ever carried matches nothing.
+        """
+        if any(self.dictionary.get(label) is None for label in labels):
+            return np.zeros(self.bits.shape[0], dtype=bool)
+        wanted = self.encode(labels)
+        return ((self.bits & wanted) == wanted).all(axis=1)
+
+    def counts(self, mask: np.ndarray) -> Dict[str, int]:
+        """Count rows per label among the rows selected by mask.
+
+        Unpacks the selected bitsets once and sums each bit column, so the
+        cost is one pass over the matching rows regardless of how many
+        labels there are.
+
+        Args:
+            mask: Boolean row mask
+
+        Returns:
+            Label -> count for labels with at least one match, most common first
+        """
+        selected = self.bits[mask]
+        if selected.shape[0] == 0:
+            return {}
+
+        as_bytes = selected.astype("<u8", copy=False).view(np.uint8)
+        per_bit = np.unpackbits(as_bytes, axis=1, bitorder="little").sum(axis=0, dtype=np.int64)
+        per_label = per_bit[:len(self.dictionary)]
+
+        present = np.flatnonzero(per_label)
+        ordered = present[np.argsort(-per_label[present], kind="stable")]
+        return {self.dictionary.labels[i]: int(per_label[i]) for i in ordered}
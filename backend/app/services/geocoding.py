@@ -0,0 +1,228 @@
+"""Offline geocoding against a local gazetteer file."""
+import asyncio
+import csv
+import math
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.services.facility_index import normalize_label
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Column positions in a GeoNames dump (cities500.txt, cities15000.txt, ...)
+_GEONAMES_NAME = 1
+_GEONAMES_ASCII_NAME = 2
+_GEONAMES_ALTERNATE_NAMES = 3
+_GEONAMES_LATITUDE = 4
+_GEONAMES_LONGITUDE = 5
+_GEONAMES_POPULATION = 14
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def parse_point(value: str) -> Tuple[float, float]:
+    """Parse a ``"lat,lng"`` string.
+
+    Raises:
+        ValueError: If the value is not two numbers or is out of range
+    """
+    parts = value.split(",")
+    if len(parts) != 2:
+        raise ValueError("Expected 'lat,lng'")
+    lat, lng = float(parts[0]), float(parts[1])
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+        raise ValueError("Latitude must be within ±90 and longitude within ±180")
+    return lat, lng
+
+
+class Gazetteer:
+    """Place name -> coordinates lookup loaded from a local file.
+
+    Two formats are accepted:
+
+    - a GeoNames dump (tab-separated, ``.txt``/``.tsv``); name, ASCII name
+      and alternate names are all indexed, and when several places share a
+      name the most populous one wins
+    - a CSV with ``name,latitude,longitude`` headers (extra columns are
+      ignored)
+
+    Resolution is at place level (city centroid), which is what the venue
+    data supports: ``city`` is always set, ``address`` is free text.
+    """
+
+    # Longest place name (in words) tried when scanning an address
+    MAX_NAME_WORDS = 4
+
+    def __init__(self):
+        self.places: Dict[str, Tuple[float, float]] = {}
+        self._population: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def add(self, name: str, latitude: float, longitude: float, population: int = 0) -> None:
+        """Add a place, keeping the more populous entry on name clashes."""
+        key = normalize_label(name)
+        if not key:
+            return
+        if key in self.places and self._population.get(key, 0) >= population:
+            return
+        self.places[key] = (latitude, longitude)
+        self._population[key] = population
+
+    @classmethod
+    def from_file(cls, path: str) -> "Gazetteer":
+        """Load a gazetteer from a GeoNames dump or a simple CSV.
+
+        Args:
+            path: Path to the gazetteer file
+
+        Returns:
+            Loaded gazetteer
+        """
+        gazetteer = cls()
+        file_path = Path(path)
+
+        with file_path.open(encoding="utf-8", newline="") as handle:
+            if file_path.suffix.lower() == ".csv":
+                for row in csv.DictReader(handle):
+                    gazetteer.add(row["name"], float(row["latitude"]), float(row["longitude"]))
+            else:
+                for row in csv.reader(handle, delimiter="\t", quoting=csv.QUOTE_NONE):
+                    if len(row) <= _GEONAMES_POPULATION:
+                        continue
+                    lat = float(row[_GEONAMES_LATITUDE])
+                    lng = float(row[_GEONAMES_LONGITUDE])
+                    population = int(row[_GEONAMES_POPULATION] or 0)
+                    names = [row[_GEONAMES_NAME], row[_GEONAMES_ASCII_NAME]]
+                    names.extend(row[_GEONAMES_ALTERNATE_NAMES].split(","))
+                    for name in names:
+                        gazetteer.add(name, lat, lng, population)
+
+        gazetteer._population.clear()
+        return gazetteer
+
+    def lookup(self, name: Optional[str]) -> Optional[Tuple[float, float]]:
+        """Exact (normalised) place name lookup."""
+        if not name:
+            return None
+        return self.places.get(normalize_label(name))
+
+    def search_text(self, text: Optional[str]) -> Optional[Tuple[float, float]]:
+        """Find a known place name inside free text such as an address.
+
+        Handles values like "Rue Neuve 1, 1000 Brussels, Belgium", "12 Rue
+        de Paris, Lyon" or "near central Ghent". The comma-separated parts
+        are tried whole first (ignoring house numbers and postcodes), so a
+        place name inside a street name ("Rue de Paris") does not win over
+        the city part. Only then is each part scanned for the longest place
+        name it contains, last part first.
+        """
+        if not text:
+            return None
+        parts = [normalize_label(part).split() for part in text.split(",")]
+        parts = [words for words in parts if words]
+
+        for words in parts:
+            name = " ".join(word for word in words if not any(c.isdigit() for c in word))
+            point = self.places.get(name)
+            if point is not None:
+                return point
+
+        for words in reversed(parts):
+            point = self._scan(words)
+            if point is not None:
+                return point
+        return None
+
+    def _scan(self, words: List[str]) -> Optional[Tuple[float, float]]:
+        """The longest known place name among the word runs, leftmost first."""
+        for size in range(min(self.MAX_NAME_WORDS, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                point = self.places.get(" ".join(words[start:start + size]))
+                if point is not None:
+                    return point
+        return None
+
+    def geocode(self, city: Optional[str], address: Optional[str] = None) -> Optional[Tuple[float, float]]:
+        """Resolve a venue's city (or, failing that, its address) to coordinates.
+
+        Args:
+            city: Venue city
+            address: Free-text address
+
+        Returns:
+            (latitude, longitude) or None if nothing matched
+        """
+        return self.lookup(city) or self.search_text(city) or self.search_text(address)
+
+
+class GeocodingService:
+    """Holds the configured gazetteer (loaded at startup) and geocodes venues."""
+
+    def __init__(self):
+        self._gazetteer: Optional[Gazetteer] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.GAZETTEER_PATH)
+
+    async def load(self) -> None:
+        """Load the gazetteer named by GAZETTEER_PATH, if any.
+
+        Parsing a GeoNames dump takes seconds, so it runs in a worker
+        thread rather than on the event loop.
+        """
+        if self.enabled and self._gazetteer is None:
+            self._gazetteer = await asyncio.to_thread(Gazetteer.from_file, settings.GAZETTEER_PATH)
+
+    @property
+    def gazetteer(self) -> Optional[Gazetteer]:
+        """The loaded gazetteer, or None before ``load`` or when GAZETTEER_PATH is not set."""
+        return self._gazetteer
+
+    def geocode(self, city: Optional[str], address: Optional[str] = None) -> Optional[Tuple[float, float]]:
+        """Geocode a city/address pair, or return None when disabled or unmatched."""
+        gazetteer = self.gazetteer
+        if gazetteer is None:
+            return None
+        return gazetteer.geocode(city, address)
+
+    def geocode_many(
+        self,
+        rows: Iterable[Tuple[object, Optional[str], Optional[str]]],
+    ) -> Dict[object, Tuple[float, float]]:
+        """Geocode (key, city, address) rows, caching repeated cities.
+
+        Args:
+            rows: Iterable of (key, city, address)
+
+        Returns:
+            Mapping of key -> (latitude, longitude) for rows that matched
+        """
+        gazetteer = self.gazetteer
+        if gazetteer is None:
+            return {}
+
+        by_city: Dict[str, Optional[Tuple[float, float]]] = {}
+        points: Dict[object, Tuple[float, float]] = {}
+        for key, city, address in rows:
+            city_key = normalize_label(city or "")
+            if city_key not in by_city:
+                by_city[city_key] = gazetteer.lookup(city) or gazetteer.search_text(city)
+            point = by_city[city_key] or gazetteer.search_text(address)
+            if point is not None:
+                points[key] = point
+        return points
+
+
+# Singleton instance
+geocoding_service = GeocodingService()
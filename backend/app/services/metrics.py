@@ -0,0 +1,236 @@
+"""Prometheus metrics for HTTP, the DB pool, PDF/AI/CSV work, activity logs, tasks, events, rate limits and upstream calls.
+
+Metrics are process-local. When ``PROMETHEUS_MULTIPROC_DIR`` is set (it must
+be an empty, writable directory shared by all workers, set before the
+workers start) prometheus_client writes them to per-process files and
+``/metrics`` aggregates every worker's values, so multi-worker
+uvicorn/gunicorn deployments report one consistent set of series.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# HTTP
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+# Database connections
+DB_CONNECTIONS_OPENED = Counter(
+    "db_connections_opened_total",
+    "New DBAPI connections opened by the engine",
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the engine pool",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the engine pool",
+    multiprocess_mode="livesum",
+)
+
+# PDF proposals
+PDF_RENDER_DURATION = Histogram(
+    "pdf_render_duration_seconds",
+    "Proposal rendering time by stage (html, pdf)",
+    ["stage"],
+    buckets=SLOW_BUCKETS,
+)
+PDF_RENDERS_IN_PROGRESS = Gauge(
+    "pdf_renders_in_progress",
+    "Proposal PDFs being rendered or waiting to render",
+    multiprocess_mode="livesum",
+)
+
+# AI
+AI_REQUEST_DURATION = Histogram(
+    "ai_request_duration_seconds",
+    "Latency of calls to the AI provider",
+    ["model", "outcome"],
+    buckets=SLOW_BUCKETS,
+)
+AI_TOKENS = Counter(
+    "ai_tokens_total",
+    "Tokens used by AI calls; kind is prompt, completion or cached_prompt. "
+    "Prompt cache hit rate = cached_prompt / prompt.",
+    ["model", "kind"],
+)
+UPSTREAM_CALLS = Counter(
+    "upstream_calls_total",
+    "Guarded upstream calls (e.g. openai) by result: succeeded, retried, failed, deadline, rejected (circuit open)",
+    ["name", "result"],
+)
+CIRCUIT_BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "Upstream circuit breaker state: 0 closed, 1 half-open, 2 open (highest across workers)",
+    ["name"],
+    multiprocess_mode="max",
+)
+
+# CSV imports
+CSV_IMPORT_ROWS = Counter(
+    "csv_import_rows_total",
+    "Venue CSV rows processed by result (created, failed)",
+    ["result"],
+)
+CSV_IMPORT_DURATION = Histogram(
+    "csv_import_duration_seconds",
+    "Wall time of venue CSV imports",
+    buckets=SLOW_BUCKETS,
+)
+
+# Activity log
+ACTIVITY_LOG_EVENTS = Counter(
+    "activity_log_events_total",
+    "Activity log events by result (written, dropped, failed)",
+    ["result"],
+)
+ACTIVITY_LOG_BATCH_SIZE = Histogram(
+    "activity_log_batch_size",
+    "Activity log events written per INSERT",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+# Background tasks
+TASKS_FINISHED = Counter(
+    "tasks_finished_total",
+    "Background task attempts by kind and result (succeeded, retried, failed, cancelled, requeued)",
+    ["kind", "result"],
+)
+TASK_DURATION = Histogram(
+    "task_duration_seconds",
+    "Wall time of background task attempts",
+    ["kind"],
+    buckets=SLOW_BUCKETS,
+)
+TASKS_IN_PROGRESS = Gauge(
+    "tasks_in_progress",
+    "Background tasks running in this process",
+    ["kind"],
+    multiprocess_mode="livesum",
+)
+
+# Realtime project events
+EVENTS_PUBLISHED = Counter(
+    "project_events_total",
+    "Project events by result (published, overflow when a slow subscriber had to resync)",
+    ["result"],
+)
+EVENTS_SUBSCRIBERS = Gauge(
+    "project_event_subscribers",
+    "Open project event streams",
+    multiprocess_mode="livesum",
+)
+
+# Rate limits on expensive endpoints
+RATE_LIMIT_REQUESTS = Counter(
+    "rate_limited_requests_total",
+    "Requests to rate-limited endpoints by class and result (allowed, rejected_rate, rejected_concurrency)",
+    ["endpoint_class", "result"],
+)
+RATE_LIMIT_IN_FLIGHT = Gauge(
+    "rate_limited_requests_in_progress",
+    "Requests to rate-limited endpoints being handled",
+    ["endpoint_class"],
+    multiprocess_mode="livesum",
+)
+
+
+def _on_connect(dbapi_connection, connection_record):
+    DB_CONNECTIONS_OPENED.inc()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CHECKOUTS.inc()
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    DB_POOL_CHECKED_OUT.dec()
+
+
+def install_pool_metrics(engine: AsyncEngine) -> None:
+    """Track connection opens and pool checkouts on an async engine."""
+    pool = engine.sync_engine.pool
+    if not event.contains(pool, "connect", _on_connect):
+        event.listen(pool, "connect", _on_connect)
+        event.listen(pool, "checkout", _on_checkout)
+        event.listen(pool, "checkin", _on_checkin)
+
+
+@contextmanager
+def track_pdf_render(stage: str) -> Iterator[None]:
+    """Time one rendering stage of a proposal."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        PDF_RENDER_DURATION.labels(stage=stage).observe(time.perf_counter() - started)
+
+
+def record_ai_usage(model: str, usage, duration: float, outcome: str = "ok") -> None:
+    """Record latency and token usage of one AI call.
+
+    Args:
+        model: Model name
+        usage: The response's ``usage`` object (may be None)
+        duration: Call duration in seconds
+        outcome: "ok" or "error"
+    """
+    AI_REQUEST_DURATION.labels(model=model, outcome=outcome).observe(duration)
+    if usage is None:
+        return
+    AI_TOKENS.labels(model=model, kind="prompt").inc(usage.prompt_tokens or 0)
+    AI_TOKENS.labels(model=model, kind="completion").inc(usage.completion_tokens or 0)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else None
+    AI_TOKENS.labels(model=model, kind="cached_prompt").inc(cached or 0)
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Exposition-format payload for /metrics (aggregated across workers)."""
+    registry: Optional[CollectorRegistry] = REGISTRY
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the multiprocess aggregate on shutdown."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
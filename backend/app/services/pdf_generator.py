@@ -1,4 +1,5 @@
 """PDF and HTML proposal generator service."""
+import asyncio
 from pathlib import Path
 from typing import Optional
 from uuid import UUID
@@ -10,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.project import Project
 from app.models.project_venue import ProjectVenue
+from app.services.metrics import PDF_RENDERS_IN_PROGRESS, track_pdf_render
 
 
 class ProposalGenerator:
@@ -114,24 +116,28 @@ class ProposalGenerator:
                 "Install with: pip install weasyprint"
             )
         
-        # Generate HTML first
-        html_content = await self.generate_html_proposal(db, project)
-        
-        # Convert to PDF
-        html = HTML(string=html_content)
-        
-        # Add CSS if available
-        css = None
-        if self.base_css_path.exists():
-            css = CSS(string=self._load_base_css())
-        
-        pdf_buffer = io.BytesIO()
-        if css:
-            html.write_pdf(pdf_buffer, stylesheets=[css])
-        else:
-            html.write_pdf(pdf_buffer)
-        
-        return pdf_buffer.getvalue()
+        with PDF_RENDERS_IN_PROGRESS.track_inprogress():
+            # Generate HTML first
+            with track_pdf_render("html"):
+                html_content = await self.generate_html_proposal(db, project)
+            
+            with track_pdf_render("pdf"):
+                # Convert to PDF
+                html = HTML(string=html_content)
+                
+                # Add CSS if available
+                css = None
+                if self.base_css_path.exists():
+                    css = CSS(string=self._load_base_css())
+                
+                # Rendering is CPU-bound; keep it off the event loop
+                pdf_buffer = io.BytesIO()
+                if css:
+                    await asyncio.to_thread(html.write_pdf, pdf_buffer, stylesheets=[css])
+                else:
+                    await asyncio.to_thread(html.write_pdf, pdf_buffer)
+            
+            return pdf_buffer.getvalue()
 
 
 # Global instance
@@ -10,6 +10,7 @@ from app.models.project import Project, ProjectStatus
 from app.models.project_venue import ProjectVenue
 from app.models.venue import Venue
 from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.services.projection import Projection
 
 
 class ProjectService:
@@ -46,6 +47,29 @@ class ProjectService:
             
         return project
     
+    async def exists(
+        self,
+        db: AsyncSession,
+        project_id: UUID,
+        user_id: Optional[UUID] = None
+    ) -> bool:
+        """Check that a project exists (and is owned by user_id, if given).
+        
+        A cheap alternative to get_by_id when the venues are not needed.
+        
+        Args:
+            db: Database session
+            project_id: Project UUID
+            user_id: Optional user ID to check ownership
+            
+        Returns:
+            True if the project exists
+        """
+        query = select(Project.id).where(Project.id == project_id)
+        if user_id:
+            query = query.where(Project.user_id == user_id)
+        return await db.scalar(query) is not None
+    
     async def get_by_id_with_venues(
         self,
         db: AsyncSession,
@@ -75,6 +99,7 @@ class ProjectService:
         status: Optional[ProjectStatus] = None,
         page: int = 1,
         page_size: int = 20,
+        projection: Optional[Projection] = None,
     ) -> Tuple[List[Project], int]:
         """Get paginated list of user's projects with filtering.
         
@@ -84,6 +109,7 @@ class ProjectService:
             status: Filter by project status
             page: Page number (1-indexed)
             page_size: Number of items per page
+            projection: Only load the requested fields (all by default)
             
         Returns:
             Tuple of (projects list, total count)
@@ -104,14 +130,19 @@ class ProjectService:
         query = query.offset((page - 1) * page_size).limit(page_size)
         
         # Load project_venues, venues and photos eagerly
-        query = query.options(
-            selectinload(Project.project_venues)
-            .selectinload(ProjectVenue.venue)
-            .selectinload(Venue.photos)
-        )
+        if projection is not None:
+            query = query.options(*projection.options(Project))
+        else:
+            query = query.options(
+                selectinload(Project.project_venues)
+                .selectinload(ProjectVenue.venue)
+                .selectinload(Venue.photos)
+            )
         
         result = await db.execute(query)
         projects = list(result.scalars().all())
+        if projection is not None:
+            await projection.load_photos(db, projects)
         
         return projects, total
     
@@ -121,15 +152,16 @@ class ProjectService:
         project_data: ProjectCreate,
         user_id: UUID
     ) -> Project:
-        """Create a new project for a user."""
-        project = Project(**project_data.model_dump(), user_id=user_id)
+        """Create a new project for a user.
+        
+        A new project has no venues, so the collection starts out loaded
+        (empty) and the response needs no re-fetch; server-generated
+        columns come back with the INSERT (see TimestampMixin).
+        """
+        project = Project(**project_data.model_dump(), user_id=user_id, project_venues=[])
         db.add(project)
         await db.commit()
-        
-        # Refresh with eagle loading to avoid MissingGreenlet
-        # Instead of db.refresh which doesn't support options well in all async cases,
-        # we just re-fetch the object using our robust get_by_id method
-        return await self.get_by_id(db, project.id)
+        return project
     
     async def update(
         self,
@@ -139,6 +171,9 @@ class ProjectService:
     ) -> Project:
         """Update an existing project.
         
+        The relationships loaded with ``project`` (by get_by_id) stay in
+        place across the commit, so the updated object is returned as is.
+        
         Args:
             db: Database session
             project: Project object to update
@@ -152,7 +187,7 @@ class ProjectService:
             setattr(project, field, value)
         
         await db.commit()
-        return await self.get_by_id(db, project.id)
+        return project
     
     async def delete(
         self,
@@ -1,16 +1,20 @@
 """ProjectVenue junction service for database operations."""
-from typing import List, Optional
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Select, bindparam, select, update
+from sqlalchemy.dialects.postgresql import Range, insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
-from app.models.project import Project
-from app.models.project_venue import ProjectVenue
+from app.models.project import Project, ProjectStatus
+from app.models.project_venue import OutreachStatus, ProjectVenue
 from app.models.venue import Venue
-from app.schemas.project_venue import ProjectVenueUpdate
+from app.schemas.project_venue import ProjectVenueBatchUpdate, ProjectVenueUpdate
+from app.services.projection import Projection
 
 
 class ProjectVenueService:
@@ -20,7 +24,8 @@ class ProjectVenueService:
         self,
         db: AsyncSession,
         project_id: UUID,
-        venue_id: UUID
+        venue_id: UUID,
+        venue: Optional[Venue] = None
     ) -> ProjectVenue:
         """Add a venue to a project.
         
@@ -28,6 +33,8 @@ class ProjectVenueService:
             db: Database session
             project_id: Project UUID
             venue_id: Venue UUID
+            venue: The venue with its photos, if the caller already loaded
+                it; the new link is then returned without a re-fetch
             
         Returns:
             Created project_venue object
@@ -39,31 +46,89 @@ class ProjectVenueService:
             project_id=project_id,
             venue_id=venue_id
         )
+        if venue is not None:
+            project_venue.venue = venue
         db.add(project_venue)
         await db.commit()
+        if venue is not None:
+            return project_venue
         return await self.get_project_venue(db, project_id, venue_id)
     
+    async def add_venues_to_project(
+        self,
+        db: AsyncSession,
+        project_id: UUID,
+        venue_ids: List[UUID],
+    ) -> Tuple[List[UUID], List[UUID]]:
+        """Add several venues to a project in one statement.
+        
+        Venues already on the shortlist are skipped by ON CONFLICT DO
+        NOTHING on the (project_id, venue_id) constraint, so there is no
+        IntegrityError to recover from and concurrent adds are safe.
+        
+        Args:
+            db: Database session
+            project_id: Project UUID (ownership already checked)
+            venue_ids: Venue UUIDs; duplicates are ignored
+            
+        Returns:
+            (created venue ids, already present venue ids), in request order
+            
+        Raises:
+            LookupError: If venues do not exist or are deleted (nothing is added)
+        """
+        venue_ids = list(dict.fromkeys(venue_ids))
+        result = await db.execute(
+            select(Venue.id).where(Venue.id.in_(venue_ids), Venue.is_deleted == False)  # noqa: E712
+        )
+        missing = set(venue_ids) - set(result.scalars().all())
+        if missing:
+            raise LookupError(", ".join(sorted(str(venue_id) for venue_id in missing)))
+        
+        table = ProjectVenue.__table__
+        result = await db.execute(
+            insert(table)
+            .values([{"project_id": project_id, "venue_id": venue_id} for venue_id in venue_ids])
+            .on_conflict_do_nothing(constraint="uq_project_venue")
+            .returning(table.c.venue_id)
+        )
+        inserted = set(result.scalars().all())
+        await db.commit()
+        
+        created = [venue_id for venue_id in venue_ids if venue_id in inserted]
+        already_present = [venue_id for venue_id in venue_ids if venue_id not in inserted]
+        return created, already_present
+    
     async def get_project_venues(
         self,
         db: AsyncSession,
-        project_id: UUID
+        project_id: UUID,
+        projection: Optional[Projection] = None,
     ) -> List[ProjectVenue]:
         """Get all venues for a project.
         
         Args:
             db: Database session
             project_id: Project UUID
+            projection: Only load the requested fields (all by default)
             
         Returns:
             List of project_venue objects with venue details
         """
+        if projection is not None:
+            options = projection.options(ProjectVenue)
+        else:
+            options = [selectinload(ProjectVenue.venue).selectinload(Venue.photos)]
         result = await db.execute(
             select(ProjectVenue)
-            .options(selectinload(ProjectVenue.venue).selectinload(Venue.photos))
+            .options(*options)
             .where(ProjectVenue.project_id == project_id)
             .order_by(ProjectVenue.created_at)
         )
-        return list(result.scalars().all())
+        project_venues = list(result.scalars().all())
+        if projection is not None:
+            await projection.load_photos(db, project_venues)
+        return project_venues
     
     async def get_project_venue(
         self,
@@ -102,6 +167,10 @@ class ProjectVenueService:
     ) -> ProjectVenue:
         """Update a project-venue link.
         
+        The venue and photos loaded with ``project_venue`` (by
+        get_project_venue) stay in place across the commit, so the updated
+        object is returned as is.
+        
         Args:
             db: Database session
             project_venue: ProjectVenue object to update
@@ -110,12 +179,153 @@ class ProjectVenueService:
         Returns:
             Updated project_venue object
         """
-        update_dict = update_data.model_dump(exclude_unset=True)
-        for field, value in update_dict.items():
+        for field, value in self._column_values(update_data).items():
             setattr(project_venue, field, value)
         
         await db.commit()
-        return await self.get_project_venue(db, project_venue.project_id, project_venue.venue_id)
+        return project_venue
+    
+    def _column_values(self, update_data: ProjectVenueUpdate, exclude: Sequence[str] = ()) -> Dict[str, Any]:
+        """Column values for the fields set in an update (ranges as Range)."""
+        values = update_data.model_dump(exclude_unset=True, exclude=set(exclude))
+        for field in ("availability_range", "hold_range"):
+            if values.get(field) is not None:
+                values[field] = getattr(update_data, field).to_range()
+        return values
+    
+    async def batch_update_project_venues(
+        self,
+        db: AsyncSession,
+        project_id: UUID,
+        updates: List[ProjectVenueBatchUpdate],
+    ) -> List[ProjectVenue]:
+        """Update several project-venue links in one transaction.
+        
+        Items that set the same fields are applied with a single UPDATE
+        executed for all of them (executemany), so changing the outreach
+        status of fifty venues is one statement, not fifty load/commit/
+        reload round trips. The updated links are then loaded in one query.
+        
+        Args:
+            db: Database session
+            project_id: Project UUID (ownership already checked)
+            updates: One item per venue, each with the fields to change
+            
+        Returns:
+            The updated project_venue objects with venue details, in
+            shortlist order
+            
+        Raises:
+            ValueError: If a venue appears more than once
+            LookupError: If venues are not in the project (nothing is changed)
+        """
+        venue_ids = [item.venue_id for item in updates]
+        if len(set(venue_ids)) != len(venue_ids):
+            raise ValueError("Each venue may appear only once in a batch update")
+        
+        result = await db.execute(
+            select(ProjectVenue.venue_id).where(
+                ProjectVenue.project_id == project_id,
+                ProjectVenue.venue_id.in_(venue_ids),
+            )
+        )
+        missing = set(venue_ids) - set(result.scalars().all())
+        if missing:
+            raise LookupError(", ".join(sorted(str(venue_id) for venue_id in missing)))
+        
+        # Group the items by the set of fields they change
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = defaultdict(list)
+        for item in updates:
+            values = self._column_values(item, exclude=("venue_id",))
+            if values:
+                groups[tuple(sorted(values))].append({**values, "b_venue_id": item.venue_id})
+        
+        table = ProjectVenue.__table__
+        for fields, rows in groups.items():
+            # updated_at is set by the column's onupdate
+            statement = (
+                update(table)
+                .where(table.c.project_id == project_id, table.c.venue_id == bindparam("b_venue_id"))
+                .values({field: bindparam(field) for field in fields})
+            )
+            await db.execute(statement, rows)
+        await db.commit()
+        
+        result = await db.execute(
+            select(ProjectVenue)
+            .options(selectinload(ProjectVenue.venue).selectinload(Venue.photos))
+            .where(ProjectVenue.project_id == project_id, ProjectVenue.venue_id.in_(venue_ids))
+            .order_by(ProjectVenue.created_at)
+        )
+        return list(result.scalars().all())
+    
+    def build_conflicts_query(
+        self,
+        project_id: UUID,
+        start: date,
+        end: date,
+    ) -> Select:
+        """Build the overlap query behind get_date_conflicts.
+        
+        Matches holds by (venue_id, hold_range && range), which is what the
+        GiST index ix_project_venues_venue_hold_range covers.
+        
+        Args:
+            project_id: Project whose venues to check
+            start: First event day
+            end: Last event day (inclusive)
+            
+        Returns:
+            Select of (ProjectVenue, venue name, event name, client name) rows
+        """
+        ours = aliased(ProjectVenue)
+        shortlisted = select(ours.venue_id).where(ours.project_id == project_id)
+        
+        return (
+            select(ProjectVenue, Venue.name, Project.event_name, Project.client_name)
+            .join(Project, Project.id == ProjectVenue.project_id)
+            .join(Venue, Venue.id == ProjectVenue.venue_id)
+            .where(
+                ProjectVenue.venue_id.in_(shortlisted.scalar_subquery()),
+                ProjectVenue.project_id != project_id,
+                ProjectVenue.hold_range.overlaps(Range(start, end, bounds="[]")),
+                ProjectVenue.outreach_status != OutreachStatus.declined,
+                Project.status != ProjectStatus.cancelled,
+            )
+            .order_by(Venue.name, ProjectVenue.hold_range)
+        )
+    
+    async def get_date_conflicts(
+        self,
+        db: AsyncSession,
+        project: Project,
+    ) -> List[dict]:
+        """Find other projects holding this project's venues on overlapping dates.
+        
+        Holds on cancelled projects and declined outreach are ignored.
+        
+        Args:
+            db: Database session
+            project: Project to check
+            
+        Returns:
+            List of conflict dicts (see VenueDateConflict)
+        """
+        result = await db.execute(
+            self.build_conflicts_query(project.id, project.event_date_start, project.event_date_end)
+        )
+        return [
+            {
+                "venue_id": project_venue.venue_id,
+                "venue_name": venue_name,
+                "project_id": project_venue.project_id,
+                "event_name": event_name,
+                "client_name": client_name,
+                "outreach_status": project_venue.outreach_status,
+                "hold_range": project_venue.hold_range,
+            }
+            for project_venue, venue_name, event_name, client_name in result.all()
+        ]
     
     async def remove_venue_from_project(
         self,
@@ -0,0 +1,340 @@
+"""Sparse fieldsets for list endpoints.
+
+A ``fields=`` query parameter (``id,name,city,photos.url``) is parsed into a
+field tree and used twice: to build loader options that only SELECT the
+columns and relationships the tree needs (``load_only`` / ``selectinload``),
+and to derive a narrowed response schema that only reads and serializes
+those attributes. Reading a column that was not loaded would trigger a lazy
+load, which fails under asyncio, so the two must always come from the same
+tree.
+
+``include=photos:first`` loads just the first photo (lowest display_order)
+of every venue with one DISTINCT ON query.
+"""
+from copy import copy
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, create_model
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload, load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.photo import Photo
+from app.models.venue import Venue
+from app.schemas.photo import PhotoResponse
+
+# Field name -> True (the whole field) or a nested tree
+FieldTree = Dict[str, Union[bool, "FieldTree"]]
+
+INCLUDE_PHOTOS_FIRST = "photos:first"
+
+
+def _nested_schema(annotation: Any) -> Optional[Type[BaseModel]]:
+    """The BaseModel inside X, List[X] or Optional[X], if any."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        nested = _nested_schema(arg)
+        if nested is not None:
+            return nested
+    return None
+
+
+def _replace_schema(annotation: Any, old: Type[BaseModel], new: Type[BaseModel]) -> Any:
+    """Rebuild X / List[X] / Optional[X] with X replaced."""
+    if annotation is old:
+        return new
+    origin = get_origin(annotation)
+    if origin is None:
+        return annotation
+    args = tuple(_replace_schema(arg, old, new) for arg in get_args(annotation))
+    if origin is Union:
+        return Union[args]
+    return origin[args if len(args) > 1 else args[0]]
+
+
+def parse_fields(value: Optional[str], schema: Type[BaseModel]) -> Optional[FieldTree]:
+    """Parse ``fields=a,b,c.d`` into a tree checked against a response schema.
+
+    ``id`` is always included at every level that has one, so clients can
+    still tell items apart.
+
+    Args:
+        value: Comma-separated field paths (dots for nested fields)
+        schema: Response schema of one item
+
+    Returns:
+        Field tree, or None when no fields were requested (everything)
+
+    Raises:
+        ValueError: On unknown fields
+    """
+    if value is None or not value.strip():
+        return None
+
+    tree: FieldTree = {}
+    for path in (part.strip() for part in value.split(",")):
+        if not path:
+            continue
+        node, current = tree, schema
+        names = path.split(".")
+        for depth, name in enumerate(names):
+            if name not in current.model_fields:
+                raise ValueError(f"unknown field '{path}'")
+            if "id" in current.model_fields:
+                node.setdefault("id", True)
+            if depth == len(names) - 1:
+                node[name] = True
+                break
+            nested = _nested_schema(current.model_fields[name].annotation)
+            if nested is None:
+                raise ValueError(f"'{'.'.join(names[:depth + 1])}' has no nested fields")
+            if node.get(name) is True:
+                break  # already requested whole
+            node = node.setdefault(name, {})
+            current = nested
+    return tree
+
+
+def parse_include(value: Optional[str]) -> bool:
+    """Parse ``include=``; returns whether only the first photo is wanted.
+
+    Raises:
+        ValueError: On unsupported values
+    """
+    if value is None or not value.strip():
+        return False
+    if value.strip() != INCLUDE_PHOTOS_FIRST:
+        raise ValueError(f"unsupported include '{value}' (supported: {INCLUDE_PHOTOS_FIRST})")
+    return True
+
+
+def with_photos(tree: Optional[FieldTree], venue_path: Sequence[str]) -> Optional[FieldTree]:
+    """Make sure the venue at ``venue_path`` has ``photos`` in the tree."""
+    if tree is None:
+        return None
+    node = tree
+    for name in venue_path:
+        child = node.get(name)
+        if child is True:
+            return tree
+        node.setdefault("id", True)
+        node = node.setdefault(name, {})
+    node.setdefault("id", True)
+    node.setdefault("photos", True)
+    return tree
+
+
+def _freeze(tree: FieldTree) -> Tuple:
+    return tuple(sorted((name, True if sub is True else _freeze(sub)) for name, sub in tree.items()))
+
+
+def _thaw(frozen: Tuple) -> FieldTree:
+    return {name: True if sub is True else _thaw(sub) for name, sub in frozen}
+
+
+def project_schema(schema: Type[BaseModel], tree: Optional[FieldTree]) -> Type[BaseModel]:
+    """Schema with only the fields in the tree (the schema itself for None)."""
+    if tree is None:
+        return schema
+    return _project_schema(schema, _freeze(tree))
+
+
+@lru_cache(maxsize=256)
+def _project_schema(schema: Type[BaseModel], frozen: Tuple) -> Type[BaseModel]:
+    fields = {}
+    for name, sub in _thaw(frozen).items():
+        info = schema.model_fields[name]
+        annotation = info.annotation
+        if sub is not True:
+            nested = _nested_schema(annotation)
+            annotation = _replace_schema(annotation, nested, project_schema(nested, sub))
+        # create_model sets the annotation on the FieldInfo it is given
+        fields[name] = (annotation, copy(info))
+    return create_model(f"{schema.__name__}Fields", __config__=schema.model_config, **fields)
+
+
+def load_options(
+    entity: type,
+    schema: Type[BaseModel],
+    tree: Optional[FieldTree],
+    *,
+    photos_first: bool = False,
+    extra_columns: Iterable[str] = (),
+) -> List[Any]:
+    """Loader options that fetch exactly what the projected schema reads.
+
+    Columns named in the tree go into ``load_only`` (with the primary key
+    and the foreign keys relationships need); relationships named in it
+    are ``selectinload``-ed with their own options, recursively. A tree of
+    None loads every field of the schema. With ``photos_first`` venue
+    photos are skipped here and attached by ``attach_first_photos``.
+
+    Args:
+        entity: Mapped class the query selects
+        schema: Response schema for the entity
+        tree: Field tree from parse_fields, or None for all fields
+        photos_first: Leave Venue.photos to attach_first_photos
+        extra_columns: Columns needed besides the requested fields
+
+    Returns:
+        Options for ``select(entity).options(...)``
+    """
+    mapper = inspect(entity)
+    names = list(schema.model_fields) if tree is None else list(tree)
+    columns = set(extra_columns) | {column.key for column in mapper.primary_key}
+    options = []
+
+    for name in names:
+        if name in mapper.column_attrs:
+            columns.add(name)
+        elif name in mapper.relationships:
+            relationship = mapper.relationships[name]
+            columns.update(column.key for column in relationship.local_columns if column.key in mapper.column_attrs)
+            if photos_first and entity is Venue and name == "photos":
+                continue
+            sub = None if tree is None or tree[name] is True else tree[name]
+            nested = _nested_schema(schema.model_fields[name].annotation)
+            remote = [column.key for column in relationship.remote_side]
+            options.append(
+                selectinload(getattr(entity, name)).options(
+                    *load_options(relationship.mapper.class_, nested, sub, photos_first=photos_first, extra_columns=remote)
+                )
+            )
+
+    # Relationships eager-loaded by default (lazy="selectin") but not
+    # requested would otherwise still be queried
+    for name, relationship in mapper.relationships.items():
+        if name not in names and relationship.lazy in ("selectin", "joined", "subquery"):
+            options.append(lazyload(getattr(entity, name)))
+
+    if tree is not None:
+        options.append(load_only(*(getattr(entity, column) for column in sorted(columns))))
+    return options
+
+
+def photo_columns(venue_tree: Optional[FieldTree]) -> Optional[FieldTree]:
+    """The photos subtree of a venue tree (None = all photo fields)."""
+    if venue_tree is None or venue_tree.get("photos", True) is True:
+        return None
+    return venue_tree["photos"]
+
+
+async def attach_first_photos(
+    db: AsyncSession,
+    venues: Iterable[Venue],
+    photo_schema: Type[BaseModel],
+    photo_tree: Optional[FieldTree] = None,
+) -> None:
+    """Load each venue's first photo in one query and set it as its photos.
+
+    Args:
+        db: Database session
+        venues: Venues loaded without their photos
+        photo_schema: Response schema of a photo
+        photo_tree: Photo fields to load (None for all)
+    """
+    venues = list({venue.id: venue for venue in venues}.values())
+    if not venues:
+        return
+    result = await db.execute(
+        select(Photo)
+        .options(*load_options(Photo, photo_schema, photo_tree, extra_columns=("venue_id",)))
+        .where(Photo.venue_id.in_([venue.id for venue in venues]))
+        .order_by(Photo.venue_id, Photo.display_order, Photo.created_at)
+        .distinct(Photo.venue_id)
+    )
+    first = {photo.venue_id: photo for photo in result.scalars().all()}
+    for venue in venues:
+        photo = first.get(venue.id)
+        set_committed_value(venue, "photos", [photo] if photo is not None else [])
+
+
+def _related(objects: Iterable[Any], path: Sequence[str]) -> List[Any]:
+    """Objects reached by following attribute names (lists are flattened)."""
+    current = list(objects)
+    for name in path:
+        reached = []
+        for obj in current:
+            value = getattr(obj, name)
+            if isinstance(value, list):
+                reached.extend(value)
+            elif value is not None:
+                reached.append(value)
+        current = reached
+    return current
+
+
+@dataclass
+class Projection:
+    """Fields requested for one endpoint's items.
+
+    Attributes:
+        schema: Response schema of one item
+        fields: Field tree, or None for every field
+        photos_first: Only the first photo of each venue
+        venue_path: Attribute path from an item to its venue(s), e.g.
+            ("project_venues", "venue") for projects
+    """
+    schema: Type[BaseModel]
+    fields: Optional[FieldTree] = None
+    photos_first: bool = False
+    venue_path: Tuple[str, ...] = ()
+
+    @classmethod
+    def parse(
+        cls,
+        schema: Type[BaseModel],
+        fields: Optional[str],
+        include: Optional[str],
+        venue_path: Tuple[str, ...] = (),
+    ) -> "Projection":
+        """Build from the ``fields=`` and ``include=`` query parameters.
+
+        Raises:
+            ValueError: On unknown fields or include values
+        """
+        photos_first = parse_include(include)
+        tree = parse_fields(fields, schema)
+        if photos_first:
+            tree = with_photos(tree, venue_path)
+        return cls(schema, tree, photos_first, venue_path)
+
+    def options(self, entity: type, extra_columns: Iterable[str] = ()) -> List[Any]:
+        """Loader options for a query selecting ``entity`` items."""
+        return load_options(entity, self.schema, self.fields, photos_first=self.photos_first, extra_columns=extra_columns)
+
+    def _venue_tree(self) -> Tuple[bool, Optional[FieldTree]]:
+        """Whether venues are requested, and their subtree (None = all)."""
+        node: Optional[FieldTree] = self.fields
+        for name in self.venue_path:
+            if node is None:
+                return True, None
+            if name not in node:
+                return False, None
+            node = None if node[name] is True else node[name]
+        return True, node
+
+    async def load_photos(self, db: AsyncSession, items: Iterable[Any]) -> None:
+        """Attach first photos to the venues of loaded items (photos_first only)."""
+        if not self.photos_first:
+            return
+        requested, venue_tree = self._venue_tree()
+        if requested:
+            await attach_first_photos(db, _related(items, self.venue_path), PhotoResponse, photo_columns(venue_tree))
+
+    @property
+    def item_schema(self) -> Type[BaseModel]:
+        """Response schema narrowed to the requested fields."""
+        return project_schema(self.schema, self.fields)
+
+    def list_schema(self, envelope: Type[BaseModel], items_field: str = "items") -> Type[BaseModel]:
+        """A paginated envelope whose items use the narrowed schema."""
+        if self.fields is None:
+            return envelope
+        tree: FieldTree = {name: True for name in envelope.model_fields}
+        tree[items_field] = self.fields
+        return project_schema(envelope, tree)
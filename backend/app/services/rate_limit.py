@@ -0,0 +1,223 @@
+"""Rate limits and concurrency caps for expensive endpoints.
+
+Endpoints that call OpenAI, render PDFs or import CSVs are grouped into
+endpoint classes (``ai``, ``pdf``, ``import``). Each class has:
+
+- a per-user token bucket (RATE_LIMITS): a user may send a burst of up
+  to ``requests`` calls, and gets tokens back at ``requests/seconds`` per
+  second. An empty bucket means 429 with a Retry-After of the time until
+  the next token.
+- a cap on the requests of the class handled at once by this process
+  (CONCURRENCY_LIMITS), whoever sends them. A full class means 429 with a
+  short Retry-After.
+
+Buckets live in memory by default, so each worker process limits on its
+own. With RATE_LIMIT_BACKEND=postgres they live in the UNLOGGED
+``rate_limit_buckets`` table and are shared by all workers; each check
+is one upsert.
+"""
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.rate_limit import RateLimitBucket
+from app.services.metrics import RATE_LIMIT_IN_FLIGHT, RATE_LIMIT_REQUESTS
+
+# Retry-After for requests turned away by a full concurrency cap
+CONCURRENCY_RETRY_AFTER = 2
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A token bucket: ``burst`` tokens, refilled at ``rate`` tokens per second."""
+    burst: int
+    rate: float
+
+    @classmethod
+    def per(cls, requests: int, seconds: float) -> "RateLimit":
+        return cls(burst=requests, rate=requests / seconds)
+
+
+class RateLimitExceeded(Exception):
+    """A request was turned away; ``retry_after`` is in whole seconds."""
+
+    def __init__(self, endpoint_class: str, reason: str, retry_after: int):
+        self.endpoint_class = endpoint_class
+        self.reason = reason
+        self.retry_after = retry_after
+        if reason == "rate":
+            message = f"Rate limit exceeded for {endpoint_class} requests. Retry in {retry_after}s."
+        else:
+            message = f"Too many {endpoint_class} requests in progress. Retry in {retry_after}s."
+        super().__init__(message)
+
+
+class MemoryBuckets:
+    """Token buckets in this process."""
+
+    # Past this many buckets, ones that have refilled are forgotten
+    MAX_BUCKETS = 10_000
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    async def take(self, db: AsyncSession, key: str, limit: RateLimit) -> float:
+        """Take a token; returns 0 if there was one, else seconds until there is."""
+        now = self.clock()
+        tokens, updated = self._buckets.get(key, (limit.burst, now))
+        tokens = min(limit.burst, tokens + (now - updated) * limit.rate)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / limit.rate
+        if len(self._buckets) >= self.MAX_BUCKETS and key not in self._buckets:
+            self._prune(now, limit)
+        self._buckets[key] = (tokens - 1, now)
+        return 0
+
+    def _prune(self, now: float, limit: RateLimit) -> None:
+        full_after = limit.burst / limit.rate
+        self._buckets = {
+            key: (tokens, updated) for key, (tokens, updated) in self._buckets.items()
+            if now - updated < full_after
+        }
+
+
+class PostgresBuckets:
+    """Token buckets in the rate_limit_buckets table, shared by all workers."""
+
+    # Buckets untouched this long are full again; deleted now and then
+    PRUNE_AFTER = timedelta(days=1)
+    PRUNE_INTERVAL = 3600
+
+    def __init__(self):
+        self._last_prune = 0.0
+
+    async def take(self, db: AsyncSession, key: str, limit: RateLimit) -> float:
+        """Take a token; returns 0 if there was one, else seconds until there is.
+
+        Uses (and commits) the request's session, so no extra connection
+        is opened.
+        """
+        table = RateLimitBucket.__table__
+        elapsed = func.extract("epoch", func.now() - table.c.updated_at)
+        refilled = func.least(limit.burst, table.c.tokens + elapsed * limit.rate)
+        statement = insert(table).values(key=key, tokens=limit.burst - 1, updated_at=func.now())
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={"tokens": refilled - 1, "updated_at": func.now()},
+            # No token: leave the row alone, and return nothing
+            where=refilled >= 1,
+        ).returning(table.c.tokens)
+        taken = (await db.execute(statement)).first() is not None
+        wait = 0.0
+        if not taken:
+            tokens = (await db.execute(select(refilled).where(table.c.key == key))).scalar()
+            wait = (1 - tokens) / limit.rate
+        if time.monotonic() - self._last_prune > self.PRUNE_INTERVAL:
+            self._last_prune = time.monotonic()
+            cutoff = datetime.now(timezone.utc) - self.PRUNE_AFTER
+            await db.execute(delete(RateLimitBucket).where(RateLimitBucket.updated_at < cutoff))
+        await db.commit()
+        return wait
+
+
+class RateLimiter:
+    """Per-user rate limits and per-class concurrency caps."""
+
+    def __init__(
+        self,
+        limits: Dict[str, RateLimit],
+        concurrency: Dict[str, int],
+        buckets=None,
+        enabled: bool = True,
+    ):
+        self.limits = limits
+        self.concurrency = concurrency
+        self.buckets = buckets or MemoryBuckets()
+        self.enabled = enabled
+        self._in_flight: Dict[str, int] = {}
+        self._rejected: Dict[Tuple[str, str], int] = {}
+
+    async def check(self, db: AsyncSession, endpoint_class: str, user_id) -> None:
+        """Take a token from the user's bucket for the class.
+
+        Args:
+            db: Database session (used by the postgres backend)
+            endpoint_class: Endpoint class, e.g. ``ai``
+            user_id: User sending the request
+
+        Raises:
+            RateLimitExceeded: If the bucket is empty
+        """
+        limit = self.limits.get(endpoint_class)
+        if not self.enabled or limit is None:
+            return
+        wait = await self.buckets.take(db, f"{endpoint_class}:{user_id}", limit)
+        if wait > 0:
+            self._reject(endpoint_class, "rate")
+            raise RateLimitExceeded(endpoint_class, "rate", max(1, math.ceil(wait)))
+        RATE_LIMIT_REQUESTS.labels(endpoint_class=endpoint_class, result="allowed").inc()
+
+    def enter(self, endpoint_class: str) -> None:
+        """Claim one of the class's concurrent slots (release with ``leave``).
+
+        Raises:
+            RateLimitExceeded: If all slots are taken
+        """
+        cap = self.concurrency.get(endpoint_class)
+        in_flight = self._in_flight.get(endpoint_class, 0)
+        if self.enabled and cap is not None and in_flight >= cap:
+            self._reject(endpoint_class, "concurrency")
+            raise RateLimitExceeded(endpoint_class, "concurrency", CONCURRENCY_RETRY_AFTER)
+        self._in_flight[endpoint_class] = in_flight + 1
+        RATE_LIMIT_IN_FLIGHT.labels(endpoint_class=endpoint_class).inc()
+
+    def leave(self, endpoint_class: str) -> None:
+        self._in_flight[endpoint_class] -= 1
+        RATE_LIMIT_IN_FLIGHT.labels(endpoint_class=endpoint_class).dec()
+
+    def _reject(self, endpoint_class: str, reason: str) -> None:
+        key = (endpoint_class, reason)
+        self._rejected[key] = self._rejected.get(key, 0) + 1
+        RATE_LIMIT_REQUESTS.labels(endpoint_class=endpoint_class, result=f"rejected_{reason}").inc()
+
+    def stats(self) -> List[dict]:
+        """Limits, requests in progress and rejections (this process) per class."""
+        classes = sorted(set(self.limits) | set(self.concurrency))
+        return [
+            {
+                "endpoint_class": name,
+                "burst": self.limits[name].burst if name in self.limits else None,
+                "refill_per_second": self.limits[name].rate if name in self.limits else None,
+                "concurrency_limit": self.concurrency.get(name),
+                "in_flight": self._in_flight.get(name, 0),
+                "rejected_rate": self._rejected.get((name, "rate"), 0),
+                "rejected_concurrency": self._rejected.get((name, "concurrency"), 0),
+            }
+            for name in classes
+        ]
+
+
+def _build_buckets():
+    if settings.RATE_LIMIT_BACKEND == "postgres":
+        return PostgresBuckets()
+    if settings.RATE_LIMIT_BACKEND != "memory":
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{settings.RATE_LIMIT_BACKEND}' (memory or postgres)")
+    return MemoryBuckets()
+
+
+# Singleton instance
+rate_limiter = RateLimiter(
+    limits={name: RateLimit.per(*limit) for name, limit in settings.rate_limits_map.items()},
+    concurrency=settings.concurrency_limits_map,
+    buckets=_build_buckets(),
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
@@ -0,0 +1,172 @@
+"""Per-request SQL/latency accounting and per-route histograms."""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Upper bounds of the histogram buckets (the last bucket is open-ended)
+DURATION_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class RequestStats:
+    """SQL statements and DB time accumulated by the current request."""
+
+    __slots__ = ("started", "queries", "db_seconds", "scope")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.scope = scope
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def endpoint(self) -> Optional[str]:
+        """Method and route template of the request, e.g. "GET /api/v1/venues/{venue_id}"."""
+        if self.scope is None:
+            return None
+        route = getattr(self.scope.get("route"), "path", None) or self.scope.get("path")
+        return f"{self.scope.get('method')} {route}"
+
+
+# The engine events fire in SQLAlchemy's greenlet, which shares the caller's
+# context, so mutating the object (rather than re-setting the var) is seen
+# by the middleware that created it.
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def begin_request(scope: Optional[dict] = None) -> Tuple[RequestStats, object]:
+    """Start accounting for a request; returns the stats and a reset token."""
+    stats = RequestStats(scope)
+    return stats, _current.set(stats)
+
+
+def end_request(token) -> None:
+    """Stop accounting for the request started with begin_request."""
+    _current.reset(token)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Stats of the request being handled, or None outside a request."""
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._request_stats_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - context._request_stats_started
+
+
+def install_query_listeners(engine: AsyncEngine) -> None:
+    """Count statements and DB time per request on an async engine."""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum and max."""
+
+    __slots__ = ("bounds", "buckets", "count", "total", "max")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation (capped at max)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.buckets):
+            seen += count
+            if seen >= rank:
+                return round(min(float(bound), self.max), 3)
+        return round(self.max, 3)
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{bound}" for bound in self.bounds] + ["inf"]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": round(self.max, 3),
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class RouteStats:
+    """Latency, query count and DB time histograms for one route."""
+
+    def __init__(self):
+        self.duration_ms = Histogram(DURATION_BUCKETS_MS)
+        self.db_ms = Histogram(DURATION_BUCKETS_MS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.errors = 0
+
+
+class RoutePerfRegistry:
+    """Per-route aggregates of completed requests (process-local)."""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+
+    def record(self, method: str, route: str, status_code: int, stats: RequestStats, duration: float) -> None:
+        """Add a finished request to its route's histograms."""
+        route_stats = self.routes.get((method, route))
+        if route_stats is None:
+            route_stats = self.routes[(method, route)] = RouteStats()
+        route_stats.duration_ms.observe(duration * 1000)
+        route_stats.db_ms.observe(stats.db_seconds * 1000)
+        route_stats.queries.observe(stats.queries)
+        if status_code >= 500:
+            route_stats.errors += 1
+
+    def snapshot(self) -> List[dict]:
+        """Per-route summaries, busiest (by total time) first."""
+        items = [
+            {
+                "method": method,
+                "route": route,
+                "requests": route_stats.duration_ms.count,
+                "errors": route_stats.errors,
+                "duration_ms": route_stats.duration_ms.to_dict(),
+                "db_ms": route_stats.db_ms.to_dict(),
+                "queries": route_stats.queries.to_dict(),
+            }
+            for (method, route), route_stats in self.routes.items()
+        ]
+        items.sort(key=lambda item: item["duration_ms"]["mean"] * item["requests"], reverse=True)
+        return items
+
+    def reset(self) -> None:
+        self.routes.clear()
+
+
+# Singleton instance
+route_perf_registry = RoutePerfRegistry()
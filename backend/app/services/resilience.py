@@ -0,0 +1,231 @@
+"""Retries, circuit breaking and deadlines for calls to upstream services.
+
+``call_with_retries`` runs a coroutine function under three guards:
+
+- Deadline: the whole call, retries and waits included, must finish
+  within the caller's deadline. Each attempt gets the time left (capped
+  by its own timeout), is cancelled if it overruns it, and no retry is
+  started that could not finish.
+- Retries: failures the caller's ``classify`` marks retryable (429s,
+  5xx, timeouts, connection errors) are retried with exponential backoff
+  and full jitter. A ``Retry-After`` from the upstream is honoured when
+  it is longer than the backoff and fits in the deadline.
+- Circuit breaker: after ``failure_threshold`` consecutive retryable
+  failures the circuit opens and calls fail at once with
+  CircuitOpenError, instead of every request waiting out its retries
+  during an outage. After ``reset_timeout`` seconds one trial call is let
+  through (half-open); its success closes the circuit, its failure opens
+  it again.
+
+Breakers are per process and per upstream.
+"""
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Tuple, TypeVar
+
+from app.services.metrics import CIRCUIT_BREAKER_STATE, UPSTREAM_CALLS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Returns (retryable, retry_after seconds or None) for a failure
+Classifier = Callable[[BaseException], Tuple[bool, Optional[float]]]
+
+# Waits between attempts (replaced in tests)
+_sleep = asyncio.sleep
+
+
+class CircuitOpenError(Exception):
+    """The upstream is failing; calls are refused for ``retry_after`` seconds."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"{name} is unavailable; retry in {retry_after:.0f}s")
+
+
+class DeadlineExceeded(TimeoutError):
+    """The call's deadline passed before it could succeed."""
+
+
+class AttemptTimeout(TimeoutError):
+    """One attempt overran its timeout and was cancelled (retryable)."""
+
+
+class Deadline:
+    """A point in time by which an operation must be done."""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed, open, half-open)."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    # Gauge values, worst last (the gauge reports the highest across workers)
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+        CIRCUIT_BREAKER_STATE.labels(name=name).set(0)
+
+    def before_call(self) -> None:
+        """Let a call through, or refuse it.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or its trial call is running)
+        """
+        if self.state == self.CLOSED:
+            return
+        wait = self.opened_at + self.reset_timeout - time.monotonic()
+        if self.state == self.OPEN and wait <= 0:
+            self._set_state(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return
+        UPSTREAM_CALLS.labels(name=self.name, result="rejected").inc()
+        raise CircuitOpenError(self.name, max(wait, 1.0))
+
+    def record_success(self) -> None:
+        self._trial_running = False
+        self.failures = 0
+        if self.state != self.CLOSED:
+            logger.info("Circuit %s closed", self.name)
+            self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self._trial_running = False
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning("Circuit %s opened after %d failures", self.name, self.failures)
+            self.opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+
+    def release(self) -> None:
+        """End a call that neither succeeded nor failed upstream (e.g. a bad request)."""
+        self._trial_running = False
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        CIRCUIT_BREAKER_STATE.labels(name=self.name).set(self._STATE_VALUES[state])
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how long to retry.
+
+    Attributes:
+        max_attempts: Attempts in total (1 = no retries)
+        base_delay: Backoff before the first retry, doubled for each further one
+        max_delay: Longest backoff
+        attempt_timeout: Longest single attempt, in seconds
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    attempt_timeout: float = 20.0
+
+    def backoff(self, retry: int) -> float:
+        """Delay before retry number ``retry`` (1-based): full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+
+async def call_with_retries(
+    call: Callable[[float], Awaitable[T]],
+    classify: Classifier,
+    policy: RetryPolicy,
+    breaker: Optional[CircuitBreaker] = None,
+    deadline: Optional[Deadline] = None,
+) -> T:
+    """Call an upstream with retries, a circuit breaker and a deadline.
+
+    Args:
+        call: Makes one attempt; receives the attempt's timeout in seconds,
+            and is cancelled if it takes longer
+        classify: Tells retryable failures from permanent ones
+        policy: Retry policy
+        breaker: Circuit breaker of the upstream
+        deadline: Deadline of the whole call
+
+    Returns:
+        The result of the first successful attempt
+
+    Raises:
+        CircuitOpenError: If the circuit is open
+        DeadlineExceeded: If the deadline passes first
+        AttemptTimeout: If the last attempt timed out
+        Exception: The last failure, when it is permanent or attempts ran out
+    """
+    name = breaker.name if breaker else "upstream"
+    attempt = 0
+    while True:
+        attempt += 1
+        if breaker:
+            breaker.before_call()
+        timeout = policy.attempt_timeout
+        if deadline:
+            timeout = min(timeout, deadline.remaining())
+            if timeout <= 0:
+                if breaker:
+                    breaker.release()
+                raise DeadlineExceeded(f"{name} call ran out of time")
+        try:
+            try:
+                # The call is told its timeout; this enforces it
+                result = await asyncio.wait_for(call(timeout), timeout)
+            except TimeoutError as e:
+                raise AttemptTimeout(f"{name} attempt timed out after {timeout:.1f}s") from e
+        except asyncio.CancelledError:
+            if breaker:
+                breaker.release()
+            raise
+        except Exception as e:
+            # Timeouts are transient whatever the upstream's errors look like
+            retryable, retry_after = (True, None) if isinstance(e, AttemptTimeout) else classify(e)
+            if not retryable:
+                if breaker:
+                    breaker.release()
+                UPSTREAM_CALLS.labels(name=name, result="failed").inc()
+                raise
+            if breaker:
+                breaker.record_failure()
+            delay = max(policy.backoff(attempt), retry_after or 0)
+            if deadline and deadline.expired:
+                # The attempt was cut short by the deadline
+                UPSTREAM_CALLS.labels(name=name, result="deadline").inc()
+                raise DeadlineExceeded(f"{name} call ran out of time after {attempt} attempts") from e
+            if attempt >= policy.max_attempts:
+                UPSTREAM_CALLS.labels(name=name, result="failed").inc()
+                raise
+            if deadline and delay >= deadline.remaining():
+                UPSTREAM_CALLS.labels(name=name, result="deadline").inc()
+                raise DeadlineExceeded(f"{name} call ran out of time after {attempt} attempts") from e
+            UPSTREAM_CALLS.labels(name=name, result="retried").inc()
+            logger.info("%s attempt %d failed (%s); retrying in %.2fs", name, attempt, type(e).__name__, delay)
+            await _sleep(delay)
+            continue
+        if breaker:
+            breaker.record_success()
+        UPSTREAM_CALLS.labels(name=name, result="succeeded").inc()
+        return result
@@ -0,0 +1,154 @@
+"""Opt-in slow-query recorder with sampled EXPLAIN (ANALYZE, BUFFERS) plans."""
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.services.request_stats import current_request_stats
+
+logger = logging.getLogger("app.slow_queries")
+
+# Set inside the EXPLAIN task so its own statements are not recorded
+_explaining: ContextVar[bool] = ContextVar("slow_query_explaining", default=False)
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Replace bound values with their type (and length for strings/bytes/lists)."""
+    if parameters is None:
+        return None
+    if isinstance(parameters, dict):
+        return {key: redact_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(value) for value in parameters]
+    return _redact_value(parameters)
+
+
+def _redact_value(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    kind = type(value).__name__
+    if isinstance(value, (str, bytes, list, tuple)):
+        return f"<{kind} len={len(value)}>"
+    return f"<{kind}>"
+
+
+def _is_read_only(statement: str) -> bool:
+    words = statement.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() in ("SELECT", "WITH")
+
+
+class SlowQueryLog:
+    """Record statements slower than SLOW_QUERY_THRESHOLD_MS.
+
+    Hooked into the engine's cursor events. Each slow statement is kept in
+    a ring buffer with its SQL, redacted parameters, duration and the
+    endpoint that ran it. For SELECTs an ``EXPLAIN (ANALYZE, BUFFERS)`` of
+    the same statement and parameters is captured in a background task on
+    a separate connection, inside a READ ONLY transaction that is rolled
+    back. To keep the overhead bounded, each distinct statement is
+    explained at most once per SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS.
+    """
+
+    # Forget explain timestamps beyond this many distinct statements
+    MAX_TRACKED_STATEMENTS = 1000
+
+    def __init__(self):
+        self.entries: Deque[Dict[str, Any]] = deque(maxlen=settings.SLOW_QUERY_BUFFER_SIZE)
+        self._engine: Optional[AsyncEngine] = None
+        self._last_explained: Dict[str, float] = {}
+        self._tasks: set = set()
+
+    def install(self, engine: AsyncEngine) -> None:
+        """Start recording slow statements run on an async engine."""
+        self._engine = engine
+        sync_engine = engine.sync_engine
+        if not event.contains(sync_engine, "before_cursor_execute", self._before_cursor_execute):
+            event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - context._slow_query_started
+        if duration * 1000 < settings.SLOW_QUERY_THRESHOLD_MS or _explaining.get():
+            return
+
+        stats = current_request_stats()
+        entry = {
+            "recorded_at": datetime.now(timezone.utc),
+            "duration_ms": round(duration * 1000, 2),
+            "sql": statement,
+            "params": redact_parameters(parameters),
+            "executemany": executemany,
+            "endpoint": stats.endpoint if stats is not None else None,
+            "plan": None,
+            "plan_error": None,
+        }
+        self.entries.append(entry)
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "duration_ms": entry["duration_ms"],
+            "endpoint": entry["endpoint"],
+            "sql": " ".join(statement.split())[:500],
+        }))
+
+        if settings.SLOW_QUERY_EXPLAIN and not executemany and _is_read_only(statement):
+            self._schedule_explain(entry, statement, parameters)
+
+    def _schedule_explain(self, entry: Dict[str, Any], statement: str, parameters: Any) -> None:
+        now = time.monotonic()
+        last = self._last_explained.get(statement)
+        if last is not None and now - last < settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if len(self._last_explained) >= self.MAX_TRACKED_STATEMENTS:
+            self._last_explained.clear()
+        self._last_explained[statement] = now
+        task = loop.create_task(self._explain(entry, statement, parameters))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _explain(self, entry: Dict[str, Any], statement: str, parameters: Any) -> None:
+        """Attach an EXPLAIN (ANALYZE, BUFFERS) plan to a recorded entry."""
+        _explaining.set(True)
+        try:
+            async with self._engine.connect() as conn:
+                # ANALYZE executes the statement: never let it write, and
+                # bound how long a pathological plan can run
+                await conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+                await conn.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}"
+                )
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}",
+                    parameters if parameters else (),
+                )
+                plan = result.scalar_one()
+                entry["plan"] = json.loads(plan) if isinstance(plan, str) else plan
+                await conn.rollback()
+        except Exception as e:
+            entry["plan_error"] = f"{type(e).__name__}: {e}"
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Recorded entries, newest first."""
+        return list(reversed(self.entries))
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self._last_explained.clear()
+
+
+# Singleton instance
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,81 @@
+"""Background task handlers.
+
+Importing this module registers the task types on the task runner. Each
+handler re-loads what it needs by ID from the payload, so a task can run
+in any process, long after the request that queued it.
+"""
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+from app.services.ai_description_service import ai_description_service
+from app.services.csv_service import csv_service
+from app.services.pdf_generator import proposal_generator
+from app.services.project_service import project_service
+from app.services.project_venue_service import project_venue_service
+from app.services.task_runner import TaskOutcome, task_runner
+
+AI_DESCRIPTION = "ai_description"
+PROPOSAL_PDF = "proposal_pdf"
+VENUE_CSV_IMPORT = "venue_csv_import"
+
+
+async def generate_ai_description(db: AsyncSession, task: Task) -> TaskOutcome:
+    """Generate and save the AI description of a shortlisted venue.
+
+    Payload: ``{"project_id", "venue_id"}``
+    """
+    project_id = UUID(task.payload["project_id"])
+    venue_id = UUID(task.payload["venue_id"])
+    project_venue = await project_venue_service.get_project_venue(db, project_id, venue_id)
+    if not project_venue:
+        raise LookupError("Venue not in project")
+    if not project_venue.ai_context:
+        raise ValueError("No AI context provided")
+    description = await ai_description_service.generate_description(db, project_venue)
+    return TaskOutcome(result={
+        "project_id": str(project_id),
+        "venue_id": str(venue_id),
+        "ai_description": description,
+    })
+
+
+async def render_proposal_pdf(db: AsyncSession, task: Task) -> TaskOutcome:
+    """Render a project's proposal PDF, kept as the task's output.
+
+    Payload: ``{"project_id"}``
+    """
+    project = await project_service.get_by_id_with_venues(db, UUID(task.payload["project_id"]), user_id=task.user_id)
+    if not project:
+        raise LookupError("Project not found")
+    if not any(pv.include_in_proposal for pv in project.project_venues):
+        raise ValueError("No venues marked for inclusion in proposal")
+    pdf_bytes = await proposal_generator.generate_pdf_proposal(db, project)
+    filename = f"{project.client_name}_{project.event_name}_proposal.pdf".replace(" ", "_")
+    return TaskOutcome(
+        result={"project_id": str(project.id), "filename": filename, "size": len(pdf_bytes)},
+        output=pdf_bytes,
+        output_type="application/pdf",
+        output_filename=filename,
+    )
+
+
+async def import_venue_csv(db: AsyncSession, task: Task) -> TaskOutcome:
+    """Create venues from an uploaded CSV.
+
+    Payload: ``{"filename", "content"}`` (content as text)
+    """
+    result = await csv_service.import_venue_csv(db, task.payload["content"].encode("utf-8"))
+    return TaskOutcome(result=result.model_dump(mode="json"))
+
+
+task_runner.register(
+    AI_DESCRIPTION, generate_ai_description, concurrency=4, success_event="project_venue.description_generated"
+)
+task_runner.register(PROPOSAL_PDF, render_proposal_pdf, concurrency=2, success_event="proposal.ready")
+# Rows are committed one by one, so a retry would create duplicates. The
+# uploaded file is not kept once the import has finished.
+task_runner.register(
+    VENUE_CSV_IMPORT, import_venue_csv, concurrency=1, max_attempts=1, transient_payload=("content",)
+)
@@ -0,0 +1,588 @@
+"""In-process background task runner.
+
+Slow work (AI descriptions, proposal PDFs, CSV imports) is submitted as a
+row in the ``tasks`` table and run by a pool of worker coroutines in each
+API process, so requests return a task id at once instead of holding a
+worker for the whole operation.
+
+- The table is the queue: a worker claims the oldest due task with
+  ``FOR UPDATE SKIP LOCKED``, so workers in any number of processes never
+  run the same task twice. Submitting wakes this process's workers; other
+  processes find the task on their next poll.
+- Each task type has a concurrency limit per process (TASK_CONCURRENCY);
+  a worker only claims types with a free slot.
+- A failed attempt is retried after an exponential backoff with jitter
+  until ``max_attempts``. ValueError, LookupError and ImportError (bad
+  input, missing rows, missing packages) fail the task at once.
+- Cancelling a queued task is immediate. A running task is flagged; the
+  worker running it sees the flag within a poll interval and cancels the
+  handler.
+- Running tasks heartbeat. A task whose worker stopped heartbeating (the
+  process died) is requeued by any runner after TASK_STALE_SECONDS.
+- On shutdown, running tasks get TASK_SHUTDOWN_GRACE_SECONDS to finish
+  and are then requeued without using up an attempt.
+- Status changes of tasks for a project (payload ``project_id``) are
+  published on the project's event channel as ``task.updated``, and a
+  type's ``success_event`` when one succeeds.
+- A type's ``transient_payload`` keys (e.g. an uploaded file's content)
+  are removed from the payload once the task has finished.
+
+Handlers are registered per task type (see task_handlers) and receive
+their own session.
+"""
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import Text, case, func, literal, select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import undefer
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models.task import Task, TaskStatus
+from app.services.events import event_bus
+from app.services.metrics import TASK_DURATION, TASKS_FINISHED, TASKS_IN_PROGRESS
+
+logger = logging.getLogger(__name__)
+
+# Failures that retrying cannot fix (bad input, missing rows or packages)
+PERMANENT_ERRORS = (ValueError, LookupError, ImportError)
+
+FINISHED_STATUSES = (TaskStatus.succeeded, TaskStatus.failed, TaskStatus.cancelled)
+
+# TASKS_FINISHED result of a stale task, by the status it was given
+STALE_OUTCOMES = {
+    TaskStatus.queued: "requeued",
+    TaskStatus.failed: "failed",
+    TaskStatus.cancelled: "cancelled",
+}
+
+
+@dataclass
+class TaskOutcome:
+    """What a successful handler returns.
+
+    Attributes:
+        result: JSON-serializable result shown on the task
+        output: File produced by the task, downloadable from the task
+        output_type: Media type of ``output``
+        output_filename: Download filename of ``output``
+    """
+    result: Optional[Dict[str, Any]] = None
+    output: Optional[bytes] = None
+    output_type: Optional[str] = None
+    output_filename: Optional[str] = None
+
+
+TaskHandler = Callable[[AsyncSession, Task], Awaitable[TaskOutcome]]
+
+
+@dataclass
+class TaskKind:
+    """A registered task type."""
+    handler: TaskHandler
+    concurrency: int
+    max_attempts: int
+    success_event: Optional[str] = None
+    transient_payload: Tuple[str, ...] = ()
+
+
+class TaskRunner:
+    """Submit, track and run background tasks."""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        concurrency: Optional[Dict[str, int]] = None,
+        poll_interval: float = 1.0,
+        timeout: float = 300,
+        backoff: float = 5,
+        backoff_max: float = 300,
+        stale_after: float = 120,
+        shutdown_grace: float = 10,
+        session_maker: async_sessionmaker = async_session_maker,
+    ):
+        self.workers = workers
+        self.concurrency = concurrency or {}
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.stale_after = stale_after
+        self.shutdown_grace = shutdown_grace
+        self.session_maker = session_maker
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._kinds: Dict[str, TaskKind] = {}
+        self._active: Dict[str, int] = {}
+        self._running: Dict[UUID, asyncio.Task] = {}
+        self._cancelled: Set[UUID] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._wakeups: List[asyncio.Event] = []
+        self._claim_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+
+    def register(
+        self,
+        kind: str,
+        handler: TaskHandler,
+        concurrency: int = 2,
+        max_attempts: int = 3,
+        success_event: Optional[str] = None,
+        transient_payload: Sequence[str] = (),
+    ) -> None:
+        """Register the handler of a task type.
+
+        Args:
+            kind: Task type name, stored on each task
+            handler: Coroutine run for each attempt
+            concurrency: Default per-process limit (TASK_CONCURRENCY overrides it)
+            max_attempts: Attempts before the task fails (1 for non-idempotent work)
+            success_event: Project event published, with the result, when a task succeeds
+            transient_payload: Payload keys removed once a task has finished (large inputs)
+        """
+        self._kinds[kind] = TaskKind(
+            handler, self.concurrency.get(kind, concurrency), max_attempts, success_event, tuple(transient_payload)
+        )
+        self._active.setdefault(kind, 0)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks) and not self._stopping
+
+    def start(self) -> None:
+        """Start the workers (on application startup)."""
+        if self._tasks:
+            return
+        self._stopping = False
+        self._claim_lock = asyncio.Lock()
+        self._wakeups = [asyncio.Event() for _ in range(self.workers)]
+        self._tasks = [
+            asyncio.create_task(self._worker(wakeup), name=f"task-worker-{n}")
+            for n, wakeup in enumerate(self._wakeups)
+        ]
+        self._tasks.append(asyncio.create_task(self._housekeeper(), name="task-housekeeper"))
+
+    async def stop(self) -> None:
+        """Stop claiming tasks; requeue the ones that don't finish within the grace period."""
+        if not self._tasks:
+            return
+        self._stopping = True
+        self._wake()
+        jobs = list(self._running.values())
+        if jobs:
+            done, pending = await asyncio.wait(jobs, timeout=self.shutdown_grace)
+            for job in pending:
+                job.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # Submitting and tracking
+
+    async def submit(
+        self,
+        db: AsyncSession,
+        kind: str,
+        user_id: UUID,
+        payload: Dict[str, Any],
+    ) -> Task:
+        """Queue a task.
+
+        Args:
+            db: Database session (committed by this call)
+            kind: Registered task type
+            user_id: Owner of the task
+            payload: JSON-serializable handler input
+
+        Returns:
+            The queued task
+
+        Raises:
+            ValueError: If the task type is not registered
+        """
+        if kind not in self._kinds:
+            raise ValueError(f"unknown task type '{kind}'")
+        task = Task(
+            kind=kind,
+            user_id=user_id,
+            payload=payload,
+            max_attempts=self._kinds[kind].max_attempts,
+            run_after=func.now(),
+        )
+        db.add(task)
+        await db.commit()
+        self._wake()
+        return task
+
+    async def get(self, db: AsyncSession, task_id: UUID, user_id: Optional[UUID] = None) -> Optional[Task]:
+        """Get a task by ID.
+
+        Args:
+            db: Database session
+            task_id: Task UUID
+            user_id: Optional user ID to check ownership
+
+        Returns:
+            Task if found (and owned by user_id), None otherwise
+        """
+        query = select(Task).where(Task.id == task_id)
+        if user_id:
+            query = query.where(Task.user_id == user_id)
+        return (await db.execute(query)).scalar_one_or_none()
+
+    async def get_output(self, db: AsyncSession, task_id: UUID, user_id: Optional[UUID] = None) -> Optional[Task]:
+        """Get a task with its output file loaded (see get)."""
+        query = select(Task).options(undefer(Task.output)).where(Task.id == task_id)
+        if user_id:
+            query = query.where(Task.user_id == user_id)
+        return (await db.execute(query)).scalar_one_or_none()
+
+    async def list_tasks(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        status: Optional[TaskStatus] = None,
+        kind: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Task]:
+        """List a user's tasks, newest first.
+
+        Args:
+            db: Database session
+            user_id: Owner
+            status: Only tasks with this status
+            kind: Only tasks of this type
+            limit: Maximum tasks to return
+
+        Returns:
+            List of tasks
+        """
+        query = select(Task).where(Task.user_id == user_id)
+        if status:
+            query = query.where(Task.status == status)
+        if kind:
+            query = query.where(Task.kind == kind)
+        result = await db.execute(query.order_by(Task.created_at.desc()).limit(limit))
+        return list(result.scalars().all())
+
+    async def cancel(self, db: AsyncSession, task: Task) -> Task:
+        """Cancel a task.
+
+        A queued task is cancelled at once; a running one is flagged and
+        cancelled by its worker shortly after.
+
+        Args:
+            db: Database session (committed by this call)
+            task: Task to cancel
+
+        Returns:
+            The updated task
+
+        Raises:
+            ValueError: If the task has already finished
+        """
+        if task.status in FINISHED_STATUSES:
+            raise ValueError(f"Task already {task.status.value}")
+        result = await db.execute(
+            update(Task)
+            .where(Task.id == task.id, Task.status.in_((TaskStatus.queued, TaskStatus.running)))
+            .values(
+                cancel_requested=True,
+                status=case(
+                    (Task.status == TaskStatus.queued, literal(TaskStatus.cancelled, Task.status.type)),
+                    else_=Task.status,
+                ),
+                finished_at=case((Task.status == TaskStatus.queued, func.now()), else_=Task.finished_at),
+                payload=case((Task.status == TaskStatus.queued, self._finished_payload(task.kind)), else_=Task.payload),
+            )
+            .returning(Task.status)
+            .execution_options(synchronize_session=False)
+        )
+        updated = result.scalar_one_or_none()
+        await db.commit()
+        if updated is None:
+            await db.refresh(task)
+            raise ValueError(f"Task already {task.status.value}")
+        if updated == TaskStatus.cancelled:
+            TASKS_FINISHED.labels(kind=task.kind, result="cancelled").inc()
+            self._publish(task, TaskStatus.cancelled)
+        elif task.id in self._running:
+            # Running here: no need to wait for the housekeeper
+            self._cancelled.add(task.id)
+            self._running[task.id].cancel()
+        await db.refresh(task)
+        return task
+
+    # Running
+
+    def _wake(self) -> None:
+        for wakeup in self._wakeups:
+            wakeup.set()
+
+    async def _sleep(self, wakeup: asyncio.Event, seconds: float) -> None:
+        """Wait for a wakeup or ``seconds``, whichever comes first."""
+        timer = asyncio.get_running_loop().call_later(seconds, wakeup.set)
+        await wakeup.wait()
+        timer.cancel()
+        wakeup.clear()
+
+    async def _worker(self, wakeup: asyncio.Event) -> None:
+        while not self._stopping:
+            try:
+                task = await self._claim()
+            except Exception:
+                logger.exception("Failed to claim a task")
+                task = None
+            if task is None:
+                await self._sleep(wakeup, self.poll_interval)
+                continue
+            await self._run(task)
+
+    async def _claim(self) -> Optional[Task]:
+        """Mark the oldest due task of a type with a free slot as ours."""
+        async with self._claim_lock:
+            kinds = [kind for kind, spec in self._kinds.items() if self._active[kind] < spec.concurrency]
+            if not kinds or self._stopping:
+                return None
+            candidate = (
+                select(Task.id)
+                .where(Task.status == TaskStatus.queued, Task.run_after <= func.now(), Task.kind.in_(kinds))
+                .order_by(Task.run_after)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            async with self.session_maker() as db:
+                result = await db.execute(
+                    update(Task)
+                    .where(Task.id == candidate)
+                    .values(
+                        status=TaskStatus.running,
+                        attempts=Task.attempts + 1,
+                        locked_by=self.worker_id,
+                        started_at=func.now(),
+                        heartbeat_at=func.now(),
+                    )
+                    .returning(Task)
+                    .execution_options(synchronize_session=False)
+                )
+                task = result.scalar_one_or_none()
+                await db.commit()
+            if task is not None:
+                self._active[task.kind] += 1
+                self._publish(task, TaskStatus.running)
+            return task
+
+    async def _call(self, task: Task) -> TaskOutcome:
+        async with self.session_maker() as db:
+            return await asyncio.wait_for(self._kinds[task.kind].handler(db, task), self.timeout)
+
+    async def _run(self, task: Task) -> None:
+        """Run one attempt and record how it ended."""
+        job = asyncio.create_task(self._call(task), name=f"task-{task.kind}-{task.id}")
+        self._running[task.id] = job
+        started = time.perf_counter()
+        try:
+            with TASKS_IN_PROGRESS.labels(kind=task.kind).track_inprogress():
+                await asyncio.wait([job])
+        finally:
+            del self._running[task.id]
+            self._active[task.kind] -= 1
+            TASK_DURATION.labels(kind=task.kind).observe(time.perf_counter() - started)
+            self._wake()
+
+        try:
+            if job.cancelled():
+                if task.id in self._cancelled:
+                    self._cancelled.discard(task.id)
+                    await self._finish(task, TaskStatus.cancelled, "cancelled", error="Cancelled")
+                else:
+                    # Shutdown: give it back without using up the attempt
+                    await self._finish(task, TaskStatus.queued, "requeued", attempts=task.attempts - 1)
+            elif job.exception() is not None:
+                error = job.exception()
+                message = f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+                if isinstance(error, PERMANENT_ERRORS) or task.attempts >= task.max_attempts:
+                    await self._finish(task, TaskStatus.failed, "failed", error=message)
+                else:
+                    await self._finish(task, TaskStatus.queued, "retried", error=message, retry_in=self._backoff(task.attempts))
+                if not isinstance(error, PERMANENT_ERRORS):
+                    logger.warning("Task %s (%s) attempt %d failed: %s", task.id, task.kind, task.attempts, message)
+            else:
+                outcome = job.result()
+                await self._finish(
+                    task,
+                    TaskStatus.succeeded,
+                    "succeeded",
+                    result=outcome.result,
+                    output=outcome.output,
+                    output_type=outcome.output_type,
+                    output_filename=outcome.output_filename,
+                )
+        except Exception:
+            # The housekeeper requeues it once its heartbeat goes stale
+            logger.exception("Failed to record the outcome of task %s", task.id)
+
+    def _backoff(self, attempts: int) -> float:
+        """Seconds before the next attempt: exponential, with equal jitter."""
+        delay = min(self.backoff_max, self.backoff * 2 ** (attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def _finish(
+        self,
+        task: Task,
+        status: TaskStatus,
+        outcome: str,
+        retry_in: Optional[float] = None,
+        **values: Any,
+    ) -> None:
+        values["status"] = status
+        values["locked_by"] = None
+        values.setdefault("error", None)
+        if status in FINISHED_STATUSES:
+            values["finished_at"] = func.now()
+            values["payload"] = self._finished_payload(task.kind)
+        else:
+            values["run_after"] = func.now() + func.make_interval(0, 0, 0, 0, 0, 0, retry_in or 0)
+        async with self.session_maker() as db:
+            result = await db.execute(
+                update(Task)
+                # Unless the task was requeued as stale meanwhile
+                .where(Task.id == task.id, Task.locked_by == self.worker_id, Task.status == TaskStatus.running)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if result.rowcount:
+            TASKS_FINISHED.labels(kind=task.kind, result=outcome).inc()
+            self._publish(task, status, values["error"], values.get("result"), values.get("output_filename"))
+
+    def _finished_payload(self, kind_name: str):
+        """The payload column, for a task of this kind, without the kind's transient keys."""
+        kind = self._kinds.get(kind_name)
+        if kind is None or not kind.transient_payload:
+            return Task.payload
+        return Task.payload.op("-")(literal(list(kind.transient_payload), postgresql.ARRAY(Text)))
+
+    def _publish(
+        self,
+        task: Task,
+        status: TaskStatus,
+        error: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+        output_filename: Optional[str] = None,
+    ) -> None:
+        """Announce a status change on the task's project channel, if it has a project."""
+        project_id = (task.payload or {}).get("project_id")
+        if not project_id:
+            return
+        event_bus.publish(UUID(project_id), "task.updated", {
+            "id": str(task.id),
+            "kind": task.kind,
+            "status": status.value,
+            "error": error,
+            "output_filename": output_filename,
+        })
+        success_event = self._kinds[task.kind].success_event if task.kind in self._kinds else None
+        if status == TaskStatus.succeeded and success_event:
+            event_bus.publish(UUID(project_id), success_event, {"task_id": str(task.id), **(result or {})})
+
+    # Heartbeats, cancellation requests and stale tasks
+
+    async def _housekeeper(self) -> None:
+        wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        next_heartbeat = next_recovery = loop.time()
+        while not self._stopping:
+            try:
+                if self._running:
+                    await self._check_running(heartbeat=loop.time() >= next_heartbeat)
+                    if loop.time() >= next_heartbeat:
+                        next_heartbeat = loop.time() + self.stale_after / 4
+                if loop.time() >= next_recovery:
+                    await self._requeue_stale()
+                    next_recovery = loop.time() + self.stale_after / 2
+            except Exception:
+                logger.exception("Task housekeeping failed")
+            await self._sleep(wakeup, self.poll_interval)
+
+    async def _check_running(self, heartbeat: bool) -> None:
+        """Cancel this process's tasks that were flagged, and heartbeat the rest."""
+        ids = list(self._running)
+        async with self.session_maker() as db:
+            if heartbeat:
+                await db.execute(
+                    update(Task)
+                    .where(Task.id.in_(ids), Task.locked_by == self.worker_id)
+                    .values(heartbeat_at=func.now())
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+            result = await db.execute(select(Task.id).where(Task.id.in_(ids), Task.cancel_requested == True))  # noqa: E712
+            for task_id in result.scalars():
+                job = self._running.get(task_id)
+                if job is not None and task_id not in self._cancelled:
+                    self._cancelled.add(task_id)
+                    job.cancel()
+
+    async def _requeue_stale(self) -> None:
+        """Requeue tasks whose worker stopped heartbeating.
+
+        Ones out of attempts fail, and ones flagged for cancellation are
+        cancelled instead; those drop their transient payload like any
+        finished task.
+        """
+        lost = Task.attempts >= Task.max_attempts
+        cancelled = Task.cancel_requested == True  # noqa: E712
+        transient = [
+            (Task.kind == name, self._finished_payload(name))
+            for name, kind in self._kinds.items() if kind.transient_payload
+        ]
+        finished_payload = case(*transient, else_=Task.payload) if transient else Task.payload
+        async with self.session_maker() as db:
+            result = await db.execute(
+                update(Task)
+                .where(
+                    Task.status == TaskStatus.running,
+                    Task.heartbeat_at < func.now() - func.make_interval(0, 0, 0, 0, 0, 0, self.stale_after),
+                )
+                .values(
+                    status=case(
+                        (cancelled, literal(TaskStatus.cancelled, Task.status.type)),
+                        (lost, literal(TaskStatus.failed, Task.status.type)),
+                        else_=literal(TaskStatus.queued, Task.status.type),
+                    ),
+                    error=case((cancelled, "Cancelled"), (lost, "Worker lost"), else_=Task.error),
+                    finished_at=case((cancelled | lost, func.now()), else_=None),
+                    payload=case((cancelled | lost, finished_payload), else_=Task.payload),
+                    run_after=func.now(),
+                    locked_by=None,
+                )
+                .returning(Task.id, Task.kind, Task.status)
+                .execution_options(synchronize_session=False)
+            )
+            stale = result.all()
+            await db.commit()
+        for task_id, kind, status in stale:
+            TASKS_FINISHED.labels(kind=kind, result=STALE_OUTCOMES[status]).inc()
+            logger.warning("Task %s (%s) lost its worker; now %s", task_id, kind, status.value)
+
+
+# Singleton instance
+task_runner = TaskRunner(
+    workers=settings.TASK_WORKERS,
+    concurrency=settings.task_concurrency_map,
+    poll_interval=settings.TASK_POLL_INTERVAL_SECONDS,
+    timeout=settings.TASK_TIMEOUT_SECONDS,
+    backoff=settings.TASK_RETRY_BACKOFF_SECONDS,
+    backoff_max=settings.TASK_RETRY_BACKOFF_MAX_SECONDS,
+    stale_after=settings.TASK_STALE_SECONDS,
+    shutdown_grace=settings.TASK_SHUTDOWN_GRACE_SECONDS,
+)
@@ -0,0 +1,517 @@
+"""Columnar in-memory snapshot of the venue catalogue."""
+import asyncio
+import math
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.venue import Venue
+from app.services.facility_index import LabelBitsetIndex, LabelDictionary
+from app.services.geocoding import EARTH_RADIUS_KM
+
+# Kilometres per degree of latitude (and of longitude at the equator)
+KM_PER_DEGREE = 2 * np.pi * EARTH_RADIUS_KM / 360.0
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km from one point to arrays of points."""
+    phi1 = np.radians(lat)
+    phi2 = np.radians(lats)
+    dphi = phi2 - phi1
+    dlmb = np.radians(lngs - lng)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+def longitude_delta(lat: float, dlat: float) -> Optional[float]:
+    """Half-width, in degrees of longitude, of a radius search's bounding box.
+
+    Args:
+        lat: Latitude of the centre
+        dlat: Half-height of the box in degrees of latitude
+
+    Returns:
+        The half-width, or None near the poles, where the box spans every
+        longitude
+    """
+    cos_lat = math.cos(math.radians(min(abs(lat) + dlat, 90.0)))
+    if cos_lat <= 1e-6:
+        return None
+    dlng = dlat / cos_lat
+    return dlng if dlng < 180.0 else None
+
+
+class VenueCatalogue:
+    """Read model holding the non-deleted venue catalogue as columnar arrays.
+
+    Each venue is one row across parallel arrays: capacity as int32, city as
+    an interned int32 id, coordinates as float64 (NaN when not geocoded),
+    and facilities and event types as bitsets packed into uint64 words (see
+    LabelBitsetIndex). Radius searches use a latitude-sorted index: a
+    binary search narrows the rows to the latitude band, a longitude check
+    trims the band to the bounding box, and only those rows get an exact
+    haversine distance.
+    Filtering, sorting and scoring work on whole columns with NumPy instead
+    of querying Postgres or iterating over ORM objects.
+
+    The snapshot is kept current incrementally: each refresh only reads rows
+    whose ``updated_at`` is past the last watermark (soft deletes bump
+    ``updated_at`` too, so they are picked up the same way). Deleted rows are
+    masked out and compacted away on the periodic full reload.
+    """
+
+    # Re-read this much history on each refresh so rows committed by
+    # transactions that started before the watermark are not missed
+    WATERMARK_OVERLAP = timedelta(seconds=30)
+    # Force a full reload once this share of rows are dead
+    MAX_DEAD_FRACTION = 0.25
+
+    def __init__(self):
+        self.ids: List[UUID] = []
+        self.names: List[str] = []
+        self.row_of: Dict[UUID, int] = {}
+        self.alive = np.zeros(0, dtype=bool)
+        self.capacity = np.zeros(0, dtype=np.int32)
+        self.city_ids = np.zeros(0, dtype=np.int32)
+        self.latitude = np.zeros(0, dtype=np.float64)
+        self.longitude = np.zeros(0, dtype=np.float64)
+        self.cities = LabelDictionary()
+        self.facilities = LabelBitsetIndex()
+        self.event_types = LabelBitsetIndex()
+
+        self.watermark: Optional[datetime] = None
+        self.loaded_at: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+        self.refreshed_at_wall: Optional[datetime] = None
+        self.full_loads = 0
+        self.incremental_refreshes = 0
+        self.rows_applied = 0
+        # Bumped whenever rows change, for caches derived from them elsewhere
+        self.version = 0
+
+        self._name_order: Optional[np.ndarray] = None
+        self._lat_order: Optional[np.ndarray] = None
+        self._city_keys: Optional[List[str]] = None
+        self._dirty = False
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _select_rows(self):
+        """Columns the snapshot is built from."""
+        return select(
+            Venue.id,
+            Venue.name,
+            Venue.city,
+            Venue.capacity,
+            Venue.facilities,
+            Venue.event_types,
+            Venue.latitude,
+            Venue.longitude,
+            Venue.is_deleted,
+            Venue.updated_at,
+        )
+
+    async def load(self, db: AsyncSession) -> None:
+        """Rebuild the snapshot from scratch.
+
+        Args:
+            db: Database session
+        """
+        result = await db.execute(self._select_rows().where(Venue.is_deleted == False))
+        rows = result.all()
+
+        cities = LabelDictionary()
+        facilities = LabelBitsetIndex()
+        event_types = LabelBitsetIndex()
+        city_ids = np.empty(len(rows), dtype=np.int32)
+        capacity = np.empty(len(rows), dtype=np.int32)
+        latitude = np.full(len(rows), np.nan, dtype=np.float64)
+        longitude = np.full(len(rows), np.nan, dtype=np.float64)
+        facility_ids: List[List[int]] = []
+        event_type_ids: List[List[int]] = []
+
+        for i, row in enumerate(rows):
+            city_ids[i] = cities.intern(row.city)
+            capacity[i] = row.capacity
+            if row.latitude is not None and row.longitude is not None:
+                latitude[i] = row.latitude
+                longitude[i] = row.longitude
+            facility_ids.append(facilities.intern_all(row.facilities))
+            event_type_ids.append(event_types.intern_all(row.event_types))
+
+        facilities.build(facility_ids)
+        event_types.build(event_type_ids)
+
+        self.ids = [row.id for row in rows]
+        self.names = [row.name for row in rows]
+        self.row_of = {venue_id: i for i, venue_id in enumerate(self.ids)}
+        self.alive = np.ones(len(rows), dtype=bool)
+        self.capacity = capacity
+        self.city_ids = city_ids
+        self.latitude = latitude
+        self.longitude = longitude
+        self.cities = cities
+        self.facilities = facilities
+        self.event_types = event_types
+        self.watermark = max((row.updated_at for row in rows), default=None)
+        self.version += 1
+        self._name_order = None
+        self._lat_order = None
+        self._city_keys = None
+
+        now = time.monotonic()
+        self.loaded_at = now
+        self.refreshed_at = now
+        self.refreshed_at_wall = datetime.now(timezone.utc)
+        self.full_loads += 1
+        self.rows_applied += len(rows)
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """Apply venue rows changed since the last watermark.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of changed rows applied
+        """
+        if self.watermark is None:
+            await self.load(db)
+            return len(self)
+
+        result = await db.execute(
+            self._select_rows().where(Venue.updated_at > self.watermark - self.WATERMARK_OVERLAP)
+        )
+        rows = result.all()
+
+        new_ids: List[UUID] = []
+        new_names: List[str] = []
+        new_capacity: List[int] = []
+        new_city_ids: List[int] = []
+        new_points: List[Tuple[float, float]] = []
+        new_facilities: List[List[int]] = []
+        new_event_types: List[List[int]] = []
+        updated_rows: List[int] = []
+        updated_facilities: List[List[int]] = []
+        updated_event_types: List[List[int]] = []
+
+        for row in rows:
+            existing = self.row_of.get(row.id)
+
+            if row.is_deleted:
+                if existing is not None:
+                    self.alive[existing] = False
+                    del self.row_of[row.id]
+                continue
+
+            city_id = self.cities.intern(row.city)
+            facility_ids = self.facilities.intern_all(row.facilities)
+            event_type_ids = self.event_types.intern_all(row.event_types)
+            point = (
+                (row.latitude, row.longitude)
+                if row.latitude is not None and row.longitude is not None
+                else (np.nan, np.nan)
+            )
+
+            if existing is None:
+                new_ids.append(row.id)
+                new_names.append(row.name)
+                new_capacity.append(row.capacity)
+                new_city_ids.append(city_id)
+                new_points.append(point)
+                new_facilities.append(facility_ids)
+                new_event_types.append(event_type_ids)
+            else:
+                self.names[existing] = row.name
+                self.capacity[existing] = row.capacity
+                self.city_ids[existing] = city_id
+                self.latitude[existing], self.longitude[existing] = point
+                updated_rows.append(existing)
+                updated_facilities.append(facility_ids)
+                updated_event_types.append(event_type_ids)
+
+        self.facilities.set_rows(updated_rows, updated_facilities)
+        self.event_types.set_rows(updated_rows, updated_event_types)
+
+        if new_ids:
+            start = len(self.ids)
+            self.ids.extend(new_ids)
+            self.names.extend(new_names)
+            self.row_of.update({venue_id: start + i for i, venue_id in enumerate(new_ids)})
+            self.alive = np.concatenate([self.alive, np.ones(len(new_ids), dtype=bool)])
+            self.capacity = np.concatenate([self.capacity, np.array(new_capacity, dtype=np.int32)])
+            self.city_ids = np.concatenate([self.city_ids, np.array(new_city_ids, dtype=np.int32)])
+            points = np.array(new_points, dtype=np.float64).reshape(-1, 2)
+            self.latitude = np.concatenate([self.latitude, points[:, 0]])
+            self.longitude = np.concatenate([self.longitude, points[:, 1]])
+            self.facilities.append_rows(new_facilities)
+            self.event_types.append_rows(new_event_types)
+
+        if rows:
+            self.watermark = max(self.watermark, max(row.updated_at for row in rows))
+            self.version += 1
+            self._name_order = None
+            self._lat_order = None
+            self._city_keys = None
+
+        self.refreshed_at = time.monotonic()
+        self.refreshed_at_wall = datetime.now(timezone.utc)
+        self.incremental_refreshes += 1
+        self.rows_applied += len(rows)
+        return len(rows)
+
+    def mark_dirty(self) -> None:
+        """Flag that venues changed in this process so the next read refreshes."""
+        self._dirty = True
+
+    def invalidate(self) -> None:
+        """Force a full reload on the next read (e.g. after bulk loads or TRUNCATE)."""
+        self.loaded_at = None
+
+    async def ensure_fresh(self, db: AsyncSession) -> "VenueCatalogue":
+        """Bring the snapshot up to date before serving a read.
+
+        Loads on first use, reloads fully every VENUE_CATALOGUE_TTL_SECONDS
+        (or when too many rows are dead), and otherwise applies incremental
+        changes when the snapshot is older than
+        VENUE_CATALOGUE_REFRESH_SECONDS or a local write marked it dirty.
+
+        Args:
+            db: Database session
+
+        Returns:
+            The catalogue itself, for chaining
+        """
+        async with self._lock:
+            now = time.monotonic()
+            needs_reload = (
+                self.loaded_at is None
+                or now - self.loaded_at > settings.VENUE_CATALOGUE_TTL_SECONDS
+                or self.dead_rows > self.MAX_DEAD_FRACTION * max(len(self), 1)
+            )
+            if needs_reload:
+                self._dirty = False
+                await self.load(db)
+            elif self._dirty or now - self.refreshed_at > settings.VENUE_CATALOGUE_REFRESH_SECONDS:
+                self._dirty = False
+                await self.refresh(db)
+        return self
+
+    @property
+    def dead_rows(self) -> int:
+        """Rows of venues deleted since the last full load."""
+        return int(len(self.alive) - np.count_nonzero(self.alive))
+
+    def city_keys_longest_first(self) -> List[str]:
+        """Normalised city names, longest first (cached until rows change)."""
+        if self._city_keys is None:
+            self._city_keys = sorted(self.cities.ids, key=len, reverse=True)
+        return self._city_keys
+
+    def _sorted_by_name(self) -> np.ndarray:
+        """Row indices in VENUE_NAME_SORT_KEY order (cached until rows change).
+
+        Lowercased names compared by code point, then ids, which is how
+        Postgres orders ``lower(name) COLLATE "C", id``.
+        """
+        if self._name_order is None or len(self._name_order) != len(self.names):
+            names = np.array([name.lower() for name in self.names], dtype=str)
+            # Hex strings of UUIDs sort like the UUIDs
+            ids = np.array([str(venue_id) for venue_id in self.ids], dtype=str)
+            self._name_order = np.lexsort((ids, names))
+        return self._name_order
+
+    def _sorted_by_latitude(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Geocoded rows ordered by latitude, with their sorted latitudes (cached)."""
+        if self._lat_order is None:
+            geocoded = np.flatnonzero(~np.isnan(self.latitude))
+            self._lat_order = geocoded[np.argsort(self.latitude[geocoded], kind="stable")]
+        return self._lat_order, self.latitude[self._lat_order]
+
+    def distances_from(self, lat: float, lng: float) -> np.ndarray:
+        """Distance in km from a point to every row (NaN when not geocoded)."""
+        return haversine_km(lat, lng, self.latitude, self.longitude)
+
+    def within_radius(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows within radius_km of a point, using the latitude index.
+
+        Args:
+            lat: Latitude of the centre
+            lng: Longitude of the centre
+            radius_km: Search radius in kilometres
+
+        Returns:
+            Tuple of (row indices, their distances in km), unordered
+        """
+        order, sorted_lat = self._sorted_by_latitude()
+        dlat = radius_km / KM_PER_DEGREE
+        lo = int(np.searchsorted(sorted_lat, lat - dlat, side="left"))
+        hi = int(np.searchsorted(sorted_lat, lat + dlat, side="right"))
+        rows = order[lo:hi]
+
+        # Trim the band to the bounding box
+        dlng = longitude_delta(lat, dlat)
+        if dlng is not None:
+            offset = np.abs((self.longitude[rows] - lng + 180.0) % 360.0 - 180.0)
+            rows = rows[offset <= dlng]
+
+        distances = haversine_km(lat, lng, self.latitude[rows], self.longitude[rows])
+        keep = distances <= radius_km
+        return rows[keep], distances[keep]
+
+    def filter_mask(
+        self,
+        *,
+        city: Optional[str] = None,
+        min_capacity: Optional[int] = None,
+        facilities: Optional[List[str]] = None,
+        event_types: Optional[List[str]] = None,
+    ) -> np.ndarray:
+        """Boolean mask of live rows matching the venue list filters.
+
+        Args:
+            city: City name (case-insensitive)
+            min_capacity: Minimum capacity
+            facilities: Facilities the venue must ALL have
+            event_types: Event types the venue must ALL support
+
+        Returns:
+            Boolean array with one entry per row
+        """
+        mask = self.alive.copy()
+
+        if city:
+            city_id = self.cities.get(city)
+            if city_id is None:
+                return np.zeros_like(mask)
+            mask &= self.city_ids == city_id
+
+        if min_capacity:
+            mask &= self.capacity >= min_capacity
+
+        if facilities:
+            mask &= self.facilities.contains_all(facilities)
+
+        if event_types:
+            mask &= self.event_types.contains_all(event_types)
+
+        return mask
+
+    def query(
+        self,
+        *,
+        city: Optional[str] = None,
+        min_capacity: Optional[int] = None,
+        facilities: Optional[List[str]] = None,
+        event_types: Optional[List[str]] = None,
+        near: Optional[Tuple[float, float]] = None,
+        radius_km: Optional[float] = None,
+        page: int = 1,
+        page_size: int = 20,
+        with_facets: bool = False,
+    ) -> Tuple[List[UUID], int, Optional[Dict[str, Dict[str, int]]]]:
+        """Filter, sort and paginate without touching Postgres.
+
+        Results are ordered by name (VENUE_NAME_SORT_KEY, the order the SQL
+        path uses), or by distance when ``near`` is given (venues without
+        coordinates are then excluded).
+
+        Args:
+            city: City name (case-insensitive)
+            min_capacity: Minimum capacity
+            facilities: Facilities the venue must ALL have
+            event_types: Event types the venue must ALL support
+            near: (latitude, longitude) to sort by distance from
+            radius_km: Only venues within this distance of ``near``
+            page: Page number (1-indexed)
+            page_size: Number of items per page
+            with_facets: Also count facilities and event types over the matches
+
+        Returns:
+            Tuple of (venue ids for the page in order, total matches, facets or None)
+        """
+        mask = self.filter_mask(
+            city=city,
+            min_capacity=min_capacity,
+            facilities=facilities,
+            event_types=event_types,
+        )
+        if near is not None:
+            lat, lng = near
+            if radius_km is not None:
+                rows, distances = self.within_radius(lat, lng, radius_km)
+            else:
+                rows = self._sorted_by_latitude()[0]
+                distances = haversine_km(lat, lng, self.latitude[rows], self.longitude[rows])
+            keep = mask[rows]
+            rows, distances = rows[keep], distances[keep]
+            # Ties in distance fall back to the name order, as in SQL
+            name_rank = np.empty(len(self.ids), dtype=np.int64)
+            name_rank[self._sorted_by_name()] = np.arange(len(self.ids))
+            matching = rows[np.lexsort((name_rank[rows], distances))]
+
+            mask = np.zeros_like(mask)
+            mask[matching] = True
+        else:
+            order = self._sorted_by_name()
+            matching = order[mask[order]]
+
+        start = (page - 1) * page_size
+        page_rows = matching[start:start + page_size]
+
+        facets = None
+        if with_facets:
+            facets = {
+                "facilities": self.facilities.counts(mask),
+                "event_types": self.event_types.counts(mask),
+            }
+
+        return [self.ids[row] for row in page_rows], int(matching.size), facets
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the snapshot (arrays + Python lists)."""
+        arrays = self.alive.nbytes + self.capacity.nbytes + self.city_ids.nbytes
+        arrays += self.latitude.nbytes + self.longitude.nbytes
+        arrays += self.facilities.nbytes + self.event_types.nbytes
+        if self._name_order is not None:
+            arrays += self._name_order.nbytes
+        if self._lat_order is not None:
+            arrays += self._lat_order.nbytes
+        lists = sys.getsizeof(self.ids) + sys.getsizeof(self.names)
+        lists += sum(sys.getsizeof(v) for v in self.ids) + sum(sys.getsizeof(n) for n in self.names)
+        lists += sys.getsizeof(self.row_of)
+        return int(arrays + lists)
+
+    def stats(self) -> dict:
+        """Size, memory and staleness figures for monitoring."""
+        now = time.monotonic()
+        return {
+            "rows": len(self),
+            "live_rows": len(self) - self.dead_rows,
+            "dead_rows": self.dead_rows,
+            "cities": len(self.cities),
+            "geocoded_rows": int(np.count_nonzero(self.alive & ~np.isnan(self.latitude))),
+            "facilities": len(self.facilities),
+            "event_types": len(self.event_types),
+            "memory_bytes": self.memory_bytes(),
+            "watermark": self.watermark,
+            "last_refresh_at": self.refreshed_at_wall,
+            "seconds_since_refresh": None if self.refreshed_at is None else round(now - self.refreshed_at, 3),
+            "seconds_since_full_load": None if self.loaded_at is None else round(now - self.loaded_at, 3),
+            "full_loads": self.full_loads,
+            "incremental_refreshes": self.incremental_refreshes,
+            "rows_applied": self.rows_applied,
+        }
+
+
+# Singleton instance
+venue_catalogue = VenueCatalogue()
@@ -0,0 +1,244 @@
+"""Project-to-venue match scoring."""
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.project import Project
+from app.models.project_venue import ProjectVenue
+from app.services.facility_index import normalize_label, popcount
+from app.services.geocoding import geocoding_service
+from app.services.venue_catalogue import VenueCatalogue, venue_catalogue
+from app.services.venue_service import venue_service
+
+
+class VenueMatchingService:
+    """Rank catalogue venues against a project's requirements.
+
+    Every candidate is scored in one vectorised pass over the columnar
+    catalogue snapshot. Criteria the project does not specify (no
+    requirements, no location, no budget) are left out of the weighted sum
+    rather than counted as a match or a miss.
+
+    Past quoted prices are aggregated over all shortlists, so they are
+    cached and re-read at most every VENUE_CATALOGUE_REFRESH_SECONDS. Their
+    per-row array is rebuilt only when the prices or the catalogue's rows
+    change.
+    """
+
+    WEIGHTS = {
+        "capacity": 0.35,
+        "requirements": 0.35,
+        "location": 0.20,
+        "price": 0.10,
+    }
+    # Score given to venues with no quote history when the project has a budget
+    UNKNOWN_PRICE_SCORE = 0.5
+    # Location score falls linearly from 1 at the preferred spot to 0 here
+    LOCATION_RADIUS_KM = 50.0
+
+    def __init__(self):
+        self._prices: Dict[UUID, float] = {}
+        self._prices_read_at: Optional[float] = None
+        self._prices_version = 0
+        self._prices_lock = asyncio.Lock()
+        self._per_head: Optional[np.ndarray] = None
+        self._per_head_key: Optional[tuple] = None
+
+    async def suggest(
+        self,
+        db: AsyncSession,
+        project: Project,
+        *,
+        limit: int = 10,
+        include_shortlisted: bool = False,
+    ) -> Tuple[List[dict], int]:
+        """Return the top-scoring venues for a project.
+
+        Args:
+            db: Database session
+            project: Project to match against (with project_venues loaded)
+            limit: Maximum number of suggestions
+            include_shortlisted: Whether venues already on the project are candidates
+
+        Returns:
+            Tuple of (suggestions ordered by score, number of candidates scored)
+        """
+        prices = await self._quoted_prices(db)
+        catalogue = await venue_catalogue.ensure_fresh(db)
+        # A concurrent refresh or reload rebinds the catalogue's arrays at
+        # its awaits, so everything read from the catalogue is read between
+        # here and the venue fetch below, which has no await in between.
+        if not len(catalogue):
+            return [], 0
+
+        scores = self._score(catalogue, project)
+        per_head = self._per_head_prices(catalogue, prices)
+        scores["price"] = self._price_score(per_head, project)
+
+        total = np.zeros(len(catalogue), dtype=np.float64)
+        weight_sum = 0.0
+        for criterion, values in scores.items():
+            if values is None:
+                continue
+            total += self.WEIGHTS[criterion] * values
+            weight_sum += self.WEIGHTS[criterion]
+        if weight_sum:
+            total /= weight_sum
+
+        # Venues that cannot seat the group are not candidates
+        candidates = catalogue.alive & (catalogue.capacity >= project.attendee_count)
+        if not include_shortlisted:
+            for pv in project.project_venues:
+                row = catalogue.row_of.get(pv.venue_id)
+                if row is not None:
+                    candidates[row] = False
+
+        candidate_rows = np.flatnonzero(candidates)
+        if candidate_rows.size == 0:
+            return [], 0
+
+        k = min(limit, candidate_rows.size)
+        candidate_scores = total[candidate_rows]
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+        top = top[np.argsort(-candidate_scores[top], kind="stable")]
+        top_rows = candidate_rows[top]
+        top_ids = [catalogue.ids[row] for row in top_rows]
+
+        venues = {venue.id: venue for venue in await venue_service.get_many(db, top_ids)}
+
+        suggestions = []
+        for venue_id, row in zip(top_ids, top_rows):
+            venue = venues.get(venue_id)
+            if venue is None:
+                # Deleted since the snapshot was taken
+                continue
+            estimate = per_head[row] * project.attendee_count
+            suggestions.append({
+                "venue": venue,
+                "score": round(float(total[row]), 4),
+                "capacity_score": self._component(scores["capacity"], row),
+                "requirement_score": self._component(scores["requirements"], row),
+                "location_score": self._component(scores["location"], row),
+                "price_score": self._component(scores["price"], row),
+                "estimated_price": None if np.isnan(estimate) else round(float(estimate), 2),
+            })
+
+        return suggestions, int(candidate_rows.size)
+
+    def _score(self, catalogue: VenueCatalogue, project: Project) -> Dict[str, Optional[np.ndarray]]:
+        """Compute the catalogue-only criteria (capacity, requirements, location)."""
+        capacity = catalogue.capacity.astype(np.float64)
+        attendees = float(project.attendee_count)
+
+        # Best fit is a room the size of the group; oversized rooms decay slowly
+        capacity_score = np.where(capacity >= attendees, np.sqrt(attendees / np.maximum(capacity, 1.0)), 0.0)
+
+        requirement_score = None
+        requirements = [r for r in project.requirements or [] if r.strip()]
+        if requirements:
+            wanted = catalogue.facilities.encode(requirements)
+            matched = popcount(catalogue.facilities.bits & wanted)
+            requirement_score = matched / float(len(requirements))
+
+        location_score = None
+        city_id = self._resolve_city(catalogue, project.location_preference)
+        city_match = None
+        if city_id is not None:
+            city_match = (catalogue.city_ids == city_id).astype(np.float64)
+        location_score = city_match
+
+        point = geocoding_service.geocode(project.location_preference)
+        if point is not None:
+            distances = catalogue.distances_from(*point)
+            with np.errstate(invalid="ignore"):
+                by_distance = np.clip(1.0 - distances / self.LOCATION_RADIUS_KM, 0.0, 1.0)
+            # Venues that have not been geocoded fall back to the city match
+            fallback = city_match if city_match is not None else 0.0
+            location_score = np.where(np.isnan(distances), fallback, by_distance)
+
+        return {
+            "capacity": capacity_score,
+            "requirements": requirement_score,
+            "location": location_score,
+        }
+
+    def _resolve_city(self, catalogue: VenueCatalogue, preference: Optional[str]) -> Optional[int]:
+        """Map a free-text location preference to a catalogue city id.
+
+        Tries an exact (normalised) match first, then looks for a known city
+        name inside the preference, e.g. "Brussels, Belgium" or "central Ghent".
+        """
+        if not preference:
+            return None
+        city_id = catalogue.cities.get(preference)
+        if city_id is not None:
+            return city_id
+
+        text = f" {normalize_label(preference)} "
+        # Longest names first so "New York" wins over "York"
+        for key in catalogue.city_keys_longest_first():
+            if f" {key} " in text or f" {key}," in text:
+                return catalogue.cities.ids[key]
+        return None
+
+    async def _quoted_prices(self, db: AsyncSession) -> Dict[UUID, float]:
+        """Average past quoted price per attendee by venue id (cached)."""
+        async with self._prices_lock:
+            max_age = settings.VENUE_CATALOGUE_REFRESH_SECONDS
+            if self._prices_read_at is None or time.monotonic() - self._prices_read_at > max_age:
+                result = await db.execute(
+                    select(
+                        ProjectVenue.venue_id,
+                        func.avg(ProjectVenue.quoted_price / Project.attendee_count),
+                    )
+                    .join(Project, Project.id == ProjectVenue.project_id)
+                    .where(ProjectVenue.quoted_price.isnot(None))
+                    .group_by(ProjectVenue.venue_id)
+                )
+                self._prices = {venue_id: float(price) for venue_id, price in result.all()}
+                self._prices_read_at = time.monotonic()
+                self._prices_version += 1
+        return self._prices
+
+    def _per_head_prices(self, catalogue: VenueCatalogue, prices: Dict[UUID, float]) -> np.ndarray:
+        """Past quoted price per attendee for each catalogue row (NaN if none).
+
+        ``prices`` must be the ones last returned by ``_quoted_prices``: the
+        array is cached until they are re-read or the catalogue's rows change.
+        """
+        key = (catalogue, catalogue.version, self._prices_version)
+        if self._per_head_key != key:
+            rows = np.fromiter(
+                (catalogue.row_of.get(venue_id, -1) for venue_id in prices), dtype=np.int64, count=len(prices)
+            )
+            values = np.fromiter(prices.values(), dtype=np.float64, count=len(prices))
+            known = rows >= 0
+            per_head = np.full(len(catalogue), np.nan, dtype=np.float64)
+            per_head[rows[known]] = values[known]
+            self._per_head, self._per_head_key = per_head, key
+        return self._per_head
+
+    def _price_score(self, per_head: np.ndarray, project: Project) -> Optional[np.ndarray]:
+        """Score estimated cost against budget: 1 within budget, decaying above it."""
+        if not project.budget:
+            return None
+        estimate = per_head * project.attendee_count
+        with np.errstate(divide="ignore", invalid="ignore"):
+            score = np.clip(float(project.budget) / estimate, 0.0, 1.0)
+        return np.where(np.isnan(estimate), self.UNKNOWN_PRICE_SCORE, score)
+
+    def _component(self, values: Optional[np.ndarray], row: int) -> Optional[float]:
+        """Extract a single criterion score for the response."""
+        if values is None:
+            return None
+        return round(float(values[row]), 4)
+
+
+# Singleton instance
+venue_matching_service = VenueMatchingService()
@@ -1,13 +1,36 @@
 """Venue service for database operations."""
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import ColumnElement, Select, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.venue import Venue
+from app.config import settings
+from app.models.venue import (
+    VENUE_CITY_KEY,
+    VENUE_EVENT_TYPE_KEYS,
+    VENUE_FACILITY_KEYS,
+    VENUE_NAME_SORT_KEY,
+    Venue,
+)
 from app.schemas.venue import VenueCreate, VenueUpdate
+from app.services.facility_index import normalize_label
+from app.services.geocoding import EARTH_RADIUS_KM, geocoding_service, haversine_km
+from app.services.projection import Projection
+from app.services.venue_catalogue import KM_PER_DEGREE, longitude_delta, venue_catalogue
+
+
+def distance_km_expr(lat: float, lng: float) -> ColumnElement[float]:
+    """SQL haversine distance in km from a point to each venue."""
+    dlat = func.radians(Venue.latitude - lat)
+    dlng = func.radians(Venue.longitude - lng)
+    a = (
+        func.power(func.sin(dlat * 0.5), 2)
+        + func.cos(func.radians(lat)) * func.cos(func.radians(Venue.latitude))
+        * func.power(func.sin(dlng * 0.5), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(a)))
 
 
 class VenueService:
@@ -39,58 +62,210 @@ class VenueService:
         result = await db.execute(query)
         return result.scalar_one_or_none()
     
-    async def get_list(
+    async def get_many(
         self,
         db: AsyncSession,
+        venue_ids: List[UUID],
+        options: Optional[list] = None,
+    ) -> List[Venue]:
+        """Get non-deleted venues by ID with photos, in the order given.
+        
+        Args:
+            db: Database session
+            venue_ids: Venue UUIDs
+            options: Loader options replacing the default photo eager load
+            
+        Returns:
+            Venues found, ordered like venue_ids (missing or deleted ones are skipped)
+        """
+        if not venue_ids:
+            return []
+        
+        if options is None:
+            options = [selectinload(Venue.photos)]
+        result = await db.execute(
+            select(Venue)
+            .options(*options)
+            .where(Venue.id.in_(venue_ids), Venue.is_deleted == False)
+        )
+        by_id = {venue.id: venue for venue in result.scalars().all()}
+        return [by_id[venue_id] for venue_id in venue_ids if venue_id in by_id]
+    
+    def build_list_query(
+        self,
         *,
         city: Optional[str] = None,
         min_capacity: Optional[int] = None,
         facilities: Optional[List[str]] = None,
-        page: int = 1,
-        page_size: int = 20,
-    ) -> Tuple[List[Venue], int]:
-        """Get paginated list of venues with filtering.
+        event_types: Optional[List[str]] = None,
+        near: Optional[Tuple[float, float]] = None,
+        radius_km: Optional[float] = None,
+    ) -> Select:
+        """Build the filtered venue query used by get_list (no paging/order).
+        
+        The predicates are written to match the partial indexes on the
+        venues table (``NOT is_deleted`` and VENUE_CITY_KEY), so keep them
+        in sync with the indexes declared in app/models/venue.py. Labels
+        and cities are compared normalised, as in the venue catalogue, so
+        both paths return the same venues.
         
         Args:
-            db: Database session
             city: Filter by city (case-insensitive)
             min_capacity: Minimum capacity filter
             facilities: Filter venues that have ALL specified facilities
-            page: Page number (1-indexed)
-            page_size: Number of items per page
+            event_types: Filter venues that support ALL specified event types
+            near: (latitude, longitude); restricts to geocoded venues
+            radius_km: Only venues within this distance of ``near``
             
         Returns:
-            Tuple of (venues list, total count)
+            Select statement for matching venues
         """
         # Build base query (exclude soft deleted)
         query = select(Venue).where(Venue.is_deleted == False)
         
         # Apply filters
         if city:
-            query = query.where(func.lower(Venue.city) == city.lower())
+            query = query.where(VENUE_CITY_KEY == normalize_label(city))
         
         if min_capacity:
             query = query.where(Venue.capacity >= min_capacity)
         
         if facilities:
             # PostgreSQL array contains - venue must have ALL specified facilities
-            query = query.where(Venue.facilities.contains(facilities))
+            # (matched like the venue catalogue does; ix_venues_facility_keys_active)
+            wanted = [normalize_label(facility) for facility in facilities]
+            query = query.where(VENUE_FACILITY_KEYS.contains(wanted))
+        
+        if event_types:
+            wanted = [normalize_label(event_type) for event_type in event_types]
+            query = query.where(VENUE_EVENT_TYPE_KEYS.contains(wanted))
+        
+        if near is not None:
+            lat, lng = near
+            query = query.where(Venue.latitude.isnot(None), Venue.longitude.isnot(None))
+            if radius_km is not None:
+                # Bounding box first so ix_venues_lat_lng_active can narrow
+                # the rows before the exact distance check
+                dlat = radius_km / KM_PER_DEGREE
+                query = query.where(Venue.latitude.between(lat - dlat, lat + dlat))
+                dlng = longitude_delta(lat, dlat)
+                if dlng is not None:
+                    west, east = lng - dlng, lng + dlng
+                    if west < -180.0:
+                        # The box crosses the antimeridian
+                        query = query.where(or_(Venue.longitude >= west + 360.0, Venue.longitude <= east))
+                    elif east > 180.0:
+                        query = query.where(or_(Venue.longitude >= west, Venue.longitude <= east - 360.0))
+                    else:
+                        query = query.where(Venue.longitude.between(west, east))
+                query = query.where(distance_km_expr(lat, lng) <= radius_km)
+        
+        return query
+    
+    async def get_list(
+        self,
+        db: AsyncSession,
+        *,
+        city: Optional[str] = None,
+        min_capacity: Optional[int] = None,
+        facilities: Optional[List[str]] = None,
+        event_types: Optional[List[str]] = None,
+        near: Optional[Tuple[float, float]] = None,
+        radius_km: Optional[float] = None,
+        page: int = 1,
+        page_size: int = 20,
+        with_facets: bool = False,
+        projection: Optional[Projection] = None,
+    ) -> Tuple[List[Venue], int, Optional[Dict[str, Dict[str, int]]]]:
+        """Get paginated list of venues with filtering.
+        
+        Args:
+            db: Database session
+            city: Filter by city (case-insensitive)
+            min_capacity: Minimum capacity filter
+            facilities: Filter venues that have ALL specified facilities
+            event_types: Filter venues that support ALL specified event types
+            near: (latitude, longitude); results are sorted by distance and
+                each venue gets a ``distance_km`` attribute
+            radius_km: Only venues within this distance of ``near``
+            page: Page number (1-indexed)
+            page_size: Number of items per page
+            with_facets: Count facilities and event types over the matches
+                (only available when served from the venue catalogue)
+            projection: Only load the requested fields (all by default)
+            
+        Returns:
+            Tuple of (venues list, total count, facet counts or None)
+        """
+        options = None
+        if projection is not None:
+            # distance_km is computed from the coordinates
+            options = projection.options(Venue, extra_columns=("latitude", "longitude") if near else ())
+        
+        if settings.VENUE_CATALOGUE_ENABLED:
+            # Filter, sort and count in memory; only the page is read from Postgres
+            catalogue = await venue_catalogue.ensure_fresh(db)
+            venue_ids, total, facets = catalogue.query(
+                city=city,
+                min_capacity=min_capacity,
+                facilities=facilities,
+                event_types=event_types,
+                near=near,
+                radius_km=radius_km,
+                page=page,
+                page_size=page_size,
+                with_facets=with_facets,
+            )
+            venues = await self.get_many(db, venue_ids, options)
+            if projection is not None:
+                await projection.load_photos(db, venues)
+            self._set_distances(venues, near)
+            return venues, total, facets
+        
+        query = self.build_list_query(
+            city=city,
+            min_capacity=min_capacity,
+            facilities=facilities,
+            event_types=event_types,
+            near=near,
+            radius_km=radius_km,
+        )
         
         # Get total count
         count_query = select(func.count()).select_from(query.subquery())
         total = await db.scalar(count_query) or 0
         
-        # Apply pagination and ordering
-        query = query.order_by(Venue.name)
+        # Apply pagination and ordering (the same order as the catalogue's)
+        if near is not None:
+            query = query.order_by(distance_km_expr(*near), VENUE_NAME_SORT_KEY, Venue.id)
+        else:
+            query = query.order_by(VENUE_NAME_SORT_KEY, Venue.id)
         query = query.offset((page - 1) * page_size).limit(page_size)
         
         # Load photos eagerly
-        query = query.options(selectinload(Venue.photos))
+        query = query.options(*(options if options is not None else [selectinload(Venue.photos)]))
         
         result = await db.execute(query)
         venues = list(result.scalars().all())
+        if projection is not None:
+            await projection.load_photos(db, venues)
+        self._set_distances(venues, near)
         
-        return venues, total
+        return venues, total, None
+    
+    def _set_distances(self, venues: List[Venue], near: Optional[Tuple[float, float]]) -> None:
+        """Attach distance_km (read by VenueResponse) to venues from a radius search."""
+        if near is None:
+            return
+        for venue in venues:
+            if venue.latitude is not None and venue.longitude is not None:
+                venue.distance_km = round(haversine_km(near[0], near[1], venue.latitude, venue.longitude), 3)
+    
+    def _geocode(self, venue: Venue) -> None:
+        """Fill in coordinates from the gazetteer when none were given."""
+        point = geocoding_service.geocode(venue.city, venue.address)
+        if point is not None:
+            venue.latitude, venue.longitude = point
     
     async def create(
         self,
@@ -106,10 +281,13 @@ class VenueService:
         Returns:
             Created venue object
         """
-        venue = Venue(**venue_data.model_dump())
+        # A new venue has no photos: start the collection out loaded
+        venue = Venue(**venue_data.model_dump(), photos=[])
+        if venue.latitude is None or venue.longitude is None:
+            self._geocode(venue)
         db.add(venue)
         await db.commit()
-        await db.refresh(venue)
+        venue_catalogue.mark_dirty()
         return venue
     
     async def update(
@@ -132,8 +310,13 @@ class VenueService:
         for field, value in update_dict.items():
             setattr(venue, field, value)
         
+        # Re-geocode a moved venue unless the caller supplied coordinates
+        moved = "city" in update_dict or "address" in update_dict
+        if moved and "latitude" not in update_dict and "longitude" not in update_dict:
+            self._geocode(venue)
+        
         await db.commit()
-        await db.refresh(venue)
+        venue_catalogue.mark_dirty()
         return venue
     
     async def soft_delete(
@@ -149,6 +332,7 @@ class VenueService:
         """
         venue.is_deleted = True
         await db.commit()
+        venue_catalogue.mark_dirty()
 
 
 # Singleton instance
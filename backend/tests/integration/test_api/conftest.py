@@ -0,0 +1,86 @@
+"""A signed-in API client whose requests run in the test's transaction."""
+from datetime import date, timedelta
+from uuid import uuid4
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db
+from app.main import app
+from app.models.project import Project
+from app.models.user import User, UserRole
+from app.services.auth import create_access_token
+
+
+@pytest.fixture
+async def user(db_session) -> User:
+    return await _add_user(db_session, "API Test")
+
+
+@pytest.fixture
+async def other_user(db_session) -> User:
+    """A second user, who does not own ``project``."""
+    return await _add_user(db_session, "Other User")
+
+
+async def _add_user(db_session, name: str) -> User:
+    user = User(
+        name=name,
+        email=f"api-test-{uuid4().hex[:8]}@example.com",
+        password_hash="not-a-real-hash",
+        role=UserRole.admin,
+    )
+    db_session.add(user)
+    await db_session.flush()
+    return user
+
+
+@pytest.fixture
+async def project(db_session, user) -> Project:
+    start = date.today() + timedelta(days=60)
+    project = Project(
+        user_id=user.id,
+        client_name="Acme",
+        event_name="Annual Summit",
+        event_date_start=start,
+        event_date_end=start + timedelta(days=1),
+        attendee_count=40,
+    )
+    db_session.add(project)
+    await db_session.flush()
+    return project
+
+
+def _sign_in(client: httpx.AsyncClient, user: User) -> None:
+    token = create_access_token({"sub": user.email, "user_id": str(user.id)})
+    client.headers["Authorization"] = f"Bearer {token}"
+
+
+@pytest.fixture
+def sign_in():
+    """Send the client's further requests as another user: ``sign_in(client, user)``."""
+    return _sign_in
+
+
+@pytest.fixture
+async def client(db_session, user):
+    """An ASGI client signed in as ``user``.
+
+    Each request gets its own session, as in the app, on the test's
+    connection, so everything it commits is rolled back after the test.
+    """
+
+    async def test_db():
+        async with AsyncSession(
+            bind=db_session.bind, expire_on_commit=False, join_transaction_mode="create_savepoint"
+        ) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = test_db
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            _sign_in(client, user)
+            yield client
+    finally:
+        del app.dependency_overrides[get_db]
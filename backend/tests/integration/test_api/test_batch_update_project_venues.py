@@ -0,0 +1,125 @@
+"""PATCH /projects/{id}/venues: all-or-nothing batch updates."""
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, select
+
+from app.models.project_venue import ProjectVenue
+from app.models.venue import Venue
+
+
+@pytest.fixture
+async def shortlist(db_session, project):
+    """Four shortlisted venues, in shortlist (created_at) order."""
+    venues = [Venue(name=f"Venue {i}", city="Brussels", capacity=100) for i in range(4)]
+    db_session.add_all(venues)
+    await db_session.flush()
+    added = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    db_session.add_all([
+        ProjectVenue(project_id=project.id, venue_id=venue.id, created_at=added + timedelta(minutes=i))
+        for i, venue in enumerate(venues)
+    ])
+    await db_session.flush()
+    return [venue.id for venue in venues]
+
+
+@pytest.fixture
+def updates_run(database):
+    """UPDATE statements run on project_venues during the test."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE project_venues"):
+            statements.append(statement)
+
+    event.listen(database.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(database.sync_engine, "before_cursor_execute", record)
+
+
+async def _columns(db_session, project, column):
+    result = await db_session.execute(
+        select(ProjectVenue.venue_id, column).where(ProjectVenue.project_id == project.id)
+    )
+    return dict(result.all())
+
+
+def _url(project) -> str:
+    return f"/api/v1/projects/{project.id}/venues"
+
+
+async def test_items_with_the_same_fields_share_one_update(client, project, shortlist, updates_run, db_session):
+    body = [
+        {"venue_id": str(shortlist[0]), "outreach_status": "sent"},
+        {"venue_id": str(shortlist[1]), "notes": "call back"},
+        {"venue_id": str(shortlist[2]), "outreach_status": "sent"},
+        {"venue_id": str(shortlist[3]), "notes": "too small"},
+    ]
+
+    response = await client.patch(_url(project), json=body)
+
+    assert response.status_code == 200
+    assert len(updates_run) == 2
+    notes = await _columns(db_session, project, ProjectVenue.notes)
+    assert notes == {shortlist[0]: None, shortlist[1]: "call back", shortlist[2]: None, shortlist[3]: "too small"}
+    statuses = await _columns(db_session, project, ProjectVenue.outreach_status)
+    assert [statuses[venue_id].value for venue_id in shortlist] == ["sent", "draft", "sent", "draft"]
+
+
+async def test_response_is_in_shortlist_order(client, project, shortlist):
+    body = [{"venue_id": str(venue_id), "notes": "checked"} for venue_id in reversed(shortlist)]
+
+    response = await client.patch(_url(project), json=body)
+
+    assert response.status_code == 200
+    assert [item["venue_id"] for item in response.json()] == [str(venue_id) for venue_id in shortlist]
+    assert all(item["notes"] == "checked" and item["venue"]["name"] for item in response.json())
+
+
+async def test_duplicate_venue_is_rejected(client, project, shortlist, updates_run):
+    body = [
+        {"venue_id": str(shortlist[0]), "notes": "one"},
+        {"venue_id": str(shortlist[0]), "notes": "two"},
+    ]
+
+    response = await client.patch(_url(project), json=body)
+
+    assert response.status_code == 400
+    assert updates_run == []
+
+
+async def test_venue_not_in_the_project_changes_nothing(client, project, shortlist, updates_run, db_session):
+    unknown = uuid4()
+    body = [
+        {"venue_id": str(shortlist[0]), "notes": "changed"},
+        {"venue_id": str(unknown), "notes": "changed"},
+    ]
+
+    response = await client.patch(_url(project), json=body)
+
+    assert response.status_code == 404
+    assert str(unknown) in response.json()["detail"]
+    assert updates_run == []
+    assert set((await _columns(db_session, project, ProjectVenue.notes)).values()) == {None}
+
+
+async def test_unknown_catering_provider_rolls_back_the_whole_batch(client, project, shortlist, db_session):
+    body = [
+        {"venue_id": str(shortlist[0]), "notes": "changed"},
+        {"venue_id": str(shortlist[1]), "catering_provider_id": str(uuid4())},
+    ]
+
+    response = await client.patch(_url(project), json=body)
+
+    assert response.status_code == 400
+    assert "catering provider" in response.json()["detail"]
+    assert set((await _columns(db_session, project, ProjectVenue.notes)).values()) == {None}
+
+
+async def test_other_users_project_is_not_found(client, project, shortlist, other_user, sign_in):
+    sign_in(client, other_user)
+
+    response = await client.patch(_url(project), json=[{"venue_id": str(shortlist[0]), "notes": "x"}])
+
+    assert response.status_code == 404
@@ -0,0 +1,84 @@
+"""POST /projects/{id}/venues/bulk: insert-or-skip in one statement."""
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.models.project_venue import ProjectVenue
+from app.models.venue import Venue
+
+
+@pytest.fixture
+async def venues(db_session):
+    venues = [Venue(name=f"Venue {i:02d}", city="Ghent", capacity=50) for i in range(31)]
+    db_session.add_all(venues)
+    await db_session.flush()
+    return [venue.id for venue in venues]
+
+
+async def _shortlisted(db_session, project):
+    result = await db_session.execute(select(ProjectVenue.venue_id).where(ProjectVenue.project_id == project.id))
+    return set(result.scalars().all())
+
+
+def _body(venue_ids):
+    return {"venue_ids": [str(venue_id) for venue_id in venue_ids]}
+
+
+def _url(project) -> str:
+    return f"/api/v1/projects/{project.id}/venues/bulk"
+
+
+async def test_splits_created_and_already_present_in_request_order(client, project, venues, db_session):
+    db_session.add_all([ProjectVenue(project_id=project.id, venue_id=venue_id) for venue_id in venues[1:3]])
+    await db_session.flush()
+    requested = [venues[2], venues[0], venues[1], venues[3], venues[0]]
+
+    response = await client.post(_url(project), json=_body(requested))
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "created": [str(venues[0]), str(venues[3])],
+        "already_present": [str(venues[2]), str(venues[1])],
+    }
+    assert await _shortlisted(db_session, project) == set(venues[:4])
+
+
+async def test_adding_the_same_venues_again_creates_nothing(client, project, venues):
+    await client.post(_url(project), json=_body(venues[:5]))
+
+    response = await client.post(_url(project), json=_body(venues[:5]))
+
+    assert response.json() == {"created": [], "already_present": [str(venue_id) for venue_id in venues[:5]]}
+
+
+async def test_one_missing_venue_adds_nothing(client, project, venues, db_session):
+    unknown = uuid4()
+
+    response = await client.post(_url(project), json=_body([venues[0], unknown, venues[1]]))
+
+    assert response.status_code == 404
+    assert str(unknown) in response.json()["detail"]
+    assert await _shortlisted(db_session, project) == set()
+
+
+async def test_deleted_venue_is_missing(client, project, venues, db_session):
+    deleted = await db_session.get(Venue, venues[0])
+    deleted.is_deleted = True
+    await db_session.flush()
+
+    response = await client.post(_url(project), json=_body(venues[:2]))
+
+    assert response.status_code == 404
+    assert await _shortlisted(db_session, project) == set()
+
+
+async def test_statement_count_does_not_depend_on_the_number_of_venues(client, project, venues, count_queries):
+    async with count_queries() as one:
+        response = await client.post(_url(project), json=_body(venues[:1]))
+        assert response.status_code == 200
+    async with count_queries() as thirty:
+        response = await client.post(_url(project), json=_body(venues[1:31]))
+        assert len(response.json()["created"]) == 30
+
+    assert 0 < one.queries == thirty.queries
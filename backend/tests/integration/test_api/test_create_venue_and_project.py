@@ -0,0 +1,60 @@
+"""Creating a venue or a project returns the written row as is.
+
+The response is built from the object just inserted, without reading it
+back (server defaults come back with the INSERT, see eager_defaults), so
+serialising it must not lazy-load anything (MissingGreenlet).
+"""
+from datetime import date, datetime, timedelta
+
+
+def _timestamps(body: dict) -> None:
+    created_at = datetime.fromisoformat(body["created_at"])
+    updated_at = datetime.fromisoformat(body["updated_at"])
+    assert created_at.tzinfo is not None
+    assert updated_at >= created_at
+
+
+async def test_create_venue_returns_the_new_venue(client):
+    response = await client.post("/api/v1/venues", json={
+        "name": "Grand Hotel",
+        "city": "Brussels",
+        "capacity": 200,
+        "facilities": ["WiFi", "Projector"],
+    })
+
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert (body["name"], body["city"], body["capacity"]) == ("Grand Hotel", "Brussels", 200)
+    assert body["facilities"] == ["WiFi", "Projector"]
+    assert body["event_types"] == []
+    assert body["is_deleted"] is False
+    assert body["photos"] == []
+    _timestamps(body)
+
+    fetched = await client.get(f"/api/v1/venues/{body['id']}")
+    assert fetched.status_code == 200
+    assert {key: fetched.json()[key] for key in body} == body
+
+
+async def test_create_project_returns_the_new_project(client, user):
+    start = date.today() + timedelta(days=90)
+
+    response = await client.post("/api/v1/projects", json={
+        "client_name": "Acme",
+        "event_name": "Kick-off",
+        "event_date_start": start.isoformat(),
+        "event_date_end": (start + timedelta(days=1)).isoformat(),
+        "attendee_count": 120,
+    })
+
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert (body["event_name"], body["attendee_count"]) == ("Kick-off", 120)
+    assert body["user_id"] == str(user.id)
+    assert body["status"] == "active"
+    assert body["project_venues"] == []
+    _timestamps(body)
+
+    fetched = await client.get(f"/api/v1/projects/{body['id']}")
+    assert fetched.status_code == 200
+    assert {key: fetched.json()[key] for key in body} == body
@@ -0,0 +1,133 @@
+"""Conditional GETs: weak ETags and 304s for venues and projects.
+
+A cached copy stays current until the resource or any row its response is
+built from changes. now() is fixed for the whole test transaction, so an
+edit is simulated by moving updated_at forward explicitly; adding or
+removing a child changes the version through the row counts.
+"""
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.models.photo import Photo
+from app.models.project_venue import ProjectVenue
+from app.models.venue import Venue
+
+
+def _later() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(hours=1)
+
+
+@pytest.fixture
+async def venue(db_session) -> Venue:
+    venue = Venue(name="Harbour Hall", city=f"ETag City {uuid4().hex[:8]}", capacity=300)
+    db_session.add(venue)
+    await db_session.flush()
+    db_session.add(Photo(venue_id=venue.id, url="https://example.com/1.jpg", display_order=1))
+    await db_session.flush()
+    return venue
+
+
+async def _revalidate(client, path: str, etag: str, **params) -> int:
+    response = await client.get(path, params=params, headers={"If-None-Match": etag})
+    return response.status_code
+
+
+async def test_venue_is_not_modified_until_a_photo_changes(client, db_session, venue):
+    path = f"/api/v1/venues/{venue.id}"
+    response = await client.get(path)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    cached = await client.get(path, headers={"If-None-Match": etag})
+    assert (cached.status_code, cached.content, cached.headers["ETag"]) == (304, b"", etag)
+    # Weak comparison, and any tag of a list
+    assert await _revalidate(client, path, etag.removeprefix("W/")) == 304
+    assert await _revalidate(client, path, f'W/"stale", {etag}') == 304
+    assert await _revalidate(client, path, "*") == 304
+
+    # A photo edited
+    photo = await db_session.scalar(select(Photo).where(Photo.venue_id == venue.id))
+    photo.updated_at = _later()
+    await db_session.flush()
+    assert await _revalidate(client, path, etag) == 200
+
+    # A photo added
+    etag = (await client.get(path)).headers["ETag"]
+    db_session.add(Photo(venue_id=venue.id, url="https://example.com/2.jpg", display_order=2))
+    await db_session.flush()
+    response = await client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["photos"]) == 2
+
+    # A photo removed: no newer timestamp is left behind, the count changes
+    etag = response.headers["ETag"]
+    await db_session.delete(photo)
+    await db_session.flush()
+    assert await _revalidate(client, path, etag) == 200
+
+
+async def test_deleted_venue_is_not_found(client, db_session, venue):
+    etag = (await client.get(f"/api/v1/venues/{venue.id}")).headers["ETag"]
+    venue.is_deleted = True
+    await db_session.flush()
+
+    assert await _revalidate(client, f"/api/v1/venues/{venue.id}", etag) == 404
+
+
+async def test_project_is_not_modified_until_its_shortlist_changes(client, db_session, project, venue):
+    path = f"/api/v1/projects/{project.id}"
+    etag = (await client.get(path)).headers["ETag"]
+    assert await _revalidate(client, path, etag) == 304
+
+    # A venue shortlisted
+    shortlisted = ProjectVenue(project_id=project.id, venue_id=venue.id)
+    db_session.add(shortlisted)
+    await db_session.flush()
+    response = await client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert [item["venue_id"] for item in response.json()["project_venues"]] == [str(venue.id)]
+
+    # Its outreach status edited
+    etag = response.headers["ETag"]
+    shortlisted.updated_at = _later()
+    await db_session.flush()
+    assert await _revalidate(client, path, etag) == 200
+
+    # A photo added to the shortlisted venue
+    etag = (await client.get(path)).headers["ETag"]
+    db_session.add(Photo(venue_id=venue.id, url="https://example.com/2.jpg", display_order=2))
+    await db_session.flush()
+    assert await _revalidate(client, path, etag) == 200
+
+
+async def test_project_venue_list_tags_differ_per_representation(client, db_session, project, venue):
+    db_session.add(ProjectVenue(project_id=project.id, venue_id=venue.id))
+    await db_session.flush()
+    path = f"/api/v1/projects/{project.id}/venues"
+
+    full = (await client.get(path)).headers["ETag"]
+    narrowed = (await client.get(path, params={"fields": "outreach_status"})).headers["ETag"]
+    project_etag = (await client.get(f"/api/v1/projects/{project.id}")).headers["ETag"]
+
+    assert len({full, narrowed, project_etag}) == 3
+    assert await _revalidate(client, path, narrowed, fields="outreach_status") == 304
+    assert await _revalidate(client, path, narrowed) == 200
+
+    venue.updated_at = _later()
+    await db_session.flush()
+    assert await _revalidate(client, path, narrowed, fields="outreach_status") == 200
+
+
+async def test_other_users_project_is_not_found_even_with_its_etag(client, project, other_user, sign_in):
+    path = f"/api/v1/projects/{project.id}"
+    etag = (await client.get(path)).headers["ETag"]
+
+    sign_in(client, other_user)
+
+    assert await _revalidate(client, path, etag) == 404
+    assert await _revalidate(client, f"{path}/venues", etag) == 404
@@ -0,0 +1,71 @@
+"""Status codes of POST .../generate-description when OpenAI misbehaves."""
+import pytest
+
+from app.config import settings
+from app.models.project_venue import ProjectVenue
+from app.models.venue import Venue
+from app.services.ai_description_service import ai_description_service
+from app.services.resilience import CircuitBreaker, RetryPolicy
+
+
+@pytest.fixture
+async def shortlisted(db_session, project):
+    venue = Venue(name="Hall", city="Brussels", capacity=100)
+    db_session.add(venue)
+    await db_session.flush()
+    db_session.add(ProjectVenue(
+        project_id=project.id, venue_id=venue.id, ai_context={"event_context": {"event_type": "Conference"}}
+    ))
+    await db_session.flush()
+    return project, venue
+
+
+@pytest.fixture(autouse=True)
+def openai(fake_openai_client, monkeypatch):
+    monkeypatch.setattr(ai_description_service, "api_key", "fake")
+    monkeypatch.setattr(ai_description_service, "_client", fake_openai_client)
+    monkeypatch.setattr(ai_description_service, "retry_policy", RetryPolicy(max_attempts=3))
+    monkeypatch.setattr(ai_description_service, "breaker", CircuitBreaker("openai", failure_threshold=3))
+    monkeypatch.setattr(settings, "OPENAI_DEADLINE_SECONDS", 2)
+
+
+def _url(shortlisted) -> str:
+    project, venue = shortlisted
+    return f"/api/v1/projects/{project.id}/venues/{venue.id}/generate-description"
+
+
+async def test_description_is_generated(client, shortlisted, fake_openai):
+    response = await client.post(_url(shortlisted))
+
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+
+
+async def test_deadline_gives_504(client, shortlisted, fake_openai, retry_sleeps):
+    # Retry-After longer than OPENAI_DEADLINE_SECONDS
+    fake_openai.update(error_rate=1, status=429, retry_after=5)
+
+    response = await client.post(_url(shortlisted))
+
+    assert response.status_code == 504
+    assert fake_openai["requests"] == 1
+
+
+async def test_open_circuit_gives_503_with_retry_after(client, shortlisted, fake_openai, retry_sleeps):
+    fake_openai.update(error_rate=1, status=500)
+    assert (await client.post(_url(shortlisted))).status_code == 500
+
+    response = await client.post(_url(shortlisted))
+
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) > 0
+    assert fake_openai["requests"] == 3
+
+
+async def test_bad_request_gives_500_without_retries(client, shortlisted, fake_openai, retry_sleeps):
+    fake_openai.update(fail_next=1, status=400)
+
+    response = await client.post(_url(shortlisted))
+
+    assert response.status_code == 500
+    assert fake_openai["requests"] == 1
@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+from app.services.events import event_bus
+
+
+async def _subscribed(project_id) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + 5
+    while str(project_id) not in event_bus._subscribers:
+        assert loop.time() < deadline, "the stream did not subscribe"
+        await asyncio.sleep(0.01)
+
+
+def _events(body: str) -> list:
+    """The events of a Server-Sent Events body, skipping comments."""
+    events = []
+    for message in body.split("\n\n"):
+        data = [line.removeprefix("data: ") for line in message.splitlines() if line.startswith("data: ")]
+        if data:
+            events.append(json.loads(data[0]))
+    return events
+
+
+async def test_stream_relays_project_changes_until_deleted(client, project):
+    stream = asyncio.create_task(client.get(f"/api/v1/projects/{project.id}/events"))
+    await _subscribed(project.id)
+
+    updated = await client.patch(f"/api/v1/projects/{project.id}", json={"event_name": "Winter Summit"})
+    assert updated.status_code == 200
+    deleted = await client.delete(f"/api/v1/projects/{project.id}")
+    assert deleted.status_code == 204
+
+    # The stream ends by itself after project.deleted
+    response = await asyncio.wait_for(stream, 5)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    assert [event["type"] for event in events] == ["ready", "project.updated", "project.deleted"]
+    assert events[1]["data"] == {"event_name": "Winter Summit"}
+    assert {event["project_id"] for event in events} == {str(project.id)}
+    assert str(project.id) not in event_bus._subscribers
+
+
+async def test_stream_of_another_users_project_is_not_found(client, project, other_user, sign_in):
+    sign_in(client, other_user)
+
+    response = await client.get(f"/api/v1/projects/{project.id}/events")
+
+    assert response.status_code == 404
+    assert str(project.id) not in event_bus._subscribers
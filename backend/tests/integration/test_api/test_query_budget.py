@@ -0,0 +1,235 @@
+"""SQL statement budget for the API endpoints.
+
+Seeds the database at two sizes (few vs many venues, photos per venue and
+shortlisted venues), calls every endpoint in ENDPOINTS through the ASGI
+app, and counts the SQL statements each request runs. An endpoint whose
+count changes between the two datasets scales with the data (N+1, lazy
+loads in a loop).
+
+The seeding is committed and TRUNCATEs the tables it fills, so this needs
+the disposable TEST_DATABASE_URL database (see conftest.py).
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+import httpx
+import pytest
+from sqlalchemy import text
+
+from app.database import async_session_maker
+from app.main import app
+from app.models.photo import Photo
+from app.models.project import Project
+from app.models.project_venue import ProjectVenue
+from app.models.user import User, UserRole
+from app.models.venue import Venue
+from app.services.auth import create_access_token
+from app.services.venue_catalogue import venue_catalogue
+
+SEEDED_TABLES = ("activity_logs", "project_venues", "photos", "projects", "venues", "clients", "users")
+
+
+@dataclass
+class Dataset:
+    """Cardinalities for one seeding pass."""
+    name: str
+    venues: int
+    photos_per_venue: int
+    shortlisted: int
+
+
+DATASETS = (
+    Dataset("small", venues=5, photos_per_venue=1, shortlisted=2),
+    Dataset("large", venues=60, photos_per_venue=4, shortlisted=40),
+)
+
+
+@dataclass
+class Seeded:
+    """Ids the endpoint paths are filled in from."""
+    user_id: UUID
+    project_id: UUID
+    venue_id: UUID
+    shortlisted_venue_id: UUID
+    shortlisted_venue_ids: List[UUID]
+    unlisted_venue_ids: List[UUID]
+    spare_venue_id: UUID
+
+
+# (name, method, path, json body factory)
+Endpoint = Tuple[str, str, str, Optional[Callable[[Seeded], Any]]]
+
+ENDPOINTS: List[Endpoint] = [
+    ("list venues", "GET", "/api/v1/venues", None),
+    ("list venues (filtered)", "GET", "/api/v1/venues?city=Brussels&facilities=WiFi&min_capacity=10", None),
+    ("list venues (gallery)", "GET", "/api/v1/venues?fields=id,name,city,capacity&include=photos:first", None),
+    ("get venue", "GET", "/api/v1/venues/{venue_id}", None),
+    ("list projects", "GET", "/api/v1/projects", None),
+    ("get project", "GET", "/api/v1/projects/{project_id}", None),
+    ("list project venues", "GET", "/api/v1/projects/{project_id}/venues", None),
+    (
+        "list project venues (sparse)",
+        "GET",
+        "/api/v1/projects/{project_id}/venues?fields=outreach_status,venue.name&include=photos:first",
+        None,
+    ),
+    ("venue suggestions", "GET", "/api/v1/projects/{project_id}/venue-suggestions", None),
+    ("date conflicts", "GET", "/api/v1/projects/{project_id}/conflicts", None),
+    ("project activity", "GET", "/api/v1/projects/{project_id}/activity", None),
+    (
+        "update project venue",
+        "PATCH",
+        "/api/v1/projects/{project_id}/venues/{shortlisted_venue_id}",
+        lambda seeded: {"notes": "query budget"},
+    ),
+    (
+        "batch update project venues",
+        "PATCH",
+        "/api/v1/projects/{project_id}/venues",
+        # Two field sets, so two grouped UPDATEs at any shortlist size
+        lambda seeded: [
+            {"venue_id": str(venue_id), "outreach_status": "sent"} if i % 2
+            else {"venue_id": str(venue_id), "notes": "query budget"}
+            for i, venue_id in enumerate(seeded.shortlisted_venue_ids)
+        ],
+    ),
+    ("proposal preview", "GET", "/api/v1/projects/{project_id}/proposal/preview", None),
+]
+
+# Run last: they change the shortlist the other endpoints read
+MUTATING_ENDPOINTS: List[Endpoint] = [
+    (
+        "add venue to project",
+        "POST",
+        "/api/v1/projects/{project_id}/venues",
+        lambda seeded: {"venue_id": str(seeded.spare_venue_id)},
+    ),
+    (
+        "bulk add venues to project",
+        "POST",
+        "/api/v1/projects/{project_id}/venues/bulk",
+        lambda seeded: {"venue_ids": [str(venue_id) for venue_id in seeded.unlisted_venue_ids]},
+    ),
+]
+
+
+async def _truncate() -> None:
+    async with async_session_maker() as db:
+        await db.execute(text(f"TRUNCATE {', '.join(SEEDED_TABLES)} CASCADE"))
+        await db.commit()
+
+
+async def _seed(dataset: Dataset) -> Seeded:
+    """Truncate the seeded tables and insert one dataset."""
+    await _truncate()
+    async with async_session_maker() as db:
+        user = User(
+            name="Query Budget",
+            email=f"query-budget-{uuid4().hex[:8]}@example.com",
+            password_hash="not-a-real-hash",
+            role=UserRole.admin,
+        )
+        db.add(user)
+        await db.flush()
+
+        venues = [
+            Venue(
+                name=f"Venue {i:04d}",
+                city="Brussels" if i % 2 == 0 else "Ghent",
+                capacity=50 + i,
+                facilities=["WiFi", "Parking"] if i % 3 else ["WiFi"],
+                event_types=["Conference"],
+                latitude=50.85 + i / 1000,
+                longitude=4.35 + i / 1000,
+            )
+            for i in range(dataset.venues)
+        ]
+        db.add_all(venues)
+        await db.flush()
+
+        db.add_all([
+            Photo(venue_id=venue.id, url=f"https://example.com/{venue.id}/{n}.jpg", display_order=n)
+            for venue in venues
+            for n in range(dataset.photos_per_venue)
+        ])
+
+        start = date.today() + timedelta(days=60)
+        project = Project(
+            user_id=user.id,
+            client_name="Acme",
+            event_name="Annual Summit",
+            event_date_start=start,
+            event_date_end=start + timedelta(days=2),
+            attendee_count=40,
+            budget=20000,
+            location_preference="Brussels",
+            requirements=["WiFi", "Parking"],
+        )
+        db.add(project)
+        await db.flush()
+
+        db.add_all([
+            ProjectVenue(project_id=project.id, venue_id=venue.id, quoted_price=1000 + i, include_in_proposal=True)
+            for i, venue in enumerate(venues[:dataset.shortlisted])
+        ])
+        await db.commit()
+
+        return Seeded(
+            user_id=user.id,
+            project_id=project.id,
+            venue_id=venues[-1].id,
+            shortlisted_venue_id=venues[0].id,
+            shortlisted_venue_ids=[venue.id for venue in venues[:dataset.shortlisted]],
+            unlisted_venue_ids=[venue.id for venue in venues[dataset.shortlisted:]],
+            spare_venue_id=venues[-1].id,
+        )
+
+
+@pytest.fixture(scope="module")
+async def query_counts(database, count_queries) -> AsyncIterator[Dict[str, Dict[str, Tuple[int, int]]]]:
+    """(status code, SQL statements) per endpoint, for each dataset."""
+
+    async def call(client: httpx.AsyncClient, endpoint: Endpoint, seeded: Seeded) -> Tuple[int, int]:
+        _, method, path, body = endpoint
+        async with count_queries() as stats:
+            response = await client.request(method, path.format(**vars(seeded)), json=body(seeded) if body else None)
+        return response.status_code, stats.queries
+
+    results = {}
+    try:
+        for dataset in DATASETS:
+            seeded = await _seed(dataset)
+            # TRUNCATE bypasses updated_at, so the read model must reload fully
+            venue_catalogue.invalidate()
+            token = create_access_token({"sub": "query-budget", "user_id": str(seeded.user_id)})
+            counts = results[dataset.name] = {}
+
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://query-budget",
+                headers={"Authorization": f"Bearer {token}"},
+            ) as client:
+                for endpoint in ENDPOINTS:
+                    # Warm-up call: one-off work (catalogue load, caches) is
+                    # not what this test is about
+                    await call(client, endpoint, seeded)
+                    counts[endpoint[0]] = await call(client, endpoint, seeded)
+
+                for endpoint in MUTATING_ENDPOINTS:
+                    counts[endpoint[0]] = await call(client, endpoint, seeded)
+        yield results
+    finally:
+        await _truncate()
+        venue_catalogue.invalidate()
+
+
+@pytest.mark.parametrize("endpoint", [endpoint[0] for endpoint in ENDPOINTS + MUTATING_ENDPOINTS])
+def test_endpoint_runs_a_constant_number_of_queries(query_counts, endpoint):
+    small, large = (query_counts[dataset.name][endpoint] for dataset in DATASETS)
+
+    assert small[0] < 400 and large[0] < 400, f"HTTP {small[0]}/{large[0]}"
+    # Every endpoint loads the user, so zero means nothing was counted
+    assert small[1] > 0
+    assert small[1] == large[1], f"{small[1]} statements with {DATASETS[0].name} data, {large[1]} with {DATASETS[-1].name}"
@@ -0,0 +1,29 @@
+from uuid import uuid4
+
+import pytest
+
+from app.api import deps
+from app.services.rate_limit import RateLimit, RateLimiter
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = RateLimiter(limits={"pdf": RateLimit.per(1, 3600)}, concurrency={"pdf": 1})
+    monkeypatch.setattr(deps, "rate_limiter", limiter)
+    return limiter
+
+
+async def test_empty_bucket_is_429_with_retry_after(client, limiter):
+    # The limit applies before the endpoint looks the project up
+    path = f"/api/v1/projects/{uuid4()}/proposal/pdf"
+
+    first = await client.get(path)
+    second = await client.get(path)
+
+    assert first.status_code == 404
+    assert second.status_code == 429
+    assert second.headers["Retry-After"] == "3600"
+    assert "Rate limit exceeded for pdf requests" in second.json()["detail"]
+    # Neither request still holds the concurrency slot
+    assert limiter.stats()[0]["in_flight"] == 0
+    assert limiter.stats()[0]["rejected_rate"] == 1
@@ -0,0 +1,162 @@
+"""``fields=`` and ``include=photos:first`` on the list endpoints.
+
+Only the requested fields are returned and only their columns are read:
+the statements the request runs are captured and checked, since loading a
+column the response does not use is what the projections are there to
+avoid.
+"""
+from contextlib import contextmanager
+from typing import Iterator, List
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+
+from app.models.photo import Photo
+from app.models.project_venue import ProjectVenue
+from app.config import settings
+from app.models.venue import Venue
+from app.services.venue_catalogue import VenueCatalogue
+
+
+@pytest.fixture
+async def venues(db_session) -> List[Venue]:
+    """Two venues in a city of their own, the first with three photos."""
+    city = f"Projection City {uuid4().hex[:8]}"
+    venues = [
+        Venue(name="Harbour Hall", city=city, capacity=300, facilities=["WiFi"], address="1 Quay Street"),
+        Venue(name="Old Mill", city=city, capacity=80),
+    ]
+    db_session.add_all(venues)
+    await db_session.flush()
+    db_session.add_all([
+        Photo(venue_id=venues[0].id, url="https://example.com/3.jpg", display_order=3),
+        Photo(venue_id=venues[0].id, url="https://example.com/1.jpg", display_order=1),
+        Photo(venue_id=venues[0].id, url="https://example.com/2.jpg", display_order=2),
+    ])
+    await db_session.flush()
+    return venues
+
+
+@pytest.fixture(params=[True, False], ids=["catalogue", "sql"])
+async def venue_source(request, db_session, venues, monkeypatch):
+    """Serve the venue list from a fresh catalogue or from Postgres.
+
+    The catalogue is loaded up front, from this test's (uncommitted) rows,
+    so its own venue query is not among the request's statements.
+    """
+    monkeypatch.setattr(settings, "VENUE_CATALOGUE_ENABLED", request.param)
+    catalogue = VenueCatalogue()
+    await catalogue.load(db_session)
+    monkeypatch.setattr("app.services.venue_service.venue_catalogue", catalogue)
+
+
+@pytest.fixture
+def statements(db_session):
+    """Record the SQL statements run inside a block: ``with statements() as sql:``."""
+
+    @contextmanager
+    def recording() -> Iterator[List[str]]:
+        sql: List[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            sql.append(statement)
+
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield sql
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    return recording
+
+
+def _venue_queries(sql: List[str]) -> List[str]:
+    return [statement for statement in sql if "FROM venues" in statement and "count(" not in statement]
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/api/v1/venues", {"fields": "id,nickname"}),
+    ("/api/v1/venues", {"fields": "name.first"}),
+    ("/api/v1/venues", {"fields": "photos.width"}),
+    ("/api/v1/venues", {"include": "photos:all"}),
+    ("/api/v1/projects", {"fields": "project_venues.venue.password"}),
+])
+async def test_unknown_fields_and_includes_are_rejected(client, path, params):
+    response = await client.get(path, params=params)
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid 'fields'/'include'")
+
+
+async def test_venue_list_returns_and_loads_only_the_requested_fields(client, venues, venue_source, statements):
+    with statements() as sql:
+        response = await client.get(
+            "/api/v1/venues", params={"city": venues[0].city, "fields": "name,capacity", "include_facets": False}
+        )
+
+    assert response.status_code == 200, response.text
+    items = response.json()["items"]
+    assert sorted(items, key=lambda item: item["name"]) == [
+        {"id": str(venues[0].id), "name": "Harbour Hall", "capacity": 300},
+        {"id": str(venues[1].id), "name": "Old Mill", "capacity": 80},
+    ]
+
+    [query] = _venue_queries(sql)
+    select_list = query.split(" FROM ")[0]
+    assert "venues.name" in select_list and "venues.capacity" in select_list
+    for column in ("address", "facilities", "event_types", "created_at"):
+        assert f"venues.{column}" not in select_list
+    # Photos were not requested, so not queried either
+    assert not any("FROM photos" in statement for statement in sql)
+
+
+async def test_include_photos_first_attaches_the_lowest_display_order(client, venues, venue_source, statements):
+    with statements() as sql:
+        response = await client.get(
+            "/api/v1/venues",
+            params={"city": venues[0].city, "fields": "name,photos.url", "include": "photos:first", "include_facets": False},
+        )
+
+    assert response.status_code == 200, response.text
+    photos = {item["name"]: item["photos"] for item in response.json()["items"]}
+    assert [photo["url"] for photo in photos["Harbour Hall"]] == ["https://example.com/1.jpg"]
+    assert set(photos["Harbour Hall"][0]) == {"id", "url"}
+    assert photos["Old Mill"] == []
+
+    [photo_query] = [statement for statement in sql if "FROM photos" in statement]
+    assert "DISTINCT ON" in photo_query
+    assert "photos.caption" not in photo_query.split(" FROM ")[0]
+
+
+async def test_include_photos_first_without_fields_returns_whole_venues(client, venues, venue_source):
+    response = await client.get(
+        "/api/v1/venues", params={"city": venues[0].city, "include": "photos:first", "include_facets": False}
+    )
+
+    assert response.status_code == 200, response.text
+    hall = next(item for item in response.json()["items"] if item["name"] == "Harbour Hall")
+    assert hall["address"] == "1 Quay Street"
+    assert [photo["display_order"] for photo in hall["photos"]] == [1]
+
+
+async def test_project_venue_list_narrows_the_nested_venue(client, db_session, project, venues, statements):
+    db_session.add_all([ProjectVenue(project_id=project.id, venue_id=venue.id) for venue in venues])
+    await db_session.flush()
+
+    with statements() as sql:
+        response = await client.get(
+            f"/api/v1/projects/{project.id}/venues",
+            params={"fields": "outreach_status,venue.name", "include": "photos:first"},
+        )
+
+    assert response.status_code == 200, response.text
+    items = sorted(response.json(), key=lambda item: item["venue"]["name"])
+    assert [set(item) for item in items] == [{"id", "outreach_status", "venue"}] * 2
+    assert items[0]["venue"]["name"] == "Harbour Hall"
+    assert set(items[0]["venue"]) == {"id", "name", "photos"}
+    assert [photo["url"] for photo in items[0]["venue"]["photos"]] == ["https://example.com/1.jpg"]
+
+    [query] = _venue_queries(sql)
+    assert "venues.capacity" not in query.split(" FROM ")[0]
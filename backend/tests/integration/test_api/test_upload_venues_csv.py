@@ -0,0 +1,37 @@
+from sqlalchemy import select
+
+from app.main import app
+from app.models.task import Task, TaskStatus
+from app.services.task_handlers import VENUE_CSV_IMPORT
+
+CSV = 'name,city,capacity\n"Grand Hotel","Brussels",200\n'
+
+
+def _upload(content: str, filename: str = "venues.csv"):
+    return {"file": (filename, content.encode(), "text/csv")}
+
+
+async def test_background_import_is_queued_with_202(client, db_session, user):
+    response = await client.post("/api/v1/venues/upload-csv?background=true", files=_upload(CSV))
+
+    assert response.status_code == 202
+    body = response.json()
+    assert (body["kind"], body["status"]) == (VENUE_CSV_IMPORT, "queued")
+    task = (await db_session.execute(select(Task).where(Task.user_id == user.id))).scalar_one()
+    assert str(task.id) == body["id"]
+    assert task.status == TaskStatus.queued
+    assert task.payload == {"filename": "venues.csv", "content": CSV}
+
+
+async def test_background_import_rejects_a_bad_file_with_400(client, db_session, user):
+    response = await client.post("/api/v1/venues/upload-csv?background=true", files=_upload("city,capacity\n"))
+
+    assert response.status_code == 400
+    assert (await db_session.execute(select(Task).where(Task.user_id == user.id))).first() is None
+
+
+def test_openapi_documents_both_responses():
+    responses = app.openapi()["paths"]["/api/v1/venues/upload-csv"]["post"]["responses"]
+
+    assert responses["200"]["content"]["application/json"]["schema"]["$ref"].endswith("/VenueUploadResult")
+    assert responses["202"]["content"]["application/json"]["schema"]["$ref"].endswith("/TaskResponse")
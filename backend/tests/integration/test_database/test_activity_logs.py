@@ -0,0 +1,205 @@
+"""activity_logs partitioning: the migration, partition maintenance and the keyset timeline.
+
+Everything runs in the test's transaction and is rolled back, except the
+retention test: DETACH PARTITION ... CONCURRENTLY cannot run in a
+transaction, so it creates (and cleans up) committed partitions for
+months long past, which no other test writes to.
+"""
+import importlib.util
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import text
+
+from app.models.activity_log import ActivityLog
+from app.models.project import Project
+from app.models.user import User, UserRole
+from app.services.activity_log_service import activity_log_service, month_start, partition_name
+
+MIGRATION = Path(__file__).parents[3] / "alembic" / "versions" / "20261019_1200_f5b1d7e93c60_partition_activity_logs.py"
+
+UTC = timezone.utc
+
+
+@pytest.fixture
+async def project(db_session) -> Project:
+    user = User(
+        name="Activity Test",
+        email=f"activity-test-{uuid4().hex[:8]}@example.com",
+        password_hash="not-a-real-hash",
+        role=UserRole.admin,
+    )
+    db_session.add(user)
+    await db_session.flush()
+    start = date.today() + timedelta(days=60)
+    project = Project(
+        user_id=user.id,
+        client_name="Acme",
+        event_name="Annual Summit",
+        event_date_start=start,
+        event_date_end=start + timedelta(days=1),
+        attendee_count=40,
+    )
+    db_session.add(project)
+    await db_session.flush()
+    return project
+
+
+async def _partitions(db, table: str = "activity_logs"):
+    result = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": table},
+    )
+    return set(result.scalars().all())
+
+
+def _upgrade(sync_conn) -> None:
+    spec = importlib.util.spec_from_file_location("partition_activity_logs", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with Operations.context(MigrationContext.configure(sync_conn)):
+        migration.upgrade()
+
+
+async def test_migration_copies_rows_into_monthly_partitions(db_session, project):
+    # The pre-migration table, in a scratch schema searched before public
+    # (where projects and users are)
+    schema = f"migration_{uuid4().hex[:8]}"
+    await db_session.execute(text(f"CREATE SCHEMA {schema}"))
+    await db_session.execute(text(f"SET LOCAL search_path TO {schema}, public"))
+    await db_session.execute(text("""
+        CREATE TABLE activity_logs (
+            id uuid PRIMARY KEY,
+            project_id uuid NOT NULL REFERENCES public.projects (id) ON DELETE CASCADE,
+            user_id uuid NOT NULL REFERENCES public.users (id) ON DELETE CASCADE,
+            action varchar(100) NOT NULL,
+            details jsonb NOT NULL DEFAULT '{}',
+            created_at timestamptz NOT NULL DEFAULT now()
+        )
+    """))
+    for column in ("project_id", "user_id", "action"):
+        await db_session.execute(text(f"CREATE INDEX ix_activity_logs_{column} ON activity_logs ({column})"))
+    rows = {
+        uuid4(): datetime(2026, 3, 31, 23, 59, tzinfo=UTC),
+        uuid4(): datetime(2026, 4, 1, tzinfo=UTC),
+        uuid4(): datetime(2026, 5, 17, 9, 30, tzinfo=UTC),
+    }
+    for log_id, created_at in rows.items():
+        await db_session.execute(
+            text(
+                "INSERT INTO activity_logs (id, project_id, user_id, action, created_at) "
+                "VALUES (:id, :project_id, :user_id, 'project.updated', :created_at)"
+            ),
+            {"id": log_id, "project_id": project.id, "user_id": project.user_id, "created_at": created_at},
+        )
+
+    conn = await db_session.connection()
+    await conn.run_sync(_upgrade)
+
+    # One partition per month, from the oldest row to 3 months from now
+    now = datetime.now(UTC)
+    expected = set()
+    month = datetime(2026, 3, 1, tzinfo=UTC)
+    while month <= month_start(now, 3):
+        expected.add(partition_name(month))
+        month = month_start(month, 1)
+    assert await _partitions(db_session, f"{schema}.activity_logs") == expected
+
+    result = await db_session.execute(text("SELECT id, created_at, tableoid::regclass::text FROM activity_logs"))
+    copied = {log_id: (created_at, partition) for log_id, created_at, partition in result.all()}
+    assert copied == {log_id: (created_at, partition_name(month_start(created_at))) for log_id, created_at in rows.items()}
+
+    old = await db_session.execute(text("SELECT to_regclass(:name)"), {"name": f"{schema}.activity_logs_old"})
+    assert old.scalar_one() is None
+
+
+async def test_ensure_partitions_creates_the_missing_months(db_session):
+    now = datetime(2199, 1, 15, tzinfo=UTC)
+
+    created = await activity_log_service.ensure_partitions(db_session, 2, now=now)
+
+    assert created == ["activity_logs_p2199_01", "activity_logs_p2199_02", "activity_logs_p2199_03"]
+    assert set(created) <= await _partitions(db_session)
+    assert await activity_log_service.ensure_partitions(db_session, 2, now=now) == []
+
+
+async def test_expired_partitions_are_detached_and_dropped(database):
+    names = [partition_name(datetime(1990, month, 1, tzinfo=UTC)) for month in (1, 2)]
+    async with database.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for month in (1, 2):
+            start = datetime(1990, month, 1, tzinfo=UTC)
+            await conn.execute(text(
+                f"CREATE TABLE {partition_name(start)} PARTITION OF activity_logs "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{month_start(start, 1).isoformat()}')"
+            ))
+        try:
+            before = await _partitions(conn)
+
+            # Keeps March (the current month) and February
+            dropped = await activity_log_service.drop_expired_partitions(
+                database, 1, now=datetime(1990, 3, 15, tzinfo=UTC)
+            )
+
+            assert dropped == [names[0]]
+            assert await _partitions(conn) == before - {names[0]}
+            gone = await conn.execute(text("SELECT to_regclass(:name)"), {"name": names[0]})
+            assert gone.scalar_one() is None
+        finally:
+            for name in names:
+                await conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
+
+async def test_timeline_pages_through_entries_newest_first(db_session, project):
+    await activity_log_service.ensure_partitions(db_session, 1, now=datetime(2199, 1, 1, tzinfo=UTC))
+    times = [
+        datetime(2199, 1, 5, tzinfo=UTC),
+        datetime(2199, 1, 20, tzinfo=UTC),
+        datetime(2199, 1, 20, tzinfo=UTC),
+        datetime(2199, 1, 20, tzinfo=UTC),
+        datetime(2199, 2, 1, tzinfo=UTC),
+        datetime(2199, 2, 1, tzinfo=UTC),
+        datetime(2199, 2, 10, tzinfo=UTC),
+    ]
+    entries = [
+        ActivityLog(
+            project_id=project.id,
+            user_id=project.user_id,
+            action="venue.added" if i % 2 else "project.updated",
+            created_at=created_at,
+        )
+        for i, created_at in enumerate(times)
+    ]
+    db_session.add_all(entries)
+    await db_session.flush()
+    newest_first = sorted(entries, key=lambda entry: (entry.created_at, entry.id), reverse=True)
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = await activity_log_service.get_project_activity(
+            db_session, project.id, limit=3, cursor=cursor
+        )
+        pages.append([entry.id for entry in page])
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [log_id for page in pages for log_id in page] == [entry.id for entry in newest_first]
+
+    since, _ = await activity_log_service.get_project_activity(
+        db_session, project.id, since=datetime(2199, 2, 1, tzinfo=UTC)
+    )
+    assert [entry.id for entry in since] == [entry.id for entry in newest_first[:3]]
+
+    added, _ = await activity_log_service.get_project_activity(db_session, project.id, action="venue.added")
+    assert [entry.id for entry in added] == [entry.id for entry in newest_first if entry.action == "venue.added"]
+
+    with pytest.raises(ValueError):
+        await activity_log_service.get_project_activity(db_session, project.id, cursor="not-a-cursor")
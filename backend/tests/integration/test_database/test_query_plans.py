@@ -0,0 +1,139 @@
+"""EXPLAIN-based regression tests for the venue list queries.
+
+Runs EXPLAIN on the exact statements built by ``VenueService`` and fails if
+the planner can no longer use the partial indexes created in migrations
+c41e7a9d2f10, d7e2b19c4a55, b92d6e0f4a17 and e6c3a9f1b284.
+
+Each test inserts a catalogue of venues and ANALYZEs it inside a
+transaction that is rolled back, so the planner has realistic statistics
+on an empty test database. Sequential scans are also disabled: if an index
+can serve the query, the planner will pick it; if the predicate no longer
+matches the index, it falls back to a (penalised) sequential scan and the
+test fails.
+"""
+import json
+from typing import Iterator, Set
+
+import pytest
+from sqlalchemy import Select, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.models.venue import VENUE_NAME_SORT_KEY, Venue
+from app.services.venue_service import venue_service
+
+INDEX_NODE_TYPES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+CITIES = ["Brussels", "Ghent", "Antwerp", "Paris", "Lyon", "Amsterdam", "Berlin", "Madrid", "Lisbon", "Vienna"]
+
+
+async def _seed_venues(conn: AsyncConnection, count: int = 5000) -> None:
+    """Insert a spread-out catalogue (a tenth soft-deleted) and refresh statistics."""
+    await conn.execute(insert(Venue), [
+        {
+            "name": f"Venue {i:05d}",
+            "city": CITIES[i % len(CITIES)],
+            "capacity": 20 + i % 500,
+            # Labels spelled as users type them; the filters normalise
+            "facilities": ["WiFi", " Projector "] if i % 20 == 3 else ["WiFi"],
+            "event_types": ["Conference", "Wedding  Party"] if i % 25 == 3 else ["Conference"],
+            "latitude": 36.0 + (i * 7919 % 2000) / 100,
+            "longitude": -9.0 + (i * 104729 % 2500) / 100,
+            "is_deleted": i % 10 == 0,
+        }
+        for i in range(count)
+    ])
+    await conn.exec_driver_sql("ANALYZE venues")
+
+
+def _plan_nodes(node: dict) -> Iterator[dict]:
+    """Yield a plan node and all of its children."""
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+async def _explain(conn: AsyncConnection, query: Select) -> dict:
+    """Return the JSON plan for a statement, compiled with the live dialect."""
+    compiled = query.compile(dialect=conn.dialect)
+    params = tuple(compiled.params[name] for name in (compiled.positiontup or []))
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def _indexes_used(plan: dict) -> Set[str]:
+    return {
+        node["Index Name"]
+        for node in _plan_nodes(plan)
+        if node.get("Node Type") in INDEX_NODE_TYPES and "Index Name" in node
+    }
+
+
+CASES = {
+    "list venues (ORDER BY name)": (
+        lambda: venue_service.build_list_query().order_by(VENUE_NAME_SORT_KEY, Venue.id).limit(20),
+        "ix_venues_name_sort_active",
+    ),
+    "filter by city (ORDER BY name)": (
+        lambda: venue_service.build_list_query(city="Brussels").order_by(VENUE_NAME_SORT_KEY, Venue.id).limit(20),
+        "ix_venues_city_key_name_sort_active",
+    ),
+    "count by city": (
+        lambda: select(func.count()).select_from(venue_service.build_list_query(city="Brussels").subquery()),
+        "ix_venues_city_key_name_sort_active",
+    ),
+    "filter by facilities": (
+        lambda: venue_service.build_list_query(facilities=["projector"]).limit(20),
+        "ix_venues_facility_keys_active",
+    ),
+    "filter by event types": (
+        lambda: venue_service.build_list_query(event_types=["wedding party"]).limit(20),
+        "ix_venues_event_type_keys_active",
+    ),
+    "radius search (bounding box)": (
+        lambda: venue_service.build_list_query(near=(50.8467, 4.3525), radius_km=10).limit(20),
+        "ix_venues_lat_lng_active",
+    ),
+}
+
+
+@pytest.mark.parametrize("case", list(CASES))
+async def test_venue_list_query_uses_its_index(database, case):
+    build_query, expected_index = CASES[case]
+    async with database.connect() as conn:
+        async with conn.begin() as transaction:
+            await _seed_venues(conn)
+            await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            plan = await _explain(conn, build_query())
+            await transaction.rollback()
+
+    assert expected_index in _indexes_used(plan), json.dumps(plan, indent=2)
+
+
+async def test_label_filters_match_normalised_labels(database):
+    query = venue_service.build_list_query(facilities=["PROJECTOR"], event_types=[" wedding party"])
+    async with database.connect() as conn:
+        async with conn.begin() as transaction:
+            await _seed_venues(conn)
+            count = (await conn.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
+            await transaction.rollback()
+
+    # Venues with both labels: i % 100 == 3, none of them soft-deleted
+    assert count == 50
+
+
+async def test_radius_search_bounds_latitude_and_longitude_in_the_index(database):
+    query = venue_service.build_list_query(near=(50.8467, 4.3525), radius_km=10).limit(20)
+    async with database.connect() as conn:
+        async with conn.begin() as transaction:
+            await _seed_venues(conn)
+            await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            plan = await _explain(conn, query)
+            await transaction.rollback()
+
+    index_conditions = " ".join(
+        node.get("Index Cond", "") for node in _plan_nodes(plan) if node.get("Index Name") == "ix_venues_lat_lng_active"
+    )
+    assert "latitude >=" in index_conditions and "longitude >=" in index_conditions, json.dumps(plan, indent=2)
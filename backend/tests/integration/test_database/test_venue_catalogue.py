@@ -0,0 +1,91 @@
+"""The in-memory venue catalogue and the SQL list query must agree.
+
+``VenueService.get_list`` serves GET /venues from the catalogue when
+VENUE_CATALOGUE_ENABLED is on and from Postgres otherwise; a request must
+return the same venues, in the same order, either way.
+"""
+import pytest
+
+from app.config import settings
+from app.models.venue import Venue
+from app.services.venue_catalogue import VenueCatalogue
+from app.services.venue_service import venue_service
+
+# Names that sort differently by case, accents, punctuation and digits,
+# and labels that differ only in case and whitespace
+VENUES = [
+    ("alpha", "Testville", 50, ["WiFi", "Parking"], ["Conference"], (50.850, 4.350)),
+    ("Alpha Hall", "testville", 120, ["wifi"], ["conference", "Gala"], (50.851, 4.351)),
+    ("Beta", "Testville ", 80, ["  WIFI ", "Sound  system"], ["Gala"], (50.900, 4.400)),
+    ("beta", "TESTVILLE", 300, ["Sound system"], ["Seminar"], (50.860, 4.360)),
+    ("Zeta", "Testville", 40, ["Parking"], [], (50.700, 4.200)),
+    ("zeta", "Othertown", 60, ["WiFi"], ["Conference"], (51.200, 4.400)),
+    ("Éclat", "Othertown", 200, ["wi-fi"], ["Conference"], None),
+    ("_Underscore", "Testville", 90, [], ["Gala"], (50.852, 4.352)),
+    ("10 Downing", "Testville", 70, ["WiFi", "Catering"], ["Conference"], (50.853, 4.353)),
+    ("Beta", "Testville", 75, ["WiFi"], ["Conference"], (50.854, 4.354)),
+    # Either side of the antimeridian
+    ("Suva Hall", "Suva", 100, ["WiFi"], ["Conference"], (-18.10, 179.95)),
+    ("Taveuni Hall", "Taveuni", 100, ["WiFi"], ["Conference"], (-16.85, -179.97)),
+]
+
+FILTERS = {
+    "everything": {},
+    "city": {"city": "testville"},
+    "city with whitespace": {"city": " TestVille"},
+    "capacity": {"min_capacity": 75},
+    "facility": {"facilities": ["wifi"]},
+    "facilities": {"facilities": ["WiFi", "sound system"]},
+    "unknown facility": {"facilities": ["Helipad"]},
+    "event type": {"event_types": ["CONFERENCE"]},
+    "combined": {"city": "Testville", "facilities": ["WiFi"], "min_capacity": 60},
+    "radius": {"near": (50.85, 4.35), "radius_km": 10},
+    "radius and facility": {"near": (50.85, 4.35), "radius_km": 30, "facilities": ["parking"]},
+    "nearest": {"near": (50.85, 4.35)},
+    "radius across the antimeridian": {"near": (-17.5, -179.9), "radius_km": 200},
+}
+
+
+@pytest.fixture
+async def seeded_venues(db_session):
+    db_session.add_all([
+        Venue(
+            name=name,
+            city=city,
+            capacity=capacity,
+            facilities=facilities,
+            event_types=event_types,
+            latitude=point[0] if point else None,
+            longitude=point[1] if point else None,
+        )
+        for name, city, capacity, facilities, event_types, point in VENUES
+    ])
+    await db_session.flush()
+
+
+async def _list_ids(db_session, use_catalogue: bool, monkeypatch, **filters):
+    monkeypatch.setattr(settings, "VENUE_CATALOGUE_ENABLED", use_catalogue)
+    # A fresh catalogue, loaded from this test's (uncommitted) rows
+    monkeypatch.setattr("app.services.venue_service.venue_catalogue", VenueCatalogue())
+    pages = []
+    for page in (1, 2):
+        venues, total, _ = await venue_service.get_list(db_session, page=page, page_size=4, **filters)
+        pages.append([venue.id for venue in venues])
+    everything, total, _ = await venue_service.get_list(db_session, page_size=10_000, **filters)
+    return pages, total, [venue.id for venue in everything]
+
+
+@pytest.mark.parametrize("case", list(FILTERS))
+async def test_get_list_catalogue_and_sql_return_the_same_venues(db_session, seeded_venues, monkeypatch, case):
+    from_catalogue = await _list_ids(db_session, True, monkeypatch, **FILTERS[case])
+    from_sql = await _list_ids(db_session, False, monkeypatch, **FILTERS[case])
+
+    assert from_catalogue == from_sql
+
+
+async def test_get_list_orders_names_case_insensitively(db_session, seeded_venues, monkeypatch):
+    _, _, ids = await _list_ids(db_session, False, monkeypatch, city="Testville")
+    names = [(await db_session.get(Venue, venue_id)).name for venue_id in ids]
+
+    assert names[:4] == ["10 Downing", "_Underscore", "alpha", "Alpha Hall"]
+    assert names.index("Zeta") == len(names) - 1
@@ -0,0 +1,89 @@
+"""PostgresBroker: relaying events between processes over LISTEN/NOTIFY."""
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from app.services.events import RESYNC, EventBus, PostgresBroker
+
+
+@pytest.fixture
+async def make_bus(database):
+    dsn = database.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    buses = []
+
+    async def make() -> EventBus:
+        bus = EventBus(broker=PostgresBroker(dsn, reconnect_delay=0.05))
+        await bus.start()
+        buses.append(bus)
+        return bus
+
+    yield make
+    for bus in buses:
+        await bus.stop()
+
+
+async def _next(subscription, timeout: float = 5.0):
+    event = await subscription.get(timeout)
+    assert event is not None, "no event relayed"
+    return event
+
+
+async def _connected(publisher: EventBus, subscriber: EventBus) -> None:
+    """Wait until an event published on ``publisher`` reaches ``subscriber``."""
+    probe = uuid4()
+    async with subscriber.subscribe(probe) as subscription:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 5
+        while True:
+            assert loop.time() < deadline, "event brokers did not connect"
+            publisher.publish(probe, "probe")
+            if await subscription.get(0.1) is not None:
+                return
+
+
+async def test_events_are_relayed_to_other_processes_once(make_bus):
+    first, second = await make_bus(), await make_bus()
+    await _connected(first, second)
+    project_id = uuid4()
+
+    async with first.subscribe(project_id) as local, second.subscribe(project_id) as remote:
+        first.publish(project_id, "project_venue.removed", {"venue_id": "v1"})
+
+        relayed = await _next(remote)
+        assert (relayed["type"], relayed["data"]) == ("project_venue.removed", {"venue_id": "v1"})
+        assert await _next(local) == relayed
+        # The publisher's own NOTIFY comes back to it, and is ignored
+        assert await local.get(0.2) is None
+
+
+async def test_oversized_event_is_relayed_as_a_resync(make_bus):
+    first, second = await make_bus(), await make_bus()
+    await _connected(first, second)
+    project_id = uuid4()
+
+    async with first.subscribe(project_id) as local, second.subscribe(project_id) as remote:
+        first.publish(project_id, "project_venue.updated", {"items": ["x" * 100] * 100})
+
+        assert (await _next(local))["type"] == "project_venue.updated"
+        relayed = await _next(remote)
+        assert (relayed["type"], relayed["data"]) == (RESYNC, {"reason": "project_venue.updated"})
+
+
+async def test_lost_connection_resyncs_subscribers_and_reconnects(database, make_bus):
+    first, second = await make_bus(), await make_bus()
+    await _connected(first, second)
+    project_id = uuid4()
+
+    async with second.subscribe(project_id) as subscription:
+        async with database.connect() as conn:
+            await conn.execute(text(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                "WHERE query LIKE '%project_events%' AND pid <> pg_backend_pid()"
+            ))
+
+        event = await _next(subscription)
+        assert (event["type"], event["data"]) == (RESYNC, {"reason": "broker reconnected"})
+
+    await _connected(first, second)
@@ -0,0 +1,66 @@
+"""PostgresBuckets: the token bucket upsert.
+
+now() is the start of the test's transaction throughout, so no time
+passes between takes unless a row's updated_at is moved back.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, text
+
+from app.models.rate_limit import RateLimitBucket
+from app.services.rate_limit import PostgresBuckets, RateLimit
+
+# 1 token every 8s
+LIMIT = RateLimit.per(2, 16)
+
+
+@pytest.fixture
+def buckets():
+    buckets = PostgresBuckets()
+    # Tests that don't look at pruning skip it
+    buckets._last_prune = float("inf")
+    return buckets
+
+
+async def _tokens(db_session, key: str) -> float:
+    return (await db_session.execute(select(RateLimitBucket.tokens).where(RateLimitBucket.key == key))).scalar_one()
+
+
+async def test_upsert_takes_tokens_until_the_bucket_is_empty(db_session, buckets):
+    assert await buckets.take(db_session, "ai:u1", LIMIT) == 0
+    assert await _tokens(db_session, "ai:u1") == 1
+    assert await buckets.take(db_session, "ai:u1", LIMIT) == 0
+    assert await _tokens(db_session, "ai:u1") == 0
+
+    assert await buckets.take(db_session, "ai:u1", LIMIT) == pytest.approx(8)
+    # A refused take leaves the row alone
+    assert await _tokens(db_session, "ai:u1") == 0
+    assert await buckets.take(db_session, "ai:u2", LIMIT) == 0
+
+
+async def test_upsert_refills_with_the_time_since_the_last_take(db_session, buckets):
+    await buckets.take(db_session, "ai:u1", LIMIT)
+    await buckets.take(db_session, "ai:u1", LIMIT)
+
+    await db_session.execute(text("UPDATE rate_limit_buckets SET updated_at = now() - interval '12 seconds'"))
+    assert await buckets.take(db_session, "ai:u1", LIMIT) == 0
+    assert await _tokens(db_session, "ai:u1") == pytest.approx(0.5)
+    assert await buckets.take(db_session, "ai:u1", LIMIT) == pytest.approx(4)
+
+    # Never more than the burst
+    await db_session.execute(text("UPDATE rate_limit_buckets SET updated_at = now() - interval '1 hour'"))
+    assert await buckets.take(db_session, "ai:u1", LIMIT) == 0
+    assert await _tokens(db_session, "ai:u1") == pytest.approx(1)
+
+
+async def test_stale_buckets_are_pruned(db_session):
+    stale = datetime.now(timezone.utc) - PostgresBuckets.PRUNE_AFTER - timedelta(minutes=1)
+    db_session.add(RateLimitBucket(key="ai:stale", tokens=0, updated_at=stale))
+    await db_session.flush()
+
+    await PostgresBuckets().take(db_session, "ai:u1", LIMIT)
+
+    keys = set((await db_session.execute(select(RateLimitBucket.key))).scalars())
+    assert "ai:stale" not in keys
+    assert "ai:u1" in keys
@@ -0,0 +1,71 @@
+"""SlowQueryLog on a real engine: recorded entries and their EXPLAIN plans."""
+import asyncio
+
+import pytest
+from sqlalchemy import event, text
+
+from app.config import settings
+from app.services.slow_queries import SlowQueryLog
+
+
+@pytest.fixture
+async def slow_queries(database, monkeypatch):
+    """A SlowQueryLog recording every statement, with plans."""
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN", True)
+    log = SlowQueryLog()
+    log.install(database)
+    try:
+        yield log
+    finally:
+        event.remove(database.sync_engine, "before_cursor_execute", log._before_cursor_execute)
+        event.remove(database.sync_engine, "after_cursor_execute", log._after_cursor_execute)
+        await asyncio.gather(*log._tasks)
+
+
+async def _recorded(log: SlowQueryLog, marker: str) -> dict:
+    await asyncio.gather(*log._tasks)
+    [entry] = [entry for entry in log.entries if marker in entry["sql"]]
+    return entry
+
+
+async def test_select_gets_a_read_only_explain_plan(database, slow_queries):
+    async with database.connect() as conn:
+        await conn.execute(
+            text("SELECT count(*) AS plan_marker FROM venues WHERE city = :city"), {"city": "Brussels"}
+        )
+
+    entry = await _recorded(slow_queries, "plan_marker")
+
+    assert entry["params"] == ["<str len=8>"]
+    assert entry["plan_error"] is None
+    plan = entry["plan"][0]
+    assert plan["Plan"]["Node Type"] == "Aggregate"
+    # ANALYZE ran it
+    assert "Actual Rows" in plan["Plan"]
+    # Only the statement itself was recorded, not the EXPLAIN
+    assert not [entry for entry in slow_queries.entries if entry["sql"].startswith("EXPLAIN")]
+
+
+async def test_writing_statement_is_refused_by_the_read_only_explain(database, slow_queries):
+    async with database.connect() as conn:
+        await conn.execute(text(
+            "WITH write_marker AS (UPDATE venues SET name = name WHERE false RETURNING id) "
+            "SELECT count(*) FROM write_marker"
+        ))
+        await conn.rollback()
+
+    entry = await _recorded(slow_queries, "write_marker")
+
+    assert entry["plan"] is None
+    assert "read-only" in entry["plan_error"]
+
+
+async def test_non_select_is_recorded_without_a_plan(database, slow_queries):
+    async with database.connect() as conn:
+        await conn.execute(text("UPDATE venues SET name = name WHERE false AND 'update_marker' = ''"))
+        await conn.rollback()
+
+    entry = await _recorded(slow_queries, "update_marker")
+
+    assert entry["plan"] is None and entry["plan_error"] is None
@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.task import Task, TaskStatus
+from app.models.user import User, UserRole
+from app.services.metrics import TASKS_FINISHED
+from app.services.task_runner import TaskOutcome, TaskRunner
+
+KIND = "test_import"
+
+
+async def _handler(db, task):
+    return TaskOutcome()
+
+
+@pytest.fixture
+async def runner(db_session):
+    # Sessions on the test's connection, so their commits are rolled back too
+    runner = TaskRunner(
+        session_maker=async_sessionmaker(
+            bind=db_session.bind, expire_on_commit=False, join_transaction_mode="create_savepoint"
+        )
+    )
+    runner.register(KIND, _handler, transient_payload=("content",))
+    return runner
+
+
+@pytest.fixture
+async def user(db_session):
+    user = User(
+        name="Task Runner",
+        email=f"task-runner-{uuid4().hex[:8]}@example.com",
+        password_hash="not-a-real-hash",
+        role=UserRole.admin,
+    )
+    db_session.add(user)
+    await db_session.flush()
+    return user
+
+
+async def _running_task(db_session, runner, user) -> Task:
+    task = Task(
+        kind=KIND,
+        user_id=user.id,
+        payload={"filename": "venues.csv", "content": "name,city\n"},
+        status=TaskStatus.running,
+        locked_by=runner.worker_id,
+    )
+    db_session.add(task)
+    await db_session.flush()
+    return task
+
+
+def _finished_count(outcome: str) -> float:
+    return TASKS_FINISHED.labels(kind=KIND, result=outcome)._value.get()
+
+
+async def test_finish_drops_transient_payload(db_session, runner, user):
+    task = await _running_task(db_session, runner, user)
+
+    await runner._finish(task, TaskStatus.succeeded, "succeeded")
+
+    await db_session.refresh(task)
+    assert task.status == TaskStatus.succeeded
+    assert task.payload == {"filename": "venues.csv"}
+
+
+async def test_retry_keeps_the_payload(db_session, runner, user):
+    task = await _running_task(db_session, runner, user)
+
+    await runner._finish(task, TaskStatus.queued, "retried", retry_in=5)
+
+    await db_session.refresh(task)
+    assert task.payload["content"] == "name,city\n"
+
+
+async def test_finish_counts_only_the_update_that_applied(db_session, runner, user):
+    task = await _running_task(db_session, runner, user)
+    before = _finished_count("failed")
+
+    await runner._finish(task, TaskStatus.failed, "failed", error="boom")
+    # No longer running: e.g. requeued as stale, or recorded already
+    await runner._finish(task, TaskStatus.failed, "failed", error="boom")
+
+    assert _finished_count("failed") == before + 1
+
+
+async def test_cancelling_a_queued_task_drops_transient_payload(db_session, runner, user):
+    task = await runner.submit(db_session, KIND, user.id, {"filename": "venues.csv", "content": "name,city\n"})
+
+    await runner.cancel(db_session, task)
+
+    assert task.status == TaskStatus.cancelled
+    assert task.payload == {"filename": "venues.csv"}
+
+
+async def _stale_task(db_session, runner, user, **values) -> Task:
+    task = await _running_task(db_session, runner, user)
+    task.heartbeat_at = datetime.now(timezone.utc) - timedelta(seconds=runner.stale_after * 2)
+    for name, value in values.items():
+        setattr(task, name, value)
+    await db_session.flush()
+    return task
+
+
+@pytest.mark.parametrize("values, status, outcome", [
+    ({"attempts": 1, "max_attempts": 3}, TaskStatus.queued, "requeued"),
+    ({"attempts": 3, "max_attempts": 3}, TaskStatus.failed, "failed"),
+    ({"attempts": 1, "max_attempts": 3, "cancel_requested": True}, TaskStatus.cancelled, "cancelled"),
+])
+async def test_stale_task_is_requeued_or_finished(db_session, runner, user, values, status, outcome):
+    task = await _stale_task(db_session, runner, user, **values)
+    before = _finished_count(outcome)
+
+    await runner._requeue_stale()
+
+    await db_session.refresh(task)
+    assert task.status == status
+    assert task.locked_by is None
+    assert _finished_count(outcome) == before + 1
+    if status == TaskStatus.queued:
+        # Needed by the next attempt
+        assert task.payload["content"] == "name,city\n"
+        assert task.finished_at is None
+    else:
+        assert task.payload == {"filename": "venues.csv"}
+        assert task.finished_at is not None
+
+
+async def test_stale_task_of_an_unregistered_kind_keeps_its_payload(db_session, runner, user):
+    task = await _stale_task(db_session, runner, user, kind="other_kind", attempts=3, max_attempts=3)
+
+    await runner._requeue_stale()
+
+    await db_session.refresh(task)
+    assert task.status == TaskStatus.failed
+    assert task.payload["content"] == "name,city\n"
@@ -0,0 +1,163 @@
+import gzip
+import zlib
+
+import brotli
+import pytest
+import zstandard
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware, Encoder, make_encoder, negotiate
+
+BODY = "venue " * 500
+CHUNKS = [f"chunk {i} ".encode() * 50 for i in range(4)]
+PREFERRED = ["zstd", "br", "gzip"]
+
+
+async def _chunks():
+    for chunk in CHUNKS:
+        yield chunk
+
+
+def _app() -> Starlette:
+    routes = [
+        Route("/text", lambda request: PlainTextResponse(BODY, headers={"ETag": '"abc"'})),
+        Route("/small", lambda request: PlainTextResponse("tiny")),
+        Route("/pdf", lambda request: Response(BODY.encode(), media_type="application/pdf")),
+        Route("/events", lambda request: StreamingResponse(_chunks(), media_type="text/event-stream")),
+        Route(
+            "/no-transform",
+            lambda request: PlainTextResponse(BODY, headers={"Cache-Control": "public, no-transform"}),
+        ),
+        Route("/stream", lambda request: StreamingResponse(_chunks(), media_type="text/plain")),
+    ]
+    return CompressionMiddleware(Starlette(routes=routes), minimum_size=500)
+
+
+@pytest.fixture
+def client():
+    return TestClient(_app())
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, br, zstd", "zstd"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0.8, gzip;q=0.8", "br"),
+        ("*", "zstd"),
+        ("gzip;q=0.5, *;q=0.1", "gzip"),
+        ("*;q=0.5, zstd;q=0", "br"),
+        ("zstd;q=0, br;q=0, gzip;q=0", None),
+        ("*;q=0", None),
+        ("identity", None),
+        ("", None),
+        ("GZIP", "gzip"),
+        ("gzip;q=abc, br", "br"),
+    ],
+)
+def test_negotiate(accept_encoding, expected):
+    assert negotiate(accept_encoding, PREFERRED) == expected
+
+
+def test_encoder_is_abstract():
+    with pytest.raises(TypeError):
+        Encoder()
+
+
+@pytest.mark.parametrize("coding", PREFERRED)
+def test_compresses_with_the_negotiated_coding(client, coding):
+    response = client.get("/text", headers={"Accept-Encoding": coding})
+
+    assert response.headers["content-encoding"] == coding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == BODY
+
+
+def test_weakens_strong_etags(client):
+    response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["etag"] == 'W/"abc"'
+
+
+def test_leaves_uncompressed_responses_alone(client):
+    response = client.get("/text", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"abc"'
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_passes_through_responses_below_the_minimum_size(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == "4"
+    assert response.text == "tiny"
+
+
+@pytest.mark.parametrize("path", ["/pdf", "/events", "/no-transform"])
+def test_skips_excluded_responses(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip, br, zstd"})
+
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+
+
+DECOMPRESSORS = {
+    "gzip": lambda: zlib.decompressobj(31),
+    "br": lambda: brotli.Decompressor(),
+    "zstd": lambda: zstandard.ZstdDecompressor().decompressobj(),
+}
+
+
+def _decompress(decompressor, data: bytes) -> bytes:
+    return decompressor.process(data) if isinstance(decompressor, brotli.Decompressor) else decompressor.decompress(data)
+
+
+@pytest.mark.parametrize("coding", PREFERRED)
+async def test_streamed_chunks_are_flushed_and_decompress(coding):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        # ASGI 2.4: StreamingResponse does not poll receive() for a disconnect
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "method": "GET",
+        "path": "/stream",
+        "raw_path": b"/stream",
+        "root_path": "",
+        "scheme": "http",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", coding.encode())],
+        "server": ("testserver", 80),
+        "client": ("testclient", 123),
+        "http_version": "1.1",
+    }
+    await _app()(scope, receive, send)
+
+    start, *bodies = messages
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == coding.encode()
+    assert b"content-length" not in headers
+
+    # Each compressed chunk decodes to its original chunk on arrival
+    decompressor = DECOMPRESSORS[coding]()
+    decoded = [_decompress(decompressor, message["body"]) for message in bodies]
+    assert decoded[:len(CHUNKS)] == CHUNKS
+    assert b"".join(decoded) == b"".join(CHUNKS)
+    assert bodies[-1]["more_body"] is False
+
+
+def test_single_chunk_gzip_is_complete():
+    encoder = make_encoder("gzip")
+
+    assert gzip.decompress(encoder.finish(BODY.encode())) == BODY.encode()
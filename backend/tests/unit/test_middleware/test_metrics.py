@@ -0,0 +1,62 @@
+import httpx
+import pytest
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY
+
+from app.main import app
+
+SERIES = [
+    "http_requests_total",
+    "http_request_duration_seconds",
+    "http_requests_in_progress",
+    "db_connections_opened_total",
+    "db_pool_checkouts_total",
+    "db_pool_checked_out",
+    "pdf_render_duration_seconds",
+    "ai_tokens_total",
+    "upstream_calls_total",
+    "circuit_breaker_state",
+    "csv_import_rows_total",
+    "activity_log_events_total",
+    "tasks_finished_total",
+    "project_events_total",
+    "project_event_subscribers",
+    "rate_limited_requests_total",
+    "rate_limited_requests_in_progress",
+]
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+def _requests(route: str, status: str) -> float:
+    labels = {"method": "GET", "route": route, "status": status}
+    return REGISTRY.get_sample_value("http_requests_total", labels) or 0.0
+
+
+async def test_metrics_serves_every_series(client):
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE_LATEST
+    for name in SERIES:
+        assert f"# TYPE {name} " in response.text
+
+
+async def test_requests_are_counted_per_route_template(client):
+    health = _requests("/health", "200")
+    venue = _requests("/api/v1/venues/{venue_id}", "422")
+    scrapes = _requests("/metrics", "200")
+
+    await client.get("/health")
+    await client.get("/health")
+    await client.get("/api/v1/venues/not-a-uuid")
+    response = await client.get("/metrics")
+
+    assert _requests("/health", "200") == health + 2
+    assert _requests("/api/v1/venues/{venue_id}", "422") == venue + 1
+    # Scrapes are not counted
+    assert _requests("/metrics", "200") == scrapes
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
@@ -0,0 +1,39 @@
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import Range
+
+from app.schemas.project_venue import DateRange, ProjectVenueUpdate
+
+
+@pytest.mark.parametrize("value", [{}, {"start": None, "end": None}, {"start": None}])
+def test_date_range_needs_a_bound(value):
+    with pytest.raises(ValidationError, match="start or end is required"):
+        DateRange.model_validate(value)
+
+
+def test_date_range_rejects_end_before_start():
+    with pytest.raises(ValidationError, match="end must be on or after start"):
+        DateRange(start=date(2026, 5, 2), end=date(2026, 5, 1))
+
+
+@pytest.mark.parametrize(
+    "value",
+    [{"start": "2026-05-01"}, {"end": "2026-05-01"}, {"start": "2026-05-01", "end": "2026-05-01"}],
+)
+def test_date_range_accepts_open_ended_and_single_day_ranges(value):
+    assert DateRange.model_validate(value).to_range().bounds == "[]"
+
+
+def test_date_range_from_canonical_pg_range_has_inclusive_end():
+    date_range = DateRange.model_validate(Range(date(2026, 5, 1), date(2026, 5, 4), bounds="[)"))
+
+    assert (date_range.start, date_range.end) == (date(2026, 5, 1), date(2026, 5, 3))
+
+
+def test_update_can_still_clear_a_range_with_null():
+    assert ProjectVenueUpdate(hold_range=None).hold_range is None
+
+    with pytest.raises(ValidationError):
+        ProjectVenueUpdate(hold_range={})
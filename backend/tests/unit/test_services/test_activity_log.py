@@ -0,0 +1,218 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.services import activity_log
+from app.services.activity_log import ActivityLogPartitionMaintainer, ActivityLogWriter
+from app.services.metrics import ACTIVITY_LOG_EVENTS
+
+
+class FakeDatabase:
+    """A session_maker recording the committed activity_logs INSERTs.
+
+    Batches containing an event with action "orphaned" fail with an
+    IntegrityError, like an event whose project was deleted. Writes wait
+    while ``gate`` is clear.
+    """
+
+    def __init__(self):
+        self.batches = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    def __call__(self):
+        return FakeSession(self)
+
+    @property
+    def events(self):
+        return [event for batch in self.batches for event in batch]
+
+
+class FakeSession:
+    def __init__(self, database: FakeDatabase):
+        self.database = database
+        self.pending = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement, rows):
+        await self.database.gate.wait()
+        if any(row["action"] == "orphaned" for row in rows):
+            raise IntegrityError("INSERT INTO activity_logs", {}, Exception("foreign key violation"))
+        self.pending = list(rows)
+
+    async def commit(self):
+        self.database.batches.append(self.pending)
+
+
+@pytest.fixture
+def fake_db():
+    return FakeDatabase()
+
+
+@pytest.fixture
+async def make_writer(fake_db):
+    writers = []
+
+    def make(**options) -> ActivityLogWriter:
+        options = {"batch_size": 100, "flush_interval": 60, **options}
+        writer = ActivityLogWriter(session_maker=fake_db, **options)
+        writer.start()
+        writers.append(writer)
+        return writer
+
+    yield make
+    fake_db.gate.set()
+    for writer in writers:
+        await writer.stop()
+
+
+async def _log(writer: ActivityLogWriter, action: str = "project.updated") -> bool:
+    return await writer.log(uuid4(), uuid4(), action, {"field": "notes"})
+
+
+async def _until(condition, timeout: float = 1.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+
+def _count(result: str) -> float:
+    return ACTIVITY_LOG_EVENTS.labels(result=result)._value.get()
+
+
+async def test_log_is_off_until_started(fake_db):
+    writer = ActivityLogWriter(session_maker=fake_db)
+
+    assert await _log(writer) is False
+
+
+async def test_full_batch_is_flushed_at_once(make_writer, fake_db):
+    writer = make_writer(batch_size=3)
+
+    for _ in range(3):
+        assert await _log(writer)
+
+    await _until(lambda: fake_db.batches)
+    assert [len(batch) for batch in fake_db.batches] == [3]
+
+
+async def test_partial_batch_is_flushed_on_the_timer(make_writer, fake_db):
+    writer = make_writer(batch_size=100, flush_interval=0.05)
+
+    await _log(writer)
+    await _log(writer)
+    await asyncio.sleep(0.01)
+    assert fake_db.batches == []
+
+    await _until(lambda: fake_db.batches)
+    assert [len(batch) for batch in fake_db.batches] == [2]
+
+
+async def test_large_backlog_is_written_in_batches_of_batch_size(make_writer, fake_db):
+    writer = make_writer(batch_size=4)
+    fake_db.gate.clear()
+    for _ in range(10):
+        await _log(writer)
+
+    fake_db.gate.set()
+
+    await _until(lambda: len(fake_db.events) == 10)
+    assert all(len(batch) <= 4 for batch in fake_db.batches)
+
+
+async def test_full_queue_drops_after_the_enqueue_timeout(make_writer, fake_db):
+    writer = make_writer(batch_size=1, max_queue=2, enqueue_timeout=0.02)
+    # The flusher takes the first event and is stuck writing it
+    fake_db.gate.clear()
+    await _log(writer)
+    await _until(lambda: writer._queue.empty())
+    assert await _log(writer) and await _log(writer)
+    dropped = _count("dropped")
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    assert await _log(writer, "project.dropped") is False
+
+    assert loop.time() - started >= 0.02
+    assert _count("dropped") == dropped + 1
+    fake_db.gate.set()
+    await writer.stop()
+    assert len(fake_db.events) == 3
+    assert "project.dropped" not in {event["action"] for event in fake_db.events}
+
+
+async def test_stop_writes_what_is_left_in_the_queue(make_writer, fake_db):
+    writer = make_writer(batch_size=100, flush_interval=60)
+    for _ in range(5):
+        await _log(writer)
+    assert fake_db.batches == []
+
+    await writer.stop()
+
+    assert [len(batch) for batch in fake_db.batches] == [5]
+    assert await _log(writer) is False
+
+
+async def test_integrity_error_falls_back_to_one_insert_per_event(make_writer, fake_db):
+    writer = make_writer(batch_size=3)
+    failed = _count("failed")
+
+    await _log(writer, "project.updated")
+    await _log(writer, "orphaned")
+    await _log(writer, "project.deleted")
+
+    await _until(lambda: len(fake_db.batches) == 2)
+    assert [event["action"] for event in fake_db.events] == ["project.updated", "project.deleted"]
+    assert _count("failed") == failed + 1
+
+
+async def test_partition_maintenance_runs_on_start_and_on_the_interval(monkeypatch, fake_db):
+    runs = []
+
+    async def ensure_partitions(db, months_ahead):
+        runs.append(months_ahead)
+        return []
+
+    async def drop_expired_partitions(engine, retention_months):
+        runs.append(-retention_months)
+        return []
+
+    monkeypatch.setattr(activity_log.activity_log_service, "ensure_partitions", ensure_partitions)
+    monkeypatch.setattr(activity_log.activity_log_service, "drop_expired_partitions", drop_expired_partitions)
+    maintainer = ActivityLogPartitionMaintainer(
+        months_ahead=2, retention_months=12, interval=0.05, session_maker=fake_db, engine=None
+    )
+
+    maintainer.start()
+    await _until(lambda: len(runs) >= 2)
+    assert runs[:2] == [2, -12]
+    await _until(lambda: len(runs) >= 4)
+
+    await maintainer.stop()
+    done = len(runs)
+    await asyncio.sleep(0.1)
+    assert len(runs) == done
+
+
+async def test_partition_maintenance_survives_a_failed_run(monkeypatch, fake_db):
+    runs = []
+
+    async def ensure_partitions(db, months_ahead):
+        runs.append(months_ahead)
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(activity_log.activity_log_service, "ensure_partitions", ensure_partitions)
+    maintainer = ActivityLogPartitionMaintainer(interval=0.02, session_maker=fake_db, engine=None)
+
+    maintainer.start()
+    await _until(lambda: len(runs) >= 2)
+    await maintainer.stop()
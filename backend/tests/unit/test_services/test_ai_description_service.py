@@ -0,0 +1,134 @@
+"""generate_description against tools.fake_openai, run in-process."""
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.services.ai_description_service import AIDescriptionService
+from app.services.resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded
+from tools.fake_openai import DESCRIPTION
+
+
+class FakeSession:
+    """Records what generate_description does with its session."""
+
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def commit(self):
+        self.commits += 1
+
+    async def refresh(self, instance):
+        pass
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def service(monkeypatch, fake_openai_client):
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "fake")
+    monkeypatch.setattr(settings, "OPENAI_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(settings, "OPENAI_DEADLINE_SECONDS", 30)
+    monkeypatch.setattr(settings, "OPENAI_BREAKER_FAILURES", 3)
+    monkeypatch.setattr(settings, "OPENAI_BREAKER_RESET_SECONDS", 30)
+    service = AIDescriptionService()
+    service._client = fake_openai_client
+    return service
+
+
+@pytest.fixture
+def project_venue():
+    return SimpleNamespace(
+        ai_context={"event_context": {"event_type": "Conference"}},
+        venue=SimpleNamespace(name="Hall", city="Brussels", address=None, capacity=100),
+        project=SimpleNamespace(client=None),
+        ai_description=None,
+    )
+
+
+async def test_generates_and_saves_the_description(service, project_venue, fake_openai):
+    db = FakeSession()
+
+    assert await service.generate_description(db, project_venue) == DESCRIPTION
+
+    assert project_venue.ai_description == DESCRIPTION
+    assert db.commits == 1
+    assert fake_openai["requests"] == 1
+
+
+async def test_retries_server_errors_then_succeeds(service, project_venue, fake_openai, retry_sleeps):
+    fake_openai.update(fail_next=2, status=503)
+
+    assert await service.generate_description(FakeSession(), project_venue) == DESCRIPTION
+
+    assert fake_openai["requests"] == 3
+    assert len(retry_sleeps) == 2
+    assert service.breaker.failures == 0
+
+
+async def test_honours_retry_after(service, project_venue, fake_openai, retry_sleeps):
+    fake_openai.update(fail_next=1, status=429, retry_after=4)
+
+    await service.generate_description(FakeSession(), project_venue)
+
+    assert retry_sleeps == [4.0]
+
+
+async def test_bad_request_is_not_retried(service, project_venue, fake_openai, retry_sleeps):
+    fake_openai.update(fail_next=1, status=400)
+    db = FakeSession()
+
+    with pytest.raises(Exception, match="OpenAI API error"):
+        await service.generate_description(db, project_venue)
+
+    assert fake_openai["requests"] == 1
+    assert retry_sleeps == []
+    assert service.breaker.failures == 0
+    assert db.rollbacks == 1
+
+
+async def test_deadline_stops_retries(service, project_venue, fake_openai, retry_sleeps, monkeypatch):
+    # Retry-After longer than the time left: no retry is started
+    monkeypatch.setattr(settings, "OPENAI_DEADLINE_SECONDS", 2)
+    fake_openai.update(error_rate=1, status=503, retry_after=5)
+
+    with pytest.raises(DeadlineExceeded):
+        await service.generate_description(FakeSession(), project_venue)
+
+    assert fake_openai["requests"] == 1
+
+
+async def test_breaker_opens_goes_half_open_and_closes(service, project_venue, fake_openai, retry_sleeps):
+    fake_openai.update(error_rate=1, status=500)
+    with pytest.raises(Exception, match="OpenAI API error"):
+        await service.generate_description(FakeSession(), project_venue)
+    assert service.breaker.state == CircuitBreaker.OPEN
+    assert fake_openai["requests"] == 3
+
+    # Open: refused without calling OpenAI
+    with pytest.raises(CircuitOpenError):
+        await service.generate_description(FakeSession(), project_venue)
+    assert fake_openai["requests"] == 3
+
+    # After the reset timeout, a trial call goes through and closes it
+    fake_openai.update(error_rate=0)
+    service.breaker.opened_at -= service.breaker.reset_timeout
+    assert await service.generate_description(FakeSession(), project_venue) == DESCRIPTION
+    assert service.breaker.state == CircuitBreaker.CLOSED
+    assert fake_openai["requests"] == 4
+
+
+async def test_failed_trial_reopens_the_breaker(service, project_venue, fake_openai, retry_sleeps):
+    fake_openai.update(error_rate=1, status=500)
+    with pytest.raises(Exception):
+        await service.generate_description(FakeSession(), project_venue)
+    service.breaker.opened_at -= service.breaker.reset_timeout
+
+    # The trial fails and reopens the circuit, which refuses the retry
+    with pytest.raises(CircuitOpenError):
+        await service.generate_description(FakeSession(), project_venue)
+
+    assert service.breaker.state == CircuitBreaker.OPEN
+    assert fake_openai["requests"] == 4
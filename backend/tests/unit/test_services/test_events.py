@@ -0,0 +1,109 @@
+import json
+from uuid import uuid4
+
+import pytest
+
+from app.services.events import RESYNC, EventBus, Subscription, format_sse, make_event
+from app.services.metrics import EVENTS_PUBLISHED, EVENTS_SUBSCRIBERS
+
+
+@pytest.fixture
+def bus():
+    return EventBus(queue_size=3)
+
+
+async def _drain(subscription: Subscription) -> list:
+    events = []
+    while (event := await subscription.get(0)) is not None:
+        events.append(event)
+    return events
+
+
+async def test_publish_fans_out_to_the_project_subscribers(bus):
+    project_id, other_id = uuid4(), uuid4()
+
+    async with (
+        bus.subscribe(project_id) as first,
+        bus.subscribe(project_id) as second,
+        bus.subscribe(other_id) as other,
+    ):
+        bus.publish(project_id, "project_venue.removed", {"venue_id": "v1"})
+        bus.publish(project_id, "project.updated")
+
+        for subscription in (first, second):
+            events = await _drain(subscription)
+            assert [event["type"] for event in events] == ["project_venue.removed", "project.updated"]
+            assert events[0]["project_id"] == str(project_id)
+            assert events[0]["data"] == {"venue_id": "v1"}
+        assert await _drain(other) == []
+
+
+async def test_unsubscribing_removes_the_channel(bus):
+    project_id = uuid4()
+    subscribers = EVENTS_SUBSCRIBERS._value.get()
+
+    async with bus.subscribe(project_id):
+        assert EVENTS_SUBSCRIBERS._value.get() == subscribers + 1
+
+    assert bus._subscribers == {}
+    assert EVENTS_SUBSCRIBERS._value.get() == subscribers
+    # Nobody listening: publishing is a no-op
+    bus.publish(project_id, "project.updated")
+
+
+async def test_overflow_replaces_the_queue_with_one_resync(bus):
+    project_id = uuid4()
+    overflows = EVENTS_PUBLISHED.labels(result="overflow")._value.get()
+
+    async with bus.subscribe(project_id) as subscription:
+        for n in range(4):
+            bus.publish(project_id, "project.updated", {"n": n})
+        events = await _drain(subscription)
+
+        assert [event["type"] for event in events] == [RESYNC]
+        assert events[0]["data"] == {"reason": "overflow"}
+        assert EVENTS_PUBLISHED.labels(result="overflow")._value.get() == overflows + 1
+
+        # Keeps delivering after catching up
+        bus.publish(project_id, "project.updated", {"n": 4})
+        assert [event["data"] for event in await _drain(subscription)] == [{"n": 4}]
+
+
+async def test_get_times_out_with_none(bus):
+    async with bus.subscribe(uuid4()) as subscription:
+        assert await subscription.get(0.01) is None
+
+
+async def test_receive_delivers_other_processes_events_only(bus):
+    project_id = uuid4()
+    other_process = EventBus()
+
+    async with bus.subscribe(project_id) as subscription:
+        event = make_event(project_id, "project.updated")
+        bus.receive(bus.encode(event))
+        bus.receive("not json")
+        assert await _drain(subscription) == []
+
+        bus.receive(other_process.encode(event))
+        assert await _drain(subscription) == [event]
+
+
+async def test_resync_all_reaches_every_subscriber(bus):
+    async with bus.subscribe(uuid4()) as first, bus.subscribe(uuid4()) as second:
+        bus.resync_all("broker reconnected")
+
+        for subscription in (first, second):
+            events = await _drain(subscription)
+            assert [(event["type"], event["data"]) for event in events] == [(RESYNC, {"reason": "broker reconnected"})]
+            assert events[0]["project_id"] == str(subscription.project_id)
+
+
+def test_format_sse():
+    event = make_event(uuid4(), "project.updated", {"event_name": "Summit"})
+
+    message = format_sse(event)
+
+    assert message.endswith("\n\n")
+    lines = message.splitlines()
+    assert lines[:2] == [f"id: {event['id']}", "event: project.updated"]
+    assert json.loads(lines[2].removeprefix("data: ")) == event
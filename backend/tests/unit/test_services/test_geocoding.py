@@ -0,0 +1,74 @@
+"""Gazetteer loading and place name matching."""
+import pytest
+
+from app.config import settings
+from app.services.geocoding import GeocodingService
+
+GAZETTEER_CSV = """name,latitude,longitude
+Brussels,50.8503,4.3517
+Ghent,51.0543,3.7174
+Paris,48.8566,2.3522
+Lyon,45.7640,4.8357
+New York,40.7128,-74.0060
+York,53.9600,-1.0873
+"""
+
+BRUSSELS = (50.8503, 4.3517)
+PARIS = (48.8566, 2.3522)
+LYON = (45.7640, 4.8357)
+
+
+@pytest.fixture
+async def geocoding(tmp_path, monkeypatch):
+    path = tmp_path / "gazetteer.csv"
+    path.write_text(GAZETTEER_CSV, encoding="utf-8")
+    monkeypatch.setattr(settings, "GAZETTEER_PATH", str(path))
+    service = GeocodingService()
+    await service.load()
+    return service
+
+
+async def test_geocoding_before_load_returns_none(tmp_path, monkeypatch):
+    path = tmp_path / "gazetteer.csv"
+    path.write_text(GAZETTEER_CSV, encoding="utf-8")
+    monkeypatch.setattr(settings, "GAZETTEER_PATH", str(path))
+    service = GeocodingService()
+
+    assert service.gazetteer is None
+    assert service.geocode("Brussels") is None
+
+
+async def test_load_reads_the_gazetteer_file(geocoding):
+    assert len(geocoding.gazetteer) == 6
+    assert geocoding.geocode("brussels") == BRUSSELS
+
+
+async def test_load_without_gazetteer_path_is_a_no_op(monkeypatch):
+    monkeypatch.setattr(settings, "GAZETTEER_PATH", None)
+    service = GeocodingService()
+    await service.load()
+
+    assert service.gazetteer is None
+    assert service.geocode("Brussels") is None
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("12 Rue de Paris, Lyon", LYON),
+        ("Rue de Paris, 69003 Lyon, France", LYON),
+        ("Rue Neuve 1, 1000 Brussels, Belgium", BRUSSELS),
+        ("Brussels, Belgium", BRUSSELS),
+        ("Avenue de Lyon 5, Paris", PARIS),
+        ("near central Brussels", BRUSSELS),
+        ("Boulevard de Paris", PARIS),
+        ("New York, NY", (40.7128, -74.0060)),
+        ("Nowhere, Atlantis", None),
+    ],
+)
+async def test_search_text_prefers_the_city_part_of_an_address(geocoding, text, expected):
+    assert geocoding.gazetteer.search_text(text) == expected
+
+
+async def test_geocode_falls_back_to_the_address(geocoding):
+    assert geocoding.geocode("Unknown City", "12 Rue de Paris, Lyon") == LYON
@@ -0,0 +1,150 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import deps
+from app.services.rate_limit import (
+    CONCURRENCY_RETRY_AFTER,
+    MemoryBuckets,
+    RateLimit,
+    RateLimiter,
+    RateLimitExceeded,
+)
+
+
+class Clock:
+    """A monotonic clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def make_limiter(clock):
+    def make(**options) -> RateLimiter:
+        options = {
+            # Rates that are exact in binary floating point: 1 token every 8s
+            "limits": {"ai": RateLimit.per(2, 16)},
+            "concurrency": {"ai": 2},
+            "buckets": MemoryBuckets(clock=clock),
+            **options,
+        }
+        return RateLimiter(**options)
+
+    return make
+
+
+async def test_bucket_allows_a_burst_then_waits_for_the_refill(clock):
+    buckets = MemoryBuckets(clock=clock)
+    limit = RateLimit.per(2, 16)
+
+    assert await buckets.take(None, "ai:u1", limit) == 0
+    assert await buckets.take(None, "ai:u1", limit) == 0
+    assert await buckets.take(None, "ai:u1", limit) == 8
+
+    clock.now += 6
+    assert await buckets.take(None, "ai:u1", limit) == 2
+
+    clock.now += 2
+    assert await buckets.take(None, "ai:u1", limit) == 0
+    assert await buckets.take(None, "ai:u1", limit) == 8
+    # Other users have their own bucket
+    assert await buckets.take(None, "ai:u2", limit) == 0
+
+
+async def test_bucket_refills_up_to_the_burst(clock):
+    buckets = MemoryBuckets(clock=clock)
+    limit = RateLimit.per(2, 16)
+    await buckets.take(None, "ai:u1", limit)
+
+    clock.now += 3600
+
+    assert await buckets.take(None, "ai:u1", limit) == 0
+    assert await buckets.take(None, "ai:u1", limit) == 0
+    assert await buckets.take(None, "ai:u1", limit) > 0
+
+
+async def test_full_buckets_are_pruned_past_max_buckets(clock):
+    buckets = MemoryBuckets(clock=clock)
+    buckets.MAX_BUCKETS = 2
+    limit = RateLimit.per(2, 16)
+    await buckets.take(None, "ai:u1", limit)
+    clock.now += 10
+    await buckets.take(None, "ai:u2", limit)
+
+    # u1's bucket is full again by now, u2's is not
+    clock.now += 10
+    await buckets.take(None, "ai:u3", limit)
+
+    assert set(buckets._buckets) == {"ai:u2", "ai:u3"}
+
+
+@pytest.mark.parametrize("elapsed, retry_after", [(0, 8), (2, 6), (2.5, 6), (7.75, 1)])
+async def test_retry_after_rounds_the_wait_up_to_whole_seconds(make_limiter, clock, elapsed, retry_after):
+    limiter = make_limiter(limits={"ai": RateLimit.per(1, 8)})
+    user_id = uuid4()
+    await limiter.check(None, "ai", user_id)
+
+    clock.now += elapsed
+    with pytest.raises(RateLimitExceeded) as error:
+        await limiter.check(None, "ai", user_id)
+
+    assert error.value.reason == "rate"
+    assert error.value.retry_after == retry_after
+    assert limiter.stats()[0]["rejected_rate"] == 1
+
+
+async def test_unlimited_class_and_disabled_limiter_never_reject(make_limiter):
+    user_id = uuid4()
+    unlimited = make_limiter(limits={})
+    disabled = make_limiter(enabled=False)
+
+    for _ in range(5):
+        await unlimited.check(None, "ai", user_id)
+        await disabled.check(None, "ai", user_id)
+        disabled.enter("ai")
+
+
+def test_concurrency_cap_rejects_until_a_slot_is_left(make_limiter):
+    limiter = make_limiter()
+    limiter.enter("ai")
+    limiter.enter("ai")
+
+    with pytest.raises(RateLimitExceeded) as error:
+        limiter.enter("ai")
+
+    assert (error.value.reason, error.value.retry_after) == ("concurrency", CONCURRENCY_RETRY_AFTER)
+    limiter.leave("ai")
+    limiter.enter("ai")
+    assert limiter.stats()[0]["in_flight"] == 2
+    assert limiter.stats()[0]["rejected_concurrency"] == 1
+
+
+async def test_rate_rejection_releases_the_concurrency_slot(monkeypatch, make_limiter):
+    limiter = make_limiter(limits={"ai": RateLimit.per(1, 8)}, concurrency={"ai": 1})
+    monkeypatch.setattr(deps, "rate_limiter", limiter)
+    dependency = deps.rate_limited("ai")
+    user = SimpleNamespace(id=uuid4())
+
+    allowed = dependency(db=None, current_user=user)
+    await allowed.__anext__()
+    assert limiter.stats()[0]["in_flight"] == 1
+    await allowed.aclose()
+    assert limiter.stats()[0]["in_flight"] == 0
+
+    with pytest.raises(HTTPException) as error:
+        await dependency(db=None, current_user=user).__anext__()
+
+    assert error.value.status_code == 429
+    assert error.value.headers == {"Retry-After": "8"}
+    assert limiter.stats()[0]["in_flight"] == 0
@@ -0,0 +1,310 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from app.services.ai_description_service import classify_openai_error
+from app.services.resilience import (
+    AttemptTimeout,
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    DeadlineExceeded,
+    RetryPolicy,
+    call_with_retries,
+)
+
+REQUEST = httpx.Request("POST", "http://fake-openai/v1/chat/completions")
+
+
+class Transient(Exception):
+    pass
+
+
+class Permanent(Exception):
+    pass
+
+
+def classify(exc):
+    return isinstance(exc, Transient), getattr(exc, "retry_after", None)
+
+
+def flaky(*outcomes):
+    """A call raising or returning ``outcomes`` in turn; records its timeouts."""
+    remaining = list(outcomes)
+
+    async def call(timeout):
+        call.timeouts.append(timeout)
+        outcome = remaining.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    call.timeouts = []
+    return call
+
+
+def hanging(*outcomes):
+    """Like ``flaky``, but ``HANG`` outcomes never return; records the attempts cancelled."""
+    remaining = list(outcomes)
+
+    async def call(timeout):
+        call.timeouts.append(timeout)
+        outcome = remaining.pop(0)
+        if outcome is HANG:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                call.cancelled += 1
+                raise
+        return outcome
+
+    call.timeouts = []
+    call.cancelled = 0
+    return call
+
+
+HANG = object()
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def _wait_out(breaker: CircuitBreaker) -> None:
+    breaker.opened_at -= breaker.reset_timeout
+
+
+# CircuitBreaker
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_call()
+    assert 29 <= error.value.retry_after <= 30
+
+
+def test_breaker_lets_one_trial_call_through_when_half_open():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30)
+    _open(breaker)
+    _wait_out(breaker)
+
+    breaker.before_call()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_breaker_closes_when_the_trial_succeeds():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30)
+    _open(breaker)
+    _wait_out(breaker)
+    breaker.before_call()
+
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+
+def test_breaker_reopens_when_the_trial_fails():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30)
+    _open(breaker)
+    _wait_out(breaker)
+    breaker.before_call()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_breaker_release_frees_the_trial_slot():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=30)
+    _open(breaker)
+    _wait_out(breaker)
+    breaker.before_call()
+
+    breaker.release()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+
+
+# RetryPolicy
+
+@pytest.mark.parametrize("retry, ceiling", [(1, 0.5), (2, 1.0), (3, 2.0), (5, 8.0), (10, 8.0)])
+def test_backoff_is_full_jitter_up_to_the_capped_exponential(monkeypatch, retry, ceiling):
+    policy = RetryPolicy(base_delay=0.5, max_delay=8.0)
+    monkeypatch.setattr("app.services.resilience.random.uniform", lambda low, high: (low, high))
+
+    assert policy.backoff(retry) == (0, ceiling)
+
+
+def test_backoff_stays_within_its_bounds():
+    policy = RetryPolicy(base_delay=0.5, max_delay=8.0)
+
+    assert all(0 <= policy.backoff(3) <= 2.0 for _ in range(200))
+
+
+# classify_openai_error
+
+def _status_error(cls, status: int, headers=None):
+    response = httpx.Response(status, headers=headers or {}, request=REQUEST)
+    return cls(f"HTTP {status}", response=response, body=None)
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (_status_error(openai.RateLimitError, 429, {"retry-after": "2"}), (True, 2.0)),
+        (_status_error(openai.RateLimitError, 429, {"retry-after-ms": "1500"}), (True, 1.5)),
+        (_status_error(openai.RateLimitError, 429, {"retry-after": "Wed, 21 Oct 2026 07:28:00 GMT"}), (True, None)),
+        (_status_error(openai.InternalServerError, 503), (True, None)),
+        (_status_error(openai.APIStatusError, 408), (True, None)),
+        (_status_error(openai.ConflictError, 409), (True, None)),
+        (_status_error(openai.BadRequestError, 400), (False, None)),
+        (_status_error(openai.AuthenticationError, 401), (False, None)),
+        (_status_error(openai.NotFoundError, 404), (False, None)),
+        (_status_error(openai.UnprocessableEntityError, 422), (False, None)),
+        (openai.APITimeoutError(request=REQUEST), (True, None)),
+        (openai.APIConnectionError(request=REQUEST), (True, None)),
+        (ValueError("bad"), (False, None)),
+    ],
+)
+def test_classify_openai_error(error, expected):
+    assert classify_openai_error(error) == expected
+
+
+# call_with_retries
+
+async def test_retries_transient_failures_until_success(retry_sleeps):
+    call = flaky(Transient(), Transient(), "ok")
+
+    result = await call_with_retries(call, classify, RetryPolicy(max_attempts=3, attempt_timeout=5))
+
+    assert result == "ok"
+    assert call.timeouts == [5, 5, 5]
+    assert len(retry_sleeps) == 2
+
+
+async def test_gives_up_after_max_attempts(retry_sleeps):
+    call = flaky(Transient("first"), Transient("second"), "ok")
+
+    with pytest.raises(Transient, match="second"):
+        await call_with_retries(call, classify, RetryPolicy(max_attempts=2))
+
+
+async def test_permanent_failures_are_not_retried(retry_sleeps):
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    call = flaky(Permanent(), "ok")
+
+    with pytest.raises(Permanent):
+        await call_with_retries(call, classify, RetryPolicy(), breaker=breaker)
+
+    assert len(call.timeouts) == 1
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+
+
+async def test_waits_at_least_retry_after(retry_sleeps):
+    failure = Transient()
+    failure.retry_after = 3.0
+    call = flaky(failure, "ok")
+
+    await call_with_retries(call, classify, RetryPolicy(base_delay=0.1, max_delay=0.1))
+
+    assert retry_sleeps == [3.0]
+
+
+async def test_each_attempt_gets_at_most_the_time_left(retry_sleeps):
+    call = flaky("ok")
+
+    await call_with_retries(call, classify, RetryPolicy(attempt_timeout=20), deadline=Deadline(2))
+
+    assert 1.9 < call.timeouts[0] <= 2
+
+
+async def test_no_retry_is_started_past_the_deadline(retry_sleeps):
+    failure = Transient()
+    failure.retry_after = 10.0
+    call = flaky(failure, "ok")
+
+    with pytest.raises(DeadlineExceeded):
+        await call_with_retries(call, classify, RetryPolicy(), deadline=Deadline(5))
+
+    assert len(call.timeouts) == 1
+    assert retry_sleeps == []
+
+
+async def test_attempt_past_its_timeout_is_cancelled_and_retried(retry_sleeps):
+    breaker = CircuitBreaker("test", failure_threshold=5)
+    call = hanging(HANG, "ok")
+
+    result = await call_with_retries(call, classify, RetryPolicy(attempt_timeout=0.05), breaker=breaker)
+
+    assert result == "ok"
+    assert call.cancelled == 1
+    assert len(retry_sleeps) == 1
+    # The timeout counted as a failure, the success reset it
+    assert breaker.failures == 0
+
+
+async def test_timeouts_on_every_attempt_raise_attempt_timeout(retry_sleeps):
+    breaker = CircuitBreaker("test", failure_threshold=5)
+    call = hanging(HANG, HANG)
+
+    with pytest.raises(AttemptTimeout):
+        await call_with_retries(call, classify, RetryPolicy(max_attempts=2, attempt_timeout=0.02), breaker=breaker)
+
+    assert call.cancelled == 2
+    assert breaker.failures == 2
+
+
+async def test_attempt_is_cut_off_at_the_deadline(retry_sleeps):
+    call = hanging(HANG, "ok")
+
+    with pytest.raises(DeadlineExceeded):
+        await call_with_retries(call, classify, RetryPolicy(attempt_timeout=20), deadline=Deadline(0.05))
+
+    assert call.cancelled == 1
+    assert retry_sleeps == []
+
+
+async def test_expired_deadline_fails_before_calling():
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    _open(breaker)
+    _wait_out(breaker)
+    call = flaky("ok")
+
+    with pytest.raises(DeadlineExceeded):
+        await call_with_retries(call, classify, RetryPolicy(), breaker=breaker, deadline=Deadline(0))
+
+    assert call.timeouts == []
+    # The half-open trial slot is given back
+    breaker.before_call()
+
+
+async def test_open_circuit_refuses_calls_at_once():
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    _open(breaker)
+    call = flaky("ok")
+
+    with pytest.raises(CircuitOpenError):
+        await call_with_retries(call, classify, RetryPolicy(), breaker=breaker)
+
+    assert call.timeouts == []
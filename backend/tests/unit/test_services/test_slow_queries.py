@@ -0,0 +1,43 @@
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.services.slow_queries import _is_read_only, redact_parameters
+
+
+@pytest.mark.parametrize("parameters, redacted", [
+    (None, None),
+    (("secret@example.com", 42, None), ["<str len=18>", "<int>", "NULL"]),
+    ([b"\x00\x01", ["a", "b", "c"], Decimal("1.5")], ["<bytes len=2>", "<list len=3>", "<Decimal>"]),
+    ({"email": "secret@example.com", "limit": 10}, {"email": "<str len=18>", "limit": "<int>"}),
+    # executemany: one entry per row
+    ([("a", 1), ("b", 2)], ["<tuple len=2>", "<tuple len=2>"]),
+    ("x", "<str len=1>"),
+])
+def test_redact_parameters_keeps_only_types_and_lengths(parameters, redacted):
+    assert redact_parameters(parameters) == redacted
+
+
+def test_redacted_parameters_contain_no_values():
+    token = uuid4()
+
+    redacted = redact_parameters({"id": token, "name": "Grand Hotel"})
+
+    assert str(token) not in repr(redacted)
+    assert "Grand Hotel" not in repr(redacted)
+
+
+@pytest.mark.parametrize("statement, read_only", [
+    ("SELECT 1", True),
+    ("  select * from venues", True),
+    ("\n\tWITH recent AS (SELECT 1) SELECT * FROM recent", True),
+    ("INSERT INTO venues DEFAULT VALUES", False),
+    ("UPDATE venues SET name = 'x'", False),
+    ("DELETE FROM venues", False),
+    ("SELECTION", False),
+    ("", False),
+    ("   ", False),
+])
+def test_is_read_only(statement, read_only):
+    assert _is_read_only(statement) is read_only
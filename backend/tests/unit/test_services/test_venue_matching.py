@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.services.venue_catalogue import VenueCatalogue
+from app.services.venue_matching import VenueMatchingService
+
+
+class FakeSession:
+    """Returns ``rows`` for the catalogue's venue query."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, statement):
+        return SimpleNamespace(all=lambda: list(self.rows))
+
+
+def _row(city: str, **values) -> SimpleNamespace:
+    row = {
+        "id": uuid4(),
+        "name": f"Venue in {city}",
+        "city": city,
+        "capacity": 100,
+        "facilities": [],
+        "event_types": [],
+        "latitude": None,
+        "longitude": None,
+        "is_deleted": False,
+        "updated_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+        **values,
+    }
+    return SimpleNamespace(**row)
+
+
+@pytest.fixture
+async def catalogue():
+    catalogue = VenueCatalogue()
+    await catalogue.load(FakeSession([_row("York"), _row("New York"), _row("Ghent")]))
+    return catalogue
+
+
+@pytest.fixture
+def matching():
+    return VenueMatchingService()
+
+
+@pytest.mark.parametrize("preference, city", [
+    ("ghent", "Ghent"),
+    ("New York, USA", "New York"),
+    ("central York", "York"),
+    ("Lisbon", None),
+    (None, None),
+])
+def test_resolve_city(catalogue, matching, preference, city):
+    city_id = matching._resolve_city(catalogue, preference)
+
+    expected = catalogue.cities.get(city) if city else None
+    assert city_id == expected
+
+
+async def test_city_keys_are_sorted_once_per_catalogue_change(catalogue):
+    keys = catalogue.city_keys_longest_first()
+    assert keys[0] == "new york"
+    assert catalogue.city_keys_longest_first() is keys
+
+    catalogue.watermark = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    await catalogue.refresh(FakeSession([_row("San Francisco")]))
+
+    assert catalogue.city_keys_longest_first()[0] == "san francisco"
+
+
+async def test_per_head_prices_are_cached_until_prices_or_rows_change(catalogue, matching):
+    york, new_york, ghent = catalogue.ids
+    prices = {york: 25.0, ghent: 40.0, uuid4(): 99.0}
+
+    per_head = matching._per_head_prices(catalogue, prices)
+
+    np.testing.assert_array_equal(per_head, [25.0, np.nan, 40.0])
+    assert matching._per_head_prices(catalogue, prices) is per_head
+
+    # Prices re-read
+    matching._prices_version += 1
+    per_head = matching._per_head_prices(catalogue, {new_york: 30.0})
+    np.testing.assert_array_equal(per_head, [np.nan, 30.0, np.nan])
+
+    # Rows added
+    added = _row("Lyon")
+    catalogue.watermark = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    await catalogue.refresh(FakeSession([added]))
+    per_head = matching._per_head_prices(catalogue, {new_york: 30.0, added.id: 12.5})
+    np.testing.assert_array_equal(per_head, [np.nan, 30.0, np.nan, 12.5])
@@ -0,0 +1 @@
+"""Developer tooling: query plan checks, benchmarks and data generators."""
@@ -0,0 +1,664 @@
+"""
+Micro-benchmarks for service hot paths, with JSON baselines.
+
+    cd backend
+    python -m tools.bench run --out bench-main.json              # record a baseline
+    python -m tools.bench run --out bench-branch.json --filter csv
+    python -m tools.bench compare bench-main.json bench-branch.json --threshold 0.15
+    python -m tools.bench run --no-db                             # in-memory benchmarks only
+
+Benchmarks marked "db" read from DATABASE_URL. Load it first with
+tools.datagen, because they pick their inputs from the existing data (the
+largest shortlist, the most common city and facilities). The CSV import
+benchmarks write venues inside a transaction that is rolled back.
+
+Database benchmarks also record the SQL statements (round trips) of their
+last round as "queries"; the write.* entries run a service write the way
+its endpoint does, load and response included, inside a rolled-back
+transaction.
+
+Benchmarks that return bytes also record the output size, so the
+compress.* entries show what each coding costs in CPU against what it
+saves on the wire (the identity entry is the uncompressed size). At
+10 Mbit/s every 12.5 KB saved is 10 ms of transfer time.
+
+``compare`` exits with status 1 if any benchmark's median got slower by
+more than --threshold (a fraction; 0.15 = 15%), so it can gate CI. Only
+compare runs made on the same machine.
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from fastapi import UploadFile
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy import String, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.responses import model_response
+from app.config import settings
+from app.middleware.compression import available_encodings, make_encoder
+from app.database import async_session_maker, engine
+from app.models.photo import Photo
+from app.models.project import Project, ProjectStatus
+from app.models.project_venue import OutreachStatus, ProjectVenue
+from app.models.user import User
+from app.models.venue import Venue
+from app.schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate
+from app.schemas.project_venue import ProjectVenueDetailResponse, ProjectVenueUpdate
+from app.schemas.venue import VenueCreate, VenueResponse, VenueUpdate
+from app.services.ai_description_service import ai_description_service
+from app.services.csv_service import CSVService
+from app.services.pdf_generator import proposal_generator
+from app.services.project_service import project_service
+from app.services.project_venue_service import project_venue_service
+from app.services.request_stats import begin_request, end_request, install_query_listeners
+from app.services.venue_catalogue import venue_catalogue
+from app.services.venue_service import venue_service
+
+# A timed callable; setup happens before it is returned
+Runner = Callable[[], Awaitable[Any]]
+
+
+class SkipBenchmark(Exception):
+    """Raised by a setup when its inputs are unavailable."""
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[], Awaitable[Runner]]
+    needs_db: bool = False
+    # Cap on rounds for slow benchmarks (overrides --rounds when lower)
+    max_rounds: Optional[int] = None
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, needs_db: bool = False, max_rounds: Optional[int] = None):
+    """Register a setup coroutine that returns the function to time."""
+    def decorator(setup: Callable[[], Awaitable[Runner]]):
+        BENCHMARKS.append(Benchmark(name, setup, needs_db, max_rounds))
+        return setup
+    return decorator
+
+
+# In-memory fixtures
+
+AI_CONTEXT = {
+    "event_context": {
+        "event_type": "Leadership summit",
+        "purpose": "Strategy offsite for 250 senior managers",
+        "target_audience": "Executives",
+        "atmosphere": ["Professional", "Inspiring", "Relaxed"],
+        "special_requirements": "Simultaneous interpretation in three languages",
+    },
+    "venue_highlights": {
+        "unique_features": ["Rooftop terrace", "Art deco ballroom", "Private garden"],
+        "ambiance": ["Elegant", "Historic"],
+        "technology": "Built-in LED walls and hybrid streaming",
+        "accessibility": "Step-free access throughout",
+        "sustainability": "Green Key certified",
+    },
+    "practical_details": {
+        "parking": "120 underground spaces",
+        "nearby": "Five minutes from Brussels-Central",
+        "restrictions": "Amplified music until 23:00",
+        "setup_time": "Access from 07:00",
+    },
+    "client_context": {
+        "budget_tier": "Premium",
+        "priorities": ["Location", "AV quality", "Catering"],
+        "brand_notes": "Understated luxury",
+        "previous_feedback": "Loved venues with natural light",
+    },
+}
+
+
+def build_project_graph(venues: int = 200, photos_per_venue: int = 4) -> Project:
+    """A transient Project with a large shortlist, as get_by_id would load it."""
+    now = datetime.now(timezone.utc)
+    start = date.today() + timedelta(days=90)
+    project = Project(
+        id=uuid4(),
+        user_id=uuid4(),
+        client_name="Acme Corp",
+        event_name="Annual Leadership Summit",
+        event_date_start=start,
+        event_date_end=start + timedelta(days=2),
+        attendee_count=250,
+        budget=85000,
+        location_preference="Brussels",
+        requirements=["WiFi", "AV equipment", "Catering", "Breakout rooms"],
+        status=ProjectStatus.active,
+        notes="Prefers venues within walking distance of the central station.",
+        created_at=now,
+        updated_at=now,
+    )
+    for i in range(venues):
+        venue = Venue(
+            id=uuid4(),
+            name=f"Brussels Venue {i:04d}",
+            city="Brussels",
+            capacity=100 + i,
+            facilities=["WiFi", "AV equipment", "Catering", "Parking", "Terrace"],
+            event_types=["Conference", "Gala dinner", "Workshop"],
+            contact_email=f"events{i}@example.com",
+            address=f"{i} Rue de la Loi, 1000 Brussels",
+            latitude=50.84 + i / 10000,
+            longitude=4.36 + i / 10000,
+            description_template="Historic venue with flexible meeting rooms and a rooftop terrace.",
+            is_deleted=False,
+            created_at=now,
+            updated_at=now,
+        )
+        venue.photos = [
+            Photo(
+                id=uuid4(),
+                venue_id=venue.id,
+                url=f"https://example.com/venues/{venue.id}/{n}.jpg",
+                caption=f"Room {n}",
+                display_order=n,
+                created_at=now,
+                updated_at=now,
+            )
+            for n in range(photos_per_venue)
+        ]
+        status = (OutreachStatus.responded, OutreachStatus.sent, OutreachStatus.declined, OutreachStatus.draft)[i % 4]
+        project.project_venues.append(ProjectVenue(
+            id=uuid4(),
+            project_id=project.id,
+            venue_id=venue.id,
+            venue=venue,
+            catering_provider_id=None,
+            outreach_status=status,
+            availability_dates="12-14 March" if status == OutreachStatus.responded else None,
+            is_available=True if status == OutreachStatus.responded else None,
+            quoted_price=12000 + i * 10,
+            room_allocation="Main hall plus three breakout rooms",
+            catering_description="Three-course seated dinner",
+            pros="Central location; excellent AV",
+            cons="Limited parking",
+            final_description="A landmark venue in the heart of Brussels. " * 8,
+            include_in_proposal=status == OutreachStatus.responded,
+            ai_context=AI_CONTEXT,
+            created_at=now,
+            updated_at=now,
+        ))
+    return project
+
+
+def build_csv(rows: int) -> bytes:
+    """A venue CSV upload with every column filled in."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(CSVService.ALL_HEADERS)
+    for i in range(rows):
+        writer.writerow([
+            f"Bench Venue {uuid4().hex[:8]} {i}",
+            "Brussels",
+            50 + i % 500,
+            "WiFi, Parking, AV equipment",
+            "Conference, Workshop",
+            f"bench{i}@example.com",
+            "+32 2 555 0100",
+            "https://example.com",
+            f"{i} Bench Street, Brussels",
+            50.85,
+            4.35,
+            "Bench venue",
+            "",
+        ])
+    return out.getvalue().encode()
+
+
+# In-memory benchmarks
+
+@benchmark("serialize.project_response[200x4]")
+async def bench_serialize_project() -> Runner:
+    project = build_project_graph(200, 4)
+
+    async def run():
+        return ProjectResponse.model_validate(project).model_dump_json()
+    return run
+
+
+@benchmark("response.shortlist[200x4,fastapi]")
+async def bench_shortlist_fastapi() -> Runner:
+    """GET /projects/{id}/venues the default way: response_model + JSONResponse."""
+    project = build_project_graph(200, 4)
+    route = APIRoute("/", endpoint=lambda: None, response_model=list[ProjectVenueDetailResponse])
+
+    async def run():
+        content = await serialize_response(field=route.response_field, response_content=project.project_venues)
+        return JSONResponse(content).body
+    return run
+
+
+@benchmark("response.shortlist[200x4,model_response]")
+async def bench_shortlist_model_response() -> Runner:
+    """The same payload through app.api.responses.model_response."""
+    project = build_project_graph(200, 4)
+
+    async def run():
+        return model_response(project.project_venues, list[ProjectVenueDetailResponse]).body
+    return run
+
+
+def _register_compression(label: str, size: str, payload: Callable[[], Awaitable[bytes]]) -> None:
+    """One compress.<label>[size,coding] benchmark per coding, plus identity."""
+    for coding in ["identity"] + available_encodings():
+        async def setup(coding: str = coding) -> Runner:
+            body = await payload()
+
+            async def run():
+                if coding == "identity":
+                    return body
+                # The same settings as CompressionMiddleware by default
+                return make_encoder(
+                    coding,
+                    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+                    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+                    zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+                ).finish(body)
+            return run
+        benchmark(f"compress.{label}[{size},{coding}]")(setup)
+
+
+async def _project_json() -> bytes:
+    return model_response(build_project_graph(200, 4), ProjectResponse).body
+
+
+async def _proposal_html() -> bytes:
+    html = await proposal_generator.generate_html_proposal(None, build_project_graph(50, 4))
+    return html.encode()
+
+
+_register_compression("project_json", "200x4", _project_json)
+_register_compression("proposal_html", "50x4", _proposal_html)
+
+
+@benchmark("ai.build_prompt")
+async def bench_build_prompt() -> Runner:
+    project = build_project_graph(1, 1)
+    project_venue = project.project_venues[0]
+
+    async def run():
+        for _ in range(100):
+            ai_description_service._build_prompt(project_venue.venue, project, AI_CONTEXT)
+    return run
+
+
+@benchmark("proposal.html[200x4]")
+async def bench_proposal_html() -> Runner:
+    project = build_project_graph(200, 4)
+
+    async def run():
+        return await proposal_generator.generate_html_proposal(None, project)
+    return run
+
+
+@benchmark("proposal.pdf[50x4]", max_rounds=3)
+async def bench_proposal_pdf() -> Runner:
+    try:
+        import weasyprint  # noqa: F401
+    except ImportError:
+        raise SkipBenchmark("weasyprint is not installed")
+    project = build_project_graph(50, 4)
+
+    async def run():
+        return await proposal_generator.generate_pdf_proposal(None, project)
+    return run
+
+
+# Database benchmarks
+
+async def _list_filters(db: AsyncSession) -> dict:
+    """Combined filters that match a realistic slice of the loaded venues."""
+    city = (await db.execute(
+        select(Venue.city).where(~Venue.is_deleted).group_by(Venue.city).order_by(func.count().desc()).limit(1)
+    )).scalar()
+    if city is None:
+        raise SkipBenchmark("no venues loaded (run tools.datagen)")
+    facility = func.unnest(Venue.facilities).label("facility")
+    facilities = (await db.execute(
+        select(facility).select_from(Venue).group_by(facility).order_by(func.count().desc()).limit(2)
+    )).scalars().all()
+    return {"city": city, "facilities": list(facilities), "min_capacity": 50, "page": 2, "page_size": 20}
+
+
+def _list_benchmark(catalogue: bool) -> Callable[[], Awaitable[Runner]]:
+    async def setup() -> Runner:
+        async with async_session_maker() as db:
+            filters = await _list_filters(db)
+
+        async def run():
+            previous = settings.VENUE_CATALOGUE_ENABLED
+            settings.VENUE_CATALOGUE_ENABLED = catalogue
+            try:
+                async with async_session_maker() as db:
+                    return await venue_service.get_list(db, with_facets=catalogue, **filters)
+            finally:
+                settings.VENUE_CATALOGUE_ENABLED = previous
+        return run
+    return setup
+
+
+benchmark("venue_service.get_list[catalogue]", needs_db=True)(_list_benchmark(catalogue=True))
+benchmark("venue_service.get_list[sql]", needs_db=True)(_list_benchmark(catalogue=False))
+
+
+@benchmark("project_service.get_by_id[largest]", needs_db=True)
+async def bench_get_project() -> Runner:
+    async with async_session_maker() as db:
+        project_id = (await db.execute(
+            select(ProjectVenue.project_id)
+            .group_by(ProjectVenue.project_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )).scalar()
+    if project_id is None:
+        raise SkipBenchmark("no shortlists loaded (run tools.datagen)")
+
+    async def run():
+        async with async_session_maker() as db:
+            return await project_service.get_by_id(db, project_id)
+    return run
+
+
+@dataclass
+class WriteFixtures:
+    user_id: Any
+    project_id: Any
+    shortlisted_venue_id: Any
+    spare_venue_id: Any
+
+
+async def _write_fixtures() -> WriteFixtures:
+    """A project with a shortlist, one of its venues and one venue it lacks."""
+    async with async_session_maker() as db:
+        row = (await db.execute(
+            select(Project.id, Project.user_id, func.min(ProjectVenue.venue_id.cast(String)))
+            .join(ProjectVenue, ProjectVenue.project_id == Project.id)
+            .group_by(Project.id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )).first()
+        if row is None:
+            raise SkipBenchmark("no shortlists loaded (run tools.datagen)")
+        spare = (await db.execute(
+            select(Venue.id)
+            .where(~Venue.is_deleted, ~Venue.id.in_(select(ProjectVenue.venue_id).where(ProjectVenue.project_id == row[0])))
+            .limit(1)
+        )).scalar()
+    return WriteFixtures(row[1], row[0], row[2], spare)
+
+
+def _write_benchmark(action: Callable[[AsyncSession, WriteFixtures], Awaitable[Any]]) -> Callable[[], Awaitable[Runner]]:
+    """Time ``action`` (load, write, serialize) in a transaction that is rolled back."""
+    async def setup() -> Runner:
+        fixtures = await _write_fixtures()
+
+        async def run():
+            async with engine.connect() as conn:
+                transaction = await conn.begin()
+                db = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+                try:
+                    return await action(db, fixtures)
+                finally:
+                    await db.close()
+                    await transaction.rollback()
+        return run
+    return setup
+
+
+def _project_create_data() -> ProjectCreate:
+    start = date.today() + timedelta(days=120)
+    return ProjectCreate(
+        client_name="Bench Corp",
+        event_name="Benchmark Summit",
+        event_date_start=start,
+        event_date_end=start + timedelta(days=1),
+        attendee_count=120,
+        requirements=["WiFi"],
+    )
+
+
+async def _create_project(db: AsyncSession, f: WriteFixtures):
+    project = await project_service.create(db, _project_create_data(), f.user_id)
+    return model_response(project, ProjectResponse).body
+
+
+async def _update_project(db: AsyncSession, f: WriteFixtures):
+    project = await project_service.get_by_id(db, f.project_id, user_id=f.user_id)
+    project = await project_service.update(db, project, ProjectUpdate(notes="bench"))
+    return model_response(project, ProjectResponse).body
+
+
+async def _add_venue(db: AsyncSession, f: WriteFixtures):
+    venue = await venue_service.get_by_id(db, f.spare_venue_id)
+    project_venue = await project_venue_service.add_venue_to_project(db, f.project_id, venue.id, venue=venue)
+    return model_response(project_venue, ProjectVenueDetailResponse).body
+
+
+async def _update_project_venue(db: AsyncSession, f: WriteFixtures):
+    project_venue = await project_venue_service.get_project_venue(db, f.project_id, f.shortlisted_venue_id)
+    project_venue = await project_venue_service.update_project_venue(
+        db, project_venue, ProjectVenueUpdate(outreach_status=OutreachStatus.sent)
+    )
+    return model_response(project_venue, ProjectVenueDetailResponse).body
+
+
+async def _create_venue(db: AsyncSession, f: WriteFixtures):
+    venue = await venue_service.create(
+        db, VenueCreate(name="Bench Hall", city="Brussels", capacity=100, latitude=50.85, longitude=4.35)
+    )
+    return model_response(venue, VenueResponse).body
+
+
+async def _update_venue(db: AsyncSession, f: WriteFixtures):
+    venue = await venue_service.get_by_id(db, f.spare_venue_id)
+    venue = await venue_service.update(db, venue, VenueUpdate(capacity=321))
+    return model_response(venue, VenueResponse).body
+
+
+benchmark("write.project.create", needs_db=True)(_write_benchmark(_create_project))
+benchmark("write.project.update", needs_db=True)(_write_benchmark(_update_project))
+benchmark("write.project_venue.add", needs_db=True)(_write_benchmark(_add_venue))
+benchmark("write.project_venue.update", needs_db=True)(_write_benchmark(_update_project_venue))
+benchmark("write.venue.create", needs_db=True)(_write_benchmark(_create_venue))
+benchmark("write.venue.update", needs_db=True)(_write_benchmark(_update_venue))
+
+
+def _csv_benchmark(rows: int) -> Callable[[], Awaitable[Runner]]:
+    async def setup() -> Runner:
+        content = build_csv(rows)
+        service = CSVService()
+        service.MAX_ROWS = rows
+        service.MAX_FILE_SIZE = len(content)
+
+        async def run():
+            # The service commits per row: join an outer transaction through
+            # savepoints so the whole import can be rolled back
+            async with engine.connect() as conn:
+                transaction = await conn.begin()
+                db = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+                try:
+                    upload = UploadFile(file=io.BytesIO(content), filename="bench.csv")
+                    result = await service.process_venue_csv(db, upload)
+                finally:
+                    await db.close()
+                    await transaction.rollback()
+            if result.failed:
+                raise RuntimeError(f"{result.failed} CSV rows failed: {result.errors[0].message}")
+            return result
+        return run
+    return setup
+
+
+benchmark("csv.process_venue_csv[1k]", needs_db=True, max_rounds=5)(_csv_benchmark(1_000))
+benchmark("csv.process_venue_csv[10k]", needs_db=True, max_rounds=2)(_csv_benchmark(10_000))
+benchmark("csv.process_venue_csv[100k]", needs_db=True, max_rounds=1)(_csv_benchmark(100_000))
+
+
+# Runner and comparison
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmarks(args: argparse.Namespace) -> dict:
+    results: Dict[str, dict] = {}
+    install_query_listeners(engine)
+    for bench in BENCHMARKS:
+        if args.filter and not any(pattern in bench.name for pattern in args.filter):
+            continue
+        if bench.needs_db and args.no_db:
+            continue
+        try:
+            runner = await bench.setup()
+        except SkipBenchmark as e:
+            print(f"  {bench.name:<44} skipped: {e}")
+            continue
+
+        rounds = min(args.rounds, bench.max_rounds or args.rounds)
+        for _ in range(args.warmup if rounds > 2 else 0):
+            await runner()
+        timings = []
+        for _ in range(rounds):
+            stats, token = begin_request()
+            started = time.perf_counter()
+            try:
+                output = await runner()
+            finally:
+                timings.append((time.perf_counter() - started) * 1000)
+                end_request(token)
+
+        results[bench.name] = {
+            "rounds": rounds,
+            "median_ms": round(statistics.median(timings), 3),
+            "min_ms": round(min(timings), 3),
+            "mean_ms": round(statistics.fmean(timings), 3),
+            "stdev_ms": round(statistics.stdev(timings), 3) if rounds > 1 else 0.0,
+        }
+        size = ""
+        if bench.needs_db:
+            results[bench.name]["queries"] = stats.queries
+            size = f"  {stats.queries:>4} queries"
+        if isinstance(output, bytes):
+            results[bench.name]["bytes"] = len(output)
+            size += f"  {len(output):>10,} bytes"
+        print(f"  {bench.name:<44} median {results[bench.name]['median_ms']:>10.2f} ms  ({rounds} rounds){size}")
+
+    # Catalogue loads belong to the benchmarks, not to what follows
+    venue_catalogue.invalidate()
+    await engine.dispose()
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "machine": platform.node(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> int:
+    """Print per-benchmark changes; return the number of regressions."""
+    regressions = 0
+    print(f"{'benchmark':<44} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<44} {'-':>10} {result['median_ms']:>10.2f} {'new':>8}")
+            continue
+        change = (result["median_ms"] - base["median_ms"]) / base["median_ms"] if base["median_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  SLOWER"
+        if "queries" in result and "queries" in base and result["queries"] != base["queries"]:
+            flag += f"  queries {base['queries']} -> {result['queries']}"
+        print(f"{name:<44} {base['median_ms']:>10.2f} {result['median_ms']:>10.2f} {change:>+8.1%}{flag}")
+    for name in baseline["results"].keys() - current["results"].keys():
+        print(f"{name:<44} {baseline['results'][name]['median_ms']:>10.2f} {'-':>10} {'missing':>8}")
+    return regressions
+
+
+def _load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run benchmarks and write a JSON result file")
+    run.add_argument("--out", help="Write results to this file")
+    run.add_argument("--filter", action="append", help="Only benchmarks whose name contains this (repeatable)")
+    run.add_argument("--rounds", type=int, default=20, help="Timed rounds per benchmark")
+    run.add_argument("--warmup", type=int, default=2, help="Untimed rounds before timing")
+    run.add_argument("--no-db", action="store_true", help="Skip benchmarks that need the database")
+    run.add_argument("--baseline", help="Compare against this result file after running")
+    run.add_argument("--threshold", type=float, default=0.15, help="Allowed median slowdown (fraction)")
+
+    cmp = commands.add_parser("compare", help="Compare two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.15, help="Allowed median slowdown (fraction)")
+
+    commands.add_parser("list", help="List benchmark names")
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = _parse_args()
+
+    if args.command == "list":
+        for bench in BENCHMARKS:
+            print(f"{bench.name}{'  (db)' if bench.needs_db else ''}")
+        return 0
+
+    if args.command == "compare":
+        baseline, current = _load(args.baseline), _load(args.current)
+    else:
+        current = await run_benchmarks(args)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(current, f, indent=2)
+            print(f"\nResults written to {args.out}")
+        if not args.baseline:
+            return 0
+        baseline = _load(args.baseline)
+
+    print()
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n❌ {regressions} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+        return 1
+    print(f"\n✅ No benchmark slower than the baseline by more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,269 @@
+"""
+Synthetic data generator for production-scale testing.
+
+Bulk-loads users, venues, photos, projects and shortlists with COPY
+(asyncpg's binary copy_records_to_table) in fixed-size batches, so 100k
+venues with their photos and shortlists load in well under a minute:
+
+    cd backend
+    python -m tools.datagen --venues 100000 --projects 2000 --shortlist 200 --photos 4
+    python -m tools.datagen --truncate --yes --venues 5000    # start from empty tables
+
+Data is deterministic for a given --seed. The first user is
+loadtest@example.com (password --password), which tools.loadtest logs in
+as; projects are spread round-robin over --users users. Rows get a fresh
+updated_at, so a running API picks the venues up on its next catalogue
+refresh.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Sequence, Tuple
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+from asyncpg import Range
+
+from app.database import engine
+from app.services.auth import hash_password
+
+LOADTEST_EMAIL = "loadtest@example.com"
+SEEDED_TABLES = ("project_venues", "photos", "projects", "venues")
+
+# City, latitude, longitude
+CITIES = (
+    ("Brussels", 50.8467, 4.3525),
+    ("Antwerp", 51.2194, 4.4025),
+    ("Ghent", 51.0543, 3.7174),
+    ("Bruges", 51.2093, 3.2247),
+    ("Amsterdam", 52.3676, 4.9041),
+    ("Rotterdam", 51.9244, 4.4777),
+    ("Paris", 48.8566, 2.3522),
+    ("Lyon", 45.7640, 4.8357),
+    ("London", 51.5072, -0.1276),
+    ("Berlin", 52.5200, 13.4050),
+    ("Munich", 48.1351, 11.5820),
+    ("Barcelona", 41.3874, 2.1686),
+    ("Lisbon", 38.7223, -9.1393),
+    ("Milan", 45.4642, 9.1900),
+    ("Vienna", 48.2082, 16.3738),
+    ("Copenhagen", 55.6761, 12.5683),
+)
+FACILITIES = (
+    "WiFi", "Parking", "AV equipment", "Catering", "Projector", "Stage",
+    "Breakout rooms", "Wheelchair access", "Terrace", "Accommodation",
+    "Natural light", "Air conditioning", "Sound system", "Bar",
+)
+EVENT_TYPES = (
+    "Conference", "Gala dinner", "Board meeting", "Product launch",
+    "Workshop", "Wedding", "Team building", "Reception", "Seminar",
+)
+VENUE_KINDS = ("Hotel", "Castle", "Loft", "Convention Centre", "Gallery", "Manor", "Studio", "Hall")
+OUTREACH_STATUSES = ("draft", "sent", "awaiting", "responded", "declined")
+
+VENUE_COLUMNS = (
+    "id", "name", "city", "capacity", "facilities", "event_types",
+    "contact_email", "address", "latitude", "longitude", "description_template", "is_deleted",
+)
+PHOTO_COLUMNS = ("id", "venue_id", "url", "caption", "display_order")
+PROJECT_COLUMNS = (
+    "id", "user_id", "client_name", "event_name", "event_date_start", "event_date_end",
+    "attendee_count", "budget", "location_preference", "requirements", "status",
+)
+PROJECT_VENUE_COLUMNS = (
+    "id", "project_id", "venue_id", "outreach_status", "availability_dates",
+    "hold_range", "is_available", "quoted_price", "include_in_proposal", "notes",
+)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="Users owning the projects")
+    parser.add_argument("--venues", type=int, default=100_000, help="Venues to create")
+    parser.add_argument("--photos", type=int, default=4, help="Photos per venue")
+    parser.add_argument("--projects", type=int, default=2000, help="Projects to create")
+    parser.add_argument("--shortlist", type=int, default=200, help="Shortlisted venues per project")
+    parser.add_argument("--deleted-ratio", type=float, default=0.02, help="Share of soft-deleted venues")
+    parser.add_argument("--batch-size", type=int, default=20_000, help="Rows per COPY batch")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--password", default="loadtest-password", help=f"Password of {LOADTEST_EMAIL}")
+    parser.add_argument("--truncate", action="store_true", help=f"Empty {', '.join(SEEDED_TABLES)} first")
+    parser.add_argument("--yes", action="store_true", help="Confirm --truncate")
+    return parser.parse_args()
+
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    batch: List[tuple] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Generator:
+    """Deterministic row factories for each table."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.venue_ids: List[UUID] = []
+
+    def uuid(self) -> UUID:
+        return UUID(int=self.rng.getrandbits(128), version=4)
+
+    def venues(self) -> Iterator[tuple]:
+        rng = self.rng
+        for i in range(self.args.venues):
+            venue_id = self.uuid()
+            self.venue_ids.append(venue_id)
+            city, lat, lng = rng.choice(CITIES)
+            kind = rng.choice(VENUE_KINDS)
+            yield (
+                venue_id,
+                f"{city} {kind} {i:06d}",
+                city,
+                rng.choice((20, 40, 60, 80, 120, 200, 350, 500, 800, 1200)),
+                rng.sample(FACILITIES, rng.randint(2, 8)),
+                rng.sample(EVENT_TYPES, rng.randint(1, 4)),
+                f"events+{i}@example.com",
+                f"{rng.randint(1, 250)} Example Street, {city}",
+                # Scatter within ~20 km of the city centre
+                lat + rng.uniform(-0.18, 0.18),
+                lng + rng.uniform(-0.25, 0.25),
+                f"A {kind.lower()} in {city}.",
+                rng.random() < self.args.deleted_ratio,
+            )
+
+    def photos(self) -> Iterator[tuple]:
+        for venue_id in self.venue_ids:
+            for n in range(self.args.photos):
+                yield (
+                    self.uuid(),
+                    venue_id,
+                    f"https://picsum.photos/seed/{venue_id.hex[:12]}-{n}/1200/800",
+                    "Main space" if n == 0 else f"Room {n}",
+                    n,
+                )
+
+    def projects(self, user_ids: Sequence[UUID]) -> Iterator[Tuple[UUID, date, tuple]]:
+        rng = self.rng
+        today = date.today()
+        for i in range(self.args.projects):
+            start = today + timedelta(days=rng.randint(-90, 365))
+            end = start + timedelta(days=rng.randint(0, 3))
+            city = rng.choice(CITIES)[0]
+            project_id = self.uuid()
+            yield project_id, start, (
+                project_id,
+                user_ids[i % len(user_ids)],
+                f"Client {rng.randint(1, max(1, self.args.projects // 5)):05d}",
+                f"{rng.choice(EVENT_TYPES)} {i:05d}",
+                start,
+                end,
+                rng.choice((20, 40, 80, 150, 300, 600)),
+                rng.choice((None, Decimal(5000), Decimal(15000), Decimal(40000), Decimal(100000))),
+                city,
+                rng.sample(FACILITIES, rng.randint(1, 4)),
+                rng.choice(("active", "active", "active", "completed", "cancelled")),
+            )
+
+    def project_venues(self, project_id: UUID, start: date) -> Iterator[tuple]:
+        rng = self.rng
+        count = min(self.args.shortlist, len(self.venue_ids))
+        for venue_id in rng.sample(self.venue_ids, count):
+            status = rng.choice(OUTREACH_STATUSES)
+            responded = status == "responded"
+            held = responded and rng.random() < 0.5
+            yield (
+                self.uuid(),
+                project_id,
+                venue_id,
+                status,
+                start.isoformat() if responded else None,
+                Range(start, start + timedelta(days=rng.randint(1, 4))) if held else None,
+                rng.choice((True, False)) if responded else None,
+                Decimal(rng.randint(20, 400) * 100) if responded else None,
+                responded and rng.random() < 0.3,
+                None,
+            )
+
+
+async def _copy(pg, table: str, columns: Sequence[str], rows: Iterable[tuple], batch_size: int) -> int:
+    started = time.perf_counter()
+    total = 0
+    for batch in _batches(rows, batch_size):
+        await pg.copy_records_to_table(table, records=batch, columns=list(columns))
+        total += len(batch)
+    elapsed = time.perf_counter() - started
+    print(f"  {table:<15} {total:>10,} rows in {elapsed:6.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+    return total
+
+
+async def _ensure_users(pg, count: int, password: str) -> List[UUID]:
+    """Return ids of the load-test users, creating the missing ones."""
+    password_hash = hash_password(password)
+    emails = [LOADTEST_EMAIL] + [f"loadtest+{n}@example.com" for n in range(1, count)]
+    user_ids = []
+    for n, email in enumerate(emails):
+        user_id = await pg.fetchval(
+            """
+            INSERT INTO users (id, name, email, password_hash, role, is_active)
+            VALUES ($1, $2, $3, $4, 'event_manager', true)
+            ON CONFLICT (email) DO UPDATE SET password_hash = EXCLUDED.password_hash
+            RETURNING id
+            """,
+            uuid4(), f"Load Test {n}", email, password_hash,
+        )
+        user_ids.append(user_id)
+    return user_ids
+
+
+async def main() -> int:
+    args = _parse_args()
+    if args.truncate and not args.yes:
+        print(f"--truncate empties {', '.join(SEEDED_TABLES)} in {engine.url.render_as_string()}.")
+        print("Re-run with --yes to confirm.")
+        return 2
+
+    generator = Generator(args)
+    started = time.perf_counter()
+
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        pg = raw.driver_connection
+
+        async with pg.transaction():
+            if args.truncate:
+                await pg.execute(f"TRUNCATE {', '.join(SEEDED_TABLES)} CASCADE")
+            user_ids = await _ensure_users(pg, max(1, args.users), args.password)
+
+            print(f"Loading into {engine.url.render_as_string()}")
+            await _copy(pg, "venues", VENUE_COLUMNS, generator.venues(), args.batch_size)
+            await _copy(pg, "photos", PHOTO_COLUMNS, generator.photos(), args.batch_size)
+
+            projects = list(generator.projects(user_ids))
+            await _copy(pg, "projects", PROJECT_COLUMNS, (row for _, _, row in projects), args.batch_size)
+            await _copy(
+                pg,
+                "project_venues",
+                PROJECT_VENUE_COLUMNS,
+                (row for project_id, start, _ in projects for row in generator.project_venues(project_id, start)),
+                args.batch_size,
+            )
+
+        # Fresh statistics, so the first queries after a load get sane plans
+        await pg.execute(f"ANALYZE users, {', '.join(SEEDED_TABLES)}")
+
+    await engine.dispose()
+    print(f"\n✅ Done in {time.perf_counter() - started:.1f}s (log in as {LOADTEST_EMAIL} / {args.password})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,127 @@
+"""
+A fake OpenAI chat completions server, for testing retries and the
+circuit breaker without the real API (or its bill).
+
+    cd backend
+    python -m tools.fake_openai --port 8999
+    python -m tools.fake_openai --latency 0.5 --error-rate 0.3 --status 503
+    python -m tools.fake_openai --error-rate 1 --status 429 --retry-after 2
+
+    # then, for the app:
+    OPENAI_BASE_URL=http://127.0.0.1:8999/v1 OPENAI_API_KEY=fake uvicorn app.main:app
+
+``POST /v1/chat/completions`` answers with a canned description (and
+token usage) after --latency seconds, or fails with --status for a
+fraction --error-rate of requests. With --status 429 or 503 the response
+carries Retry-After when --retry-after is given.
+
+The behaviour can be changed while it runs, e.g. to fail the next three
+requests, or to hang longer than the app's timeout:
+
+    curl -X POST localhost:8999/_control -d '{"fail_next": 3, "status": 500}'
+    curl -X POST localhost:8999/_control -d '{"latency": 30}'
+    curl localhost:8999/_control        # settings and request counts
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from uuid import uuid4
+
+import uvicorn
+from fastapi import Body, FastAPI
+from fastapi.responses import JSONResponse
+
+DESCRIPTION = (
+    "Set in the heart of the city, this venue pairs flexible event space with "
+    "attentive service, making it a natural fit for your programme."
+)
+
+state = {
+    "latency": 0.0,
+    "error_rate": 0.0,
+    "status": 500,
+    "retry_after": None,
+    "fail_next": 0,
+    "requests": 0,
+    "failed": 0,
+}
+
+app = FastAPI(title="Fake OpenAI")
+
+
+def _error(status: int) -> JSONResponse:
+    state["failed"] += 1
+    headers = {}
+    if state["retry_after"] is not None and status in (429, 503):
+        headers["retry-after"] = str(state["retry_after"])
+    body = {"error": {"message": f"Fake error {status}", "type": "fake_error", "code": None}}
+    return JSONResponse(body, status_code=status, headers=headers)
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: dict = Body(...)):
+    state["requests"] += 1
+    if state["latency"]:
+        await asyncio.sleep(state["latency"])
+    if state["fail_next"] > 0:
+        state["fail_next"] -= 1
+        return _error(state["status"])
+    if random.random() < state["error_rate"]:
+        return _error(state["status"])
+
+    prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in request.get("messages", []))
+    completion_tokens = len(DESCRIPTION.split())
+    return {
+        "id": f"chatcmpl-{uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "gpt-4o-mini"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": DESCRIPTION},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+@app.get("/_control")
+async def get_control():
+    return state
+
+
+@app.post("/_control")
+async def set_control(changes: dict = Body(...)):
+    unknown = set(changes) - set(state)
+    if unknown:
+        return JSONResponse({"detail": f"Unknown settings: {sorted(unknown)}"}, status_code=400)
+    state.update(changes)
+    return state
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail (0-1)")
+    parser.add_argument("--status", type=int, default=500, help="Status code of failed requests")
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After of 429/503 responses")
+    args = parser.parse_args()
+
+    state.update(
+        latency=args.latency, error_rate=args.error_rate, status=args.status, retry_after=args.retry_after
+    )
+    print(f"Fake OpenAI on http://{args.host}:{args.port}/v1")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
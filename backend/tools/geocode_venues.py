@@ -0,0 +1,87 @@
+"""
+Bulk-geocode venues from the local gazetteer.
+
+Fills in latitude/longitude for venues that have none (or all venues with
+--all), resolving each distinct city once and writing the results back in
+executemany batches:
+
+    cd backend
+    python -m tools.geocode_venues --gazetteer data/cities15000.txt
+    python -m tools.geocode_venues --dry-run
+
+The gazetteer defaults to GAZETTEER_PATH. Updated rows get a fresh
+updated_at, so the venue catalogue picks them up on its next refresh.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+
+from sqlalchemy import bindparam, func, select, update
+
+from app.config import settings
+from app.database import async_session_maker, engine
+from app.models.venue import Venue
+from app.services.geocoding import geocoding_service
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gazetteer", help="Gazetteer file (defaults to GAZETTEER_PATH)")
+    parser.add_argument("--all", action="store_true", help="Re-geocode venues that already have coordinates")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per UPDATE executemany batch")
+    parser.add_argument("--dry-run", action="store_true", help="Report matches without writing")
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = _parse_args()
+    if args.gazetteer:
+        settings.GAZETTEER_PATH = args.gazetteer
+    if not geocoding_service.enabled:
+        print("❌ No gazetteer: pass --gazetteer or set GAZETTEER_PATH")
+        return 1
+
+    started = time.perf_counter()
+    await geocoding_service.load()
+    gazetteer = geocoding_service.gazetteer
+    print(f"Loaded {len(gazetteer)} place names in {time.perf_counter() - started:.1f}s")
+
+    query = select(Venue.id, Venue.city, Venue.address).where(Venue.is_deleted == False)
+    if not args.all:
+        query = query.where((Venue.latitude.is_(None)) | (Venue.longitude.is_(None)))
+
+    stmt = (
+        update(Venue.__table__)
+        .where(Venue.__table__.c.id == bindparam("b_id"))
+        .values(latitude=bindparam("b_latitude"), longitude=bindparam("b_longitude"), updated_at=func.now())
+    )
+
+    async with async_session_maker() as db:
+        rows = (await db.execute(query)).all()
+        points = geocoding_service.geocode_many((row.id, row.city, row.address) for row in rows)
+
+        unmatched = Counter(row.city for row in rows if row.id not in points)
+        print(f"Matched {len(points)} of {len(rows)} venues")
+        for city, count in unmatched.most_common(10):
+            print(f"  unmatched: {city!r} ({count})")
+
+        if args.dry_run or not points:
+            return 0
+
+        params = [
+            {"b_id": venue_id, "b_latitude": lat, "b_longitude": lng}
+            for venue_id, (lat, lng) in points.items()
+        ]
+        for start in range(0, len(params), args.batch_size):
+            await db.execute(stmt, params[start:start + args.batch_size])
+        await db.commit()
+
+    await engine.dispose()
+    print(f"\n✅ Geocoded {len(points)} venues in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,298 @@
+"""
+Scripted load test against a running API.
+
+Drives a weighted mix of realistic traffic from --concurrency virtual
+users for --duration seconds and reports throughput and latency
+percentiles per endpoint:
+
+    cd backend
+    python -m tools.datagen --venues 100000 --projects 2000
+    uvicorn app.main:app --workers 4 &
+    python -m tools.loadtest --base-url http://localhost:8000 --concurrency 32 --duration 60
+
+Scenarios (weights can be changed with --mix, e.g. --mix browse=70,pdf=0):
+
+    browse    gallery browsing: filtered venue list pages, then a venue detail
+    project   project detail and its shortlist
+    outreach  PATCH the outreach status of a shortlisted venue
+    preview   HTML proposal preview
+    pdf       proposal PDF
+
+It logs in as the tools.datagen user, so run the generator first. Like a
+browser, each virtual user keeps the ETags of the project and venue
+details it has seen and revalidates them with If-None-Match (304s count as
+successes); --no-etags disables that.
+--json writes the report for comparing runs.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+from tools.datagen import CITIES, FACILITIES, LOADTEST_EMAIL, OUTREACH_STATUSES
+
+DEFAULT_MIX = {"browse": 50, "project": 25, "outreach": 15, "preview": 8, "pdf": 2}
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000", help="API root")
+    parser.add_argument("--email", default=LOADTEST_EMAIL, help="User to log in as")
+    parser.add_argument("--password", default="loadtest-password", help="Password of --email")
+    parser.add_argument("--concurrency", type=int, default=16, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--mix", default="", help="Scenario weights, e.g. browse=60,pdf=0")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    parser.add_argument("--no-etags", action="store_true", help="Never send If-None-Match")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    return parser.parse_args()
+
+
+def _parse_mix(value: str) -> Dict[str, int]:
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, value.split(",")):
+        name, _, weight = item.partition("=")
+        if name not in mix:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(mix)}")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise SystemExit("--mix leaves no scenario to run")
+    return mix
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, round(q * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Recorder:
+    """Latencies and errors per endpoint name."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return None
+        self.latencies[name].append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+    def report(self) -> dict:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        endpoints = {}
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            values = sorted(self.latencies[name])
+            endpoints[name] = {
+                "requests": len(values),
+                "errors": self.errors[name],
+                "rps": round(len(values) / elapsed, 2),
+                "p50_ms": _round(percentile(values, 0.50)),
+                "p90_ms": _round(percentile(values, 0.90)),
+                "p95_ms": _round(percentile(values, 0.95)),
+                "p99_ms": _round(percentile(values, 0.99)),
+                "max_ms": _round(values[-1] if values else None),
+            }
+        total = sum(item["requests"] for item in endpoints.values())
+        return {
+            "duration_s": round(elapsed, 2),
+            "requests": total,
+            "errors": sum(item["errors"] for item in endpoints.values()),
+            "rps": round(total / elapsed, 2),
+            "endpoints": endpoints,
+        }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
+
+
+class Fixtures:
+    """Project and venue ids discovered through the API before the run."""
+
+    def __init__(self):
+        self.project_ids: List[str] = []
+        self.venue_ids: List[str] = []
+        self.shortlists: Dict[str, List[str]] = {}
+
+    async def discover(self, client: httpx.AsyncClient, max_projects: int = 200) -> None:
+        page = 1
+        while len(self.project_ids) < max_projects:
+            response = await client.get("/api/v1/projects", params={"page": page, "page_size": 100})
+            response.raise_for_status()
+            items = response.json()["items"]
+            self.project_ids.extend(item["id"] for item in items)
+            if len(items) < 100:
+                break
+            page += 1
+        for page in range(1, 6):
+            response = await client.get("/api/v1/venues", params={"page": page, "page_size": 100, "include_facets": False})
+            response.raise_for_status()
+            self.venue_ids.extend(item["id"] for item in response.json()["items"])
+        if not self.project_ids or not self.venue_ids:
+            raise SystemExit("No projects or venues visible to the load-test user; run tools.datagen first")
+
+    async def shortlist(self, client: httpx.AsyncClient, project_id: str) -> List[str]:
+        if project_id not in self.shortlists:
+            response = await client.get(f"/api/v1/projects/{project_id}/venues")
+            self.shortlists[project_id] = (
+                [item["venue_id"] for item in response.json()] if response.status_code == 200 else []
+            )
+        return self.shortlists[project_id]
+
+
+class VirtualUser:
+    """One simulated user picking scenarios by weight until the deadline."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        recorder: Recorder,
+        fixtures: Fixtures,
+        mix: Dict[str, int],
+        rng: random.Random,
+        etags: bool = True,
+    ):
+        self.client = client
+        self.recorder = recorder
+        self.fixtures = fixtures
+        self.rng = rng
+        self.etags: Optional[Dict[str, str]] = {} if etags else None
+        self.scenarios = [name for name, weight in mix.items() if weight > 0]
+        self.weights = [mix[name] for name in self.scenarios]
+
+    async def run(self, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            scenario = self.rng.choices(self.scenarios, self.weights)[0]
+            await getattr(self, scenario)()
+
+    async def get_cached(self, name: str, url: str) -> None:
+        """GET a detail resource, revalidating a previously seen ETag."""
+        if self.etags is None:
+            await self.recorder.request(self.client, name, "GET", url)
+            return
+        headers = {"If-None-Match": self.etags[url]} if url in self.etags else {}
+        response = await self.recorder.request(self.client, name, "GET", url, headers=headers)
+        if response is not None and "etag" in response.headers:
+            self.etags[url] = response.headers["etag"]
+
+    async def browse(self) -> None:
+        params = {"page": self.rng.randint(1, 20), "page_size": 20}
+        if self.rng.random() < 0.6:
+            params["city"] = self.rng.choice(CITIES)[0]
+        if self.rng.random() < 0.4:
+            params["facilities"] = self.rng.sample(FACILITIES, self.rng.randint(1, 2))
+        if self.rng.random() < 0.3:
+            params["min_capacity"] = self.rng.choice((50, 100, 200, 500))
+        if self.rng.random() < 0.2:
+            _, lat, lng = self.rng.choice(CITIES)
+            params["near"] = f"{lat},{lng}"
+            params["radius_km"] = 25
+        response = await self.recorder.request(self.client, "GET /venues", "GET", "/api/v1/venues", params=params)
+        items = response.json().get("items", []) if response is not None and response.status_code == 200 else []
+        venue_id = self.rng.choice(items)["id"] if items else self.rng.choice(self.fixtures.venue_ids)
+        await self.get_cached("GET /venues/{id}", f"/api/v1/venues/{venue_id}")
+
+    async def project(self) -> None:
+        project_id = self.rng.choice(self.fixtures.project_ids)
+        await self.get_cached("GET /projects/{id}", f"/api/v1/projects/{project_id}")
+        await self.get_cached("GET /projects/{id}/venues", f"/api/v1/projects/{project_id}/venues")
+
+    async def outreach(self) -> None:
+        project_id = self.rng.choice(self.fixtures.project_ids)
+        shortlist = await self.fixtures.shortlist(self.client, project_id)
+        if not shortlist:
+            return
+        await self.recorder.request(
+            self.client,
+            "PATCH /projects/{id}/venues/{venue_id}",
+            "PATCH",
+            f"/api/v1/projects/{project_id}/venues/{self.rng.choice(shortlist)}",
+            json={"outreach_status": self.rng.choice(OUTREACH_STATUSES)},
+        )
+
+    async def preview(self) -> None:
+        project_id = self.rng.choice(self.fixtures.project_ids)
+        await self.recorder.request(
+            self.client, "GET /projects/{id}/proposal/preview", "GET", f"/api/v1/projects/{project_id}/proposal/preview"
+        )
+
+    async def pdf(self) -> None:
+        project_id = self.rng.choice(self.fixtures.project_ids)
+        await self.recorder.request(
+            self.client, "GET /projects/{id}/proposal/pdf", "GET", f"/api/v1/projects/{project_id}/proposal/pdf"
+        )
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{'endpoint':<40} {'reqs':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for name, item in report["endpoints"].items():
+        cells = [item[key] for key in ("p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms")]
+        print(
+            f"{name:<40} {item['requests']:>7} {item['errors']:>5} {item['rps']:>8.1f} "
+            + " ".join(f"{'-' if cell is None else f'{cell:.1f}':>8}" for cell in cells)
+        )
+    print(
+        f"\n{report['requests']} requests, {report['errors']} errors in {report['duration_s']}s "
+        f"({report['rps']} req/s); latencies in ms"
+    )
+
+
+async def main() -> int:
+    args = _parse_args()
+    mix = _parse_mix(args.mix)
+    rng = random.Random(args.seed)
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        response = await client.post("/api/v1/auth/login", json={"email": args.email, "password": args.password})
+        if response.status_code != 200:
+            print(f"❌ Login as {args.email} failed ({response.status_code}); run tools.datagen first")
+            return 1
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+        fixtures = Fixtures()
+        await fixtures.discover(client)
+        print(
+            f"Running {args.concurrency} virtual users for {args.duration:.0f}s against {args.base_url} "
+            f"({len(fixtures.project_ids)} projects, mix {mix})"
+        )
+
+        recorder = Recorder()
+        deadline = time.perf_counter() + args.duration
+        users = [
+            VirtualUser(client, recorder, fixtures, mix, random.Random(rng.random()), etags=not args.no_etags)
+            for _ in range(args.concurrency)
+        ]
+        await asyncio.gather(*(user.run(deadline) for user in users))
+        recorder.finished = time.perf_counter()
+
+    report = recorder.report()
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
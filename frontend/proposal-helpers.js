@@ -22,15 +22,13 @@ async function toggleVenueInProposal(projectId, venueId, include) {
 
 async function toggleAllVenuesInProposal(include) {
     const projectId = state.currentParams;
+    if (!state.projectVenues.length) return;
 
-    // Update all venues
-    const promises = state.projectVenues.map(pv =>
-        apiCall(`/projects/${projectId}/venues/${pv.venue.id}`, 'PATCH', {
-            include_in_proposal: include
-        })
+    // Update all venues in one batch request
+    const result = await apiCall(`/projects/${projectId}/venues`, 'PATCH',
+        state.projectVenues.map(pv => ({ venue_id: pv.venue.id, include_in_proposal: include }))
     );
-
-    await Promise.all(promises);
+    if (!result) return;
 
     // Update local state
     state.projectVenues.forEach(pv => {